@@ -0,0 +1,79 @@
+"""Cost of getting a ready agent: cold creation vs borrowing from a pool.
+
+The agent builds a real OpenAI ``LLMClient`` through ``create_client`` in
+its ``setup`` (no request is sent). Creating and setting up an agent per
+step is timed against borrowing and returning a warm pooled instance,
+for one mission and alternating between missions (which adds a reset).
+
+Usage:
+    python benchmarks/bench_agent_pool.py [--steps 2000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.agents.base import Agent  # noqa: E402
+from harmonicgalaxy.agents.pool import AgentPool  # noqa: E402
+from harmonicgalaxy.llm import LLMConfig, LLMProvider, create_client  # noqa: E402
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+CONFIG = LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4o-mini", api_key="sk-bench")
+
+
+class Assistant(Agent):
+    def __init__(self):
+        super().__init__("assistant")
+        self.client = None
+        self.history = []
+
+    async def setup(self):
+        self.client = create_client(CONFIG)
+
+    async def reset(self):
+        self.history = []
+
+    async def run(self, inputs, mission):
+        return None
+
+
+async def cold(steps):
+    started = time.perf_counter()
+    for _ in range(steps):
+        agent = Assistant()
+        await agent.setup()
+        await agent.close()
+    return (time.perf_counter() - started) / steps
+
+
+async def pooled(steps, missions):
+    async with AgentPool(Assistant, min_size=4, max_size=4) as pool:
+        started = time.perf_counter()
+        for index in range(steps):
+            agent = await pool.acquire(missions[index % len(missions)])
+            await pool.release(agent)
+        return (time.perf_counter() - started) / steps
+
+
+async def run(steps):
+    print(f"{steps} steps")
+    print(f"  create + setup       {await cold(steps) * 1e6:9.1f} µs/step")
+    print(f"  pool, same mission   {await pooled(steps, ['m']) * 1e6:9.1f} µs/step")
+    print(f"  pool, new mission    {await pooled(steps, ['m1', 'm2']) * 1e6:9.1f} µs/step")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+    setup_logging(LoggingConfig(level="WARNING"))
+    asyncio.run(run(args.steps))
+
+
+if __name__ == "__main__":
+    main()
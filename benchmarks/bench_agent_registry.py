@@ -0,0 +1,103 @@
+"""Agent selection cost with thousands of registered agents.
+
+Registers agents with random capability tags and data types, then times
+``AgentRegistry.find`` (index intersection, cold and cached) against a
+linear scan over every agent, and the cost of registering/unregistering
+one agent.
+
+Usage:
+    python benchmarks/bench_agent_registry.py [--agents 5000] [--tags 300] [--queries 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.agents.base import FunctionAgent  # noqa: E402
+from harmonicgalaxy.agents.registry import AgentRegistry  # noqa: E402
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+TYPES = ("text", "image", "audio", "table", "embedding", "code", "json", "html")
+
+
+def make_agents(count, tags, rng):
+    vocabulary = [f"tag{index}" for index in range(tags)]
+    return [
+        FunctionAgent(
+            f"agent{index}",
+            lambda inputs, mission: None,
+            description="",
+            capabilities=rng.sample(vocabulary, rng.randint(1, 8)),
+            input_types=rng.sample(TYPES, rng.randint(1, 3)),
+            output_types=rng.sample(TYPES, 1),
+        )
+        for index in range(count)
+    ], vocabulary
+
+
+def linear_scan(agents, requires, accepts, prefers):
+    matches = [
+        agent
+        for agent in agents
+        if requires <= agent.capabilities and accepts <= agent.input_types
+    ]
+    return sorted(matches, key=lambda agent: -len(prefers & agent.capabilities))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=5000)
+    parser.add_argument("--tags", type=int, default=300)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    setup_logging(LoggingConfig(level="WARNING"))
+
+    rng = random.Random(42)
+    agents, vocabulary = make_agents(args.agents, args.tags, rng)
+    registry = AgentRegistry(agents)
+    queries = [
+        (
+            frozenset(rng.sample(vocabulary, rng.randint(1, 2))),
+            frozenset(rng.sample(TYPES, 1)),
+            frozenset(rng.sample(vocabulary, 2)),
+        )
+        for _ in range(args.queries)
+    ]
+
+    print(f"{args.agents} agents, {args.tags} tags, {args.queries} queries")
+    started = time.perf_counter()
+    for requires, accepts, prefers in queries:
+        linear_scan(agents, requires, accepts, prefers)
+    scan = (time.perf_counter() - started) / args.queries * 1e6
+    print(f"  linear scan       {scan:9.2f} µs/query")
+
+    started = time.perf_counter()
+    for requires, accepts, prefers in queries:
+        registry._cache.clear()
+        registry.find(requires=requires, accepts=accepts, prefers=prefers)
+    cold = (time.perf_counter() - started) / args.queries * 1e6
+    print(f"  index             {cold:9.2f} µs/query")
+
+    # Steps of a mission repeat the same few queries
+    repeated = queries[:100] * (args.queries // 100)
+    started = time.perf_counter()
+    for requires, accepts, prefers in repeated:
+        registry.find(requires=requires, accepts=accepts, prefers=prefers)
+    cached = (time.perf_counter() - started) / len(repeated) * 1e6
+    print(f"  index (cached)    {cached:9.2f} µs/query")
+
+    started = time.perf_counter()
+    for agent in agents[:1000]:
+        registry.unregister(agent.name)
+        registry.register(agent)
+    update = (time.perf_counter() - started) / 1000 * 1e6
+    print(f"  unregister+register {update:7.2f} µs/agent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Mission checkpoint cost and recovery time against mission length and delta volume.
+
+Runs simulated missions of ``--steps`` steps whose outputs are ``--payload``
+bytes each, checkpointing after every step into an SQLite store, then
+recovers each mission in a fresh checkpointer. For every combination with
+each ``--snapshot-every`` setting, prints:
+
+- the checkpoint cost per step and the bytes written to the journal;
+- the number of deltas replayed by recovery and the recovery time.
+
+``--snapshot-every 1`` writes the whole mission at every checkpoint, i.e.
+the cost of saving the mission after each step without a journal.
+
+Usage:
+    python benchmarks/bench_checkpoint_recovery.py [--steps 10,40,160,640]
+        [--payload 256,4096] [--snapshot-every 1,16,128] [--durability none]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.core.mission import Mission  # noqa: E402
+from harmonicgalaxy.state.backends import Durability, SQLiteBackend  # noqa: E402
+from harmonicgalaxy.state.checkpoint import MissionCheckpointer  # noqa: E402
+from harmonicgalaxy.state.manager import StateManager  # noqa: E402
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+
+def integers(text):
+    return [int(value) for value in text.split(",")]
+
+
+async def measure(path, durability, steps, payload, snapshot_every):
+    mission = Mission("bench", context={"topic": "checkpoints", "progress": 0}, mission_id="m")
+    mission.start()
+    async with StateManager(SQLiteBackend(path, durability=durability)) as state:
+        checkpointer = MissionCheckpointer(state, snapshot_every=snapshot_every)
+        started = time.perf_counter()
+        await checkpointer.checkpoint(mission)
+        for step in range(steps):
+            mission.record_step(
+                "writer", f"step-{step}", duration=0.0, input={"step": step}, output="x" * payload
+            )
+            mission.context["progress"] = step + 1
+            await checkpointer.checkpoint(mission)
+        per_step = (time.perf_counter() - started) / steps
+        written = checkpointer.bytes_written
+
+    async with StateManager(SQLiteBackend(path, durability=durability)) as state:
+        checkpointer = MissionCheckpointer(state)
+        started = time.perf_counter()
+        restored = await checkpointer.recover("m")
+        recovery = time.perf_counter() - started
+        replayed = checkpointer.replayed
+    assert len(restored.history) == steps
+    return per_step, written, replayed, recovery
+
+
+async def run(args, directory):
+    durability = Durability(args.durability)
+    print(f"SQLite store, durability={durability.value}")
+    print(
+        f"  {'steps':>6} {'payload':>8} {'snap every':>10} {'µs/step':>9} "
+        f"{'journal KiB':>12} {'replayed':>9} {'recovery ms':>12}"
+    )
+    for steps in integers(args.steps):
+        for payload in integers(args.payload):
+            for snapshot_every in integers(args.snapshot_every):
+                path = Path(directory) / f"{steps}-{payload}-{snapshot_every}.db"
+                per_step, written, replayed, recovery = await measure(
+                    path, durability, steps, payload, snapshot_every
+                )
+                print(
+                    f"  {steps:6} {payload:8} {snapshot_every:10} {per_step * 1e6:9.0f} "
+                    f"{written / 1024:12.0f} {replayed:9} {recovery * 1e3:12.2f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", default="10,40,160,640", help="Mission lengths")
+    parser.add_argument("--payload", default="256,4096", help="Output bytes per step")
+    parser.add_argument("--snapshot-every", default="1,16,128", help="Deltas between snapshots")
+    parser.add_argument("--durability", default="none", choices=[d.value for d in Durability])
+    parser.add_argument("--dir", help="Directory of the store files (default: a temporary one)")
+    args = parser.parse_args()
+    setup_logging(LoggingConfig(level="WARNING"))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        asyncio.run(run(args, directory))
+
+
+if __name__ == "__main__":
+    main()
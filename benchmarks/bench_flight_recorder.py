@@ -0,0 +1,60 @@
+"""Cost of recording a DEBUG record in the flight recorder.
+
+Logs the same record through the flight recorder ring and through a plain
+``FileHandler`` (formatted text, flushed on every record) and reports the
+time per record of each handler.
+
+Usage:
+    python benchmarks/bench_flight_recorder.py [--records 100000]
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.utils.flight_recorder import FlightRecorderHandler  # noqa: E402
+
+
+def per_record_ns(handler, records):
+    """Time per ``handler.handle`` call in nanoseconds."""
+    record = logging.LogRecord(
+        "harmonicgalaxy.agents.planner",
+        logging.DEBUG,
+        __file__,
+        1,
+        "Evaluating step %d of mission %s",
+        (7, "m-42"),
+        None,
+    )
+    handle = handler.handle
+    started = time.perf_counter()
+    for _ in range(records):
+        handle(record)
+    return (time.perf_counter() - started) / records * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        ring = FlightRecorderHandler(Path(directory) / "flight.ring")
+        text = logging.FileHandler(Path(directory) / "debug.log")
+        text.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+        try:
+            for name, handler in (("flight recorder", ring), ("file handler", text)):
+                print(f"  {name:<16} {per_record_ns(handler, args.records):8.0f} ns/record")
+        finally:
+            ring.close()
+            text.close()
+
+
+if __name__ == "__main__":
+    main()
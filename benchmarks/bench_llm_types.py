@@ -0,0 +1,97 @@
+"""Memory footprint and serialization benchmarks for LLM data types.
+
+Compares the mutable LLMMessage/LLMResponse dataclasses with their slotted,
+frozen counterparts and the stdlib ``json`` path with ``orjson``.
+
+Usage:
+    python benchmarks/bench_llm_types.py [--count 100000]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.llm import serialization  # noqa: E402
+from harmonicgalaxy.llm.types import (  # noqa: E402
+    FrozenLLMMessage,
+    FrozenLLMResponse,
+    LLMMessage,
+    LLMResponse,
+)
+
+ROLES = ["system", "user", "assistant"]
+
+
+def measure_memory(factory, count):
+    """Return bytes allocated per object built by ``factory``."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return total / count
+
+
+def measure_time(func, repeat=5):
+    """Return the best wall-clock time of ``func`` over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stdlib_dump(messages):
+    return json.dumps([m.to_dict() for m in messages], separators=(",", ":")).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    count = args.count
+
+    # Content strings are shared so only the per-object overhead is measured
+    content = "x" * 64
+
+    print(f"Memory per object ({count:,} objects, shared content)")
+    for label, factory in [
+        ("LLMMessage", lambda i: LLMMessage(role=ROLES[i % 3], content=content)),
+        ("FrozenLLMMessage", lambda i: FrozenLLMMessage(role=ROLES[i % 3], content=content)),
+        ("LLMResponse", lambda i: LLMResponse(content=content, model="gpt-4", provider="openai")),
+        (
+            "FrozenLLMResponse",
+            lambda i: FrozenLLMResponse(content=content, model="gpt-4", provider="openai"),
+        ),
+    ]:
+        print(f"  {label:20s} {measure_memory(factory, count):8.1f} B")
+
+    mutable = [LLMMessage(role=ROLES[i % 3], content=f"message {i}") for i in range(count)]
+    frozen = [FrozenLLMMessage(role=ROLES[i % 3], content=f"message {i}") for i in range(count)]
+
+    print(f"\nSerialization ({count:,} messages, best of 5)")
+    dump_std = measure_time(lambda: stdlib_dump(mutable))
+    print(f"  json    dump  LLMMessage        {dump_std * 1e3:8.1f} ms")
+    payload = stdlib_dump(mutable)
+    load_std = measure_time(lambda: [LLMMessage.from_dict(d) for d in json.loads(payload)])
+    print(f"  json    load  LLMMessage        {load_std * 1e3:8.1f} ms")
+
+    serialization.dump_messages(frozen)  # warm the cached dicts
+    backend = "orjson" if serialization.orjson is not None else "json"
+    dump_fast = measure_time(lambda: serialization.dump_messages(frozen))
+    print(f"  {backend:7s} dump  FrozenLLMMessage  {dump_fast * 1e3:8.1f} ms")
+    load_fast = measure_time(lambda: serialization.load_messages(payload))
+    print(f"  {backend:7s} load  FrozenLLMMessage  {load_fast * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Event-loop latency with synchronous vs queue-based logging.
+
+Simulates a slow log sink (e.g. stdout under a container log collector) and
+measures how late a periodic 1 ms timer fires while several coroutines log
+continuously.
+
+Usage:
+    python benchmarks/bench_logging_event_loop.py [--sink-delay 0.0005] [--duration 2]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.utils import logging as galaxy_logging  # noqa: E402
+
+
+class SlowStream(io.StringIO):
+    """Text stream whose writes block for a fixed time."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return len(text)
+
+
+async def measure(duration, writers):
+    """Return timer overshoot samples (seconds) while ``writers`` coroutines log."""
+    logger = galaxy_logging.get_logger("bench.eventloop")
+    stop = time.monotonic() + duration
+    lags = []
+
+    async def writer(index):
+        n = 0
+        while time.monotonic() < stop:
+            logger.info("writer %d message %d", index, n)
+            n += 1
+            await asyncio.sleep(0)
+
+    async def ticker():
+        while time.monotonic() < stop:
+            expected = time.monotonic() + 0.001
+            await asyncio.sleep(0.001)
+            lags.append(time.monotonic() - expected)
+
+    await asyncio.gather(ticker(), *(writer(i) for i in range(writers)))
+    return lags
+
+
+def run(async_logging, sink_delay, duration, writers):
+    config = galaxy_logging.LoggingConfig(
+        level="INFO",
+        theme="standard",
+        use_colors=False,
+        async_logging=async_logging,
+        queue_size=1000,
+        overflow_policy="drop_oldest",
+    )
+    galaxy_logging.setup_logging(config)
+    # Swap the console stream for the simulated slow sink
+    handlers = (
+        galaxy_logging._queue_listener.handlers
+        if galaxy_logging._queue_listener is not None
+        else logging.getLogger().handlers
+    )
+    for handler in handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setStream(SlowStream(sink_delay))
+
+    lags = asyncio.run(measure(duration, writers))
+    stats = galaxy_logging.get_logging_stats()
+    galaxy_logging.shutdown_logging()
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1]
+    label = "queue" if async_logging else "sync"
+    print(
+        f"  {label:5s}  ticks={len(lags):6d}  median lag={statistics.median(lags) * 1e3:7.3f} ms  "
+        f"p99 lag={p99 * 1e3:7.3f} ms  max lag={lags[-1] * 1e3:7.3f} ms  dropped={stats['dropped']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sink-delay", type=float, default=0.0005)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Event-loop timer lag, sink write delay {args.sink_delay * 1e3:.2f} ms")
+    run(False, args.sink_delay, args.duration, args.writers)
+    run(True, args.sink_delay, args.duration, args.writers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Formatting throughput of the galaxy, standard and json log themes.
+
+Usage:
+    python benchmarks/bench_logging_formatters.py [--records 200000]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.utils import logging as galaxy_logging  # noqa: E402
+
+
+def make_records(count):
+    """Build records spread over a few seconds, with mission/agent extras."""
+    start = time.time()
+    records = []
+    for i in range(count):
+        record = logging.makeLogRecord(
+            {
+                "name": "harmonicgalaxy.bench",
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+                "msg": "agent %s finished step %d",
+                "args": ("planner", i),
+                "mission_id": "mission-42",
+                "agent_id": "planner",
+            }
+        )
+        record.created = start + i / 50000
+        records.append(record)
+    return records
+
+
+def bench(label, formatter, records):
+    start = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:8s}  {len(records) / elapsed:12,.0f} records/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    print(f"Formatting {args.records} records (orjson: {galaxy_logging.orjson is not None})")
+    bench("galaxy", galaxy_logging.GalaxyFormatter(use_colors=False), records)
+    bench("standard", galaxy_logging.StandardFormatter(use_colors=False), records)
+    bench("json", galaxy_logging.JsonFormatter(), records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Overhead of the logging decorators when DEBUG is disabled.
+
+Calls a trivial function with large arguments directly and through
+``log_function_call`` and reports the per-call difference. Exits with a
+non-zero status if the overhead exceeds the budget.
+
+Usage:
+    python benchmarks/bench_logging_overhead.py [--calls 200000] [--budget-ns 500]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.utils.decorators import log_function_call  # noqa: E402
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+
+def per_call_ns(func, args, kwargs, calls, repeat=5):
+    """Best-of-``repeat`` time per call in nanoseconds."""
+    timings = timeit.repeat(lambda: func(*args, **kwargs), number=calls, repeat=repeat)
+    return min(timings) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--budget-ns", type=float, default=500.0)
+    args = parser.parse_args()
+
+    setup_logging(LoggingConfig(level="INFO", use_colors=False))
+
+    def handle(messages, config=None):
+        return messages
+
+    decorated = log_function_call()(handle)
+    messages = [{"role": "user", "content": "x" * 200} for _ in range(1000)]
+    call_args = (messages,)
+    call_kwargs = {"config": {"model": "gpt-4", "temperature": 0.7}}
+
+    plain = per_call_ns(handle, call_args, call_kwargs, args.calls)
+    wrapped = per_call_ns(decorated, call_args, call_kwargs, args.calls)
+    overhead = wrapped - plain
+    print(f"  plain      {plain:8.1f} ns/call")
+    print(f"  decorated  {wrapped:8.1f} ns/call")
+    print(f"  overhead   {overhead:8.1f} ns/call (budget {args.budget_ns:.0f} ns)")
+    if overhead > args.budget_ns:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Memory and time cost of a long mission history.
+
+Records the same steps in a :class:`MissionHistory` and, for comparison, as
+a list of one dict per step, and reports the memory per step (tracemalloc)
+and the time to append, index and iterate.
+
+Usage:
+    python benchmarks/bench_mission_history.py [--steps 50000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.core.mission import MissionHistory  # noqa: E402
+
+AGENTS = ("planner", "researcher", "writer", "reviewer")
+
+
+def fill_history(steps, context):
+    history = MissionHistory()
+    for index in range(steps):
+        history.append(
+            AGENTS[index % len(AGENTS)], "step", started_at=index, duration=0.5, input=context
+        )
+    return history
+
+
+def fill_dicts(steps, context):
+    return [
+        {
+            "agent": AGENTS[index % len(AGENTS)],
+            "action": "step",
+            "status": "succeeded",
+            "started_at": float(index),
+            "duration": 0.5,
+            "input": context,
+            "output": None,
+            "error": None,
+        }
+        for index in range(steps)
+    ]
+
+
+def measure(fill, steps, context):
+    started = time.perf_counter()
+    result = fill(steps, context)
+    elapsed = time.perf_counter() - started
+    del result
+    tracemalloc.start()
+    result = fill(steps, context)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size / steps, elapsed / steps * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=50000)
+    args = parser.parse_args()
+
+    context = {"document": "x" * 1_000_000}
+    history, history_bytes, history_ns = measure(fill_history, args.steps, context)
+    _, dict_bytes, dict_ns = measure(fill_dicts, args.steps, context)
+    print(f"  MissionHistory  {history_bytes:7.1f} bytes/step  {history_ns:7.0f} ns/append")
+    print(f"  list of dicts   {dict_bytes:7.1f} bytes/step  {dict_ns:7.0f} ns/append")
+
+    started = time.perf_counter()
+    for index in range(0, args.steps, 7):
+        history[index]
+    lookups = len(range(0, args.steps, 7))
+    print(f"  lookup          {(time.perf_counter() - started) / lookups * 1e9:7.0f} ns/step")
+    started = time.perf_counter()
+    for _ in history:
+        pass
+    print(f"  iteration       {(time.perf_counter() - started) / args.steps * 1e9:7.0f} ns/step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Scheduler overhead per step of the orchestration engine.
+
+Runs graphs of trivial async agents (which return immediately) through
+:class:`OrchestrationEngine`, so the measured time is the engine's own cost:
+dependency bookkeeping, task creation, the parallelism caps, the tracing
+span and the mission history record of each step.
+
+Shapes:
+    wide     all steps independent
+    chain    each step depends on the previous one
+    layered  random DAG: each step depends on up to 3 steps of the previous layer
+
+Usage:
+    python benchmarks/bench_orchestrator.py [--steps 10000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.agents.base import Agent  # noqa: E402
+from harmonicgalaxy.core.mission import Mission  # noqa: E402
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine  # noqa: E402
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+
+class NoopAgent(Agent):
+    async def run(self, inputs, mission):
+        return None
+
+
+def build(shape, steps, agent):
+    graph = MissionGraph()
+    if shape == "wide":
+        for index in range(steps):
+            graph.add_step(f"s{index}", agent)
+    elif shape == "chain":
+        graph.add_step("s0", agent)
+        for index in range(1, steps):
+            graph.add_step(f"s{index}", agent, depends_on=[f"s{index - 1}"])
+    else:
+        rng = random.Random(42)
+        width = 100
+        for index in range(steps):
+            layer = index // width
+            if layer == 0:
+                graph.add_step(f"s{index}", agent)
+                continue
+            previous = range((layer - 1) * width, layer * width)
+            parents = rng.sample(previous, rng.randint(1, 3))
+            graph.add_step(f"s{index}", agent, depends_on=[f"s{p}" for p in parents])
+    return graph
+
+
+async def measure(shape, steps, repeat, max_parallel):
+    agent = NoopAgent("noop")
+    engine = OrchestrationEngine(max_concurrency=max_parallel or steps)
+    graph = build(shape, steps, agent)
+    started = time.perf_counter()
+    graph.compile()
+    compile_us = (time.perf_counter() - started) / steps * 1e6
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await engine.run(Mission(shape), graph, max_parallel=max_parallel)
+        best = min(best, time.perf_counter() - started)
+    return compile_us, best / steps * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-parallel", type=int, default=None)
+    args = parser.parse_args()
+    setup_logging(LoggingConfig(level="WARNING"))
+
+    print(f"Scheduler overhead, {args.steps} steps (best of {args.repeat})")
+    for shape in ("wide", "chain", "layered"):
+        compile_us, run_us = asyncio.run(
+            measure(shape, args.steps, args.repeat, args.max_parallel)
+        )
+        print(f"  {shape:8s} compile {compile_us:6.2f} µs/step   run {run_us:6.2f} µs/step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Per-step snapshot cost: deep copies vs persistent structures.
+
+Builds a mission context of ``--documents`` documents, then simulates
+``--steps`` steps that each snapshot the context and update one document:
+
+- ``deepcopy``: ``copy.deepcopy`` of a plain dict per snapshot;
+- ``persistent``: the snapshot is a reference to a :class:`PersistentMap`
+  version and the update copies one path (``set_in``).
+
+Also times :func:`diff` between consecutive versions, as used for journaling.
+
+Usage:
+    python benchmarks/bench_persistent_state.py [--documents 2000] [--steps 200]
+"""
+
+import argparse
+import copy
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.state.persistent import diff, freeze  # noqa: E402
+
+
+def make_context(documents):
+    return {
+        "documents": [
+            {"id": index, "title": f"Document {index}", "text": "lorem ipsum " * 20, "tags": []}
+            for index in range(documents)
+        ],
+        "step": 0,
+    }
+
+
+def run_deepcopy(context, steps):
+    snapshots = []
+    started = time.perf_counter()
+    for step in range(steps):
+        snapshots.append(copy.deepcopy(context))
+        context["documents"][step % len(context["documents"])]["summary"] = f"summary {step}"
+        context["step"] = step
+    return time.perf_counter() - started, snapshots
+
+
+def run_persistent(context, steps):
+    snapshots = []
+    documents = len(context["documents"])
+    started = time.perf_counter()
+    for step in range(steps):
+        snapshots.append(context)
+        context = context.set_in(("documents", step % documents, "summary"), f"summary {step}")
+        context = context.set("step", step)
+    snapshots.append(context)
+    return time.perf_counter() - started, snapshots
+
+
+def measure_memory(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.documents} documents, {args.steps} steps (time, then peak memory)")
+    elapsed, _ = run_deepcopy(make_context(args.documents), args.steps)
+    _, peak = measure_memory(run_deepcopy, make_context(args.documents), args.steps)
+    print(f"  deepcopy     {elapsed / args.steps * 1e6:10.1f} µs/step  {peak / 2**20:8.1f} MiB")
+
+    frozen = freeze(make_context(args.documents))
+    elapsed, versions = run_persistent(frozen, args.steps)
+    _, peak = measure_memory(run_persistent, frozen, args.steps)
+    print(f"  persistent   {elapsed / args.steps * 1e6:10.1f} µs/step  {peak / 2**20:8.1f} MiB")
+
+    started = time.perf_counter()
+    changes = sum(len(diff(old, new)) for old, new in zip(versions, versions[1:]))
+    elapsed = time.perf_counter() - started
+    print(f"  diff         {elapsed / args.steps * 1e6:10.1f} µs/step  ({changes} changes)")
+
+
+if __name__ == "__main__":
+    main()
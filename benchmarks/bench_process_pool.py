@@ -0,0 +1,52 @@
+"""Cost of passing large arguments to the process pool.
+
+Sends the same buffer to a worker with the shared memory path disabled
+(pickled through the executor's pipe) and enabled (protocol 5 out-of-band
+buffers copied once into shared memory), and reports the round trip time.
+
+Usage:
+    python benchmarks/bench_process_pool.py [--size-mb 64] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import pickle
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.orchestrator.process_pool import ProcessPool  # noqa: E402
+
+
+def first_byte(buffer):
+    return memoryview(buffer)[0]
+
+
+async def measure(shm_threshold, data, repeat):
+    async with ProcessPool(max_workers=1, shm_threshold=shm_threshold) as pool:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await pool.run(first_byte, pickle.PickleBuffer(data))
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = bytearray(args.size_mb << 20)
+    print(f"Round trip of a {args.size_mb} MiB argument (best of {args.repeat})")
+    for label, threshold in (("pipe", None), ("shared memory", 1 << 20)):
+        elapsed = asyncio.run(measure(threshold, data, args.repeat))
+        print(f"  {label:14s} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Per-call overhead of the ``timed`` and ``profiled`` decorators.
+
+Usage:
+    python benchmarks/bench_profiling_overhead.py [--calls 200000] [--sample-rate 0.001]
+"""
+
+import argparse
+import asyncio
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.utils.decorators import profiled, timed  # noqa: E402
+
+
+def per_call_ns(func, calls, repeat=5):
+    """Best-of-``repeat`` time per call in nanoseconds."""
+    return min(timeit.repeat(func, number=calls, repeat=repeat)) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--sample-rate", type=float, default=0.001)
+    args = parser.parse_args()
+
+    def handle(x):
+        return x
+
+    variants = {
+        "plain": handle,
+        "timed": timed("bench.timed")(handle),
+        "profiled": profiled("bench.profiled", sample_rate=args.sample_rate)(handle),
+        "stack": profiled("bench.stack", sample_rate=args.sample_rate, mode="stack")(handle),
+    }
+    baseline = None
+    print(f"Sync calls ({args.calls} per run, sample rate {args.sample_rate})")
+    for label, func in variants.items():
+        ns = per_call_ns(lambda: func(1), args.calls)
+        baseline = ns if baseline is None else baseline
+        print(f"  {label:9s} {ns:8.1f} ns/call  overhead {ns - baseline:7.1f} ns")
+
+    async def run(func, calls):
+        for _ in range(calls):
+            await func(1)
+
+    async def handle_async(x):
+        return x
+
+    print("Async calls")
+    baseline = None
+    for label, func in (
+        ("plain", handle_async),
+        ("timed", timed("bench.async")(handle_async)),
+    ):
+        ns = per_call_ns(lambda: asyncio.run(run(func, args.calls)), 1, repeat=3) / args.calls
+        baseline = ns if baseline is None else baseline
+        print(f"  {label:9s} {ns:8.1f} ns/call  overhead {ns - baseline:7.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
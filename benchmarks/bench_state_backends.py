@@ -0,0 +1,108 @@
+"""Throughput of the state backends at each durability level.
+
+For every backend and durability level, measures:
+
+- sequential writes per second (one writer awaiting each write);
+- concurrent writes per second (``--writers`` tasks writing at once, which
+  group commit turns into shared commits/fsyncs);
+- random reads per second;
+- the cost of one ``flush`` (fsync) after a burst of writes;
+- the number of SQLite commits or log fsyncs the writes took.
+
+Usage:
+    python benchmarks/bench_state_backends.py [--writes 2000] [--writers 64] [--dir /tmp]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.state.backends import (  # noqa: E402
+    Durability,
+    MemoryBackend,
+    MmapLogBackend,
+    SQLiteBackend,
+)
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+VALUE = b"x" * 256
+
+
+def backends(directory):
+    yield "memory", "-", lambda: MemoryBackend()
+    for durability in Durability:
+        for name, cls, suffix in (("sqlite", SQLiteBackend, "db"), ("mmap", MmapLogBackend, "log")):
+            path = Path(directory) / f"{name}-{durability.value}.{suffix}"
+            yield name, durability.value, lambda cls=cls, path=path, d=durability: cls(
+                path, durability=d
+            )
+
+
+async def measure(factory, writes, writers):
+    async with factory() as backend:
+        started = time.perf_counter()
+        for index in range(writes):
+            await backend.put(f"seq/{index}", VALUE)
+        sequential = writes / (time.perf_counter() - started)
+
+        async def writer(offset):
+            for index in range(offset, writes, writers):
+                await backend.put(f"con/{index}", VALUE)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(offset) for offset in range(writers)))
+        concurrent = writes / (time.perf_counter() - started)
+
+        keys = [f"seq/{index}" for index in range(writes)]
+        random.Random(0).shuffle(keys)
+        started = time.perf_counter()
+        for key in keys:
+            await backend.get(key)
+        reads = writes / (time.perf_counter() - started)
+
+        for index in range(100):
+            await backend.put(f"burst/{index}", VALUE)
+        started = time.perf_counter()
+        await backend.flush()
+        flush = time.perf_counter() - started
+        stats = backend.stats()
+    return sequential, concurrent, reads, flush, stats
+
+
+async def run(args, directory):
+    print(f"{args.writes} writes of {len(VALUE)} bytes, {args.writers} concurrent writers")
+    print(
+        f"  {'backend':8} {'durability':10} {'seq w/s':>10} {'conc w/s':>10} "
+        f"{'reads/s':>10} {'flush ms':>9} {'commits/fsyncs':>15}"
+    )
+    for name, durability, factory in backends(directory):
+        writes = args.writes if durability != "full" else max(args.writes // 10, 100)
+        sequential, concurrent, reads, flush, stats = await measure(factory, writes, args.writers)
+        commits = stats.get("commits", stats.get("syncs", "-"))
+        print(
+            f"  {name:8} {durability:10} {sequential:10.0f} {concurrent:10.0f} "
+            f"{reads:10.0f} {flush * 1e3:9.2f} {commits:>15}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--dir", help="Directory of the store files (default: a temporary one)")
+    args = parser.parse_args()
+    setup_logging(LoggingConfig(level="WARNING"))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        asyncio.run(run(args, directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Mission queries through secondary indexes vs a full scan of saved missions.
+
+Saves ``--missions`` missions with random statuses, steps in flight (and
+their agents), tags and creation times, then answers operator-style queries two ways:
+
+- ``index``: :meth:`StateManager.query_missions`, which scans only the
+  matching index entries and loads the matching missions;
+- ``scan``: :meth:`StateManager.list_missions` and a filter in Python.
+
+Also prints the cost of saving a mission with and without the indexes.
+
+Usage:
+    python benchmarks/bench_state_queries.py [--missions 5000] [--backend sqlite] [--dir /tmp]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from harmonicgalaxy.core.mission import Mission, MissionStatus  # noqa: E402
+from harmonicgalaxy.state.indexes import Range  # noqa: E402
+from harmonicgalaxy.state.manager import StateManager, create_backend  # noqa: E402
+from harmonicgalaxy.utils.logging import LoggingConfig, setup_logging  # noqa: E402
+
+AGENTS = [f"agent-{index}" for index in range(20)]
+STEPS = [f"step-{index}" for index in range(40)]
+TAGS = ["urgent", "eu", "us", "batch", "trial", "vip"]
+NOW = 1_700_000_000.0
+
+
+def make_missions(count):
+    rng = random.Random(0)
+    missions = []
+    for index in range(count):
+        mission = Mission(
+            "bench",
+            context={"document": "lorem ipsum " * 50},
+            mission_id=f"m{index:06d}",
+            metadata={"tags": rng.sample(TAGS, rng.randrange(3))},
+        )
+        mission.created_at = NOW - rng.uniform(0, 86400)
+        mission.start()
+        for _ in range(rng.randrange(1, 6)):
+            mission.record_step(rng.choice(AGENTS), rng.choice(STEPS), output="done")
+        for _ in range(rng.randrange(1, 3)):
+            mission.running_steps[rng.choice(STEPS)] = rng.choice(AGENTS)
+        if rng.random() < 0.8:
+            mission.complete(result="ok")
+        missions.append(mission)
+    return missions
+
+
+def queries():
+    """(label, index conditions, equivalent filter)."""
+    recent = NOW - 600
+    return [
+        (
+            "running at step-7",
+            {"status": "running", "step": "step-7"},
+            lambda m: m.status is MissionStatus.RUNNING and "step-7" in m.running_steps,
+        ),
+        (
+            "running on agent-3",
+            {"status": "running", "agent": "agent-3"},
+            lambda m: m.status is MissionStatus.RUNNING
+            and "agent-3" in m.running_steps.values(),
+        ),
+        (
+            "tagged vip",
+            {"tag": "vip"},
+            lambda m: "vip" in m.metadata.get("tags", []),
+        ),
+        (
+            "created < 10 min ago",
+            {"created": Range(start=recent)},
+            lambda m: m.created_at >= recent,
+        ),
+    ]
+
+
+async def timed(coroutine):
+    started = time.perf_counter()
+    result = await coroutine
+    return result, time.perf_counter() - started
+
+
+async def run(args, directory):
+    missions = make_missions(args.missions)
+    suffix = {"sqlite": "db", "mmap": "log"}.get(args.backend)
+    for label, indexes in (("no indexes", ()), ("indexed", None)):
+        url = "memory://" if suffix is None else f"{args.backend}:///{directory}/{label}.{suffix}"
+        async with StateManager(create_backend(url, durability="none"), indexes=indexes) as state:
+            started = time.perf_counter()
+            for mission in missions:
+                await state.save_mission(mission)
+            elapsed = time.perf_counter() - started
+            print(f"save ({label:10}) {elapsed / len(missions) * 1e6:8.0f} µs/mission")
+
+            if indexes is not None:
+                continue
+            print(f"  {'query':22} {'matches':>8} {'index ms':>9} {'scan ms':>9}")
+            for name, conditions, predicate in queries():
+                found, indexed = await timed(state.query_missions(**conditions))
+                everything, scanned = await timed(state.list_missions())
+                expected = sorted(m.id for m in everything if predicate(m))
+                assert sorted(m.id for m in found) == expected, name
+                print(
+                    f"  {name:22} {len(found):8} {indexed * 1e3:9.2f} {scanned * 1e3:9.2f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--missions", type=int, default=5000)
+    parser.add_argument("--backend", default="sqlite", choices=["memory", "sqlite", "mmap"])
+    parser.add_argument("--dir", help="Directory of the store files (default: a temporary one)")
+    args = parser.parse_args()
+    setup_logging(LoggingConfig(level="WARNING"))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        asyncio.run(run(args, directory))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,13 @@ from harmonicgalaxy.llm import (
     LLMProvider,
 )
 
+# Export core models
+from harmonicgalaxy.core import Mission, MissionStatus
+
+# Export agents and orchestration
+from harmonicgalaxy.agents import Agent, FunctionAgent
+from harmonicgalaxy.orchestrator import MissionGraph, OrchestrationEngine
+
 # Export logging utilities
 from harmonicgalaxy.utils.logging import get_logger, setup_logging, LogLevel
 
@@ -30,6 +37,12 @@ __all__ = [
     "LLMResponse",
     "LLMConfig",
     "LLMProvider",
+    "Mission",
+    "MissionStatus",
+    "Agent",
+    "FunctionAgent",
+    "MissionGraph",
+    "OrchestrationEngine",
     "get_logger",
     "setup_logging",
     "LogLevel",
@@ -1,2 +1,15 @@
 """Agent registry and capability description."""
 
+from harmonicgalaxy.agents.base import Agent, CPUBoundAgent, FunctionAgent
+from harmonicgalaxy.agents.pool import AgentPool, PooledAgent
+from harmonicgalaxy.agents.registry import AgentMatch, AgentRegistry
+
+__all__ = [
+    "Agent",
+    "AgentMatch",
+    "AgentPool",
+    "AgentRegistry",
+    "CPUBoundAgent",
+    "FunctionAgent",
+    "PooledAgent",
+]
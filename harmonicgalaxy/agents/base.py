@@ -0,0 +1,166 @@
+"""Agent base class.
+
+Every agent is an independent capability node: it has a name, a description
+of what it can do, and an async :meth:`Agent.run` that turns the inputs of a
+mission step into its output.
+
+Example:
+    >>> class Summarizer(Agent):
+    ...     async def run(self, inputs, mission):
+    ...         response = await self.client.chat([...])
+    ...         return response.content
+    >>> summarizer = Summarizer("summarizer", capabilities={"summarize"})
+"""
+
+import asyncio
+import functools
+import inspect
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional
+
+if TYPE_CHECKING:
+    from harmonicgalaxy.core.mission import Mission
+
+
+class Agent(ABC):
+    """Abstract base class for agents."""
+
+    #: Whether the agent does heavy local computation (see :class:`CPUBoundAgent`)
+    cpu_bound = False
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        capabilities: Optional[Iterable[str]] = None,
+        input_types: Optional[Iterable[str]] = None,
+        output_types: Optional[Iterable[str]] = None,
+    ):
+        """Initialize agent.
+
+        Args:
+            name: Unique agent name
+            description: What the agent does
+            capabilities: Capability tags the agent provides (e.g. ``summarize``)
+            input_types: Types of data the agent consumes (e.g. ``text``, ``image``)
+            output_types: Types of data the agent produces (e.g. ``embedding``)
+        """
+        self.name = name
+        self.description = description
+        self.capabilities = frozenset(capabilities or ())
+        self.input_types = frozenset(input_types or ())
+        self.output_types = frozenset(output_types or ())
+
+    @abstractmethod
+    async def run(self, inputs: Dict[str, Any], mission: "Mission") -> Any:
+        """Execute one mission step.
+
+        Args:
+            inputs: Inputs of the step: its static inputs plus the outputs of
+                the steps it depends on, keyed by step id
+            mission: Mission the step belongs to (context and history)
+
+        Returns:
+            Output of the step, passed to the steps that depend on it
+        """
+        pass
+
+    async def setup(self) -> None:
+        """Acquire the agent's resources (LLM client, connections) before its first step.
+
+        Called once per instance by :class:`~harmonicgalaxy.agents.pool.AgentPool`.
+        """
+        pass
+
+    async def reset(self) -> None:
+        """Clear per-mission mutable state before the instance serves another mission."""
+        pass
+
+    async def check_health(self) -> bool:
+        """Return whether the instance can still serve steps (e.g. its client is usable)."""
+        return True
+
+    async def close(self) -> None:
+        """Release the resources acquired by :meth:`setup`."""
+        pass
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r})"
+
+
+class CPUBoundAgent(Agent):
+    """Agent doing heavy local computation (parsing, scoring, post-processing).
+
+    Subclasses implement the synchronous :meth:`compute`. When the engine
+    has a process pool, it runs ``compute`` there so the event loop keeps
+    serving LLM I/O; the agent and the step inputs must then be picklable,
+    and the step gets no access to the mission. Without a pool, ``compute``
+    runs in the default thread pool executor.
+    """
+
+    cpu_bound = True
+
+    @abstractmethod
+    def compute(self, inputs: Dict[str, Any]) -> Any:
+        """Compute the output of a step from its inputs (possibly in another process).
+
+        Args:
+            inputs: Inputs of the step (see :meth:`Agent.run`)
+
+        Returns:
+            Output of the step
+        """
+        pass
+
+    async def run(self, inputs: Dict[str, Any], mission: "Mission") -> Any:
+        """Run :meth:`compute` in the default thread pool executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.compute, inputs)
+
+
+class FunctionAgent(Agent):
+    """Agent running a plain function.
+
+    The function is called as ``func(inputs, mission)``. Coroutine functions
+    are awaited; sync functions run in the default thread pool executor so
+    they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        description: Optional[str] = None,
+        capabilities: Optional[Iterable[str]] = None,
+        input_types: Optional[Iterable[str]] = None,
+        output_types: Optional[Iterable[str]] = None,
+    ):
+        """Initialize function agent.
+
+        Args:
+            name: Unique agent name
+            func: Sync or async callable ``func(inputs, mission)``
+            description: What the agent does (defaults to the first docstring line)
+            capabilities: Capability tags the agent provides
+            input_types: Types of data the agent consumes
+            output_types: Types of data the agent produces
+        """
+        if description is None:
+            doc = inspect.getdoc(func) or ""
+            description = doc.splitlines()[0] if doc else ""
+        super().__init__(
+            name,
+            description=description,
+            capabilities=capabilities,
+            input_types=input_types,
+            output_types=output_types,
+        )
+        self.func = func
+        self._is_async = inspect.iscoroutinefunction(func)
+
+    async def run(self, inputs: Dict[str, Any], mission: "Mission") -> Any:
+        """Call the function with the step inputs."""
+        if self._is_async:
+            return await self.func(inputs, mission)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.func, inputs, mission))
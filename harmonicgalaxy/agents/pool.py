@@ -0,0 +1,509 @@
+"""Pools of warm agent instances.
+
+Building an agent means building its LLM client (``create_client``) and
+whatever else :meth:`Agent.setup` acquires. When missions create agents on
+demand, that cost lands on the critical path of every step.
+:class:`AgentPool` keeps ready instances of one agent instead:
+
+- **Pre-warming**: :meth:`AgentPool.start` creates and sets up ``min_size``
+  instances up front. The pool grows on demand up to ``max_size``; beyond
+  that, borrowers wait for an instance to be returned.
+- **Per-mission isolation**: an instance serves one borrower at a time. An
+  idle instance last used by the same mission is preferred, keeping its
+  state; an instance moving to another mission is :meth:`~Agent.reset`
+  first, so mutable state never leaks from one mission to another.
+- **Health checks**: idle instances are checked with
+  :meth:`~Agent.check_health` every ``health_check_interval`` seconds, and
+  unhealthy ones are closed and replaced. Borrowers can also discard an
+  instance they found broken.
+- **Idle eviction**: instances idle for ``idle_timeout`` seconds are
+  closed, down to ``min_size``.
+
+:class:`PooledAgent` exposes a pool as an ordinary agent, so mission graphs
+and the registry use pooled instances unchanged: each step borrows an
+instance for its mission and returns it when done.
+
+Example:
+    >>> pool = AgentPool(lambda: Summarizer("summarizer"), min_size=4, max_size=16)
+    >>> await pool.start()
+    >>> graph.add_step("summary", PooledAgent(pool, capabilities={"summarize"}))
+    >>> async with pool.lease(mission.id) as summarizer:
+    ...     await summarizer.run(inputs, mission)
+    >>> await pool.stop()
+"""
+
+import asyncio
+import bisect
+import inspect
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from harmonicgalaxy.core.mission import Mission
+
+logger = get_logger(__name__)
+
+#: Callable building a new (not yet set up) agent instance, sync or async
+AgentFactory = Callable[[], Union[Agent, Awaitable[Agent]]]
+
+
+class _Instance:
+    """A pooled agent instance and its bookkeeping."""
+
+    __slots__ = ("agent", "mission_id", "last_used", "last_checked", "uses")
+
+    def __init__(self, agent: Agent):
+        now = time.monotonic()
+        self.agent = agent
+        self.mission_id: Optional[str] = None
+        self.last_used = now
+        self.last_checked = now
+        self.uses = 0
+
+
+def _last_used(instance: _Instance) -> float:
+    return instance.last_used
+
+
+class AgentPool:
+    """Warm, reusable instances of one agent.
+
+    Every instance is idle, borrowed, or pending (being created or health
+    checked); the three together never exceed ``max_size``. Use from the
+    event loop thread only.
+    """
+
+    def __init__(
+        self,
+        factory: AgentFactory,
+        min_size: int = 1,
+        max_size: int = 8,
+        idle_timeout: Optional[float] = 300.0,
+        health_check_interval: Optional[float] = 30.0,
+        health_check_timeout: float = 5.0,
+        name: Optional[str] = None,
+    ):
+        """Initialize pool.
+
+        Args:
+            factory: Sync or async callable returning a new agent instance
+            min_size: Instances created by :meth:`start` and kept through eviction
+            max_size: Maximum number of instances
+            idle_timeout: Seconds after which an idle instance is closed
+                (None: never)
+            health_check_interval: Seconds between health checks of an idle
+                instance (None: never)
+            health_check_timeout: Seconds after which a health check counts as failed
+            name: Pool name, used in logs (default: the factory's name)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if not 0 <= min_size <= max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.name = name or getattr(factory, "__name__", type(factory).__name__)
+
+        # Idle instances by last use, most recent last (reused first)
+        self._idle: List[_Instance] = []
+        self._busy: Dict[int, _Instance] = {}
+        self._pending = 0
+        self._waiters: Deque["asyncio.Future[Optional[_Instance]]"] = deque()
+        self._maintenance: Optional["asyncio.Task[None]"] = None
+        self._closed = False
+
+        self.created = 0
+        self.evicted = 0
+        self.discarded = 0
+
+    @property
+    def size(self) -> int:
+        """Number of instances (idle, borrowed and pending)."""
+        return len(self._idle) + len(self._busy) + self._pending
+
+    def __repr__(self) -> str:
+        return (
+            f"AgentPool(name={self.name!r}, idle={len(self._idle)}, "
+            f"busy={len(self._busy)}, max_size={self.max_size})"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Current occupancy and lifetime counters."""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "busy": len(self._busy),
+            "waiting": sum(1 for waiter in self._waiters if not waiter.done()),
+            "created": self.created,
+            "evicted": self.evicted,
+            "discarded": self.discarded,
+        }
+
+    async def start(self) -> None:
+        """Create ``min_size`` instances and start the maintenance task."""
+        if self._closed:
+            raise RuntimeError("Agent pool is stopped")
+        await self._fill()
+        intervals = [
+            interval
+            for interval in (self.idle_timeout, self.health_check_interval)
+            if interval is not None
+        ]
+        if intervals and self._maintenance is None:
+            self._maintenance = asyncio.ensure_future(self._maintain(min(intervals)))
+        logger.info(f"Agent pool {self.name} warmed: {len(self._idle)} instances")
+
+    async def stop(self) -> None:
+        """Close idle instances and stop the pool.
+
+        Waiting borrowers get a RuntimeError; borrowed instances are closed
+        when they are released.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            try:
+                await self._maintenance
+            except asyncio.CancelledError:
+                pass
+            self._maintenance = None
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(RuntimeError("Agent pool is stopped"))
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(self._close(instance) for instance in idle))
+        logger.info(f"Agent pool {self.name} stopped")
+
+    async def __aenter__(self) -> "AgentPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def acquire(
+        self, mission_id: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Agent:
+        """Borrow an instance for ``mission_id``.
+
+        Args:
+            mission_id: Mission the instance will serve (None: no mission)
+            timeout: Seconds to wait for an instance when all ``max_size``
+                are borrowed (None: no limit)
+
+        Returns:
+            A set up agent instance, to give back with :meth:`release`
+
+        Raises:
+            asyncio.TimeoutError: If no instance was returned in time
+            RuntimeError: If the pool is stopped
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = None if timeout is None else loop.time() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("Agent pool is stopped")
+            instance = self._take_idle(mission_id)
+            if instance is None:
+                if self.size < self.max_size:
+                    instance = await self._create()
+                    if self._closed:
+                        await self._close(instance)
+                        raise RuntimeError("Agent pool is stopped")
+                    self._busy[id(instance.agent)] = instance
+                else:
+                    remaining = None if deadline_at is None else deadline_at - loop.time()
+                    instance = await self._wait(remaining)
+                    if instance is None:
+                        # An instance was discarded: retry, creating a new one
+                        continue
+            if instance.uses and instance.mission_id != mission_id:
+                try:
+                    await instance.agent.reset()
+                except asyncio.CancelledError:
+                    asyncio.ensure_future(self.release(instance.agent, discard=True))
+                    raise
+                except Exception as e:
+                    logger.warning(f"Agent pool {self.name}: reset failed, discarding: {e}")
+                    await self.release(instance.agent, discard=True)
+                    continue
+            instance.mission_id = mission_id
+            return instance.agent
+
+    async def release(self, agent: Agent, discard: bool = False) -> None:
+        """Give back an instance borrowed with :meth:`acquire`.
+
+        Args:
+            agent: The borrowed instance
+            discard: Close the instance instead of reusing it (e.g. it is broken)
+
+        Raises:
+            ValueError: If ``agent`` is not borrowed from this pool
+        """
+        instance = self._busy.get(id(agent))
+        if instance is None:
+            raise ValueError(f"{agent!r} is not borrowed from agent pool {self.name}")
+        instance.uses += 1
+        instance.last_used = time.monotonic()
+        if discard or self._closed:
+            del self._busy[id(agent)]
+            if discard:
+                self.discarded += 1
+            self._wake()
+            await self._close(instance)
+        else:
+            self._return(instance)
+
+    @asynccontextmanager
+    async def lease(
+        self, mission_id: Optional[str] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[Agent]:
+        """Borrow an instance for the duration of a ``with`` block (see :meth:`acquire`)."""
+        agent = await self.acquire(mission_id, timeout)
+        try:
+            yield agent
+        finally:
+            await self.release(agent)
+
+    def _take_idle(self, mission_id: Optional[str]) -> Optional[_Instance]:
+        """Move an idle instance to the borrowed ones, preferring one of ``mission_id``."""
+        idle = self._idle
+        if not idle:
+            return None
+        index = len(idle) - 1
+        if mission_id is not None and idle[index].mission_id != mission_id:
+            for position in range(index - 1, -1, -1):
+                if idle[position].mission_id == mission_id:
+                    index = position
+                    break
+        instance = idle.pop(index)
+        self._busy[id(instance.agent)] = instance
+        return instance
+
+    def _return(self, instance: _Instance) -> None:
+        """Hand a usable instance to the first waiter, or make it idle."""
+        waiter = self._next_waiter()
+        if waiter is not None:
+            self._busy[id(instance.agent)] = instance
+            waiter.set_result(instance)
+            return
+        self._busy.pop(id(instance.agent), None)
+        bisect.insort(self._idle, instance, key=_last_used)
+
+    def _wake(self) -> None:
+        """Tell the first waiter that an instance slot was freed."""
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(None)
+
+    def _next_waiter(self) -> Optional["asyncio.Future[Optional[_Instance]]"]:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                return waiter
+        return None
+
+    async def _wait(self, timeout: Optional[float]) -> Optional[_Instance]:
+        """Wait for a returned instance (or None when a slot was freed)."""
+        waiter: "asyncio.Future[Optional[_Instance]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=None if timeout is None else max(timeout, 0))
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            waiter.cancel()
+            raise asyncio.TimeoutError(f"No {self.name} instance returned within {timeout}s")
+        return waiter.result()
+
+    def _abandon(self, waiter: "asyncio.Future[Optional[_Instance]]") -> None:
+        """Pass on whatever a cancelled borrower was handed."""
+        if not waiter.done():
+            waiter.cancel()
+        elif not waiter.cancelled() and waiter.exception() is None:
+            instance = waiter.result()
+            if instance is None:
+                self._wake()
+            else:
+                self._return(instance)
+
+    async def _create(self) -> _Instance:
+        """Build and set up a new instance (counted as pending meanwhile)."""
+        self._pending += 1
+        agent = None
+        try:
+            agent = self.factory()
+            if inspect.isawaitable(agent):
+                agent = await agent
+            await agent.setup()
+        except BaseException:
+            self._pending -= 1
+            self._wake()
+            if isinstance(agent, Agent):
+                await self._close(_Instance(agent))
+            raise
+        self._pending -= 1
+        self.created += 1
+        return _Instance(agent)
+
+    async def _close(self, instance: _Instance) -> None:
+        try:
+            await instance.agent.close()
+        except Exception as e:
+            logger.warning(f"Agent pool {self.name}: closing {instance.agent!r} failed: {e}")
+
+    async def _fill(self) -> None:
+        """Create instances up to ``min_size``."""
+        missing = self.min_size - self.size
+        if missing <= 0:
+            return
+        results = await asyncio.gather(
+            *(self._create() for _ in range(missing)), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for result in results:
+            if isinstance(result, _Instance):
+                self._return(result)
+        if errors:
+            raise errors[0]
+
+    async def _maintain(self, interval: float) -> None:
+        """Periodically evict idle instances, check health and refill to ``min_size``."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._evict_idle()
+                await self._check_health()
+                await self._fill()
+            except Exception as e:
+                logger.warning(f"Agent pool {self.name} maintenance failed: {e}")
+
+    async def _evict_idle(self) -> None:
+        if self.idle_timeout is None:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = []
+        # The least recently used instances come first
+        while self._idle and self._idle[0].last_used < cutoff and self.size > self.min_size:
+            stale.append(self._idle.pop(0))
+        if stale:
+            self.evicted += len(stale)
+            logger.debug(f"Agent pool {self.name}: evicting {len(stale)} idle instances")
+            await asyncio.gather(*(self._close(instance) for instance in stale))
+
+    async def _check_health(self) -> None:
+        if self.health_check_interval is None:
+            return
+        now = time.monotonic()
+        due = [
+            instance
+            for instance in self._idle
+            if now - instance.last_checked >= self.health_check_interval
+        ]
+        if not due:
+            return
+        self._idle = [instance for instance in self._idle if instance not in due]
+        self._pending += len(due)
+        try:
+            healthy = await asyncio.gather(*(self._is_healthy(instance) for instance in due))
+        except BaseException:
+            self._pending -= len(due)
+            self._idle = sorted(self._idle + due, key=_last_used)
+            raise
+        self._pending -= len(due)
+        unhealthy = []
+        for instance, ok in zip(due, healthy):
+            instance.last_checked = now
+            if ok:
+                self._return(instance)
+            else:
+                unhealthy.append(instance)
+                self._wake()
+        if unhealthy:
+            self.discarded += len(unhealthy)
+            logger.warning(
+                f"Agent pool {self.name}: replacing {len(unhealthy)} unhealthy instances"
+            )
+            await asyncio.gather(*(self._close(instance) for instance in unhealthy))
+
+    async def _is_healthy(self, instance: _Instance) -> bool:
+        try:
+            return bool(
+                await asyncio.wait_for(
+                    instance.agent.check_health(), self.health_check_timeout
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Agent pool {self.name}: health check failed: {e!r}")
+            return False
+
+
+class PooledAgent(Agent):
+    """Agent running each step on an instance borrowed from an :class:`AgentPool`.
+
+    Instances are borrowed for the step's mission: steps of one mission may
+    find the state they left, other missions get a reset instance.
+    """
+
+    def __init__(
+        self,
+        pool: AgentPool,
+        name: Optional[str] = None,
+        description: str = "",
+        capabilities: Optional[Iterable[str]] = None,
+        input_types: Optional[Iterable[str]] = None,
+        output_types: Optional[Iterable[str]] = None,
+        acquire_timeout: Optional[float] = None,
+    ):
+        """Initialize pooled agent.
+
+        Args:
+            pool: Pool of the instances running the steps
+            name: Unique agent name (default: the pool name)
+            description: What the agent does
+            capabilities: Capability tags the agent provides
+            input_types: Types of data the agent consumes
+            output_types: Types of data the agent produces
+            acquire_timeout: Seconds to wait for a free instance (None: no limit)
+        """
+        super().__init__(
+            name or pool.name,
+            description=description,
+            capabilities=capabilities,
+            input_types=input_types,
+            output_types=output_types,
+        )
+        self.pool = pool
+        self.acquire_timeout = acquire_timeout
+
+    async def run(self, inputs: Dict[str, Any], mission: "Mission") -> Any:
+        """Run the step on a borrowed instance."""
+        async with self.pool.lease(mission.id, timeout=self.acquire_timeout) as agent:
+            return await agent.run(inputs, mission)
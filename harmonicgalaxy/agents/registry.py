@@ -0,0 +1,224 @@
+"""Agent registry indexed by capability and data type.
+
+The orchestrator asks the registry which agent can run a step, on every
+step, so lookups must not scan the registered agents. The registry keeps
+an inverted index (posting sets) from each capability tag, input type and
+output type to the names of the agents declaring it:
+
+- required tags and types are matched by intersecting their posting sets,
+  smallest first, so the cost depends on the rarest requirement rather
+  than on the number of agents;
+- preferred capability tags score the remaining candidates, by
+  intersecting each preferred tag's posting set with them;
+- registering or unregistering an agent only touches the posting sets of
+  that agent's own tags.
+
+Example:
+    >>> registry = AgentRegistry()
+    >>> registry.register(summarizer)  # capabilities={"summarize"}, input_types={"text"}
+    >>> registry.register(translator)  # capabilities={"translate", "summarize"}
+    >>> registry.best(requires={"summarize"}, accepts={"text"}, prefers={"translate"})
+"""
+
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Index namespaces, so that a capability and a data type can share a name
+_CAPABILITY = "capability"
+_INPUT = "input"
+_OUTPUT = "output"
+
+_QueryKey = Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str], FrozenSet[str]]
+
+
+class AgentMatch(NamedTuple):
+    """An agent matching a query, with its score (number of preferred tags it has)."""
+
+    agent: Agent
+    score: int
+    preferred: FrozenSet[str]
+
+
+class AgentRegistry:
+    """Registered agents, by name and by capability/data type.
+
+    Not thread-safe: register, unregister and query from the event loop thread.
+    """
+
+    # Query results are cached until the next registration change
+    _CACHE_SIZE = 1024
+
+    def __init__(self, agents: Iterable[Agent] = ()):
+        """Initialize registry.
+
+        Args:
+            agents: Agents to register
+        """
+        self._agents: Dict[str, Agent] = {}
+        self._order: Dict[str, int] = {}
+        self._sequence = 0
+        self._index: Dict[Tuple[str, str], Set[str]] = {}
+        self._cache: Dict[_QueryKey, List[AgentMatch]] = {}
+        for agent in agents:
+            self.register(agent)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __iter__(self) -> Iterator[Agent]:
+        return iter(self._agents.values())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._agents
+
+    def __repr__(self) -> str:
+        return f"AgentRegistry(agents={len(self._agents)}, keys={len(self._index)})"
+
+    @staticmethod
+    def _keys(agent: Agent) -> Iterator[Tuple[str, str]]:
+        for tag in agent.capabilities:
+            yield _CAPABILITY, tag
+        for data_type in agent.input_types:
+            yield _INPUT, data_type
+        for data_type in agent.output_types:
+            yield _OUTPUT, data_type
+
+    def register(self, agent: Agent, replace: bool = False) -> None:
+        """Register ``agent`` under its name.
+
+        Args:
+            agent: Agent to register
+            replace: Replace an agent registered under the same name
+
+        Raises:
+            ValueError: If an agent with this name is registered and not ``replace``
+        """
+        if agent.name in self._agents:
+            if not replace:
+                raise ValueError(f"Agent already registered: {agent.name}")
+            self.unregister(agent.name)
+        self._agents[agent.name] = agent
+        self._order[agent.name] = self._sequence
+        self._sequence += 1
+        for key in self._keys(agent):
+            self._index.setdefault(key, set()).add(agent.name)
+        self._cache.clear()
+        logger.agent_activated(agent.name, ", ".join(sorted(agent.capabilities)) or None)
+
+    def unregister(self, name: str) -> Agent:
+        """Remove the agent registered under ``name`` and return it.
+
+        Raises:
+            KeyError: If no agent has this name
+        """
+        agent = self._agents.pop(name)
+        del self._order[name]
+        for key in self._keys(agent):
+            names = self._index[key]
+            names.discard(name)
+            if not names:
+                del self._index[key]
+        self._cache.clear()
+        logger.agent_deactivated(name)
+        return agent
+
+    def get(self, name: str) -> Optional[Agent]:
+        """Return the agent registered under ``name``, if any."""
+        return self._agents.get(name)
+
+    def capabilities(self) -> Dict[str, int]:
+        """Number of registered agents per capability tag."""
+        return {
+            tag: len(names) for (kind, tag), names in self._index.items() if kind == _CAPABILITY
+        }
+
+    def find(
+        self,
+        requires: Iterable[str] = (),
+        accepts: Iterable[str] = (),
+        produces: Iterable[str] = (),
+        prefers: Iterable[str] = (),
+        limit: Optional[int] = None,
+    ) -> List[AgentMatch]:
+        """Find the agents matching a step's needs, best first.
+
+        Args:
+            requires: Capability tags the agent must have (all of them)
+            accepts: Input types the agent must consume (all of them)
+            produces: Output types the agent must produce (all of them)
+            prefers: Capability tags raising the score of agents having them
+            limit: Return at most this many matches
+
+        Returns:
+            Matches sorted by score (descending), then registration order
+        """
+        key = (frozenset(requires), frozenset(accepts), frozenset(produces), frozenset(prefers))
+        matches = self._cache.get(key)
+        if matches is None:
+            matches = self._match(*key)
+            if len(self._cache) >= self._CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = matches
+        return matches[:limit]
+
+    def best(
+        self,
+        requires: Iterable[str] = (),
+        accepts: Iterable[str] = (),
+        produces: Iterable[str] = (),
+        prefers: Iterable[str] = (),
+    ) -> Optional[Agent]:
+        """Return the best matching agent (see :meth:`find`), or None."""
+        matches = self.find(requires, accepts, produces, prefers, limit=1)
+        return matches[0].agent if matches else None
+
+    def _match(
+        self,
+        requires: FrozenSet[str],
+        accepts: FrozenSet[str],
+        produces: FrozenSet[str],
+        prefers: FrozenSet[str],
+    ) -> List[AgentMatch]:
+        postings = []
+        for kind, values in ((_CAPABILITY, requires), (_INPUT, accepts), (_OUTPUT, produces)):
+            for value in values:
+                names = self._index.get((kind, value))
+                if not names:
+                    return []
+                postings.append(names)
+
+        if postings:
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for names in postings[1:]:
+                candidates &= names
+                if not candidates:
+                    return []
+        else:
+            candidates = set(self._agents)
+
+        preferred: Dict[str, Set[str]] = {}
+        for tag in prefers:
+            names = self._index.get((_CAPABILITY, tag))
+            if names:
+                for name in names & candidates:
+                    preferred.setdefault(name, set()).add(tag)
+
+        order = self._order
+        ranked = sorted(
+            candidates, key=lambda name: (-len(preferred.get(name, ())), order[name])
+        )
+        agents = self._agents
+        empty: FrozenSet[str] = frozenset()
+        return [
+            AgentMatch(
+                agents[name],
+                len(preferred.get(name, ())),
+                frozenset(preferred[name]) if name in preferred else empty,
+            )
+            for name in ranked
+        ]
@@ -1,2 +1,19 @@
 """Core components of HarmonicGalaxy."""
 
+from harmonicgalaxy.core.mission import (
+    Mission,
+    MissionHistory,
+    MissionStateError,
+    MissionStatus,
+    MissionStep,
+    StepStatus,
+)
+
+__all__ = [
+    "Mission",
+    "MissionHistory",
+    "MissionStateError",
+    "MissionStatus",
+    "MissionStep",
+    "StepStatus",
+]
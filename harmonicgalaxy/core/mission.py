@@ -0,0 +1,511 @@
+"""Mission model: context, execution state and step history.
+
+A :class:`Mission` is the unit of a multi-step, multi-agent workflow. Its
+:class:`MissionHistory` is an append-only log of the steps executed so far,
+kept in parallel typed arrays (one entry per step per column) rather than one
+object per step:
+
+- agent and action names are interned once and stored as integer ids;
+- step inputs and outputs are stored by reference in a payload table,
+  deduplicated by identity, so a large context passed to every step is held
+  once rather than copied into each step;
+- errors are rare and kept in a sparse mapping.
+
+A step costs a few dozen bytes plus its own payloads, and indexing or
+iterating the history builds a small :class:`MissionStep` tuple per step,
+so missions with tens of thousands of steps stay cheap to hold and
+inspect.
+
+Example:
+    >>> mission = Mission("summarize", context={"document": text})
+    >>> mission.start()
+    >>> mission.record_step("reader", "extract", duration=0.8, input=text, output=facts)
+    >>> mission.complete(result=summary)
+    >>> mission.history[-1].output is facts
+    True
+"""
+
+import time
+import uuid
+from array import array
+from enum import Enum
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union, overload
+
+
+class MissionStatus(str, Enum):
+    """Execution state of a mission."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the mission can no longer change state."""
+        return self in _TERMINAL_STATUSES
+
+
+_TERMINAL_STATUSES = frozenset(
+    {MissionStatus.COMPLETED, MissionStatus.FAILED, MissionStatus.CANCELLED}
+)
+
+# Allowed transitions between mission states
+_TRANSITIONS = {
+    MissionStatus.PENDING: {MissionStatus.RUNNING, MissionStatus.CANCELLED},
+    MissionStatus.RUNNING: {
+        MissionStatus.PAUSED,
+        MissionStatus.COMPLETED,
+        MissionStatus.FAILED,
+        MissionStatus.CANCELLED,
+    },
+    MissionStatus.PAUSED: {MissionStatus.RUNNING, MissionStatus.FAILED, MissionStatus.CANCELLED},
+}
+
+
+class StepStatus(str, Enum):
+    """Outcome of one mission step."""
+
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+# Step statuses by their code in MissionHistory; being a str enum, the codes
+# can be looked up by member or by value
+_STEP_STATUSES = tuple(StepStatus)
+_STEP_STATUS_CODES = {status: code for code, status in enumerate(_STEP_STATUSES)}
+
+
+def _status_code(status: Union[StepStatus, str]) -> int:
+    code = _STEP_STATUS_CODES.get(status)
+    if code is None:
+        raise ValueError(f"Invalid step status: {status!r}")
+    return code
+
+# Payload reference of a step without input or output
+_NO_PAYLOAD = -1
+
+
+class MissionStateError(ValueError):
+    """Raised on an invalid mission state transition."""
+
+
+class MissionStep(NamedTuple):
+    """Read-only view of one step of a mission history."""
+
+    index: int
+    agent: str
+    action: str
+    status: StepStatus
+    started_at: float
+    duration: float
+    input: Any = None
+    output: Any = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert step to dictionary format (payloads included as-is)."""
+        result: Dict[str, Any] = {
+            "index": self.index,
+            "agent": self.agent,
+            "action": self.action,
+            "status": self.status.value,
+            "started_at": self.started_at,
+            "duration": self.duration,
+        }
+        if self.input is not None:
+            result["input"] = self.input
+        if self.output is not None:
+            result["output"] = self.output
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+_make_step = MissionStep._make
+
+
+class MissionHistory:
+    """Append-only log of mission steps stored column-wise in typed arrays."""
+
+    __slots__ = (
+        "_names",
+        "_name_ids",
+        "_agents",
+        "_actions",
+        "_statuses",
+        "_started_at",
+        "_durations",
+        "_inputs",
+        "_outputs",
+        "_payloads",
+        "_payload_ids",
+        "_errors",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        # Interned agent and action names
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._agents = array("I")
+        self._actions = array("I")
+        self._statuses = array("B")
+        self._started_at = array("d")
+        self._durations = array("d")
+        # Indexes into _payloads, or _NO_PAYLOAD
+        self._inputs = array("q")
+        self._outputs = array("q")
+        self._payloads: List[Any] = []
+        # id(payload) -> index; entries stay valid since _payloads keeps payloads alive
+        self._payload_ids: Dict[int, int] = {}
+        self._errors: Dict[int, str] = {}
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+    def _store(self, payload: Any) -> int:
+        if payload is None:
+            return _NO_PAYLOAD
+        ref = self._payload_ids.get(id(payload))
+        if ref is None:
+            ref = len(self._payloads)
+            self._payloads.append(payload)
+            self._payload_ids[id(payload)] = ref
+        return ref
+
+    def append(
+        self,
+        agent: str,
+        action: str,
+        status: Union[StepStatus, str] = StepStatus.SUCCEEDED,
+        started_at: Optional[float] = None,
+        duration: float = 0.0,
+        input: Any = None,
+        output: Any = None,
+        error: Optional[str] = None,
+    ) -> int:
+        """Record one step.
+
+        Args:
+            agent: Name of the agent that ran the step
+            action: What the agent did (e.g. a capability or tool name)
+            status: Outcome of the step
+            started_at: Start time (``time.time()``; default: now minus ``duration``)
+            duration: Duration in seconds
+            input: Input of the step, stored by reference
+            output: Output of the step, stored by reference
+            error: Error message of a failed step
+
+        Returns:
+            Index of the new step
+        """
+        index = len(self._statuses)
+        if started_at is None:
+            started_at = time.time() - duration
+        self._agents.append(self._intern(agent))
+        self._actions.append(self._intern(action))
+        self._statuses.append(_status_code(status))
+        self._started_at.append(started_at)
+        self._durations.append(duration)
+        self._inputs.append(self._store(input))
+        self._outputs.append(self._store(output))
+        if error:
+            self._errors[index] = error
+        return index
+
+    def _step(self, index: int) -> MissionStep:
+        input_ref = self._inputs[index]
+        output_ref = self._outputs[index]
+        names = self._names
+        # _make skips the keyword handling of the generated __new__
+        return _make_step(
+            (
+                index,
+                names[self._agents[index]],
+                names[self._actions[index]],
+                _STEP_STATUSES[self._statuses[index]],
+                self._started_at[index],
+                self._durations[index],
+                self._payloads[input_ref] if input_ref != _NO_PAYLOAD else None,
+                self._payloads[output_ref] if output_ref != _NO_PAYLOAD else None,
+                self._errors.get(index) if self._errors else None,
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    @overload
+    def __getitem__(self, index: int) -> MissionStep: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[MissionStep]: ...
+
+    def __getitem__(self, index):
+        """Return a step (negative indexes count from the end) or a list of steps."""
+        if isinstance(index, slice):
+            return [self._step(i) for i in range(*index.indices(len(self)))]
+        # Indexing a range resolves negative indexes and raises IndexError
+        return self._step(range(len(self._statuses))[index])
+
+    def __iter__(self) -> Iterator[MissionStep]:
+        for index in range(len(self)):
+            yield self._step(index)
+
+    def __repr__(self) -> str:
+        return f"MissionHistory(steps={len(self)}, payloads={len(self._payloads)})"
+
+    @property
+    def total_duration(self) -> float:
+        """Sum of the step durations in seconds."""
+        return sum(self._durations)
+
+    def count(self, status: Union[StepStatus, str]) -> int:
+        """Return the number of steps with the given status."""
+        return self._statuses.count(_status_code(status))
+
+    def for_agent(self, agent: str) -> Iterator[MissionStep]:
+        """Yield the steps run by ``agent``, in order."""
+        name_id = self._name_ids.get(agent)
+        if name_id is None:
+            return
+        for index, step_agent in enumerate(self._agents):
+            if step_agent == name_id:
+                yield self._step(index)
+
+    def errors(self) -> Iterator[MissionStep]:
+        """Yield the steps that recorded an error, in order."""
+        for index in sorted(self._errors):
+            yield self._step(index)
+
+    @property
+    def payload_count(self) -> int:
+        """Number of distinct payloads stored so far."""
+        return len(self._payloads)
+
+    def to_dict(self, start: int = 0, payload_start: int = 0) -> Dict[str, Any]:
+        """Convert history to dictionary format.
+
+        Payloads are listed once under ``payloads``; steps refer to them by
+        position through ``input``/``output``.
+
+        Args:
+            start: First step to include
+            payload_start: First payload to include; steps still refer to
+                payloads by their position in the whole history, so the
+                parts from successive calls can be concatenated (e.g. to
+                journal only the steps recorded since the previous call)
+        """
+        steps = []
+        for index in range(start, len(self)):
+            step: Dict[str, Any] = {
+                "agent": self._names[self._agents[index]],
+                "action": self._names[self._actions[index]],
+                "status": _STEP_STATUSES[self._statuses[index]].value,
+                "started_at": self._started_at[index],
+                "duration": self._durations[index],
+            }
+            if self._inputs[index] != _NO_PAYLOAD:
+                step["input"] = self._inputs[index]
+            if self._outputs[index] != _NO_PAYLOAD:
+                step["output"] = self._outputs[index]
+            if index in self._errors:
+                step["error"] = self._errors[index]
+            steps.append(step)
+        return {"steps": steps, "payloads": self._payloads[payload_start:]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MissionHistory":
+        """Create history from dictionary format (see :meth:`to_dict`)."""
+        history = cls()
+        payloads = data.get("payloads", [])
+        for step in data.get("steps", []):
+            input_ref = step.get("input")
+            output_ref = step.get("output")
+            history.append(
+                step["agent"],
+                step["action"],
+                status=step["status"],
+                started_at=step["started_at"],
+                duration=step["duration"],
+                input=payloads[input_ref] if input_ref is not None else None,
+                output=payloads[output_ref] if output_ref is not None else None,
+                error=step.get("error"),
+            )
+        return history
+
+
+class Mission:
+    """A multi-step, multi-agent unit of work.
+
+    Holds the mission context (inputs shared by every step), its execution
+    state and the history of executed steps.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        context: Optional[Dict[str, Any]] = None,
+        mission_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize mission.
+
+        Args:
+            name: Mission name
+            context: Inputs and shared data of the mission
+            mission_id: Unique id (default: a random UUID)
+            metadata: Free-form metadata (e.g. tenant, priority)
+        """
+        self.id = mission_id or uuid.uuid4().hex
+        self.name = name
+        self.context: Dict[str, Any] = context if context is not None else {}
+        self.metadata: Dict[str, Any] = metadata or {}
+        self.status = MissionStatus.PENDING
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.history = MissionHistory()
+        #: Steps in flight: step id -> agent name (maintained by the orchestration engine)
+        self.running_steps: Dict[str, str] = {}
+        #: Time of the latest write to a state store
+        self.updated_at: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Mission(name={self.name!r}, id={self.id}, status={self.status.value}, "
+            f"steps={len(self.history)})"
+        )
+
+    def _transition(self, status: MissionStatus) -> None:
+        if status not in _TRANSITIONS.get(self.status, ()):
+            raise MissionStateError(
+                f"Mission {self.name!r} cannot go from {self.status.value} to {status.value}"
+            )
+        self.status = status
+        if status.is_terminal:
+            self.finished_at = time.time()
+            self.running_steps.clear()
+
+    def start(self) -> None:
+        """Start (or resume) the mission."""
+        self._transition(MissionStatus.RUNNING)
+        if self.started_at is None:
+            self.started_at = time.time()
+
+    def pause(self) -> None:
+        """Pause a running mission."""
+        self._transition(MissionStatus.PAUSED)
+
+    def complete(self, result: Any = None) -> None:
+        """Mark the mission as completed with ``result``."""
+        self._transition(MissionStatus.COMPLETED)
+        self.result = result
+
+    def fail(self, error: Union[str, BaseException]) -> None:
+        """Mark the mission as failed with ``error``."""
+        self._transition(MissionStatus.FAILED)
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def cancel(self) -> None:
+        """Cancel the mission."""
+        self._transition(MissionStatus.CANCELLED)
+
+    def record_step(
+        self,
+        agent: str,
+        action: str,
+        status: Union[StepStatus, str] = StepStatus.SUCCEEDED,
+        started_at: Optional[float] = None,
+        duration: float = 0.0,
+        input: Any = None,
+        output: Any = None,
+        error: Optional[str] = None,
+    ) -> int:
+        """Append a step to the history (see :meth:`MissionHistory.append`).
+
+        Raises:
+            MissionStateError: If the mission has already finished
+        """
+        if self.status.is_terminal:
+            raise MissionStateError(f"Mission {self.name!r} is {self.status.value}")
+        return self.history.append(
+            agent,
+            action,
+            status=status,
+            started_at=started_at,
+            duration=duration,
+            input=input,
+            output=output,
+            error=error,
+        )
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        """Seconds since the mission started (until it finished), or None if not started."""
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+    def to_dict(self, include_history: bool = True) -> Dict[str, Any]:
+        """Convert mission to dictionary format.
+
+        Args:
+            include_history: Whether to include the step history (under ``history``)
+        """
+        result: Dict[str, Any] = {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status.value,
+            "context": self.context,
+            "created_at": self.created_at,
+        }
+        if include_history:
+            result["history"] = self.history.to_dict()
+        if self.metadata:
+            result["metadata"] = self.metadata
+        if self.started_at is not None:
+            result["started_at"] = self.started_at
+        if self.finished_at is not None:
+            result["finished_at"] = self.finished_at
+        if self.result is not None:
+            result["result"] = self.result
+        if self.error:
+            result["error"] = self.error
+        if self.running_steps:
+            result["running_steps"] = self.running_steps
+        if self.updated_at is not None:
+            result["updated_at"] = self.updated_at
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Mission":
+        """Create mission from dictionary format (see :meth:`to_dict`)."""
+        mission = cls(
+            data["name"],
+            context=data.get("context"),
+            mission_id=data["id"],
+            metadata=data.get("metadata"),
+        )
+        mission.status = MissionStatus(data["status"])
+        mission.created_at = data["created_at"]
+        mission.started_at = data.get("started_at")
+        mission.finished_at = data.get("finished_at")
+        mission.result = data.get("result")
+        mission.error = data.get("error")
+        mission.history = MissionHistory.from_dict(data.get("history", {}))
+        mission.running_steps = dict(data.get("running_steps", {}))
+        mission.updated_at = data.get("updated_at")
+        return mission
@@ -0,0 +1,22 @@
+"""Distributed execution: a coordinator dispatching mission steps to worker processes."""
+
+from harmonicgalaxy.distributed.coordinator import (
+    Coordinator,
+    RemoteAgent,
+    RemoteTaskError,
+    TaskLostError,
+)
+from harmonicgalaxy.distributed.protocol import ProtocolError, format_address, parse_address
+from harmonicgalaxy.distributed.worker import Worker, load_agent
+
+__all__ = [
+    "Coordinator",
+    "ProtocolError",
+    "RemoteAgent",
+    "RemoteTaskError",
+    "TaskLostError",
+    "Worker",
+    "format_address",
+    "load_agent",
+    "parse_address",
+]
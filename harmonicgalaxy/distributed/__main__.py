@@ -0,0 +1,8 @@
+"""Run a worker: ``python -m harmonicgalaxy.distributed --connect HOST:PORT --agent ...``."""
+
+import sys
+
+from harmonicgalaxy.distributed.worker import main
+
+if __name__ == "__main__":
+    sys.exit(main())
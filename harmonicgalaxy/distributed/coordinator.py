@@ -0,0 +1,502 @@
+"""Coordinator dispatching mission steps to worker processes.
+
+Workers on the same or other hosts connect to the coordinator (TCP or Unix
+socket), announce the agents they host, their capability tags and how many
+tasks they run at once, then send heartbeats. The coordinator:
+
+- places each task on a connected worker hosting the agent and providing
+  every required capability, preferring the least loaded one;
+- gives the worker a lease on the task, renewed by its heartbeats;
+- re-dispatches the task to another worker when the worker disconnects,
+  misses heartbeats, or lets the lease expire, up to ``max_attempts``.
+
+Results of a superseded attempt are ignored, so a task completes at most
+once from the caller's point of view. Tasks are executed at least once,
+though: agents whose steps have external side effects should be idempotent.
+
+Example:
+    >>> async with Coordinator(port=7700) as coordinator:
+    ...     # workers: python -m harmonicgalaxy.distributed --connect host:7700 ...
+    ...     graph.add_step("embed", RemoteAgent(coordinator, "embedder", requires={"gpu"}))
+    ...     await engine.run(mission, graph)
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.distributed import protocol
+from harmonicgalaxy.llm.deadline import time_remaining
+from harmonicgalaxy.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from harmonicgalaxy.core.mission import Mission
+
+logger = get_logger(__name__)
+
+
+class RemoteTaskError(RuntimeError):
+    """Raised when the agent of a task raised on its worker."""
+
+
+class TaskLostError(RuntimeError):
+    """Raised when a task was dispatched ``max_attempts`` times without completing."""
+
+
+class _WorkerConnection:
+    """Coordinator-side state of a connected worker."""
+
+    __slots__ = ("worker_id", "agents", "capabilities", "slots", "tasks", "writer", "last_seen")
+
+    def __init__(
+        self,
+        worker_id: str,
+        agents: FrozenSet[str],
+        capabilities: FrozenSet[str],
+        slots: int,
+        writer: asyncio.StreamWriter,
+    ):
+        self.worker_id = worker_id
+        self.agents = agents
+        self.capabilities = capabilities
+        self.slots = slots
+        self.tasks: Set["_Task"] = set()
+        self.writer = writer
+        self.last_seen = time.monotonic()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        if not self.writer.is_closing():
+            protocol.write_message(self.writer, message)
+
+
+class _Task:
+    """A submitted task and its current assignment."""
+
+    __slots__ = (
+        "task_id",
+        "agent",
+        "inputs",
+        "requires",
+        "mission",
+        "expires_at",
+        "future",
+        "attempt",
+        "worker",
+        "lease_expires",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        agent: str,
+        inputs: Dict[str, Any],
+        requires: FrozenSet[str],
+        mission: Optional[Dict[str, Any]],
+        expires_at: Optional[float],
+        future: "asyncio.Future[Any]",
+    ):
+        self.task_id = task_id
+        self.agent = agent
+        self.inputs = inputs
+        self.requires = requires
+        self.mission = mission
+        self.expires_at = expires_at
+        self.future = future
+        self.attempt = 0
+        self.worker: Optional[_WorkerConnection] = None
+        self.lease_expires = 0.0
+
+
+class Coordinator:
+    """Accepts worker connections and dispatches tasks to them."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: Optional[str] = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_timeout: Optional[float] = None,
+        lease_timeout: Optional[float] = None,
+        max_attempts: int = 3,
+    ):
+        """Initialize coordinator.
+
+        Args:
+            host: Interface to listen on (TCP)
+            port: Port to listen on (0: any free port, see :attr:`address`)
+            path: Listen on this Unix socket path instead of TCP
+            heartbeat_interval: Seconds between worker heartbeats
+            heartbeat_timeout: Seconds without a message after which a worker is
+                considered dead (default: 3 heartbeat intervals)
+            lease_timeout: Seconds a task lease lasts without being renewed by a
+                heartbeat (default: 3 heartbeat intervals)
+            max_attempts: Dispatches of a task before it fails with TaskLostError
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout or 3 * heartbeat_interval
+        self.lease_timeout = lease_timeout or 3 * heartbeat_interval
+        self.max_attempts = max_attempts
+        self._workers: Dict[str, _WorkerConnection] = {}
+        self._tasks: Dict[str, _Task] = {}
+        self._pending: Deque[_Task] = deque()
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._monitor: Optional["asyncio.Task[None]"] = None
+        self._connections: Set["asyncio.Task[None]"] = set()
+        self._worker_joined: Optional[asyncio.Event] = None
+
+    @property
+    def address(self) -> protocol.Address:
+        """Address workers connect to: a (host, port) pair or a Unix socket path."""
+        if self.path is not None:
+            return self.path
+        if self._server is None:
+            return (self.host, self.port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        """Start listening for workers."""
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._worker_joined = asyncio.Event()
+        self._monitor = asyncio.get_running_loop().create_task(self._monitor_loop())
+        logger.info(f"Coordinator listening on {protocol.format_address(self.address)}")
+
+    async def stop(self) -> None:
+        """Stop listening, disconnect workers and fail the tasks still pending."""
+        if self._server is None:
+            return
+        self._server.close()
+        self._monitor.cancel()
+        for worker in list(self._workers.values()):
+            worker.writer.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(self._monitor, *self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        for task in list(self._tasks.values()):
+            if not task.future.done():
+                task.future.set_exception(TaskLostError("Coordinator stopped"))
+        self._tasks.clear()
+        self._pending.clear()
+
+    async def __aenter__(self) -> "Coordinator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    def workers(self) -> List[Dict[str, Any]]:
+        """Snapshot of the connected workers."""
+        return [
+            {
+                "worker_id": worker.worker_id,
+                "agents": sorted(worker.agents),
+                "capabilities": sorted(worker.capabilities),
+                "slots": worker.slots,
+                "running": len(worker.tasks),
+            }
+            for worker in self._workers.values()
+        ]
+
+    async def wait_for_workers(self, count: int, timeout: Optional[float] = None) -> None:
+        """Wait until at least ``count`` workers are connected."""
+
+        async def wait() -> None:
+            while len(self._workers) < count:
+                self._worker_joined.clear()
+                await self._worker_joined.wait()
+
+        await asyncio.wait_for(wait(), timeout)
+
+    async def submit(
+        self,
+        agent: str,
+        inputs: Dict[str, Any],
+        requires: Iterable[str] = (),
+        mission: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run ``agent`` on a worker and return its output.
+
+        Waits for a suitable worker if none is connected or all are busy.
+
+        Args:
+            agent: Name of the agent to run
+            inputs: JSON-serializable step inputs
+            requires: Capability tags the worker must provide
+            mission: ``id``, ``name``, ``context`` and ``metadata`` of the mission
+                the step belongs to (JSON-serializable), rebuilt on the worker
+            timeout: Seconds to wait for the output, including queueing (default:
+                the active deadline, if any, which is also enforced on the worker)
+
+        Returns:
+            Output of the agent
+
+        Raises:
+            RemoteTaskError: If the agent raised on the worker
+            TaskLostError: If the task was lost ``max_attempts`` times
+            asyncio.TimeoutError: If ``timeout`` elapsed
+            TypeError: If the inputs are not JSON-serializable
+            protocol.ProtocolError: If the task message would be oversized
+        """
+        if self._server is None:
+            raise RuntimeError("Coordinator is not running")
+        # Fail here rather than when the task is dispatched
+        protocol.encode_message({"type": protocol.TASK, "inputs": inputs, "mission": mission})
+        if timeout is None:
+            timeout = time_remaining()
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        task = _Task(
+            str(next(self._ids)),
+            agent,
+            inputs,
+            frozenset(requires),
+            mission,
+            expires_at,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._tasks[task.task_id] = task
+        self._pending.append(task)
+        self._dispatch()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task.future), timeout)
+        finally:
+            self._forget(task)
+
+    def _forget(self, task: _Task) -> None:
+        """Drop a finished or abandoned task, cancelling it on its worker."""
+        if self._tasks.pop(task.task_id, None) is None:
+            return
+        if task.worker is not None:
+            task.worker.tasks.discard(task)
+            if not task.future.done():
+                task.worker.send({"type": protocol.CANCEL, "task_id": task.task_id})
+            task.worker = None
+            self._dispatch()
+        elif task in self._pending:
+            self._pending.remove(task)
+        if not task.future.done():
+            task.future.cancel()
+
+    def _place(self, task: _Task) -> Optional[_WorkerConnection]:
+        """Pick the least loaded worker able to run ``task`` with a free slot."""
+        best = None
+        best_load = 1.0
+        for worker in self._workers.values():
+            if task.agent not in worker.agents or not task.requires <= worker.capabilities:
+                continue
+            load = len(worker.tasks) / worker.slots
+            if load < best_load:
+                best, best_load = worker, load
+        return best
+
+    def _dispatch(self) -> None:
+        """Assign pending tasks to workers; unplaceable tasks keep waiting in order."""
+        waiting: Deque[_Task] = deque()
+        now = time.monotonic()
+        try:
+            while self._pending:
+                task = self._pending.popleft()
+                worker = self._place(task)
+                if worker is None:
+                    waiting.append(task)
+                    continue
+                try:
+                    worker.send(
+                        {
+                            "type": protocol.TASK,
+                            "task_id": task.task_id,
+                            "attempt": task.attempt + 1,
+                            "agent": task.agent,
+                            "inputs": task.inputs,
+                            "mission": task.mission,
+                            "deadline": None if task.expires_at is None else task.expires_at - now,
+                        }
+                    )
+                except (TypeError, ValueError, protocol.ProtocolError) as e:
+                    # The task cannot be sent to any worker; the others still can
+                    logger.error(f"Cannot send task {task.task_id} ({task.agent}): {e}")
+                    if not task.future.done():
+                        task.future.set_exception(e)
+                    continue
+                task.attempt += 1
+                task.worker = worker
+                task.lease_expires = now + self.lease_timeout
+                worker.tasks.add(task)
+        finally:
+            # Tasks not reached yet keep waiting behind the unplaceable ones
+            waiting.extend(self._pending)
+            self._pending = waiting
+
+    def _requeue(self, task: _Task, reason: str) -> None:
+        """Take ``task`` away from its worker and dispatch it again."""
+        worker = task.worker
+        if worker is not None:
+            worker.tasks.discard(task)
+            task.worker = None
+        if task.attempt >= self.max_attempts:
+            logger.error(f"Task {task.task_id} ({task.agent}) lost: {reason}")
+            if not task.future.done():
+                task.future.set_exception(
+                    TaskLostError(f"Task {task.task_id} lost {task.attempt} times: {reason}")
+                )
+            return
+        logger.warning(f"Re-dispatching task {task.task_id} ({task.agent}): {reason}")
+        self._pending.appendleft(task)
+
+    def _drop_worker(self, worker: _WorkerConnection, reason: str) -> None:
+        """Unregister ``worker`` and re-dispatch its tasks."""
+        if self._workers.get(worker.worker_id) is not worker:
+            return
+        del self._workers[worker.worker_id]
+        worker.writer.close()
+        logger.warning(f"Worker {worker.worker_id} lost: {reason}")
+        for task in list(worker.tasks):
+            self._requeue(task, f"worker {worker.worker_id} lost ({reason})")
+        self._dispatch()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one worker connection."""
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        worker = None
+        try:
+            hello = await asyncio.wait_for(protocol.read_message(reader), self.heartbeat_timeout)
+            if hello["type"] != protocol.HELLO:
+                raise protocol.ProtocolError(f"Expected hello, got {hello['type']}")
+            worker = _WorkerConnection(
+                str(hello["worker_id"]),
+                frozenset(hello.get("agents", ())),
+                frozenset(hello.get("capabilities", ())),
+                max(1, int(hello.get("slots", 1))),
+                writer,
+            )
+            previous = self._workers.get(worker.worker_id)
+            if previous is not None:
+                self._drop_worker(previous, "reconnected")
+            self._workers[worker.worker_id] = worker
+            worker.send({"type": protocol.WELCOME, "heartbeat_interval": self.heartbeat_interval})
+            logger.info(
+                f"Worker {worker.worker_id} joined: agents={sorted(worker.agents)} "
+                f"slots={worker.slots}"
+            )
+            self._worker_joined.set()
+            self._dispatch()
+            while True:
+                message = await protocol.read_message(reader)
+                worker.last_seen = time.monotonic()
+                self._on_message(worker, message)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.TimeoutError) as e:
+            if worker is not None:
+                self._drop_worker(worker, type(e).__name__)
+            else:
+                writer.close()
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Invalid message from worker: {type(e).__name__}: {e}")
+            if worker is not None:
+                self._drop_worker(worker, "protocol error")
+            else:
+                writer.close()
+        except asyncio.CancelledError:
+            writer.close()
+            raise
+        finally:
+            self._connections.discard(connection)
+
+    def _on_message(self, worker: _WorkerConnection, message: Dict[str, Any]) -> None:
+        kind = message["type"]
+        if kind == protocol.HEARTBEAT:
+            lease_expires = worker.last_seen + self.lease_timeout
+            for task_id in message.get("running", ()):
+                task = self._tasks.get(task_id)
+                if task is not None and task.worker is worker:
+                    task.lease_expires = lease_expires
+            return
+        if kind not in (protocol.RESULT, protocol.ERROR):
+            raise protocol.ProtocolError(f"Unexpected message from worker: {kind}")
+
+        task = self._tasks.get(message.get("task_id"))
+        if task is None or task.worker is not worker or task.attempt != message.get("attempt"):
+            return  # Superseded attempt or abandoned task
+        worker.tasks.discard(task)
+        task.worker = None
+        if not task.future.done():
+            if kind == protocol.RESULT:
+                task.future.set_result(message.get("output"))
+            else:
+                task.future.set_exception(RemoteTaskError(message.get("error", "")))
+        self._dispatch()
+
+    async def _monitor_loop(self) -> None:
+        """Drop silent workers and re-dispatch tasks whose lease expired."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval / 2)
+            now = time.monotonic()
+            for worker in list(self._workers.values()):
+                if now - worker.last_seen > self.heartbeat_timeout:
+                    self._drop_worker(worker, "heartbeat timeout")
+            expired = False
+            for task in list(self._tasks.values()):
+                if task.worker is not None and task.lease_expires < now:
+                    task.worker.send({"type": protocol.CANCEL, "task_id": task.task_id})
+                    self._requeue(task, "lease expired")
+                    expired = True
+            if expired:
+                self._dispatch()
+
+
+class RemoteAgent(Agent):
+    """Agent whose steps run on coordinator workers.
+
+    Lets a :class:`~harmonicgalaxy.orchestrator.engine.MissionGraph` mix local
+    and remote steps. The step timeout (through the active deadline) bounds
+    the remote execution too. The worker gets a copy of the mission's context
+    and metadata: changes the agent makes to them are not sent back, only its
+    output is.
+    """
+
+    def __init__(
+        self,
+        coordinator: Coordinator,
+        name: str,
+        requires: Iterable[str] = (),
+        description: str = "",
+    ):
+        """Initialize remote agent.
+
+        Args:
+            coordinator: Coordinator dispatching the steps
+            name: Name of the agent on the workers
+            requires: Capability tags the worker must provide (e.g. ``gpu``)
+            description: What the agent does
+        """
+        super().__init__(name, description=description, capabilities=requires)
+        self.coordinator = coordinator
+
+    async def run(self, inputs: Dict[str, Any], mission: "Mission") -> Any:
+        """Run the step on a worker."""
+        return await self.coordinator.submit(
+            self.name,
+            inputs,
+            requires=self.capabilities,
+            mission={
+                "id": mission.id,
+                "name": mission.name,
+                "context": mission.context,
+                "metadata": mission.metadata,
+            },
+        )
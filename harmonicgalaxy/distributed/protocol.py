@@ -0,0 +1,115 @@
+"""Wire protocol between the coordinator and its workers.
+
+Messages are JSON objects framed by a 4-byte big-endian length, sent over
+a TCP or Unix stream socket. Every message has a ``type``:
+
+========== ===================== ============================================
+Type       Direction             Fields
+========== ===================== ============================================
+hello      worker → coordinator  worker_id, agents, capabilities, slots
+welcome    coordinator → worker  heartbeat_interval
+heartbeat  worker → coordinator  running (task ids, renewing their leases)
+task       coordinator → worker  task_id, attempt, agent, inputs, mission,
+                                 deadline (seconds left, or null)
+result     worker → coordinator  task_id, attempt, output
+error      worker → coordinator  task_id, attempt, error
+cancel     coordinator → worker  task_id (lease expired, task re-dispatched)
+========== ===================== ============================================
+
+The ``mission`` of a task holds the id, name, context and metadata of the
+mission the step belongs to. Step inputs and outputs, and the context and
+metadata of missions with remote steps, must therefore be JSON-serializable.
+"""
+
+import asyncio
+import struct
+from typing import Any, Dict, Tuple, Union
+
+from harmonicgalaxy.llm.serialization import dumps, loads
+
+HELLO = "hello"
+WELCOME = "welcome"
+HEARTBEAT = "heartbeat"
+TASK = "task"
+RESULT = "result"
+ERROR = "error"
+CANCEL = "cancel"
+
+MAX_MESSAGE_SIZE = 64 << 20
+
+_LENGTH = struct.Struct(">I")
+
+Address = Union[Tuple[str, int], str]
+
+
+class ProtocolError(ConnectionError):
+    """Raised when a peer sends a malformed or oversized message."""
+
+
+async def read_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Read one message.
+
+    Raises:
+        asyncio.IncompleteReadError: If the connection closed
+        ProtocolError: If the message is oversized or not a JSON object
+    """
+    (size,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if size > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message of {size} bytes exceeds {MAX_MESSAGE_SIZE}")
+    try:
+        message = loads(await reader.readexactly(size))
+    except ValueError as e:
+        raise ProtocolError(f"Invalid message: {e}") from e
+    if not isinstance(message, dict) or "type" not in message:
+        raise ProtocolError(f"Invalid message: {message!r:.200}")
+    return message
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode one message (without its length prefix).
+
+    Raises:
+        TypeError: If the message is not JSON-serializable
+        ProtocolError: If the message is oversized
+    """
+    data = dumps(message)
+    if len(data) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Message of {len(data)} bytes exceeds {MAX_MESSAGE_SIZE}")
+    return data
+
+
+def write_message(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    """Queue one message on ``writer`` (await ``writer.drain()`` for flow control).
+
+    Raises:
+        TypeError: If the message is not JSON-serializable
+        ProtocolError: If the message is oversized
+    """
+    data = encode_message(message)
+    writer.write(_LENGTH.pack(len(data)) + data)
+
+
+def parse_address(address: str) -> Address:
+    """Parse ``HOST:PORT`` or ``unix:PATH`` into a (host, port) pair or a socket path."""
+    if address.startswith("unix:"):
+        return address[len("unix:") :]
+    host, separator, port = address.rpartition(":")
+    if not separator or not port.isdigit():
+        raise ValueError(f"Invalid address {address!r}: expected HOST:PORT or unix:PATH")
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+def format_address(address: Address) -> str:
+    """Inverse of :func:`parse_address`."""
+    if isinstance(address, str):
+        return f"unix:{address}"
+    host, port = address
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+async def open_connection(address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connect to a coordinator listening on ``address``."""
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    host, port = address
+    return await asyncio.open_connection(host, port)
@@ -0,0 +1,217 @@
+"""Worker process running mission steps dispatched by a coordinator.
+
+A worker hosts a set of agents, connects to a
+:class:`~harmonicgalaxy.distributed.coordinator.Coordinator`, runs up to
+``slots`` tasks at once and sends a heartbeat listing its running tasks
+every ``heartbeat_interval`` seconds (set by the coordinator). A task
+cancelled by the coordinator (lease expired or caller gave up) is
+cancelled locally.
+
+Run a worker from the command line, naming agents by import path
+(``module:attribute``, an :class:`~harmonicgalaxy.agents.base.Agent`
+instance or a factory returning one)::
+
+    python -m harmonicgalaxy.distributed --connect 10.0.0.5:7700 \\
+        --agent myapp.agents:embedder --capability gpu --slots 8
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import socket
+from typing import Any, Dict, Iterable, List, Optional
+
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.distributed import protocol
+from harmonicgalaxy.llm.deadline import deadline
+from harmonicgalaxy.utils.logging import get_logger, log_context
+
+logger = get_logger(__name__)
+
+
+class Worker:
+    """Runs agents for a coordinator."""
+
+    def __init__(
+        self,
+        agents: Iterable[Agent],
+        address: protocol.Address,
+        slots: int = 4,
+        capabilities: Iterable[str] = (),
+        worker_id: Optional[str] = None,
+    ):
+        """Initialize worker.
+
+        Args:
+            agents: Agents hosted by this worker (looked up by name)
+            address: Coordinator address, (host, port) or a Unix socket path
+            slots: Tasks run at once
+            capabilities: Extra capability tags of this worker (e.g. ``gpu``),
+                added to those of its agents
+            worker_id: Unique worker id (default: ``hostname:pid``)
+        """
+        self.agents: Dict[str, Agent] = {agent.name: agent for agent in agents}
+        self.address = address
+        self.slots = slots
+        self.capabilities = frozenset(capabilities).union(
+            *(agent.capabilities for agent in self.agents.values())
+        )
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[str, "asyncio.Task[None]"] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def run(self) -> None:
+        """Serve the coordinator until the connection closes or :meth:`stop` is called."""
+        reader, writer = await protocol.open_connection(self.address)
+        self._writer = writer
+        heartbeat = None
+        try:
+            protocol.write_message(
+                writer,
+                {
+                    "type": protocol.HELLO,
+                    "worker_id": self.worker_id,
+                    "agents": sorted(self.agents),
+                    "capabilities": sorted(self.capabilities),
+                    "slots": self.slots,
+                },
+            )
+            welcome = await protocol.read_message(reader)
+            if welcome["type"] != protocol.WELCOME:
+                raise protocol.ProtocolError(f"Expected welcome, got {welcome['type']}")
+            logger.info(
+                f"Worker {self.worker_id} connected to "
+                f"{protocol.format_address(self.address)}"
+            )
+            heartbeat = asyncio.get_running_loop().create_task(
+                self._heartbeat_loop(welcome["heartbeat_interval"])
+            )
+            while True:
+                message = await protocol.read_message(reader)
+                if message["type"] == protocol.TASK:
+                    self._start(message)
+                elif message["type"] == protocol.CANCEL:
+                    task = self._running.get(message["task_id"])
+                    if task is not None:
+                        task.cancel()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.info(f"Worker {self.worker_id} disconnected")
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            running = list(self._running.values())
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            writer.close()
+            self._writer = None
+
+    def stop(self) -> None:
+        """Disconnect; :meth:`run` returns once running tasks are cancelled."""
+        if self._writer is not None:
+            self._writer.close()
+
+    def _start(self, message: Dict[str, Any]) -> None:
+        task_id = message["task_id"]
+        task = asyncio.get_running_loop().create_task(self._execute(message))
+        self._running[task_id] = task
+        task.add_done_callback(lambda _: self._running.pop(task_id, None))
+
+    async def _execute(self, message: Dict[str, Any]) -> None:
+        """Run one task and report its output or error."""
+        reply = {"task_id": message["task_id"], "attempt": message["attempt"]}
+        info = message.get("mission") or {}
+        mission = Mission(
+            info.get("name", "remote"),
+            context=info.get("context"),
+            mission_id=info.get("id"),
+            metadata=info.get("metadata"),
+        )
+        mission.start()
+        try:
+            agent = self.agents.get(message["agent"])
+            if agent is None:
+                raise LookupError(f"Agent {message['agent']!r} is not hosted by this worker")
+            with log_context(mission_id=mission.id, task_id=message["task_id"]):
+                if message.get("deadline") is None:
+                    output = await agent.run(message["inputs"], mission)
+                else:
+                    with deadline(message["deadline"]):
+                        output = await asyncio.wait_for(
+                            agent.run(message["inputs"], mission), message["deadline"]
+                        )
+            reply.update(type=protocol.RESULT, output=output)
+            self._send(reply)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            reply.update(type=protocol.ERROR, error=f"{type(e).__name__}: {e}")
+            reply.pop("output", None)
+            self._send(reply)
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        if self._writer is not None and not self._writer.is_closing():
+            protocol.write_message(self._writer, message)
+
+    async def _heartbeat_loop(self, interval: float) -> None:
+        while True:
+            self._send({"type": protocol.HEARTBEAT, "running": list(self._running)})
+            await asyncio.sleep(interval)
+
+
+def load_agent(path: str) -> Agent:
+    """Import an agent from ``module:attribute`` (an Agent or a factory returning one)."""
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        raise ValueError(f"Invalid agent path {path!r}: expected module:attribute")
+    target = getattr(importlib.import_module(module_name), attribute)
+    agent = target if isinstance(target, Agent) else target()
+    if not isinstance(agent, Agent):
+        raise TypeError(f"{path} is not an Agent")
+    return agent
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m harmonicgalaxy.distributed",
+        description="Run HarmonicGalaxy agents for a coordinator.",
+    )
+    parser.add_argument("--connect", required=True, help="coordinator HOST:PORT or unix:PATH")
+    parser.add_argument(
+        "--agent", action="append", required=True, help="agent import path module:attribute"
+    )
+    parser.add_argument("--capability", action="append", default=[], help="capability tag")
+    parser.add_argument("--slots", type=int, default=4, help="tasks run at once")
+    parser.add_argument("--worker-id", help="unique worker id (default: hostname:pid)")
+    parser.add_argument(
+        "--reconnect", type=float, metavar="SECONDS", help="reconnect after this delay"
+    )
+    args = parser.parse_args(argv)
+
+    worker = Worker(
+        [load_agent(path) for path in args.agent],
+        protocol.parse_address(args.connect),
+        slots=args.slots,
+        capabilities=args.capability,
+        worker_id=args.worker_id,
+    )
+
+    async def serve() -> None:
+        while True:
+            try:
+                await worker.run()
+            except OSError as e:
+                logger.warning(f"Cannot reach coordinator: {e}")
+            if args.reconnect is None:
+                return
+            await asyncio.sleep(args.reconnect)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
@@ -1,2 +1,25 @@
 """Event / log stream for observability."""
 
+from harmonicgalaxy.events.tracing import (
+    BatchSpanProcessor,
+    JsonlSpanExporter,
+    Span,
+    configure_tracing,
+    configure_tracing_from_env,
+    current_span,
+    shutdown_tracing,
+    span,
+    traced,
+)
+
+__all__ = [
+    "BatchSpanProcessor",
+    "JsonlSpanExporter",
+    "Span",
+    "configure_tracing",
+    "configure_tracing_from_env",
+    "current_span",
+    "shutdown_tracing",
+    "span",
+    "traced",
+]
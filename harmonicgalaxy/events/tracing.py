@@ -0,0 +1,452 @@
+"""Lightweight tracing with spans carried in context variables.
+
+A span times one unit of work (a mission, an agent step, an LLM call). The
+active span is kept in a :class:`contextvars.ContextVar`, so spans opened
+further down the call chain, across ``await`` and in tasks spawned from the
+current context, become its children. While a span is active, its trace and
+span IDs are attached to every record logged through ``GalaxyLogger`` (see
+:func:`harmonicgalaxy.utils.logging.log_context`).
+
+``LLMClient.chat``/``stream_chat`` open spans automatically; orchestration
+code uses :func:`span` or :func:`traced`. Finished spans are exported in
+batches from a background thread once :func:`configure_tracing` has been
+called, as OTLP/JSON lines (one ``ExportTraceServiceRequest`` per line, as
+written by the OpenTelemetry collector file exporter).
+
+Example:
+    >>> configure_tracing("traces.jsonl")
+    >>> with span("mission.run", mission_id="m-42"):
+    ...     with span("agent.plan", agent="planner"):
+    ...         response = await client.chat(messages)  # child span "llm.chat"
+"""
+
+import asyncio
+import atexit
+import functools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar, Union
+
+from harmonicgalaxy.utils.logging import get_logger, log_context
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Span kinds (OTLP ``SpanKind`` values)
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+# Span status codes (OTLP ``Status.StatusCode`` values)
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "harmonicgalaxy_current_span", default=None
+)
+
+# IDs only need to be unique, not unpredictable
+_ids = random.Random()
+
+
+class Span:
+    """One timed unit of work within a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "status_message",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize and start a span.
+
+        Args:
+            name: Span name (e.g. ``llm.chat``)
+            parent: Parent span; None starts a new trace
+            kind: OTLP span kind
+            attributes: Initial attributes
+        """
+        self.name = name
+        if parent is None:
+            self.trace_id = f"{_ids.getrandbits(128):032x}"
+            self.parent_id: Optional[str] = None
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self.span_id = f"{_ids.getrandbits(64):016x}"
+        self.kind = kind
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set one attribute."""
+        self.attributes[key] = value
+
+    def set_status(self, status: int, message: str = "") -> None:
+        """Set the status (``STATUS_OK`` or ``STATUS_ERROR``)."""
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, error: BaseException) -> None:
+        """Mark the span as failed with ``error``."""
+        self.attributes["exception.type"] = type(error).__name__
+        self.attributes["exception.message"] = str(error)
+        self.set_status(STATUS_ERROR, f"{type(error).__name__}: {error}")
+
+    def end(self) -> None:
+        """Stop the span and hand it to the exporter (ending twice is a no-op)."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        processor = _processor
+        if processor is not None:
+            processor.on_end(self)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, or None while the span is running."""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Return the span in the OTLP/JSON encoding."""
+        status: Dict[str, Any] = {"code": self.status}
+        if self.status_message:
+            status["message"] = self.status_message
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns if self.end_ns is not None else self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": status,
+        }
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, trace_id={self.trace_id}, span_id={self.span_id})"
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Encode an attribute value as an OTLP ``AnyValue``."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def current_span() -> Optional[Span]:
+    """Return the active span, or None outside of any span."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(
+    name: str, kind: int = SPAN_KIND_INTERNAL, activate: bool = True, **attributes: Any
+) -> Iterator[Span]:
+    """Run the enclosed block in a new child of the active span.
+
+    The span is marked as failed if the block raises, flagged as cancelled
+    on cancellation, and ended when the block exits.
+
+    Args:
+        name: Span name (e.g. ``agent.plan``)
+        kind: OTLP span kind
+        activate: Make the span the active span of the block. Pass False
+            inside async generators: a context variable set there would leak
+            into the consumer between two items.
+        **attributes: Initial attributes
+
+    Yields:
+        The new span
+    """
+    current = Span(name, _current_span.get(), kind, attributes)
+    try:
+        if activate:
+            token = _current_span.set(current)
+            try:
+                with log_context(trace_id=current.trace_id, span_id=current.span_id):
+                    yield current
+            finally:
+                _current_span.reset(token)
+        else:
+            yield current
+    except Exception as e:
+        current.record_exception(e)
+        raise
+    except BaseException:
+        current.set_attribute("cancelled", True)
+        raise
+    finally:
+        current.end()
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable[[F], F]:
+    """Decorator running every call of a function in a span.
+
+    Works on sync and async functions.
+
+    Args:
+        name: Span name (default: ``module.qualname`` of the function)
+        **attributes: Attributes set on every span
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+class JsonlSpanExporter:
+    """Append batches of spans to a file as OTLP/JSON lines."""
+
+    def __init__(self, path: Union[str, Path], service_name: str = "harmonicgalaxy"):
+        """Initialize exporter.
+
+        Args:
+            path: Output file (appended to)
+            service_name: ``service.name`` resource attribute
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._resource = {"attributes": _otlp_attributes({"service.name": service_name})}
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Write one ``ExportTraceServiceRequest`` line holding ``spans``."""
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "harmonicgalaxy"},
+                            "spans": [item.to_otlp() for item in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        if orjson is not None:
+            line = orjson.dumps(request, default=str).decode("utf-8")
+        else:
+            line = json.dumps(request, default=str, ensure_ascii=False, separators=(",", ":"))
+        self._file.write(line + "\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class BatchSpanProcessor:
+    """Buffer finished spans and export them in batches from a daemon thread.
+
+    Ending a span only appends it to a list. A batch is exported once
+    ``max_batch_size`` spans are buffered or ``schedule_delay`` seconds have
+    passed. Spans ending while ``max_queue_size`` spans are already buffered
+    are dropped and counted in :attr:`dropped`.
+    """
+
+    def __init__(
+        self,
+        exporter: Any,
+        max_batch_size: int = 512,
+        schedule_delay: float = 5.0,
+        max_queue_size: int = 2048,
+    ):
+        """Initialize and start the processor.
+
+        Args:
+            exporter: Object with ``export(spans)`` and ``shutdown()``
+            max_batch_size: Maximum spans per exported batch
+            schedule_delay: Maximum seconds between exports
+            max_queue_size: Maximum spans buffered before new ones are dropped
+        """
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="harmonicgalaxy-trace-export", daemon=True
+        )
+        self._thread.start()
+
+    def on_end(self, finished: Span) -> None:
+        """Buffer a finished span."""
+        with self._lock:
+            buffered = len(self._buffer)
+            if buffered >= self.max_queue_size:
+                self.dropped += 1
+                return
+            self._buffer.append(finished)
+        if buffered + 1 >= self.max_batch_size:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.schedule_delay)
+            self._wakeup.clear()
+            self._export_buffered()
+
+    def _export_buffered(self) -> None:
+        with self._export_lock:
+            with self._lock:
+                # Swap the buffer so on_end never waits for the export
+                spans, self._buffer = self._buffer, []
+            for start in range(0, len(spans), self.max_batch_size):
+                try:
+                    self.exporter.export(spans[start : start + self.max_batch_size])
+                except Exception as e:
+                    logger.warning(f"Failed to export {len(spans)} spans: {e}")
+
+    def force_flush(self) -> None:
+        """Export every buffered span now."""
+        self._export_buffered()
+
+    def shutdown(self) -> None:
+        """Stop the export thread after exporting the buffered spans."""
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self._export_buffered()
+        self.exporter.shutdown()
+
+
+_processor: Optional[BatchSpanProcessor] = None
+_atexit_registered = False
+
+
+def configure_tracing(
+    path: Optional[Union[str, Path]] = None,
+    exporter: Any = None,
+    service_name: str = "harmonicgalaxy",
+    max_batch_size: int = 512,
+    schedule_delay: float = 5.0,
+    max_queue_size: int = 2048,
+) -> BatchSpanProcessor:
+    """Export finished spans in batches, replacing a previous configuration.
+
+    Args:
+        path: Write spans to this OTLP/JSON lines file
+        exporter: Custom exporter, used instead of ``path``
+        service_name: ``service.name`` resource attribute of the file exporter
+        max_batch_size: Maximum spans per exported batch
+        schedule_delay: Maximum seconds between exports
+        max_queue_size: Maximum spans buffered before new ones are dropped
+
+    Returns:
+        The started processor
+    """
+    if exporter is None:
+        if path is None:
+            raise ValueError("Pass either a path or an exporter")
+        exporter = JsonlSpanExporter(path, service_name=service_name)
+
+    global _processor, _atexit_registered
+    shutdown_tracing()
+    _processor = BatchSpanProcessor(
+        exporter,
+        max_batch_size=max_batch_size,
+        schedule_delay=schedule_delay,
+        max_queue_size=max_queue_size,
+    )
+    if not _atexit_registered:
+        atexit.register(shutdown_tracing)
+        _atexit_registered = True
+    return _processor
+
+
+def configure_tracing_from_env() -> Optional[BatchSpanProcessor]:
+    """Configure tracing from environment variables.
+
+    Environment variables:
+        HARMONICGALAXY_TRACE_FILE: Export spans to this OTLP/JSON lines file
+        HARMONICGALAXY_TRACE_SERVICE: ``service.name`` of the spans (default: harmonicgalaxy)
+        HARMONICGALAXY_TRACE_BATCH_SIZE: Maximum spans per batch (default: 512)
+        HARMONICGALAXY_TRACE_DELAY: Maximum seconds between exports (default: 5)
+
+    Returns:
+        The started processor, or None if no trace file is configured
+    """
+    path = os.getenv("HARMONICGALAXY_TRACE_FILE")
+    if not path:
+        return None
+    return configure_tracing(
+        path,
+        service_name=os.getenv("HARMONICGALAXY_TRACE_SERVICE", "harmonicgalaxy"),
+        max_batch_size=int(os.getenv("HARMONICGALAXY_TRACE_BATCH_SIZE", "512")),
+        schedule_delay=float(os.getenv("HARMONICGALAXY_TRACE_DELAY", "5")),
+    )
+
+
+def shutdown_tracing() -> None:
+    """Export the buffered spans and stop exporting."""
+    global _processor
+    processor, _processor = _processor, None
+    if processor is not None:
+        processor.shutdown()
@@ -5,7 +5,31 @@ including OpenAI, Anthropic, and others.
 """
 
 from harmonicgalaxy.llm.client import LLMClient, create_client
-from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMConfig, LLMProvider
+from harmonicgalaxy.llm.types import (
+    LLMMessage,
+    LLMResponse,
+    LLMConfig,
+    LLMProvider,
+    LLMToolCall,
+    LLMToolDefinition,
+    FrozenLLMMessage,
+    FrozenLLMResponse,
+    FrozenLLMConfig,
+)
+from harmonicgalaxy.llm.tools import Tool, ToolExecutor
+from harmonicgalaxy.llm.deadline import DeadlineExceededError, deadline, time_remaining
+from harmonicgalaxy.llm.limiter import (
+    AdaptiveConcurrencyLimiter,
+    configure_adaptive_limits,
+    limiter_snapshot,
+)
+from harmonicgalaxy.llm.scheduler import (
+    LLMScheduler,
+    RequestPriority,
+    configure_scheduler,
+    get_scheduler,
+    request_context,
+)
 
 __all__ = [
     "LLMClient",
@@ -14,5 +38,23 @@ __all__ = [
     "LLMResponse",
     "LLMConfig",
     "LLMProvider",
+    "LLMToolCall",
+    "LLMToolDefinition",
+    "FrozenLLMMessage",
+    "FrozenLLMResponse",
+    "FrozenLLMConfig",
+    "Tool",
+    "ToolExecutor",
+    "DeadlineExceededError",
+    "deadline",
+    "time_remaining",
+    "LLMScheduler",
+    "RequestPriority",
+    "configure_scheduler",
+    "get_scheduler",
+    "request_context",
+    "AdaptiveConcurrencyLimiter",
+    "configure_adaptive_limits",
+    "limiter_snapshot",
 ]
 
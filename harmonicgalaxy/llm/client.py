@@ -1,16 +1,58 @@
 """Base LLM client interface and factory."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional, TYPE_CHECKING
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:
     from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMConfig, LLMProvider
 
+from harmonicgalaxy.events.tracing import SPAN_KIND_CLIENT, span
+from harmonicgalaxy.llm.deadline import DeadlineExceededError, time_remaining
+from harmonicgalaxy.llm.limiter import AdaptiveConcurrencyLimiter, get_limiter
+from harmonicgalaxy.llm.scheduler import current_request_context, get_scheduler
 from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMConfig, LLMProvider
+from harmonicgalaxy.metrics.instruments import LLMRequestMetrics
 from harmonicgalaxy.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# HTTP status codes worth retrying (timeouts, conflicts, rate limits)
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429})
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check whether a provider error is transient and worth retrying."""
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    # SDK connection/timeout errors (e.g. APIConnectionError, APITimeoutError)
+    name = type(error).__name__
+    return "Connection" in name or "Timeout" in name
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether a provider error is a rate-limit (HTTP 429) rejection."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(error).__name__
+
 
 class LLMClient(ABC):
     """Abstract base class for LLM clients."""
@@ -23,6 +65,10 @@ class LLMClient(ABC):
         """
         self.config = config
         self.provider = config.provider
+        # Smoothed latency of successful requests, used to decide whether a
+        # retry can still finish before the active deadline
+        self._latency_estimate: Optional[float] = None
+        self._metrics = LLMRequestMetrics(config.provider.value, config.model)
         logger.debug(f"Initializing {self.__class__.__name__} with model={config.model}")
 
     @abstractmethod
@@ -62,6 +108,222 @@ class LLMClient(ABC):
         """
         pass
 
+    @asynccontextmanager
+    async def _request_scope(self, operation: str) -> AsyncIterator[None]:
+        """Scope of one logical ``chat``/``stream_chat`` request.
+
+        Providers wrap each request (for streams, including the whole
+        iteration) in this scope. The scope runs in an ``llm.<operation>``
+        tracing span, records request metrics (outcome, latency, in-flight
+        requests) and admits the request through :meth:`_admission`.
+
+        Args:
+            operation: Operation name ("chat" or "stream_chat")
+        """
+        metrics = self._metrics
+        succeeded, failed, cancelled, duration = metrics.operation(operation)
+        metrics.in_flight.inc()
+        started = time.perf_counter()
+        try:
+            # stream_chat runs in an async generator, where the span must not
+            # become the active span (see harmonicgalaxy.events.tracing.span)
+            with span(
+                f"llm.{operation}",
+                SPAN_KIND_CLIENT,
+                activate=operation != "stream_chat",
+                **{"llm.provider": self.provider.value, "llm.model": self.config.model},
+            ) as request_span:
+                async with self._admission():
+                    request_span.set_attribute(
+                        "llm.queued_seconds", round(time.perf_counter() - started, 6)
+                    )
+                    yield
+        except Exception as e:
+            failed.inc()
+            metrics.record_error(e)
+            raise
+        except BaseException:
+            cancelled.inc()
+            raise
+        else:
+            succeeded.inc()
+        finally:
+            metrics.in_flight.dec()
+            duration.observe(time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def _admission(self) -> AsyncIterator[None]:
+        """Wait until the request may be sent.
+
+        If a scheduler is configured for the provider/model, the request
+        waits here for a slot. Requests then take a permit from the adaptive
+        concurrency limiter of the endpoint, if adaptive limiting is enabled.
+        """
+        scheduler = get_scheduler(self.provider, self.config.model)
+        limiter = self._limiter()
+        if scheduler is None and limiter is None:
+            yield
+            return
+
+        if scheduler is not None:
+            ticket = await scheduler.acquire(*current_request_context())
+        try:
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                yield
+            finally:
+                if limiter is not None:
+                    limiter.release()
+        finally:
+            if scheduler is not None:
+                scheduler.release(ticket)
+
+    def _limiter(self) -> Optional[AdaptiveConcurrencyLimiter]:
+        """Return the adaptive concurrency limiter of this client's endpoint."""
+        return get_limiter(self.provider.value, self.config.model, self.config.base_url)
+
+    def _request_timeout(self) -> Optional[float]:
+        """Return the per-request timeout bounded by the active deadline.
+
+        Returns:
+            None if no deadline is active (the client's configured timeout
+            applies), otherwise the smaller of ``config.timeout`` and the time
+            remaining before the deadline
+
+        Raises:
+            DeadlineExceededError: If the deadline has already passed
+        """
+        remaining = time_remaining()
+        if remaining is None:
+            return None
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                f"Deadline exceeded before {self.provider.value} request to {self.config.model}"
+            )
+        if self.config.timeout:
+            return min(self.config.timeout, remaining)
+        return remaining
+
+    async def _send(self, attempt: Callable[[Optional[float]], Awaitable[T]]) -> T:
+        """Run a provider request under the active deadline.
+
+        Without a deadline or an adaptive limiter, ``attempt`` runs once with
+        ``timeout=None`` and the provider SDK's own timeout and retry settings
+        apply. Otherwise the SDK must not retry on its own (see the providers'
+        ``_client_for``) and transient failures are retried here, so that the
+        limiter observes every rate-limited attempt and backs off. Under a
+        deadline, each attempt gets a timeout shrunk to the time remaining and
+        is retried only if another attempt can still finish in time. Each
+        retried attempt runs in an ``llm.attempt`` tracing span.
+
+        Args:
+            attempt: Performs one request with the given timeout in seconds
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            DeadlineExceededError: If the deadline passes or no retry can finish in time
+        """
+        if time_remaining() is None and self._limiter() is None:
+            started = time.monotonic()
+            try:
+                result = await attempt(None)
+            except Exception as e:
+                self._record_failure(e)
+                raise
+            self._record_latency(time.monotonic() - started)
+            return result
+
+        for attempt_index in range(self.config.max_retries + 1):
+            timeout = self._request_timeout()
+            started = time.monotonic()
+            try:
+                with span("llm.attempt", SPAN_KIND_CLIENT, **{"llm.attempt": attempt_index}):
+                    result = await asyncio.wait_for(attempt(timeout), timeout)
+            except Exception as e:
+                self._record_failure(e)
+                remaining = time_remaining()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(
+                        f"Deadline exceeded during {self.provider.value} request "
+                        f"to {self.config.model}"
+                    ) from e
+                if not is_retryable_error(e) or attempt_index == self.config.max_retries:
+                    raise
+
+                backoff = min(0.5 * 2**attempt_index, 8.0)
+                expected = max(time.monotonic() - started, self._latency_estimate or 0.0)
+                if remaining is not None and backoff + expected > remaining:
+                    raise DeadlineExceededError(
+                        f"Skipping retry of {self.provider.value} request: {remaining:.2f}s left, "
+                        f"~{backoff + expected:.2f}s needed"
+                    ) from e
+                logger.debug(f"Retrying {self.provider.value} request after {type(e).__name__}")
+                await asyncio.sleep(backoff)
+                continue
+
+            self._record_latency(time.monotonic() - started)
+            return result
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _record_latency(self, latency: float) -> None:
+        """Record the latency of a successful request attempt."""
+        if self._latency_estimate is None:
+            self._latency_estimate = latency
+        else:
+            self._latency_estimate = 0.8 * self._latency_estimate + 0.2 * latency
+
+        limiter = self._limiter()
+        if limiter is not None:
+            limiter.observe(latency)
+
+    def _record_failure(self, error: BaseException) -> None:
+        """Record a failed request attempt."""
+        if is_rate_limit_error(error):
+            limiter = self._limiter()
+            if limiter is not None:
+                limiter.observe(0.0, rate_limited=True)
+
+    def _record_usage(self, usage: Optional[Mapping[str, Any]]) -> None:
+        """Record the token usage reported for a completed request."""
+        self._metrics.record_usage(usage)
+
+    async def _iter_with_deadline(self, iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+        """Iterate a response stream, failing once the active deadline passes.
+
+        Args:
+            iterator: Async iterator of stream chunks
+
+        Yields:
+            Items from ``iterator``
+
+        Raises:
+            DeadlineExceededError: If the next chunk does not arrive in time
+        """
+        if time_remaining() is None:
+            async for item in iterator:
+                yield item
+            return
+
+        iterator = iterator.__aiter__()
+        while True:
+            timeout = self._request_timeout()
+            try:
+                item = await asyncio.wait_for(iterator.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError as e:
+                remaining = time_remaining()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceededError(
+                        f"Deadline exceeded while streaming from {self.provider.value}"
+                    ) from e
+                raise
+            yield item
+
     def __repr__(self) -> str:
         """String representation."""
         return f"{self.__class__.__name__}(provider={self.provider.value}, model={self.config.model})"
@@ -0,0 +1,71 @@
+"""Context-variable based deadlines for LLM calls.
+
+A deadline is an absolute point in time (``time.monotonic()`` clock) carried in
+a :class:`contextvars.ContextVar`, so it follows the call chain across
+``await`` and into tasks spawned from the current context. Every
+``LLMClient.chat``/``stream_chat`` call bounds its per-request timeout by the
+time remaining and fails fast with :class:`DeadlineExceededError` once the
+deadline has passed.
+
+Example:
+    >>> with deadline(10.0):
+    ...     response = await client.chat(messages)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("harmonicgalaxy_llm_deadline", default=None)
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when an LLM call cannot complete before the active deadline."""
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """Run the enclosed block under a deadline ``seconds`` from now.
+
+    Nested deadlines can only shorten the effective deadline, never extend it.
+
+    Args:
+        seconds: Time budget in seconds
+
+    Yields:
+        The effective absolute deadline (``time.monotonic()`` clock)
+    """
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < expires_at:
+        expires_at = current
+
+    token = _deadline.set(expires_at)
+    try:
+        yield expires_at
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Return the active absolute deadline, or None if there is none."""
+    return _deadline.get()
+
+
+def time_remaining() -> Optional[float]:
+    """Return seconds left before the active deadline, or None if there is none.
+
+    The value is negative once the deadline has passed.
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Raise DeadlineExceededError if the active deadline has passed."""
+    remaining = time_remaining()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededError(f"Deadline exceeded by {-remaining:.3f}s")
@@ -0,0 +1,234 @@
+"""Adaptive concurrency limiting for LLM requests.
+
+An :class:`AdaptiveConcurrencyLimiter` caps the number of requests in flight to
+one endpoint and adjusts the cap from feedback (AIMD):
+
+- While latency stays close to the observed baseline and the current limit
+  is actually being used, the limit grows additively (about +1 per window of
+  ``limit`` completed requests).
+- When the provider answers with a rate-limit error, or smoothed latency
+  rises well above the baseline, the limit is cut multiplicatively, at most
+  once per cooldown period.
+
+Limiters are opt-in and kept per (provider, model, base_url):
+
+Example:
+    >>> configure_adaptive_limits(initial_limit=8, max_limit=128)
+    >>> response = await client.chat(messages)  # limited transparently
+    >>> limiter_snapshot()
+    [{'provider': 'openai', 'model': 'gpt-4', 'base_url': None, 'limit': 9, ...}]
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter driven by latency and rate-limit feedback.
+
+    The limiter is bound to the event loop it is first used from.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff_ratio: float = 0.7,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        baseline_window: float = 60.0,
+        name: str = "",
+    ):
+        """Initialize limiter.
+
+        Args:
+            initial_limit: Starting in-flight limit
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            backoff_ratio: Factor applied to the limit on overload
+            latency_tolerance: Smoothed latency above ``baseline * tolerance``
+                counts as overload
+            smoothing: EWMA factor for latency samples
+            baseline_window: Seconds after which the latency baseline is
+                re-learned, so it can follow slow drifts
+            name: Label used in logs and snapshots
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self.name = name
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+        self._baseline: Optional[float] = None
+        self._baseline_since = time.monotonic()
+        self._ewma: Optional[float] = None
+        self._last_decrease = 0.0
+
+        self.rate_limited = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current in-flight limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a permit."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Permit was handed over while we were being cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a permit."""
+        self._in_flight -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def permit(self) -> AsyncIterator[None]:
+        """Hold a permit for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def observe(self, latency: float, rate_limited: bool = False) -> None:
+        """Feed the outcome of one request back into the limit.
+
+        Args:
+            latency: Request latency in seconds
+            rate_limited: Whether the provider rejected the request with a rate limit
+        """
+        now = time.monotonic()
+        if rate_limited:
+            self.rate_limited += 1
+            self._decrease(now, "rate limited")
+            return
+
+        if self._baseline is None or now - self._baseline_since > self.baseline_window:
+            self._baseline = latency
+            self._baseline_since = now
+        else:
+            self._baseline = min(self._baseline, latency)
+
+        if self._ewma is None:
+            self._ewma = latency
+        else:
+            self._ewma += self.smoothing * (latency - self._ewma)
+
+        if self._ewma > self._baseline * self.latency_tolerance:
+            self._decrease(now, "latency rising")
+        elif self._in_flight >= self._limit / 2:
+            # Only grow while the current limit is actually being used
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            self._wake()
+
+    def _decrease(self, now: float, reason: str) -> None:
+        """Cut the limit multiplicatively, at most once per cooldown."""
+        cooldown = max(self._ewma or 0.0, 0.1)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        self.decreases += 1
+        # Re-learn the smoothed latency at the new concurrency level
+        self._ewma = self._baseline
+        logger.debug(f"Concurrency limit {self.name or ''} {previous} -> {self.limit} ({reason})")
+
+    def _wake(self) -> None:
+        """Hand permits to waiters while there is room."""
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the limiter state for dashboards."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": sum(1 for f in self._waiters if not f.done()),
+            "baseline_latency": self._baseline,
+            "smoothed_latency": self._ewma,
+            "rate_limited": self.rate_limited,
+            "decreases": self.decreases,
+        }
+
+
+_limiters: Dict[Tuple[str, str, Optional[str]], AdaptiveConcurrencyLimiter] = {}
+_limiter_settings: Optional[Dict[str, Any]] = None
+
+
+def configure_adaptive_limits(enabled: bool = True, **kwargs) -> None:
+    """Enable (or disable) adaptive concurrency limiting for all LLM clients.
+
+    Args:
+        enabled: Whether LLM clients should use adaptive limiters
+        **kwargs: Arguments for :class:`AdaptiveConcurrencyLimiter`, applied
+            to limiters created from now on
+    """
+    global _limiter_settings
+    _limiter_settings = dict(kwargs) if enabled else None
+    if not enabled:
+        _limiters.clear()
+
+
+def get_limiter(
+    provider: str, model: str, base_url: Optional[str] = None
+) -> Optional[AdaptiveConcurrencyLimiter]:
+    """Return the limiter for an endpoint, creating it on first use.
+
+    Returns:
+        None if adaptive limiting is not enabled
+    """
+    if _limiter_settings is None:
+        return None
+    key = (provider, model, base_url)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        name = f"{provider}/{model}" + (f"@{base_url}" if base_url else "")
+        limiter = AdaptiveConcurrencyLimiter(name=name, **_limiter_settings)
+        _limiters[key] = limiter
+    return limiter
+
+
+def limiter_snapshot() -> List[Dict[str, Any]]:
+    """Return the state of every limiter, for dashboards."""
+    return [
+        {"provider": provider, "model": model, "base_url": base_url, **limiter.snapshot()}
+        for (provider, model, base_url), limiter in _limiters.items()
+    ]
@@ -2,7 +2,7 @@
 
 from harmonicgalaxy.llm.providers.openai_client import OpenAIClient
 from harmonicgalaxy.llm.providers.anthropic_client import AnthropicClient
-from harmonicgalaxy.llm.providers.qwen_client import QwenClient
+from harmonicgalaxy.llm.providers.qwen_client import QwenClient, QwenAPIError
 
-__all__ = ["OpenAIClient", "AnthropicClient", "QwenClient"]
+__all__ = ["OpenAIClient", "AnthropicClient", "QwenClient", "QwenAPIError"]
 
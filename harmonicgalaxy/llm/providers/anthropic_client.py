@@ -2,7 +2,14 @@
 
 from typing import List, Optional, Dict, Any, AsyncIterator
 from harmonicgalaxy.llm.client import LLMClient
-from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMConfig, LLMProvider
+from harmonicgalaxy.llm.types import (
+    LLMMessage,
+    LLMResponse,
+    LLMConfig,
+    LLMProvider,
+    LLMToolCall,
+    LLMToolDefinition,
+)
 
 
 class AnthropicClient(LLMClient):
@@ -34,6 +41,20 @@ class AnthropicClient(LLMClient):
             max_retries=config.max_retries,
         )
 
+    def _client_for(self, timeout: Optional[float]):
+        """Return the SDK client to use for a request with the given timeout.
+
+        Args:
+            timeout: Per-request timeout from the deadline, or None for defaults
+        """
+        if timeout is None and self._limiter() is None:
+            return self._client
+        # Under a deadline or an adaptive limiter, retries are handled by
+        # LLMClient._send, so that the limiter sees every rate-limited attempt
+        if timeout is None:
+            return self._client.with_options(max_retries=0)
+        return self._client.with_options(timeout=timeout, max_retries=0)
+
     def _convert_messages(self, messages: List[LLMMessage]) -> List[Dict[str, Any]]:
         """Convert LLMMessage format to Anthropic format.
 
@@ -49,6 +70,40 @@ class AnthropicClient(LLMClient):
         for msg in messages:
             if msg.role == "system":
                 system_message = msg.content
+            elif msg.role == "tool":
+                # Tool results travel as tool_result blocks in a user turn; results
+                # of parallel tool calls must share a single user message.
+                block: Dict[str, Any] = {
+                    "type": "tool_result",
+                    "tool_use_id": msg.tool_call_id,
+                    "content": msg.content,
+                }
+                if msg.metadata and msg.metadata.get("is_error"):
+                    block["is_error"] = True
+                previous = anthropic_messages[-1] if anthropic_messages else None
+                if (
+                    previous
+                    and previous["role"] == "user"
+                    and isinstance(previous["content"], list)
+                    and previous["content"][-1].get("type") == "tool_result"
+                ):
+                    previous["content"].append(block)
+                else:
+                    anthropic_messages.append({"role": "user", "content": [block]})
+            elif msg.tool_calls:
+                blocks: List[Dict[str, Any]] = []
+                if msg.content:
+                    blocks.append({"type": "text", "text": msg.content})
+                for call in msg.tool_calls:
+                    blocks.append(
+                        {
+                            "type": "tool_use",
+                            "id": call.id,
+                            "name": call.name,
+                            "input": call.arguments,
+                        }
+                    )
+                anthropic_messages.append({"role": "assistant", "content": blocks})
             else:
                 # Anthropic uses "user" and "assistant" roles
                 anthropic_messages.append(
@@ -60,6 +115,27 @@ class AnthropicClient(LLMClient):
 
         return anthropic_messages, system_message
 
+    @staticmethod
+    def _convert_tools(tools: List[Any]) -> List[Dict[str, Any]]:
+        """Convert tool definitions to Anthropic tools.
+
+        Plain dictionaries are assumed to be in Anthropic format already.
+        """
+        converted = []
+        for tool in tools:
+            if isinstance(tool, LLMToolDefinition):
+                data = tool.to_dict()
+                converted.append(
+                    {
+                        "name": data["name"],
+                        "description": data["description"],
+                        "input_schema": data["parameters"],
+                    }
+                )
+            else:
+                converted.append(tool)
+        return converted
+
     async def chat(
         self,
         messages: List[LLMMessage],
@@ -69,11 +145,12 @@ class AnthropicClient(LLMClient):
 
         Args:
             messages: List of messages in the conversation
-            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+            **kwargs: Additional parameters (temperature, max_tokens, tools, etc.)
 
         Returns:
             LLMResponse object containing the response
         """
+        tools = kwargs.pop("tools", None)
         anthropic_messages, system_message = self._convert_messages(messages)
 
         # Merge config parameters with kwargs
@@ -86,6 +163,9 @@ class AnthropicClient(LLMClient):
         if system_message:
             params["system"] = system_message
 
+        if tools:
+            params["tools"] = self._convert_tools(tools)
+
         if self.config.max_tokens:
             params["max_tokens"] = kwargs.get("max_tokens", self.config.max_tokens)
         if self.config.top_p:
@@ -100,15 +180,23 @@ class AnthropicClient(LLMClient):
         # Override with kwargs
         params.update(kwargs)
 
-        response = await self._client.messages.create(**params)
+        async with self._request_scope("chat"):
+            response = await self._send(
+                lambda timeout: self._client_for(timeout).messages.create(**params)
+            )
 
         # Extract response data
         content_text = ""
+        tool_calls = []
         for content_block in response.content:
             if content_block.type == "text":
                 content_text += content_block.text
+            elif content_block.type == "tool_use":
+                tool_calls.append(
+                    LLMToolCall.parse(content_block.id, content_block.name, content_block.input)
+                )
 
-        return LLMResponse(
+        result = LLMResponse(
             content=content_text,
             model=response.model,
             provider=LLMProvider.ANTHROPIC.value,
@@ -120,7 +208,10 @@ class AnthropicClient(LLMClient):
             else None,
             finish_reason=response.stop_reason,
             metadata={"id": response.id},
+            tool_calls=tool_calls or None,
         )
+        self._record_usage(result.usage)
+        return result
 
     async def stream_chat(
         self,
@@ -163,9 +254,15 @@ class AnthropicClient(LLMClient):
         # Override with kwargs
         params.update(kwargs)
 
-        async with self._client.messages.stream(**params) as stream:
-            async for event in stream:
-                if event.type == "content_block_delta":
-                    if event.delta.type == "text":
+        async with self._request_scope("stream_chat"):
+            # Opened through _send so that failures to open the stream (e.g. 429)
+            # are retried and reported to the limiter, like other requests
+            stream = await self._send(
+                lambda timeout: self._client_for(timeout).messages.create(**params)
+            )
+            try:
+                async for event in self._iter_with_deadline(stream):
+                    if event.type == "content_block_delta" and event.delta.type == "text_delta":
                         yield event.delta.text
-
+            finally:
+                await stream.close()
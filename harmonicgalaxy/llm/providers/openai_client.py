@@ -1,8 +1,16 @@
 """OpenAI client implementation."""
 
+import json
 from typing import List, Optional, Dict, Any, AsyncIterator
 from harmonicgalaxy.llm.client import LLMClient
-from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMConfig, LLMProvider
+from harmonicgalaxy.llm.types import (
+    LLMMessage,
+    LLMResponse,
+    LLMConfig,
+    LLMProvider,
+    LLMToolCall,
+    LLMToolDefinition,
+)
 
 
 class OpenAIClient(LLMClient):
@@ -34,6 +42,70 @@ class OpenAIClient(LLMClient):
             max_retries=config.max_retries,
         )
 
+    def _client_for(self, timeout: Optional[float]):
+        """Return the SDK client to use for a request with the given timeout.
+
+        Args:
+            timeout: Per-request timeout from the deadline, or None for defaults
+        """
+        if timeout is None and self._limiter() is None:
+            return self._client
+        # Under a deadline or an adaptive limiter, retries are handled by
+        # LLMClient._send, so that the limiter sees every rate-limited attempt
+        if timeout is None:
+            return self._client.with_options(max_retries=0)
+        return self._client.with_options(timeout=timeout, max_retries=0)
+
+    def _convert_messages(self, messages: List[LLMMessage]) -> List[Dict[str, Any]]:
+        """Convert LLMMessage format to OpenAI format.
+
+        Args:
+            messages: List of LLMMessage objects
+
+        Returns:
+            List of messages in OpenAI format
+        """
+        openai_messages = []
+        for msg in messages:
+            if msg.role == "tool":
+                openai_messages.append(
+                    {"role": "tool", "tool_call_id": msg.tool_call_id, "content": msg.content}
+                )
+            elif msg.tool_calls:
+                openai_messages.append(
+                    {
+                        "role": "assistant",
+                        "content": msg.content or None,
+                        "tool_calls": [
+                            {
+                                "id": call.id,
+                                "type": "function",
+                                "function": {
+                                    "name": call.name,
+                                    "arguments": json.dumps(call.arguments),
+                                },
+                            }
+                            for call in msg.tool_calls
+                        ],
+                    }
+                )
+            else:
+                openai_messages.append(msg.to_dict())
+        return openai_messages
+
+    @staticmethod
+    def _convert_tools(tools: List[Any]) -> List[Dict[str, Any]]:
+        """Convert tool definitions to OpenAI function tools.
+
+        Plain dictionaries are assumed to be in OpenAI format already.
+        """
+        return [
+            {"type": "function", "function": tool.to_dict()}
+            if isinstance(tool, LLMToolDefinition)
+            else tool
+            for tool in tools
+        ]
+
     async def chat(
         self,
         messages: List[LLMMessage],
@@ -43,18 +115,23 @@ class OpenAIClient(LLMClient):
 
         Args:
             messages: List of messages in the conversation
-            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+            **kwargs: Additional parameters (temperature, max_tokens, tools, etc.)
 
         Returns:
             LLMResponse object containing the response
         """
+        tools = kwargs.pop("tools", None)
+
         # Merge config parameters with kwargs
         params: Dict[str, Any] = {
             "model": self.config.model,
-            "messages": [msg.to_dict() for msg in messages],
+            "messages": self._convert_messages(messages),
             "temperature": kwargs.get("temperature", self.config.temperature),
         }
 
+        if tools:
+            params["tools"] = self._convert_tools(tools)
+
         if self.config.max_tokens:
             params["max_tokens"] = kwargs.get("max_tokens", self.config.max_tokens)
         if self.config.top_p:
@@ -77,13 +154,20 @@ class OpenAIClient(LLMClient):
         # Override with kwargs
         params.update(kwargs)
 
-        response = await self._client.chat.completions.create(**params)
+        async with self._request_scope("chat"):
+            response = await self._send(
+                lambda timeout: self._client_for(timeout).chat.completions.create(**params)
+            )
 
         # Extract response data
         choice = response.choices[0]
         message = choice.message
+        tool_calls = [
+            LLMToolCall.parse(call.id, call.function.name, call.function.arguments)
+            for call in (message.tool_calls or [])
+        ]
 
-        return LLMResponse(
+        result = LLMResponse(
             content=message.content or "",
             model=response.model,
             provider=LLMProvider.OPENAI.value,
@@ -96,7 +180,10 @@ class OpenAIClient(LLMClient):
             else None,
             finish_reason=choice.finish_reason,
             metadata={"id": response.id, "created": response.created},
+            tool_calls=tool_calls or None,
         )
+        self._record_usage(result.usage)
+        return result
 
     async def stream_chat(
         self,
@@ -115,7 +202,7 @@ class OpenAIClient(LLMClient):
         # Merge config parameters with kwargs
         params: Dict[str, Any] = {
             "model": self.config.model,
-            "messages": [msg.to_dict() for msg in messages],
+            "messages": self._convert_messages(messages),
             "stream": True,
             "temperature": kwargs.get("temperature", self.config.temperature),
         }
@@ -134,9 +221,12 @@ class OpenAIClient(LLMClient):
         # Override with kwargs
         params.update(kwargs)
 
-        stream = await self._client.chat.completions.create(**params)
+        async with self._request_scope("stream_chat"):
+            stream = await self._send(
+                lambda timeout: self._client_for(timeout).chat.completions.create(**params)
+            )
 
-        async for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+            async for chunk in self._iter_with_deadline(stream):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
@@ -1,8 +1,27 @@
 """Qwen (通义千问) client implementation via DashScope API."""
 
+import asyncio
+import functools
+import json
 from typing import List, Optional, Dict, Any, AsyncIterator
 from harmonicgalaxy.llm.client import LLMClient
-from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMConfig, LLMProvider
+from harmonicgalaxy.llm.types import (
+    LLMMessage,
+    LLMResponse,
+    LLMConfig,
+    LLMProvider,
+    LLMToolCall,
+    LLMToolDefinition,
+)
+
+
+class QwenAPIError(RuntimeError):
+    """Error status returned by the DashScope API."""
+
+    def __init__(self, status_code: Any, message: Optional[str] = None):
+        super().__init__(f"Qwen API error: {status_code} - {message}")
+        self.status_code = status_code
+        self.message = message
 
 
 class QwenClient(LLMClient):
@@ -49,6 +68,34 @@ class QwenClient(LLMClient):
         for msg in messages:
             if msg.role == "system":
                 system_message = msg.content
+            elif msg.role == "tool":
+                dashscope_messages.append(
+                    {
+                        "role": "tool",
+                        "content": msg.content,
+                        "name": msg.name or "",
+                        "tool_call_id": msg.tool_call_id,
+                    }
+                )
+            elif msg.tool_calls:
+                # DashScope follows the OpenAI function-calling message layout
+                dashscope_messages.append(
+                    {
+                        "role": "assistant",
+                        "content": msg.content,
+                        "tool_calls": [
+                            {
+                                "id": call.id,
+                                "type": "function",
+                                "function": {
+                                    "name": call.name,
+                                    "arguments": json.dumps(call.arguments),
+                                },
+                            }
+                            for call in msg.tool_calls
+                        ],
+                    }
+                )
             else:
                 # DashScope uses "user" and "assistant" roles
                 dashscope_messages.append(
@@ -60,6 +107,40 @@ class QwenClient(LLMClient):
 
         return dashscope_messages, system_message
 
+    @staticmethod
+    def _convert_tools(tools: List[Any]) -> List[Dict[str, Any]]:
+        """Convert tool definitions to DashScope function tools.
+
+        Plain dictionaries are assumed to be in DashScope format already.
+        """
+        return [
+            {"type": "function", "function": tool.to_dict()}
+            if isinstance(tool, LLMToolDefinition)
+            else tool
+            for tool in tools
+        ]
+
+    @staticmethod
+    def _extract_tool_calls(message: Any) -> List[LLMToolCall]:
+        """Extract tool calls from a DashScope response message."""
+        raw_calls = None
+        if isinstance(message, dict):
+            raw_calls = message.get("tool_calls")
+        else:
+            raw_calls = getattr(message, "tool_calls", None)
+
+        tool_calls = []
+        for index, call in enumerate(raw_calls or []):
+            function = call.get("function") or {}
+            tool_calls.append(
+                LLMToolCall.parse(
+                    call.get("id") or f"call_{index}",
+                    function.get("name", ""),
+                    function.get("arguments"),
+                )
+            )
+        return tool_calls
+
     async def chat(
         self,
         messages: List[LLMMessage],
@@ -69,11 +150,12 @@ class QwenClient(LLMClient):
 
         Args:
             messages: List of messages in the conversation
-            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+            **kwargs: Additional parameters (temperature, max_tokens, tools, etc.)
 
         Returns:
             LLMResponse object containing the response
         """
+        tools = kwargs.pop("tools", None)
         dashscope_messages, system_message = self._convert_messages(messages)
 
         # Merge config parameters with kwargs
@@ -86,6 +168,11 @@ class QwenClient(LLMClient):
         if system_message:
             params["system"] = system_message
 
+        if tools:
+            params["tools"] = self._convert_tools(tools)
+            # Tool calls are only reported with the message result format
+            params["result_format"] = "message"
+
         if self.config.max_tokens:
             params["max_tokens"] = kwargs.get("max_tokens", self.config.max_tokens)
         if self.config.top_p:
@@ -102,17 +189,21 @@ class QwenClient(LLMClient):
 
         # Use DashScope API
         # Note: DashScope Generation.call is synchronous, but we wrap it in async
-        import asyncio
         from dashscope import Generation
 
-        # Run synchronous call in executor to make it async-friendly
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, Generation.call, **params)
+        loop = asyncio.get_running_loop()
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"Qwen API error: {response.status_code} - {response.message}"
+        async def _attempt(timeout: Optional[float]):
+            """Run one synchronous call in the executor (timeout enforced by _send)."""
+            response = await loop.run_in_executor(
+                None, functools.partial(Generation.call, **params)
             )
+            if response.status_code != 200:
+                raise QwenAPIError(response.status_code, response.message)
+            return response
+
+        async with self._request_scope("chat"):
+            response = await self._send(_attempt)
 
         # Extract response data
         output = response.output
@@ -120,9 +211,10 @@ class QwenClient(LLMClient):
             raise RuntimeError("No response from Qwen API")
 
         choice = output.choices[0]
-        content = choice.message.content if choice.message else ""
+        content = (choice.message.content or "") if choice.message else ""
+        tool_calls = self._extract_tool_calls(choice.message) if choice.message else []
 
-        return LLMResponse(
+        result = LLMResponse(
             content=content,
             model=output.model or self.config.model,
             provider=LLMProvider.QWEN.value,
@@ -142,7 +234,10 @@ class QwenClient(LLMClient):
                 "request_id": response.request_id,
                 "status_code": response.status_code,
             },
+            tool_calls=tool_calls or None,
         )
+        self._record_usage(result.usage)
+        return result
 
     async def stream_chat(
         self,
@@ -186,20 +281,24 @@ class QwenClient(LLMClient):
         params.update(kwargs)
 
         # Use DashScope API with streaming
-        import asyncio
         from dashscope import Generation
 
         # DashScope streaming: Generation.call returns an iterator when stream=True
         # We need to run it in executor since it's synchronous
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         def _get_stream():
             """Get the stream iterator."""
             response_stream = Generation.call(**params)
             return response_stream
 
-        # Get the stream iterator in executor
-        response_stream = await loop.run_in_executor(None, _get_stream)
+        async def _chunks():
+            """Pull chunks from the synchronous stream in the executor."""
+            while True:
+                chunk = await loop.run_in_executor(None, next, response_stream, None)
+                if chunk is None:
+                    return
+                yield chunk
 
         # Process chunks asynchronously
         def _process_chunk(chunk):
@@ -211,30 +310,26 @@ class QwenClient(LLMClient):
                         return choice.message.content
             return None
 
-        # Iterate through stream chunks
-        while True:
+        async with self._request_scope("stream_chat"):
+            # Get the stream iterator in executor
+            response_stream = await self._send(
+                lambda timeout: loop.run_in_executor(None, _get_stream)
+            )
+
+            # Iterate through stream chunks
             try:
-                # Get next chunk in executor
-                chunk = await loop.run_in_executor(
-                    None, lambda: next(response_stream, None)
-                )
-                if chunk is None:
-                    break
-
-                content = _process_chunk(chunk)
-                if content:
-                    yield content
-
-                # Check if stream is done
-                if hasattr(chunk, "output") and chunk.output:
-                    if hasattr(chunk.output, "finish_reason"):
-                        if chunk.output.finish_reason:
-                            break
-            except StopIteration:
-                break
+                async for chunk in self._iter_with_deadline(_chunks()):
+                    content = _process_chunk(chunk)
+                    if content:
+                        yield content
+
+                    # Check if stream is done
+                    if hasattr(chunk, "output") and chunk.output:
+                        if hasattr(chunk.output, "finish_reason"):
+                            if chunk.output.finish_reason:
+                                break
             except Exception as e:
                 # Handle errors
                 if hasattr(e, "status_code") and e.status_code != 200:
-                    raise RuntimeError(f"Qwen API error: {e.status_code} - {e.message}")
+                    raise QwenAPIError(e.status_code, getattr(e, "message", None))
                 raise
-
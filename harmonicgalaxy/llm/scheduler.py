@@ -0,0 +1,328 @@
+"""Priority-aware scheduling of LLM requests.
+
+A :class:`LLMScheduler` sits in front of every ``LLMClient`` for one
+provider/model and decides which waiting request is sent next:
+
+- Priority classes are served strictly in order (interactive before default
+  before batch), subject to a per-class concurrency cap so that a class can
+  never occupy every slot.
+- Within a class, tenants (missions, users, ...) share capacity through
+  weighted fair queuing: each request gets a virtual finish tag and the
+  smallest tag goes first, so a tenant with a deep backlog cannot starve
+  the others.
+- Time spent waiting in the queue is measured separately from the time spent
+  at the provider.
+
+Schedulers are opt-in and registered per provider/model:
+
+Example:
+    >>> configure_scheduler(
+    ...     LLMProvider.OPENAI, "gpt-4", max_concurrency=32,
+    ...     class_limits={RequestPriority.BATCH: 8},
+    ... )
+    >>> with request_context(priority=RequestPriority.BATCH, tenant="mission-42"):
+    ...     response = await client.chat(messages)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+from harmonicgalaxy.llm.types import LLMProvider
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority classes for LLM requests (lower value is served first)."""
+
+    INTERACTIVE = 0
+    DEFAULT = 1
+    BATCH = 2
+
+
+DEFAULT_TENANT = "default"
+
+_request_context: ContextVar[Tuple[RequestPriority, str]] = ContextVar(
+    "harmonicgalaxy_llm_request_context",
+    default=(RequestPriority.DEFAULT, DEFAULT_TENANT),
+)
+
+
+@contextmanager
+def request_context(
+    priority: Optional[RequestPriority] = None,
+    tenant: Optional[str] = None,
+) -> Iterator[None]:
+    """Set the priority class and tenant of LLM requests made in this context.
+
+    Args:
+        priority: Priority class (inherits the enclosing context if None)
+        tenant: Tenant used for fair queuing, e.g. a mission ID (inherits if None)
+    """
+    current_priority, current_tenant = _request_context.get()
+    token = _request_context.set(
+        (
+            priority if priority is not None else current_priority,
+            tenant if tenant is not None else current_tenant,
+        )
+    )
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def current_request_context() -> Tuple[RequestPriority, str]:
+    """Return the (priority, tenant) of the current context."""
+    return _request_context.get()
+
+
+@dataclass
+class _Ticket:
+    """A request waiting for, or holding, a scheduler slot."""
+
+    priority: RequestPriority
+    tenant: str
+    future: "asyncio.Future[None]"
+    enqueued_at: float
+    dispatched_at: Optional[float] = None
+
+
+@dataclass
+class _ClassStats:
+    """Counters for one priority class."""
+
+    in_flight: int = 0
+    completed: int = 0
+    total_queue_wait: float = 0.0
+    max_queue_wait: float = 0.0
+    total_service_time: float = 0.0
+
+
+@dataclass
+class _ClassQueue:
+    """Weighted fair queue for one priority class."""
+
+    heap: List[Tuple[float, int, _Ticket]] = field(default_factory=list)
+    virtual_time: float = 0.0
+    last_finish: Dict[str, float] = field(default_factory=dict)
+    stats: _ClassStats = field(default_factory=_ClassStats)
+
+
+class LLMScheduler:
+    """Schedules LLM requests by priority class and tenant weight.
+
+    The scheduler is bound to the event loop it is first used from.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        class_limits: Optional[Dict[RequestPriority, int]] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            max_concurrency: Maximum requests in flight across all classes
+            class_limits: Per-class in-flight caps (default: ``max_concurrency``)
+            tenant_weights: Relative share of each tenant within a class (default 1.0)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.class_limits: Dict[RequestPriority, int] = {
+            priority: max_concurrency for priority in RequestPriority
+        }
+        self.class_limits.update(class_limits or {})
+        self.tenant_weights = dict(tenant_weights or {})
+
+        self._queues = {priority: _ClassQueue() for priority in RequestPriority}
+        self._in_flight = 0
+        self._sequence = itertools.count()
+
+    def set_tenant_weight(self, tenant: str, weight: float) -> None:
+        """Set the fair-queuing weight of a tenant."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.tenant_weights[tenant] = weight
+
+    async def acquire(
+        self,
+        priority: RequestPriority = RequestPriority.DEFAULT,
+        tenant: str = DEFAULT_TENANT,
+    ) -> _Ticket:
+        """Wait for a slot.
+
+        Returns:
+            Ticket to hand back to :meth:`release`
+        """
+        loop = asyncio.get_running_loop()
+        ticket = _Ticket(
+            priority=priority,
+            tenant=tenant,
+            future=loop.create_future(),
+            enqueued_at=time.monotonic(),
+        )
+
+        queue = self._queues[priority]
+        weight = self.tenant_weights.get(tenant, 1.0)
+        start = max(queue.virtual_time, queue.last_finish.get(tenant, 0.0))
+        finish = start + 1.0 / weight
+        queue.last_finish[tenant] = finish
+        heapq.heappush(queue.heap, (finish, next(self._sequence), ticket))
+
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.dispatched_at is not None:
+                # Slot was granted while we were being cancelled; give it back
+                self.release(ticket)
+            # Otherwise the ticket is skipped lazily when it reaches the heap top
+            raise
+        return ticket
+
+    def release(self, ticket: _Ticket) -> None:
+        """Release the slot held by ``ticket``."""
+        stats = self._queues[ticket.priority].stats
+        stats.in_flight -= 1
+        stats.completed += 1
+        if ticket.dispatched_at is not None:
+            stats.total_service_time += time.monotonic() - ticket.dispatched_at
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[RequestPriority] = None,
+        tenant: Optional[str] = None,
+    ) -> AsyncIterator[_Ticket]:
+        """Hold a slot for the duration of the block.
+
+        Priority and tenant default to the current :func:`request_context`.
+        """
+        context_priority, context_tenant = _request_context.get()
+        ticket = await self.acquire(
+            priority if priority is not None else context_priority,
+            tenant if tenant is not None else context_tenant,
+        )
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def _dispatch(self) -> None:
+        """Grant free slots to the best waiting requests."""
+        while self._in_flight < self.max_concurrency:
+            for priority in RequestPriority:
+                queue = self._queues[priority]
+                if queue.stats.in_flight >= self.class_limits[priority]:
+                    continue
+                ticket = self._pop(queue)
+                if ticket is not None:
+                    break
+            else:
+                return
+
+            now = time.monotonic()
+            wait = now - ticket.enqueued_at
+            ticket.dispatched_at = now
+            queue.stats.in_flight += 1
+            queue.stats.total_queue_wait += wait
+            queue.stats.max_queue_wait = max(queue.stats.max_queue_wait, wait)
+            self._in_flight += 1
+            ticket.future.set_result(None)
+
+    @staticmethod
+    def _pop(queue: _ClassQueue) -> Optional[_Ticket]:
+        """Pop the waiting ticket with the smallest finish tag, skipping cancelled ones."""
+        while queue.heap:
+            finish, _, ticket = heapq.heappop(queue.heap)
+            if ticket.future.done():
+                continue
+            queue.virtual_time = max(queue.virtual_time, finish)
+            return ticket
+        # Every tenant of the class is idle; their finish tags no longer matter
+        queue.last_finish.clear()
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue and latency statistics.
+
+        Queue wait (time before a slot was granted) and service time (time
+        the slot was held, i.e. provider latency) are reported separately.
+        """
+        classes: Dict[str, Any] = {}
+        for priority, queue in self._queues.items():
+            stats = queue.stats
+            dispatched = stats.completed + stats.in_flight
+            classes[priority.name.lower()] = {
+                "queued": sum(1 for _, _, t in queue.heap if not t.future.done()),
+                "in_flight": stats.in_flight,
+                "completed": stats.completed,
+                "avg_queue_wait": stats.total_queue_wait / dispatched if dispatched else 0.0,
+                "max_queue_wait": stats.max_queue_wait,
+                "avg_service_time": (
+                    stats.total_service_time / stats.completed if stats.completed else 0.0
+                ),
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "classes": classes,
+        }
+
+
+_schedulers: Dict[Tuple[str, Optional[str]], LLMScheduler] = {}
+
+
+def _provider_key(provider: Union[LLMProvider, str]) -> str:
+    return provider.value if isinstance(provider, LLMProvider) else provider
+
+
+def configure_scheduler(
+    provider: Union[LLMProvider, str],
+    model: Optional[str] = None,
+    **kwargs,
+) -> LLMScheduler:
+    """Create and register the scheduler for a provider/model.
+
+    Args:
+        provider: LLM provider
+        model: Model name, or None to cover every model of the provider
+            without a more specific scheduler
+        **kwargs: Arguments for :class:`LLMScheduler`
+
+    Returns:
+        The registered scheduler
+    """
+    scheduler = LLMScheduler(**kwargs)
+    _schedulers[(_provider_key(provider), model)] = scheduler
+    logger.info(
+        f"LLM scheduler configured: provider={_provider_key(provider)}, "
+        f"model={model or '*'}, max_concurrency={scheduler.max_concurrency}"
+    )
+    return scheduler
+
+
+def get_scheduler(provider: Union[LLMProvider, str], model: str) -> Optional[LLMScheduler]:
+    """Return the scheduler for a provider/model, if one is configured."""
+    if not _schedulers:
+        return None
+    key = _provider_key(provider)
+    return _schedulers.get((key, model)) or _schedulers.get((key, None))
+
+
+def remove_scheduler(provider: Union[LLMProvider, str], model: Optional[str] = None) -> None:
+    """Unregister the scheduler for a provider/model."""
+    _schedulers.pop((_provider_key(provider), model), None)
@@ -0,0 +1,64 @@
+"""Bulk JSON serialization for LLM messages and responses.
+
+Uses ``orjson`` when it is installed (``pip install harmonicgalaxy[fast]``) and
+falls back to the standard library ``json`` module otherwise. Both paths
+produce compact UTF-8 encoded bytes.
+"""
+
+import json
+from typing import Any, Iterable, List, Union
+
+from harmonicgalaxy.llm.types import FrozenLLMMessage, FrozenLLMResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize a JSON-compatible object to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_messages(messages: Iterable[Any]) -> bytes:
+    """Serialize messages (LLMMessage or FrozenLLMMessage) to a JSON array.
+
+    Args:
+        messages: Messages to serialize
+
+    Returns:
+        JSON array encoded as bytes
+    """
+    return dumps([message.to_dict() for message in messages])
+
+
+def load_messages(data: Union[bytes, str]) -> List[FrozenLLMMessage]:
+    """Deserialize a JSON array of messages into FrozenLLMMessage objects.
+
+    Args:
+        data: JSON produced by :func:`dump_messages`
+
+    Returns:
+        List of FrozenLLMMessage objects
+    """
+    return [FrozenLLMMessage.from_dict(item) for item in loads(data)]
+
+
+def dump_responses(responses: Iterable[Any]) -> bytes:
+    """Serialize responses (LLMResponse or FrozenLLMResponse) to a JSON array."""
+    return dumps([response.to_dict() for response in responses])
+
+
+def load_responses(data: Union[bytes, str]) -> List[FrozenLLMResponse]:
+    """Deserialize a JSON array of responses into FrozenLLMResponse objects."""
+    return [FrozenLLMResponse.from_dict(item) for item in loads(data)]
@@ -0,0 +1,219 @@
+"""Tool registration and parallel tool execution for LLM function calling."""
+
+import asyncio
+import functools
+import inspect
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from harmonicgalaxy.llm.client import LLMClient
+from harmonicgalaxy.llm.types import LLMMessage, LLMResponse, LLMToolCall, LLMToolDefinition
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Tool:
+    """A callable registered with a ToolExecutor."""
+
+    definition: LLMToolDefinition
+    func: Callable[..., Any]
+    timeout: Optional[float] = None
+
+    @property
+    def is_async(self) -> bool:
+        """Whether the tool function is a coroutine function."""
+        return inspect.iscoroutinefunction(self.func)
+
+
+class ToolExecutor:
+    """Runs the tool calls requested by a model.
+
+    All tool calls returned in a single model turn are independent by
+    construction, so they are executed concurrently, each under its own
+    timeout. Their results are then sent back to the model together in one
+    follow-up request.
+
+    Example:
+        >>> executor = ToolExecutor(default_timeout=10.0)
+        >>> @executor.tool(description="Look up the weather for a city")
+        ... async def get_weather(city: str) -> str:
+        ...     return "sunny"
+        >>> response = await executor.run(client, messages)
+    """
+
+    def __init__(self, default_timeout: Optional[float] = 30.0):
+        """Initialize tool executor.
+
+        Args:
+            default_timeout: Timeout in seconds applied to tools registered
+                without their own timeout. None disables the timeout.
+        """
+        self.default_timeout = default_timeout
+        self._tools: Dict[str, Tool] = {}
+
+    def register(
+        self,
+        func: Callable[..., Any],
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Tool:
+        """Register a callable as a tool.
+
+        Args:
+            func: Sync or async callable invoked with the call's arguments as kwargs.
+                Sync callables run in the default thread pool executor.
+            name: Tool name exposed to the model (defaults to the function name)
+            description: Tool description (defaults to the first docstring line)
+            parameters: JSON schema of the arguments
+            timeout: Per-tool timeout in seconds (defaults to ``default_timeout``)
+
+        Returns:
+            The registered Tool
+        """
+        tool_name = name or func.__name__
+        if description is None:
+            doc = inspect.getdoc(func) or ""
+            description = doc.splitlines()[0] if doc else ""
+
+        tool = Tool(
+            definition=LLMToolDefinition(
+                name=tool_name,
+                description=description,
+                parameters=parameters,
+            ),
+            func=func,
+            timeout=timeout if timeout is not None else self.default_timeout,
+        )
+        self._tools[tool_name] = tool
+        logger.debug(f"Registered tool '{tool_name}'")
+        return tool
+
+    def tool(
+        self,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of :meth:`register`."""
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.register(
+                func, name=name, description=description, parameters=parameters, timeout=timeout
+            )
+            return func
+
+        return decorator
+
+    @property
+    def definitions(self) -> List[LLMToolDefinition]:
+        """Definitions of all registered tools, to pass as ``tools=`` to ``chat``."""
+        return [tool.definition for tool in self._tools.values()]
+
+    async def execute(self, tool_calls: List[LLMToolCall]) -> List[LLMMessage]:
+        """Execute tool calls concurrently.
+
+        Failures, unknown tools and timeouts do not raise; they are reported
+        back as error tool results so the model can react to them.
+
+        Args:
+            tool_calls: Tool calls returned by the model in one turn
+
+        Returns:
+            Tool result messages, in the same order as ``tool_calls``
+        """
+        return list(await asyncio.gather(*(self._execute_one(call) for call in tool_calls)))
+
+    async def _execute_one(self, call: LLMToolCall) -> LLMMessage:
+        """Execute a single tool call and wrap its outcome in a tool message."""
+        tool = self._tools.get(call.name)
+        if tool is None:
+            logger.warning(f"Model requested unknown tool '{call.name}'")
+            return LLMMessage.tool_result(
+                call.id, f"Error: unknown tool '{call.name}'", name=call.name, is_error=True
+            )
+        if "_raw" in call.arguments:
+            return LLMMessage.tool_result(
+                call.id,
+                f"Error: arguments are not valid JSON: {call.arguments['_raw']}",
+                name=call.name,
+                is_error=True,
+            )
+
+        try:
+            if tool.is_async:
+                awaitable = tool.func(**call.arguments)
+            else:
+                loop = asyncio.get_running_loop()
+                awaitable = loop.run_in_executor(
+                    None, functools.partial(tool.func, **call.arguments)
+                )
+            result = await asyncio.wait_for(awaitable, timeout=tool.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Tool '{call.name}' timed out after {tool.timeout}s")
+            return LLMMessage.tool_result(
+                call.id,
+                f"Error: tool '{call.name}' timed out after {tool.timeout}s",
+                name=call.name,
+                is_error=True,
+            )
+        except Exception as e:
+            logger.warning(f"Tool '{call.name}' failed: {e}")
+            return LLMMessage.tool_result(
+                call.id, f"Error: {type(e).__name__}: {e}", name=call.name, is_error=True
+            )
+
+        return LLMMessage.tool_result(call.id, self._serialize(result), name=call.name)
+
+    @staticmethod
+    def _serialize(result: Any) -> str:
+        """Serialize a tool result to the text sent back to the model."""
+        if isinstance(result, str):
+            return result
+        return json.dumps(result, default=str, ensure_ascii=False)
+
+    async def run(
+        self,
+        client: LLMClient,
+        messages: List[LLMMessage],
+        max_rounds: int = 8,
+        **kwargs,
+    ) -> LLMResponse:
+        """Run a chat conversation, resolving tool calls until the model answers.
+
+        Each round sends one request; all tool calls the model returns in
+        that round are executed concurrently and their results are sent back
+        together in the next request.
+
+        Args:
+            client: LLM client to use
+            messages: Conversation so far. It is extended in place with the
+                assistant tool-call turns and tool results.
+            max_rounds: Maximum number of tool-call rounds
+            **kwargs: Additional parameters passed to ``client.chat``
+
+        Returns:
+            The first response without tool calls
+
+        Raises:
+            RuntimeError: If the model still requests tools after ``max_rounds``
+        """
+        for round_index in range(max_rounds + 1):
+            response = await client.chat(messages, tools=self.definitions, **kwargs)
+            if not response.tool_calls:
+                return response
+            if round_index == max_rounds:
+                break
+
+            logger.debug(
+                f"Round {round_index + 1}: executing {len(response.tool_calls)} tool call(s)"
+            )
+            messages.append(response.to_message())
+            messages.extend(await self.execute(response.tool_calls))
+
+        raise RuntimeError(f"Model still requested tools after {max_rounds} rounds")
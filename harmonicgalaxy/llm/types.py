@@ -1,7 +1,9 @@
 """Type definitions for LLM client."""
 
-from typing import Optional, List, Dict, Any, Literal
-from dataclasses import dataclass
+import json
+import sys
+from typing import Optional, List, Dict, Any, Literal, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -16,14 +18,67 @@ class LLMProvider(str, Enum):
     # COHERE = "cohere"
 
 
+@dataclass
+class LLMToolDefinition:
+    """Describes a tool (function) the model is allowed to call."""
+
+    name: str
+    description: str = ""
+    parameters: Optional[Dict[str, Any]] = None  # JSON schema of the arguments
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert tool definition to dictionary format."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": self.parameters or {"type": "object", "properties": {}},
+        }
+
+
+@dataclass
+class LLMToolCall:
+    """Represents a tool invocation requested by the model."""
+
+    id: str
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert tool call to dictionary format."""
+        return {"id": self.id, "name": self.name, "arguments": self.arguments}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LLMToolCall":
+        """Create tool call from dictionary."""
+        return cls(id=data["id"], name=data["name"], arguments=data.get("arguments") or {})
+
+    @classmethod
+    def parse(
+        cls, id: str, name: str, arguments: Union[str, Dict[str, Any], None]
+    ) -> "LLMToolCall":
+        """Create tool call from provider output, decoding JSON-encoded arguments.
+
+        Arguments that are not valid JSON are kept under the ``_raw`` key so the
+        tool executor can report the problem back to the model.
+        """
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments) if arguments else {}
+            except json.JSONDecodeError:
+                arguments = {"_raw": arguments}
+        return cls(id=id, name=name, arguments=arguments or {})
+
+
 @dataclass
 class LLMMessage:
     """Represents a message in a conversation."""
 
-    role: Literal["system", "user", "assistant"]
+    role: Literal["system", "user", "assistant", "tool"]
     content: str
     name: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    tool_calls: Optional[List[LLMToolCall]] = None  # assistant messages only
+    tool_call_id: Optional[str] = None  # tool messages only
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary format."""
@@ -35,16 +90,40 @@ class LLMMessage:
             result["name"] = self.name
         if self.metadata:
             result["metadata"] = self.metadata
+        if self.tool_calls:
+            result["tool_calls"] = [call.to_dict() for call in self.tool_calls]
+        if self.tool_call_id:
+            result["tool_call_id"] = self.tool_call_id
         return result
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LLMMessage":
         """Create message from dictionary."""
+        tool_calls = data.get("tool_calls")
         return cls(
             role=data["role"],
             content=data["content"],
             name=data.get("name"),
             metadata=data.get("metadata"),
+            tool_calls=[LLMToolCall.from_dict(call) for call in tool_calls] if tool_calls else None,
+            tool_call_id=data.get("tool_call_id"),
+        )
+
+    @classmethod
+    def tool_result(
+        cls,
+        tool_call_id: str,
+        content: str,
+        name: Optional[str] = None,
+        is_error: bool = False,
+    ) -> "LLMMessage":
+        """Create a tool message carrying the result of a tool call."""
+        return cls(
+            role="tool",
+            content=content,
+            name=name,
+            metadata={"is_error": True} if is_error else None,
+            tool_call_id=tool_call_id,
         )
 
 
@@ -58,6 +137,7 @@ class LLMResponse:
     usage: Optional[Dict[str, Any]] = None
     finish_reason: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    tool_calls: Optional[List[LLMToolCall]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert response to dictionary format."""
@@ -72,8 +152,18 @@ class LLMResponse:
             result["finish_reason"] = self.finish_reason
         if self.metadata:
             result["metadata"] = self.metadata
+        if self.tool_calls:
+            result["tool_calls"] = [call.to_dict() for call in self.tool_calls]
         return result
 
+    def to_message(self) -> LLMMessage:
+        """Convert response to an assistant message for the conversation history."""
+        return LLMMessage(
+            role="assistant",
+            content=self.content,
+            tool_calls=list(self.tool_calls) if self.tool_calls else None,
+        )
+
 
 @dataclass
 class LLMConfig:
@@ -121,3 +211,238 @@ class LLMConfig:
             result["extra_params"] = self.extra_params
         return result
 
+
+
+# ---------------------------------------------------------------------------
+# Compact immutable variants
+#
+# The frozen types below mirror LLMMessage, LLMResponse and LLMConfig with
+# ``__slots__`` (no per-instance ``__dict__``) and are hashable. They expose the
+# same attributes and ``to_dict`` as the mutable classes, so every provider
+# accepts them interchangeably. Mapping-valued fields (metadata, usage, tool
+# call arguments) take no part in hashing; they must not be mutated after
+# construction.
+# ---------------------------------------------------------------------------
+
+# Role strings are few and repeated millions of times; map every incoming role
+# to one canonical interned instance.
+_INTERNED_ROLES = {role: sys.intern(role) for role in ("system", "user", "assistant", "tool")}
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenLLMMessage:
+    """Immutable, slotted message. Role strings are interned."""
+
+    role: str
+    content: str
+    name: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    tool_calls: Optional[Tuple[LLMToolCall, ...]] = field(default=None, hash=False)
+    tool_call_id: Optional[str] = None
+    # to_dict() result, built once on first use
+    _dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False, hash=False
+    )
+
+    def __post_init__(self) -> None:
+        role = _INTERNED_ROLES.get(self.role)
+        if role is None:
+            raise ValueError(f"Invalid role: {self.role}")
+        if role is not self.role:
+            object.__setattr__(self, "role", role)
+        if self.tool_calls is not None and not isinstance(self.tool_calls, tuple):
+            object.__setattr__(self, "tool_calls", tuple(self.tool_calls))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert message to dictionary format.
+
+        The dictionary is cached on the instance and must not be mutated.
+        """
+        if self._dict is None:
+            result: Dict[str, Any] = {
+                "role": self.role,
+                "content": self.content,
+            }
+            if self.name:
+                result["name"] = self.name
+            if self.metadata:
+                result["metadata"] = self.metadata
+            if self.tool_calls:
+                result["tool_calls"] = [call.to_dict() for call in self.tool_calls]
+            if self.tool_call_id:
+                result["tool_call_id"] = self.tool_call_id
+            object.__setattr__(self, "_dict", result)
+        return self._dict  # type: ignore[return-value]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FrozenLLMMessage":
+        """Create message from dictionary.
+
+        This is the bulk deserialization path, so it fills the slots directly
+        instead of going through the frozen ``__init__``.
+        """
+        role = _INTERNED_ROLES.get(data["role"])
+        if role is None:
+            raise ValueError(f"Invalid role: {data['role']}")
+        tool_calls = data.get("tool_calls")
+
+        message = object.__new__(cls)
+        set_role, set_content, set_name, set_metadata, set_calls, set_call_id, set_dict = (
+            _FROZEN_MESSAGE_SETTERS
+        )
+        set_role(message, role)
+        set_content(message, data["content"])
+        set_name(message, data.get("name"))
+        set_metadata(message, data.get("metadata"))
+        set_calls(
+            message,
+            tuple(LLMToolCall.from_dict(call) for call in tool_calls) if tool_calls else None,
+        )
+        set_call_id(message, data.get("tool_call_id"))
+        set_dict(message, None)
+        return message
+
+    @classmethod
+    def from_message(cls, message: LLMMessage) -> "FrozenLLMMessage":
+        """Create an immutable copy of an LLMMessage."""
+        return cls(
+            role=message.role,
+            content=message.content,
+            name=message.name,
+            metadata=message.metadata,
+            tool_calls=tuple(message.tool_calls) if message.tool_calls else None,
+            tool_call_id=message.tool_call_id,
+        )
+
+    def to_message(self) -> LLMMessage:
+        """Convert to a mutable LLMMessage."""
+        return LLMMessage(
+            role=self.role,  # type: ignore[arg-type]
+            content=self.content,
+            name=self.name,
+            metadata=self.metadata,
+            tool_calls=list(self.tool_calls) if self.tool_calls else None,
+            tool_call_id=self.tool_call_id,
+        )
+
+
+# Slot descriptors used by FrozenLLMMessage.from_dict to bypass the frozen __init__
+_FROZEN_MESSAGE_SETTERS = tuple(
+    FrozenLLMMessage.__dict__[name].__set__
+    for name in ("role", "content", "name", "metadata", "tool_calls", "tool_call_id", "_dict")
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenLLMResponse:
+    """Immutable, slotted response. Model and provider strings are interned."""
+
+    content: str
+    model: str
+    provider: str
+    usage: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    finish_reason: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    tool_calls: Optional[Tuple[LLMToolCall, ...]] = field(default=None, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "model", sys.intern(self.model))
+        object.__setattr__(self, "provider", sys.intern(self.provider))
+        if self.tool_calls is not None and not isinstance(self.tool_calls, tuple):
+            object.__setattr__(self, "tool_calls", tuple(self.tool_calls))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert response to dictionary format."""
+        result: Dict[str, Any] = {
+            "content": self.content,
+            "model": self.model,
+            "provider": self.provider,
+        }
+        if self.usage:
+            result["usage"] = self.usage
+        if self.finish_reason:
+            result["finish_reason"] = self.finish_reason
+        if self.metadata:
+            result["metadata"] = self.metadata
+        if self.tool_calls:
+            result["tool_calls"] = [call.to_dict() for call in self.tool_calls]
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FrozenLLMResponse":
+        """Create response from dictionary."""
+        tool_calls = data.get("tool_calls")
+        return cls(
+            content=data["content"],
+            model=data["model"],
+            provider=data["provider"],
+            usage=data.get("usage"),
+            finish_reason=data.get("finish_reason"),
+            metadata=data.get("metadata"),
+            tool_calls=tuple(LLMToolCall.from_dict(call) for call in tool_calls)
+            if tool_calls
+            else None,
+        )
+
+    @classmethod
+    def from_response(cls, response: LLMResponse) -> "FrozenLLMResponse":
+        """Create an immutable copy of an LLMResponse."""
+        return cls(
+            content=response.content,
+            model=response.model,
+            provider=response.provider,
+            usage=response.usage,
+            finish_reason=response.finish_reason,
+            metadata=response.metadata,
+            tool_calls=tuple(response.tool_calls) if response.tool_calls else None,
+        )
+
+    def to_message(self) -> FrozenLLMMessage:
+        """Convert response to an assistant message for the conversation history."""
+        return FrozenLLMMessage(role="assistant", content=self.content, tool_calls=self.tool_calls)
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenLLMConfig:
+    """Immutable, slotted configuration, usable as a dictionary key."""
+
+    provider: LLMProvider
+    model: str
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    timeout: Optional[float] = None
+    max_retries: int = 3
+    temperature: float = 1.0
+    max_tokens: Optional[int] = None
+    top_p: Optional[float] = None
+    frequency_penalty: Optional[float] = None
+    presence_penalty: Optional[float] = None
+    stop: Optional[Tuple[str, ...]] = None
+    extra_params: Optional[Dict[str, Any]] = field(default=None, hash=False)
+
+    def __post_init__(self) -> None:
+        if self.stop is not None and not isinstance(self.stop, tuple):
+            object.__setattr__(self, "stop", tuple(self.stop))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert config to dictionary format."""
+        return LLMConfig.to_dict(self)  # type: ignore[arg-type]
+
+    @classmethod
+    def from_config(cls, config: LLMConfig) -> "FrozenLLMConfig":
+        """Create an immutable copy of an LLMConfig."""
+        return cls(
+            provider=config.provider,
+            model=config.model,
+            api_key=config.api_key,
+            base_url=config.base_url,
+            timeout=config.timeout,
+            max_retries=config.max_retries,
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
+            top_p=config.top_p,
+            frequency_penalty=config.frequency_penalty,
+            presence_penalty=config.presence_penalty,
+            stop=tuple(config.stop) if config.stop else None,
+            extra_params=config.extra_params,
+        )
@@ -0,0 +1,39 @@
+"""In-process metrics for HarmonicGalaxy with Prometheus text exposition."""
+
+from harmonicgalaxy.metrics.registry import (
+    DEFAULT_BUCKETS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsRegistry,
+)
+from harmonicgalaxy.metrics.exposition import (
+    MetricsFileDumper,
+    MetricsServer,
+    generate_text,
+    start_exporters_from_env,
+    start_file_dump,
+    start_http_server,
+    write_text_file,
+)
+from harmonicgalaxy.metrics.instruments import register_logging_metrics
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Metric",
+    "MetricsRegistry",
+    "MetricsFileDumper",
+    "MetricsServer",
+    "generate_text",
+    "start_exporters_from_env",
+    "start_file_dump",
+    "start_http_server",
+    "write_text_file",
+    "register_logging_metrics",
+]
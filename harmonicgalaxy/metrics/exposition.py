@@ -0,0 +1,179 @@
+"""Prometheus text exposition of a :class:`MetricsRegistry`.
+
+Metrics can be scraped from a small HTTP server on a local port, or dumped
+periodically to a file (e.g. for the node_exporter textfile collector).
+
+Example:
+    >>> server = start_http_server(9464)          # GET http://127.0.0.1:9464/metrics
+    >>> dumper = start_file_dump("/var/lib/node_exporter/harmonicgalaxy.prom", interval=15)
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Union
+
+from harmonicgalaxy.metrics.registry import REGISTRY, MetricsRegistry, _format_value
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def generate_text(registry: MetricsRegistry = REGISTRY) -> str:
+    """Render every metric of ``registry`` in the Prometheus text format (0.0.4)."""
+    lines: List[str] = []
+    for metric in registry.metrics():
+        lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        for name, labels, value in metric.collect():
+            if labels:
+                rendered = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """HTTP server exposing a registry on ``/metrics`` from a daemon thread."""
+
+    def __init__(
+        self, port: int = 9464, addr: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+    ):
+        """Initialize and start the server.
+
+        Args:
+            port: Port to listen on (0 picks a free port, see :attr:`port`)
+            addr: Address to bind; the default only accepts local connections
+            registry: Registry to expose
+        """
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = generate_text(registry).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                # Scrapes every few seconds would flood the logs
+                pass
+
+        self._server = ThreadingHTTPServer((addr, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="harmonicgalaxy-metrics-http", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Serving metrics on http://{addr}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def start_http_server(
+    port: int = 9464, addr: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> MetricsServer:
+    """Serve ``registry`` in the Prometheus text format on ``http://addr:port/metrics``."""
+    return MetricsServer(port=port, addr=addr, registry=registry)
+
+
+def write_text_file(path: Union[str, Path], registry: MetricsRegistry = REGISTRY) -> None:
+    """Write the exposition of ``registry`` to ``path`` atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(generate_text(registry), encoding="utf-8")
+    os.replace(partial, path)
+
+
+class MetricsFileDumper:
+    """Daemon thread writing a registry to a file every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        interval: float = 15.0,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        """Initialize and start the dumper.
+
+        Args:
+            path: Output file, replaced atomically on every dump
+            interval: Seconds between dumps
+            registry: Registry to dump
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self.registry = registry
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="harmonicgalaxy-metrics-dump", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                write_text_file(self.path, self.registry)
+            except OSError as e:
+                logger.warning(f"Failed to write metrics to {self.path}: {e}")
+            if self._stopped.wait(self.interval):
+                return
+
+    def stop(self) -> None:
+        """Stop dumping after writing the metrics one last time."""
+        self._stopped.set()
+        self._thread.join()
+        write_text_file(self.path, self.registry)
+
+
+def start_file_dump(
+    path: Union[str, Path], interval: float = 15.0, registry: MetricsRegistry = REGISTRY
+) -> MetricsFileDumper:
+    """Write ``registry`` to ``path`` every ``interval`` seconds."""
+    return MetricsFileDumper(path, interval=interval, registry=registry)
+
+
+def start_exporters_from_env() -> List[Union[MetricsServer, MetricsFileDumper]]:
+    """Start the exporters configured through environment variables.
+
+    Environment variables:
+        HARMONICGALAXY_METRICS_PORT: Serve metrics on this local port
+        HARMONICGALAXY_METRICS_ADDR: Address to bind (default: 127.0.0.1)
+        HARMONICGALAXY_METRICS_FILE: Dump metrics to this file
+        HARMONICGALAXY_METRICS_INTERVAL: Seconds between file dumps (default: 15)
+
+    Returns:
+        The started exporters (empty if none is configured)
+    """
+    exporters: List[Union[MetricsServer, MetricsFileDumper]] = []
+    port: Optional[str] = os.getenv("HARMONICGALAXY_METRICS_PORT")
+    if port:
+        addr = os.getenv("HARMONICGALAXY_METRICS_ADDR", "127.0.0.1")
+        exporters.append(start_http_server(int(port), addr=addr))
+    path = os.getenv("HARMONICGALAXY_METRICS_FILE")
+    if path:
+        interval = float(os.getenv("HARMONICGALAXY_METRICS_INTERVAL", "15"))
+        exporters.append(start_file_dump(path, interval=interval))
+    return exporters
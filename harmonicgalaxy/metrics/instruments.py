@@ -0,0 +1,110 @@
+"""Metrics of the HarmonicGalaxy components, registered in :data:`REGISTRY`.
+
+LLM metrics are updated by :class:`~harmonicgalaxy.llm.client.LLMClient` on
+every request; logging metrics are read from the logging system when the
+registry is collected.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from harmonicgalaxy.metrics.registry import REGISTRY, MetricsRegistry
+from harmonicgalaxy.utils.logging import get_lost_record_totals, get_record_counts
+
+LLM_REQUESTS = REGISTRY.counter(
+    "harmonicgalaxy_llm_requests_total",
+    "LLM requests by outcome (success, error or cancelled)",
+    ("provider", "model", "operation", "outcome"),
+)
+LLM_ERRORS = REGISTRY.counter(
+    "harmonicgalaxy_llm_errors_total",
+    "Failed LLM requests by exception type",
+    ("provider", "model", "error"),
+)
+LLM_REQUEST_DURATION = REGISTRY.histogram(
+    "harmonicgalaxy_llm_request_duration_seconds",
+    "LLM request latency including scheduler queueing (whole stream for stream_chat)",
+    ("provider", "model", "operation"),
+)
+LLM_IN_FLIGHT = REGISTRY.gauge(
+    "harmonicgalaxy_llm_requests_in_flight",
+    "LLM requests currently queued or running",
+    ("provider", "model"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "harmonicgalaxy_llm_tokens_total",
+    "Tokens reported by LLM providers",
+    ("provider", "model", "direction"),
+)
+
+# Usage keys of the different providers, by direction
+_INPUT_TOKEN_KEYS = ("prompt_tokens", "input_tokens")
+_OUTPUT_TOKEN_KEYS = ("completion_tokens", "output_tokens")
+
+
+class LLMRequestMetrics:
+    """Pre-resolved metric children for one provider/model.
+
+    Created once per client so the request path does no label lookups.
+    """
+
+    def __init__(self, provider: str, model: str):
+        """Initialize metrics for one provider/model."""
+        self.provider = provider
+        self.model = model
+        self.in_flight = LLM_IN_FLIGHT.labels(provider, model)
+        self.input_tokens = LLM_TOKENS.labels(provider, model, "input")
+        self.output_tokens = LLM_TOKENS.labels(provider, model, "output")
+        self._by_operation: Dict[str, Tuple[Any, Any, Any, Any]] = {}
+
+    def operation(self, operation: str) -> Tuple[Any, Any, Any, Any]:
+        """Return the success, error and cancelled counters and the duration histogram."""
+        children = self._by_operation.get(operation)
+        if children is None:
+            children = (
+                LLM_REQUESTS.labels(self.provider, self.model, operation, "success"),
+                LLM_REQUESTS.labels(self.provider, self.model, operation, "error"),
+                LLM_REQUESTS.labels(self.provider, self.model, operation, "cancelled"),
+                LLM_REQUEST_DURATION.labels(self.provider, self.model, operation),
+            )
+            self._by_operation[operation] = children
+        return children
+
+    def record_error(self, error: BaseException) -> None:
+        """Count a failed request by exception type."""
+        LLM_ERRORS.labels(self.provider, self.model, type(error).__name__).inc()
+
+    def record_usage(self, usage: Optional[Mapping[str, Any]]) -> None:
+        """Count the tokens of a provider usage report."""
+        if not usage:
+            return
+        for key in _INPUT_TOKEN_KEYS:
+            if usage.get(key):
+                self.input_tokens.inc(usage[key])
+                break
+        for key in _OUTPUT_TOKEN_KEYS:
+            if usage.get(key):
+                self.output_tokens.inc(usage[key])
+                break
+
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def register_logging_metrics(registry: MetricsRegistry = REGISTRY) -> None:
+    """Expose logging counters (records by level, lost records) in ``registry``."""
+    records = registry.counter(
+        "harmonicgalaxy_log_records_total", "Log records emitted, by level", ("level",)
+    )
+    for level in LOG_LEVELS:
+        records.labels(level).set_function(lambda level=level: get_record_counts().get(level, 0))
+
+    lost = registry.counter(
+        "harmonicgalaxy_log_records_lost_total",
+        "Log records discarded by a full logging queue (dropped) or by rate limiting (suppressed)",
+        ("reason",),
+    )
+    for reason in ("dropped", "suppressed"):
+        lost.labels(reason).set_function(lambda reason=reason: get_lost_record_totals()[reason])
+
+
+register_logging_metrics()
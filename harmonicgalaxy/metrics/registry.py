@@ -0,0 +1,339 @@
+"""Counters, gauges and histograms kept in a process-wide registry.
+
+Metric values are plain Python numbers updated without locks (a single
+``+=`` per update), so instrumenting hot paths costs well under a
+microsecond. Under heavy contention from several threads an update may very
+rarely be lost, which is acceptable for monitoring. Locks are only taken
+when a metric or a label combination is created.
+
+Example:
+    >>> requests = REGISTRY.counter(
+    ...     "harmonicgalaxy_agent_runs_total", "Agent runs", labelnames=("agent",)
+    ... )
+    >>> requests.labels(agent="planner").inc()
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Default histogram buckets (seconds), suited to LLM and agent latencies
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# One exposition sample: (suffix, extra labels, value)
+Sample = Tuple[str, Tuple[Tuple[str, str], ...], float]
+
+
+class _CounterChild:
+    """Value of a counter for one label combination."""
+
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by ``amount`` (must not be negative)."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the counter from ``function`` at collection time.
+
+        Useful for totals another component already keeps.
+        """
+        self.function = function
+
+    def samples(self) -> List[Sample]:
+        value = self.function() if self.function is not None else self.value
+        return [("", (), float(value))]
+
+
+class _GaugeChild:
+    """Value of a gauge for one label combination."""
+
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the gauge from ``function`` at collection time."""
+        self.function = function
+
+    def samples(self) -> List[Sample]:
+        value = self.function() if self.function is not None else self.value
+        return [("", (), float(value))]
+
+
+class _HistogramChild:
+    """Bucket counts of a histogram for one label combination."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> List[Sample]:
+        samples: List[Sample] = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds + (math.inf,), self.counts):
+            cumulative += bucket_count
+            samples.append(("_bucket", (("le", _format_value(bound)),), float(cumulative)))
+        samples.append(("_sum", (), self.sum))
+        samples.append(("_count", (), float(self.count)))
+        return samples
+
+
+class Metric:
+    """A named metric with optional labels.
+
+    Metrics without labels are updated directly (``counter.inc()``); metrics
+    with labels through :meth:`labels` (``counter.labels(model="gpt-4").inc()``).
+    Keep the child returned by :meth:`labels` to skip the lookup on hot paths.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize metric.
+
+        Args:
+            name: Metric name (e.g. ``harmonicgalaxy_llm_requests_total``)
+            documentation: Help text
+            labelnames: Names of the labels of this metric
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **labels: str):
+        """Return the child for one combination of label values."""
+        if labels:
+            if values:
+                raise ValueError("Pass label values either by position or by name")
+            try:
+                values = tuple(str(labels[name]) for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"Missing label {e} for metric {self.name}") from None
+            if len(labels) != len(self.labelnames):
+                raise ValueError(f"Unexpected labels for metric {self.name}: {sorted(labels)}")
+        else:
+            values = tuple(str(value) for value in values)
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"Metric {self.name} expects {len(self.labelnames)} label values"
+                )
+
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def remove(self, *values: str) -> None:
+        """Forget the child for one combination of label values."""
+        with self._lock:
+            self._children.pop(tuple(str(value) for value in values), None)
+
+    def _unlabeled(self):
+        if self.labelnames:
+            raise ValueError(f"Metric {self.name} has labels; use .labels(...)")
+        return self._default
+
+    def collect(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Yield ``(sample name, labels, value)`` for every sample."""
+        for values, child in list(self._children.items()):
+            base = dict(zip(self.labelnames, values))
+            for suffix, extra, value in child.samples():
+                labels = dict(base)
+                labels.update(extra)
+                yield self.name + suffix, labels, value
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter (metrics without labels only)."""
+        self._unlabeled().inc(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the counter from ``function`` at collection time (metrics without labels only)."""
+        self._unlabeled().set_function(function)
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge (metrics without labels only)."""
+        self._unlabeled().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge (metrics without labels only)."""
+        self._unlabeled().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the gauge (metrics without labels only)."""
+        self._unlabeled().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the gauge from ``function`` at collection time (metrics without labels only)."""
+        self._unlabeled().set_function(function)
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed, cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels of this metric
+            buckets: Upper bounds of the buckets, in increasing order
+        """
+        bounds = tuple(float(bound) for bound in buckets if bound != math.inf)
+        if list(bounds) != sorted(bounds):
+            raise ValueError("Histogram buckets must be in increasing order")
+        self.buckets = bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record one observation (metrics without labels only)."""
+        self._unlabeled().observe(value)
+
+
+class MetricsRegistry:
+    """Collection of metrics exposed together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter ``name``, creating it on first use."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Return the gauge ``name``, creating it on first use."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram ``name``, creating it on first use."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Return a registered metric by name."""
+        return self._metrics.get(name)
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric from the registry."""
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def metrics(self) -> List[Metric]:
+        """Return every registered metric, sorted by name."""
+        return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def get_sample_value(
+        self, name: str, labels: Optional[Dict[str, str]] = None
+    ) -> Optional[float]:
+        """Return the current value of one sample (handy in tests and health checks)."""
+        labels = labels or {}
+        for metric in self.metrics():
+            if not name.startswith(metric.name):
+                continue
+            for sample_name, sample_labels, value in metric.collect():
+                if sample_name == name and sample_labels == labels:
+                    return value
+        return None
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value or bucket bound for the text format."""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
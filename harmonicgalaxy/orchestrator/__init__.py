@@ -1,2 +1,29 @@
 """Orchestrator to decide which agent runs next."""
 
+from harmonicgalaxy.orchestrator.engine import (
+    MissionGraph,
+    OrchestrationEngine,
+    Step,
+    StepFailedError,
+)
+from harmonicgalaxy.orchestrator.process_pool import ProcessPool
+from harmonicgalaxy.orchestrator.selection import (
+    FirstMatchPolicy,
+    LeastOutstandingPolicy,
+    LoadTracker,
+    PowerOfTwoChoicesPolicy,
+    SelectionPolicy,
+)
+
+__all__ = [
+    "FirstMatchPolicy",
+    "LeastOutstandingPolicy",
+    "LoadTracker",
+    "MissionGraph",
+    "OrchestrationEngine",
+    "PowerOfTwoChoicesPolicy",
+    "ProcessPool",
+    "SelectionPolicy",
+    "Step",
+    "StepFailedError",
+]
@@ -0,0 +1,498 @@
+"""Orchestration engine running a mission as a dependency graph of agent steps.
+
+A :class:`MissionGraph` lists the steps of a mission, the agent that runs
+each step and the steps it depends on. :class:`OrchestrationEngine` runs
+the graph dataflow-style: a step is dispatched the moment the last of its
+dependencies completes (not in fixed phases), and independent steps run
+concurrently, bounded by an engine-wide cap shared by all missions and an
+optional per-mission cap.
+
+A step names its agent, or the capabilities it requires; the engine then
+picks the best match in its :class:`~harmonicgalaxy.agents.registry.AgentRegistry`
+when the step is dispatched, so agents registered or removed at runtime
+are taken into account. Among equally good matches, the engine's
+:class:`~harmonicgalaxy.orchestrator.selection.SelectionPolicy` picks one
+by live load (steps in flight, EWMA latency and error rate).
+
+Each step receives its static inputs plus the outputs of its dependencies
+(keyed by step id), runs in a ``orchestrator.step`` tracing span, and is
+recorded in the mission history. The first failing step cancels the steps
+still running and fails the mission. Steps of CPU-bound agents run in the
+engine's :class:`~harmonicgalaxy.orchestrator.process_pool.ProcessPool`,
+when it has one, so they do not block the event loop.
+
+With a :class:`~harmonicgalaxy.state.checkpoint.MissionCheckpointer`, the
+engine checkpoints the mission when it starts, after every step and when it
+finishes. Steps the mission history already records as succeeded (e.g. in a
+mission restored with ``checkpointer.recover``) are not run again: their
+recorded outputs are reused, so a mission interrupted by a crash resumes
+after its last checkpointed step.
+
+Example:
+    >>> graph = MissionGraph()
+    >>> graph.add_step("research", researcher, inputs={"topic": "exoplanets"})
+    >>> graph.add_step("outline", planner, depends_on=["research"])
+    >>> graph.add_step("images", illustrator, depends_on=["research"])
+    >>> graph.add_step("write", writer, depends_on=["outline", "images"])
+    >>> engine = OrchestrationEngine(max_concurrency=32)
+    >>> outputs = await engine.run(Mission("article"), graph)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.agents.registry import AgentRegistry
+from harmonicgalaxy.core.mission import Mission, MissionStateError, MissionStatus, StepStatus
+from harmonicgalaxy.events.tracing import span
+from harmonicgalaxy.llm.deadline import deadline
+from harmonicgalaxy.orchestrator.process_pool import ProcessPool
+from harmonicgalaxy.orchestrator.selection import (
+    LeastOutstandingPolicy,
+    LoadTracker,
+    SelectionPolicy,
+)
+from harmonicgalaxy.state.checkpoint import MissionCheckpointer
+from harmonicgalaxy.utils.logging import get_logger, log_context
+
+logger = get_logger(__name__)
+
+
+class StepFailedError(RuntimeError):
+    """Raised when a step of a mission fails; the step's exception is the cause."""
+
+    def __init__(self, step_id: str, error: BaseException):
+        """Initialize error.
+
+        Args:
+            step_id: Id of the failed step
+            error: Exception raised by the step
+        """
+        super().__init__(f"Step '{step_id}' failed: {type(error).__name__}: {error}")
+        self.step_id = step_id
+        self.error = error
+
+
+@dataclass
+class Step:
+    """One node of a mission graph."""
+
+    id: str
+    agent: Optional[Agent]
+    depends_on: Tuple[str, ...] = ()
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    timeout: Optional[float] = None
+    requires: FrozenSet[str] = frozenset()
+    prefers: FrozenSet[str] = frozenset()
+
+
+class MissionGraph:
+    """Steps of a mission and their dependencies (a directed acyclic graph)."""
+
+    def __init__(self) -> None:
+        """Initialize an empty graph."""
+        self.steps: Dict[str, Step] = {}
+        self._compiled: Optional["_CompiledGraph"] = None
+
+    def add_step(
+        self,
+        step_id: str,
+        agent: Optional[Agent] = None,
+        depends_on: Sequence[str] = (),
+        inputs: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        requires: Iterable[str] = (),
+        prefers: Iterable[str] = (),
+    ) -> Step:
+        """Add a step.
+
+        Dependencies may be added after the steps that depend on them; the
+        graph is validated when it is run.
+
+        Args:
+            step_id: Unique step id
+            agent: Agent running the step (None: chosen from the engine's
+                registry by ``requires`` and ``prefers``)
+            depends_on: Ids of the steps whose outputs this step needs
+            inputs: Static inputs of the step
+            timeout: Seconds the step may run (also bounds its LLM calls as a deadline)
+            requires: Capability tags the chosen agent must have
+            prefers: Capability tags preferred when choosing the agent
+
+        Returns:
+            The new step
+        """
+        if step_id in self.steps:
+            raise ValueError(f"Duplicate step id: {step_id}")
+        if agent is None and not requires:
+            raise ValueError(f"Step '{step_id}' needs an agent or required capabilities")
+        step = Step(
+            step_id,
+            agent,
+            tuple(depends_on),
+            dict(inputs or {}),
+            timeout,
+            frozenset(requires),
+            frozenset(prefers),
+        )
+        self.steps[step_id] = step
+        self._compiled = None
+        return step
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def compile(self) -> "_CompiledGraph":
+        """Validate the graph and index it for execution (cached until it changes).
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+        """
+        if self._compiled is None:
+            self._compiled = _CompiledGraph(list(self.steps.values()))
+        return self._compiled
+
+
+class _CompiledGraph:
+    """Steps indexed by position, with successor lists and dependency counts."""
+
+    __slots__ = ("steps", "successors", "dependency_counts", "roots")
+
+    def __init__(self, steps: List[Step]):
+        positions = {step.id: index for index, step in enumerate(steps)}
+        self.steps = steps
+        self.successors: List[List[int]] = [[] for _ in steps]
+        self.dependency_counts: List[int] = []
+        for index, step in enumerate(steps):
+            for dependency in step.depends_on:
+                position = positions.get(dependency)
+                if position is None:
+                    raise ValueError(f"Step '{step.id}' depends on unknown step '{dependency}'")
+                self.successors[position].append(index)
+            self.dependency_counts.append(len(step.depends_on))
+        self.roots = [index for index, count in enumerate(self.dependency_counts) if count == 0]
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        """Raise ValueError if some steps can never become ready (Kahn's algorithm)."""
+        remaining = list(self.dependency_counts)
+        ready = list(self.roots)
+        visited = 0
+        while ready:
+            index = ready.pop()
+            visited += 1
+            for successor in self.successors[index]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    ready.append(successor)
+        if visited != len(self.steps):
+            cyclic = sorted(self.steps[index].id for index, count in enumerate(remaining) if count)
+            raise ValueError(f"Mission graph has a cycle through steps: {cyclic}")
+
+
+class OrchestrationEngine:
+    """Runs mission graphs with bounded parallelism."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_parallel_per_mission: Optional[int] = None,
+        process_pool: Optional[ProcessPool] = None,
+        registry: Optional[AgentRegistry] = None,
+        selection_policy: Optional[SelectionPolicy] = None,
+        checkpointer: Optional[MissionCheckpointer] = None,
+    ):
+        """Initialize engine.
+
+        Args:
+            max_concurrency: Steps running at once across all missions of this engine
+            max_parallel_per_mission: Default cap of steps running at once per
+                mission (None: only the engine-wide cap applies)
+            process_pool: Pool running the steps of CPU-bound agents (None:
+                they run in the default thread pool executor)
+            registry: Registry choosing the agents of steps declared by capability
+            selection_policy: Choice among equally good registry matches
+                (default: :class:`LeastOutstandingPolicy`)
+            checkpointer: Journal of mission state, checkpointed after every step
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_parallel_per_mission = max_parallel_per_mission
+        self.process_pool = process_pool
+        self.registry = registry
+        self.selection_policy = selection_policy or LeastOutstandingPolicy()
+        self.loads = LoadTracker()
+        self.checkpointer = checkpointer
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    def select_agent(self, step: Step) -> Optional[Agent]:
+        """Choose the agent of a step declared by capability, or None if none matches.
+
+        The policy chooses among the registry matches with the best score.
+        """
+        matches = self.registry.find(requires=step.requires, prefers=step.prefers)
+        if not matches:
+            return None
+        top = matches[0].score
+        candidates = [match.agent for match in matches if match.score == top]
+        return self.selection_policy.select(candidates, self.loads)
+
+    async def run(
+        self, mission: Mission, graph: MissionGraph, max_parallel: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Run every step of ``graph`` for ``mission``.
+
+        The mission is started if it is pending, completed with the step
+        outputs as result, or failed/cancelled if a step fails or the run is
+        cancelled. Steps that already succeeded in the mission history (same
+        step id) are not run again; their recorded outputs are reused.
+
+        Args:
+            mission: Mission the steps belong to
+            graph: Steps to run
+            max_parallel: Cap of steps running at once for this mission
+                (default: the engine's ``max_parallel_per_mission``)
+
+        Returns:
+            Output of every step, by step id
+
+        Raises:
+            StepFailedError: If a step raises, or recording or checkpointing its
+                result fails; the other running steps are cancelled
+            MissionStateError: If the mission has already finished
+            ValueError: If the graph is invalid
+        """
+        if mission.status.is_terminal:
+            raise MissionStateError(f"Mission {mission.name!r} is {mission.status.value}")
+        compiled = graph.compile()
+        if self.registry is None:
+            for step in compiled.steps:
+                if step.agent is None:
+                    raise ValueError(
+                        f"Step '{step.id}' needs an agent registry to choose its agent"
+                    )
+        if max_parallel is None:
+            max_parallel = self.max_parallel_per_mission
+        if mission.status == MissionStatus.PENDING:
+            mission.start()
+        checkpointer = self.checkpointer
+        if checkpointer is not None:
+            await checkpointer.checkpoint(mission)
+
+        run = _MissionRun(self, mission, compiled, max_parallel)
+        with log_context(mission_id=mission.id), span(
+            "orchestrator.mission", mission=mission.name, steps=len(compiled.steps)
+        ):
+            logger.mission_start(mission.name, steps=len(compiled.steps))
+            try:
+                await run.execute()
+            except StepFailedError as e:
+                mission.fail(e)
+                if checkpointer is not None:
+                    try:
+                        await checkpointer.checkpoint(mission)
+                    except Exception as checkpoint_error:
+                        logger.warning(
+                            f"Checkpoint of failed mission {mission.id} failed: {checkpoint_error}"
+                        )
+                raise
+            except BaseException:
+                mission.cancel()
+                raise
+        mission.complete(result=run.outputs)
+        if checkpointer is not None:
+            await checkpointer.checkpoint(mission)
+        logger.mission_complete(mission.name, elapsed=f"{mission.elapsed:.3f}s")
+        return run.outputs
+
+
+class _MissionRun:
+    """State of one execution of a compiled graph."""
+
+    def __init__(
+        self,
+        engine: OrchestrationEngine,
+        mission: Mission,
+        graph: _CompiledGraph,
+        max_parallel: Optional[int],
+    ):
+        self.engine = engine
+        self.mission = mission
+        self.graph = graph
+        self.max_parallel = max_parallel
+        self.outputs: Dict[str, Any] = {}
+        self.remaining = list(graph.dependency_counts)
+        self.ready: Deque[int] = deque(graph.roots)
+        self.running = 0
+        self.completed = 0
+        # Left by an interrupted run: those steps run again
+        mission.running_steps.clear()
+        if len(mission.history):
+            self._resume()
+        self.tasks: Set["asyncio.Task[None]"] = set()
+        self.done: Optional["asyncio.Future[None]"] = None
+
+    def _resume(self) -> None:
+        """Mark the steps that already succeeded in the mission history as completed."""
+        succeeded = {
+            step.action: step.output
+            for step in self.mission.history
+            if step.status is StepStatus.SUCCEEDED
+        }
+        steps, remaining = self.graph.steps, self.remaining
+        for index, step in enumerate(steps):
+            if step.id in succeeded:
+                self.outputs[step.id] = succeeded[step.id]
+                for successor in self.graph.successors[index]:
+                    remaining[successor] -= 1
+        if self.outputs:
+            self.completed = len(self.outputs)
+            self.ready = deque(
+                index
+                for index, step in enumerate(steps)
+                if remaining[index] == 0 and step.id not in self.outputs
+            )
+
+    async def execute(self) -> None:
+        """Run all steps; like a task group, no step outlives this call."""
+        if self.completed == len(self.graph.steps):
+            return
+        self.done = asyncio.get_running_loop().create_future()
+        self._dispatch()
+        try:
+            await self.done
+        finally:
+            if self.tasks:
+                for task in self.tasks:
+                    task.cancel()
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        """Start ready steps while the mission is under its parallelism cap."""
+        ready, tasks = self.ready, self.tasks
+        limit = self.max_parallel
+        loop = asyncio.get_running_loop()
+        while ready and (limit is None or self.running < limit):
+            self.running += 1
+            task = loop.create_task(self._run_step(ready.popleft()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    async def _run_step(self, index: int) -> None:
+        """Run one step; any error, even outside the agent, fails the run."""
+        try:
+            await self._execute_step(index)
+        except Exception as e:
+            # e.g. recording or checkpointing the step failed: without this,
+            # the run would wait forever for a step that will never finish
+            if not self.done.done():
+                self.done.set_exception(StepFailedError(self.graph.steps[index].id, e))
+
+    async def _execute_step(self, index: int) -> None:
+        step = self.graph.steps[index]
+        inputs = dict(step.inputs)
+        for dependency in step.depends_on:
+            inputs[dependency] = self.outputs[dependency]
+
+        agent = step.agent
+        if agent is None:
+            agent = self.engine.select_agent(step)
+            if agent is None:
+                error = LookupError(f"No registered agent has {sorted(step.requires)}")
+                self._fail(step, "?", inputs, time.time(), 0.0, error)
+                return
+
+        running_steps = self.mission.running_steps
+        running_steps[step.id] = agent.name
+        checkpointer = self.engine.checkpointer
+        if checkpointer is not None:
+            # So that the mission indexes show the step in flight
+            await checkpointer.checkpoint(self.mission)
+
+        loads = self.engine.loads
+        # Counted in flight while queued for a slot, so concurrent selections see it
+        loads.started(agent.name)
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            async with self.engine._slots:
+                logger.orchestration_step(index, f"{step.id} -> {agent.name}")
+                started_at = time.time()
+                started = time.perf_counter()
+                with span("orchestrator.step", step=step.id, agent=agent.name):
+                    output = await self._call(agent, step, inputs)
+        except Exception as e:
+            duration = time.perf_counter() - started
+            loads.finished(agent.name, duration, failed=True)
+            running_steps.pop(step.id, None)
+            self._fail(step, agent.name, inputs, started_at, duration, e)
+            return
+        except BaseException:
+            loads.cancelled(agent.name)
+            running_steps.pop(step.id, None)
+            raise
+        duration = time.perf_counter() - started
+        loads.finished(agent.name, duration)
+
+        running_steps.pop(step.id, None)
+        self.mission.record_step(
+            agent.name,
+            step.id,
+            started_at=started_at,
+            duration=duration,
+            input=inputs,
+            output=output,
+        )
+        if checkpointer is not None:
+            await checkpointer.checkpoint(self.mission)
+        self.outputs[step.id] = output
+        self.running -= 1
+        self.completed += 1
+
+        remaining, ready = self.remaining, self.ready
+        for successor in self.graph.successors[index]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                ready.append(successor)
+        if self.completed == len(self.graph.steps):
+            if not self.done.done():
+                self.done.set_result(None)
+        elif not self.done.done():
+            self._dispatch()
+
+    async def _call(self, agent: Agent, step: Step, inputs: Dict[str, Any]) -> Any:
+        """Run ``agent`` on the step inputs, in the process pool if it is CPU-bound."""
+        process_pool = self.engine.process_pool
+        if agent.cpu_bound and process_pool is not None:
+            return await process_pool.run(agent.compute, inputs, timeout=step.timeout)
+        if step.timeout is None:
+            return await agent.run(inputs, self.mission)
+        with deadline(step.timeout):
+            return await asyncio.wait_for(agent.run(inputs, self.mission), step.timeout)
+
+    def _fail(
+        self,
+        step: Step,
+        agent: str,
+        inputs: Dict[str, Any],
+        started_at: float,
+        duration: float,
+        error: Exception,
+    ) -> None:
+        """Record a failed step and fail the run."""
+        self.mission.record_step(
+            agent,
+            step.id,
+            status=StepStatus.FAILED,
+            started_at=started_at,
+            duration=duration,
+            input=inputs,
+            error=f"{type(error).__name__}: {error}",
+        )
+        self.running -= 1
+        if not self.done.done():
+            self.done.set_exception(StepFailedError(step.id, error))
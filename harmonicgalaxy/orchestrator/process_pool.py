@@ -0,0 +1,300 @@
+"""Process pool running CPU-bound agent work off the event loop.
+
+Heavy local work (parsing, scoring, embedding post-processing) would block
+the event loop that drives all LLM I/O. :class:`ProcessPool` wraps a
+:class:`concurrent.futures.ProcessPoolExecutor` with:
+
+- **Warm workers**: :meth:`ProcessPool.start` spawns every worker up front
+  and runs the initializer (and imports the ``preload`` modules) in each, so
+  the first tasks do not pay for process start-up and imports.
+- **Out-of-band arguments**: arguments are pickled with protocol 5. When
+  their out-of-band buffers (NumPy arrays, ``pickle.PickleBuffer``, ...)
+  reach ``shm_threshold`` bytes, the buffers are copied once into a shared
+  memory segment, which the worker maps and unpickles from without copying,
+  instead of streaming them through the executor's pipe.
+- **Per-task timeouts**: a task still running at its timeout raises
+  :class:`asyncio.TimeoutError`. Its worker cannot be interrupted, so the
+  pool switches to fresh workers and the stuck ones are terminated once the
+  other tasks they were running have finished.
+- **Worker recycling**: after ``max_tasks_per_worker`` tasks per worker on
+  average, the workers are replaced to contain memory growth (leaks and
+  fragmentation in long-lived processes). Tasks already submitted finish
+  on the old workers.
+
+Functions and their arguments must be picklable (module-level functions,
+or bound methods of picklable objects).
+
+Example:
+    >>> pool = ProcessPool(max_workers=4, preload=["json"], max_tasks_per_worker=500)
+    >>> await pool.start()
+    >>> scores = await pool.run(score_documents, documents, timeout=30)
+    >>> await pool.shutdown()
+"""
+
+import asyncio
+import importlib
+import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Copying buffers into shared memory costs a segment creation and mapping;
+# below this size, pickling them through the pipe is cheaper.
+DEFAULT_SHM_THRESHOLD = 1 << 20
+
+
+def _initialize_worker(
+    preload: Tuple[str, ...], initializer: Optional[Callable[..., Any]], initargs: Tuple
+) -> None:
+    """Import ``preload`` modules and run the user initializer (in the worker)."""
+    for module in preload:
+        importlib.import_module(module)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _call_payload(payload: bytes, buffers: List[bytes]) -> Any:
+    """Unpickle a protocol 5 call and its out-of-band buffers, then run it."""
+    func, args, kwargs = pickle.loads(payload, buffers=buffers)
+    return func(*args, **kwargs)
+
+
+def _call_out_of_band(payload: bytes, segment: str, layout: List[Tuple[int, int]]) -> Any:
+    """Unpickle a call from ``payload`` and a shared memory segment, then run it.
+
+    The arguments reference the segment without copies, so they are only
+    valid during the call.
+    """
+    memory = shared_memory.SharedMemory(segment)
+    try:
+        buffers = [memory.buf[offset : offset + size] for offset, size in layout]
+        func, args, kwargs = pickle.loads(payload, buffers=buffers)
+        del buffers
+        return func(*args, **kwargs)
+    finally:
+        func = args = kwargs = None
+        try:
+            memory.close()
+        except BufferError:
+            # The function kept a reference to an argument; the mapping is
+            # released when the worker exits.
+            pass
+
+
+class _Generation:
+    """One executor and the workers it spawned."""
+
+    __slots__ = ("executor", "submitted", "in_flight", "retired", "stuck")
+
+    def __init__(self, executor: ProcessPoolExecutor):
+        self.executor = executor
+        self.submitted = 0
+        self.in_flight = 0
+        self.retired = False
+        self.stuck = False
+
+
+class ProcessPool:
+    """Managed process pool for CPU-bound agents."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple = (),
+        preload: Iterable[str] = (),
+        max_tasks_per_worker: Optional[int] = None,
+        shm_threshold: Optional[int] = DEFAULT_SHM_THRESHOLD,
+        mp_context: Any = None,
+    ):
+        """Initialize process pool.
+
+        Args:
+            max_workers: Worker processes (default: number of CPUs)
+            initializer: Called as ``initializer(*initargs)`` once in each worker
+            initargs: Arguments of ``initializer``
+            preload: Modules imported in each worker when it starts
+            max_tasks_per_worker: Replace the workers after this many tasks per
+                worker (None: never)
+            shm_threshold: Out-of-band argument bytes from which arguments are
+                passed through shared memory (None: never)
+            mp_context: ``multiprocessing`` context used to start workers
+        """
+        if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+            raise ValueError("max_tasks_per_worker must be at least 1")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self.preload = tuple(preload)
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.shm_threshold = shm_threshold
+        self.mp_context = mp_context
+        self.tasks = 0
+        self.timeouts = 0
+        self.recycles = 0
+        self.out_of_band_bytes = 0
+        self._generation: Optional[_Generation] = None
+        self._closed = False
+
+    def _new_generation(self) -> _Generation:
+        # Workers must share our resource tracker: one they start themselves
+        # would report the segments they attach to as leaked
+        resource_tracker.ensure_running()
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            initializer=_initialize_worker,
+            initargs=(self.preload, self.initializer, self.initargs),
+        )
+        return _Generation(executor)
+
+    def _current(self) -> _Generation:
+        if self._closed:
+            raise RuntimeError("Process pool is shut down")
+        generation = self._generation
+        if generation is None:
+            generation = self._generation = self._new_generation()
+        elif self.max_tasks_per_worker and (
+            generation.submitted >= self.max_tasks_per_worker * self.max_workers
+        ):
+            logger.debug(f"Recycling process pool workers after {generation.submitted} tasks")
+            self.recycles += 1
+            self._retire(generation)
+            generation = self._generation = self._new_generation()
+        return generation
+
+    def _retire(self, generation: _Generation) -> None:
+        """Stop sending tasks to ``generation``; release it once it is idle."""
+        generation.retired = True
+        if generation.in_flight == 0:
+            self._release(generation)
+
+    @staticmethod
+    def _release(generation: _Generation) -> None:
+        if generation.stuck:
+            # Workers still running abandoned (timed out) tasks
+            for process in list(getattr(generation.executor, "_processes", {}).values()):
+                process.terminate()
+        generation.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """Spawn and initialize every worker before the first task."""
+        generation = self._current()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(generation.executor, _worker_pid)
+                for _ in range(self.max_workers)
+            )
+        )
+
+    def _submit(self, generation: _Generation, func: Callable[..., Any], args, kwargs) -> Future:
+        # Pickle the call once; the executor then only copies the resulting bytes
+        buffers: List[pickle.PickleBuffer] = []
+        payload = pickle.dumps((func, args, kwargs), protocol=5, buffer_callback=buffers.append)
+        views = [buffer.raw() for buffer in buffers]
+        size = sum(view.nbytes for view in views)
+        if size and self.shm_threshold is not None and size >= self.shm_threshold:
+            return self._submit_shared(generation, payload, views, size)
+        return generation.executor.submit(_call_payload, payload, [bytes(v) for v in views])
+
+    def _submit_shared(
+        self, generation: _Generation, payload: bytes, views: List[memoryview], size: int
+    ) -> Future:
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        layout = []
+        offset = 0
+        for view in views:
+            memory.buf[offset : offset + view.nbytes] = view
+            layout.append((offset, view.nbytes))
+            offset += view.nbytes
+        self.out_of_band_bytes += size
+        future = generation.executor.submit(_call_out_of_band, payload, memory.name, layout)
+
+        def release(_):
+            memory.close()
+            memory.unlink()
+
+        future.add_done_callback(release)
+        return future
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any
+    ) -> Any:
+        """Run ``func(*args, **kwargs)`` in a worker process.
+
+        Args:
+            func: Picklable callable
+            *args: Positional arguments
+            timeout: Seconds the task may take, including time queued behind
+                other tasks (None: no limit)
+            **kwargs: Keyword arguments
+
+        Returns:
+            Return value of ``func``
+
+        Raises:
+            asyncio.TimeoutError: If the task did not finish within ``timeout``
+        """
+        generation = self._current()
+        future = self._submit(generation, func, args, kwargs)
+        generation.submitted += 1
+        generation.in_flight += 1
+        self.tasks += 1
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+            if not future.cancel() and not future.done():
+                # Already running and workers cannot be interrupted: move on to
+                # fresh workers and terminate these once their other tasks end
+                generation.stuck = True
+                if not generation.retired:
+                    logger.warning(
+                        f"Process pool task {getattr(func, '__qualname__', func)!s} "
+                        "abandoned while running; replacing workers"
+                    )
+                    if self._generation is generation:
+                        self._generation = None
+                    generation.retired = True
+            raise
+        finally:
+            generation.in_flight -= 1
+            if generation.retired and generation.in_flight == 0:
+                self._release(generation)
+
+    async def shutdown(self, wait: bool = True) -> None:
+        """Shut the pool down.
+
+        Args:
+            wait: Wait for submitted tasks to finish (otherwise cancel queued
+                tasks, terminate the workers and return immediately)
+        """
+        self._closed = True
+        generation, self._generation = self._generation, None
+        if generation is None:
+            return
+        if wait:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, generation.executor.shutdown, True)
+        else:
+            generation.stuck = True
+            self._release(generation)
+
+    async def __aenter__(self) -> "ProcessPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.shutdown()
+
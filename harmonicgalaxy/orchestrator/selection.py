@@ -0,0 +1,194 @@
+"""Load-aware choice between agents providing the same capability.
+
+When several registered agents can run a step, picking always the first
+one turns it into a hotspot while the others sit idle. :class:`LoadTracker`
+keeps live per-agent load signals, updated by the engine around every step:
+
+- ``in_flight``: steps dispatched to the agent and not finished yet;
+- ``latency``: exponentially weighted moving average (EWMA) of step durations;
+- ``error_rate``: EWMA of step failures (1) and successes (0).
+
+A :class:`SelectionPolicy` chooses among equally good candidates using
+these signals. Both load-aware policies first prefer the agents failing
+least, by ``error_level`` (the error rate in steps of 10%): a failure often
+takes less time than a real answer, so a failing agent would otherwise look
+like the fastest one and attract even more steps. Then:
+
+- :class:`LeastOutstandingPolicy` picks the agent with the fewest steps in
+  flight (ties: lower expected cost, then registry order);
+- :class:`PowerOfTwoChoicesPolicy` samples two candidates at random and
+  keeps the one with the lower expected cost. It avoids the herd behaviour
+  of always picking the global minimum from slightly stale signals, at
+  O(1) cost per choice.
+
+Custom policies subclass :class:`SelectionPolicy` and implement ``select``.
+"""
+
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Sequence
+
+from harmonicgalaxy.agents.base import Agent
+
+# Latency assumed for agents without samples yet, so new agents get tried
+_DEFAULT_LATENCY = 0.0
+# Floor of the success rate in the cost, so a failing agent costs at most 20x
+_MIN_SUCCESS_RATE = 0.05
+# Width of the error rate steps compared before any other signal
+_ERROR_LEVEL_STEP = 0.1
+
+
+class AgentLoad:
+    """Live load signals of one agent."""
+
+    __slots__ = ("in_flight", "latency", "error_rate", "completed", "failed")
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def cost(self) -> float:
+        """Expected time to serve one more step: queue length times latency, error-penalized."""
+        latency = _DEFAULT_LATENCY if self.latency is None else self.latency
+        return (self.in_flight + 1) * latency / max(1.0 - self.error_rate, _MIN_SUCCESS_RATE)
+
+    @property
+    def error_level(self) -> int:
+        """Error rate in steps of 10% (0: below 10%), compared before load and cost."""
+        return int(self.error_rate / _ERROR_LEVEL_STEP)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"AgentLoad(in_flight={self.in_flight}, latency={self.latency}, "
+            f"error_rate={self.error_rate:.3f})"
+        )
+
+
+class LoadTracker:
+    """Per-agent load signals, keyed by agent name."""
+
+    def __init__(self, alpha: float = 0.2):
+        """Initialize tracker.
+
+        Args:
+            alpha: EWMA weight of the newest sample (higher reacts faster)
+        """
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self._loads: Dict[str, AgentLoad] = {}
+
+    def __getitem__(self, agent: str) -> AgentLoad:
+        load = self._loads.get(agent)
+        if load is None:
+            load = self._loads[agent] = AgentLoad()
+        return load
+
+    def started(self, agent: str) -> None:
+        """Record a step dispatched to ``agent``."""
+        self[agent].in_flight += 1
+
+    def finished(self, agent: str, duration: float, failed: bool = False) -> None:
+        """Record the end of a step of ``agent``.
+
+        Args:
+            agent: Agent name
+            duration: Seconds the step took
+            failed: Whether the step failed
+        """
+        load = self[agent]
+        load.in_flight -= 1
+        alpha = self.alpha
+        if load.latency is None:
+            load.latency = duration
+        else:
+            load.latency += alpha * (duration - load.latency)
+        load.error_rate += alpha * ((1.0 if failed else 0.0) - load.error_rate)
+        if failed:
+            load.failed += 1
+        else:
+            load.completed += 1
+
+    def cancelled(self, agent: str) -> None:
+        """Record a step of ``agent`` abandoned before finishing (no latency sample)."""
+        self[agent].in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Load signals of every agent seen so far."""
+        return {agent: load.to_dict() for agent, load in self._loads.items()}
+
+
+class SelectionPolicy(ABC):
+    """Chooses one agent among candidates able to run a step."""
+
+    @abstractmethod
+    def select(self, candidates: Sequence[Agent], loads: LoadTracker) -> Agent:
+        """Choose an agent.
+
+        Args:
+            candidates: Agents able to run the step, in registry order (at least one)
+            loads: Live load signals
+
+        Returns:
+            The chosen agent
+        """
+        pass
+
+
+class FirstMatchPolicy(SelectionPolicy):
+    """Always the first candidate (registry order), ignoring load."""
+
+    def select(self, candidates: Sequence[Agent], loads: LoadTracker) -> Agent:
+        return candidates[0]
+
+
+class LeastOutstandingPolicy(SelectionPolicy):
+    """Fewest steps in flight among the agents failing least.
+
+    Ties go to the lower expected cost, then registry order.
+    """
+
+    def select(self, candidates: Sequence[Agent], loads: LoadTracker) -> Agent:
+        best = candidates[0]
+        best_key = None
+        for agent in candidates:
+            load = loads[agent.name]
+            key = (load.error_level, load.in_flight, load.cost)
+            if best_key is None or key < best_key:
+                best, best_key = agent, key
+        return best
+
+
+class PowerOfTwoChoicesPolicy(SelectionPolicy):
+    """Lower expected cost of two candidates sampled at random, failing least first."""
+
+    def __init__(self, seed: Optional[int] = None):
+        """Initialize policy.
+
+        Args:
+            seed: Seed of the sampling (for reproducible choices)
+        """
+        self._random = random.Random(seed)
+
+    def select(self, candidates: Sequence[Agent], loads: LoadTracker) -> Agent:
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = self._random.sample(candidates, 2)
+        first_load, second_load = loads[first.name], loads[second.name]
+        second_key = (second_load.error_level, second_load.cost, second_load.in_flight)
+        if second_key < (first_load.error_level, first_load.cost, first_load.in_flight):
+            return second
+        return first
@@ -1,2 +1,37 @@
 """Context & state management."""
 
+from harmonicgalaxy.state.backends import (
+    Durability,
+    MemoryBackend,
+    MmapLogBackend,
+    SQLiteBackend,
+    StateBackend,
+)
+from harmonicgalaxy.state.checkpoint import MissionCheckpointer
+from harmonicgalaxy.state.indexes import MissionIndex, Range
+from harmonicgalaxy.state.manager import StateManager, create_backend
+from harmonicgalaxy.state.persistent import (
+    Change,
+    PersistentMap,
+    PersistentVector,
+    freeze,
+    thaw,
+)
+
+__all__ = [
+    "Change",
+    "Durability",
+    "MemoryBackend",
+    "MissionCheckpointer",
+    "MissionIndex",
+    "MmapLogBackend",
+    "PersistentMap",
+    "PersistentVector",
+    "Range",
+    "SQLiteBackend",
+    "StateBackend",
+    "StateManager",
+    "create_backend",
+    "freeze",
+    "thaw",
+]
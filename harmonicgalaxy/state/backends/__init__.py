@@ -0,0 +1,15 @@
+"""Storage backends of the state manager."""
+
+from harmonicgalaxy.state.backends.base import Durability, StateBackend, Write
+from harmonicgalaxy.state.backends.memory import MemoryBackend
+from harmonicgalaxy.state.backends.mmap_log import MmapLogBackend
+from harmonicgalaxy.state.backends.sqlite import SQLiteBackend
+
+__all__ = [
+    "Durability",
+    "MemoryBackend",
+    "MmapLogBackend",
+    "SQLiteBackend",
+    "StateBackend",
+    "Write",
+]
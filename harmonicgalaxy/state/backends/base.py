@@ -0,0 +1,181 @@
+"""State backend interface.
+
+Backends store opaque byte values under string keys; the
+:class:`~harmonicgalaxy.state.manager.StateManager` serializes values on
+top of them. Every backend exposes the same async API, so the store can be
+swapped without touching the code using it.
+"""
+
+import bisect
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+#: Write of a batch: the new value of a key, or None to delete it
+Write = Tuple[str, Optional[bytes]]
+
+
+class Durability(str, Enum):
+    """When a write is acknowledged, relative to reaching stable storage."""
+
+    #: Acknowledged once applied; stable after :meth:`StateBackend.flush`, on
+    #: close or by OS writeback. Survives a process crash, not a power loss.
+    NONE = "none"
+    #: Group commit: acknowledged after an fsync shared by every write
+    #: pending at the same time.
+    BATCH = "batch"
+    #: Every write is fsynced on its own before being acknowledged.
+    FULL = "full"
+
+
+def prefix_end(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with ``prefix``.
+
+    Returns None when there is none (empty prefix, or only maximal code points).
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+def key_range(
+    prefix: str = "", start: Optional[str] = None, end: Optional[str] = None
+) -> Tuple[str, Optional[str]]:
+    """Bounds ``[low, high)`` of the keys starting with ``prefix`` within ``[start, end)``.
+
+    ``high`` is None when the range is unbounded above.
+    """
+    low = prefix if start is None or start < prefix else start
+    high = prefix_end(prefix)
+    if end is not None and (high is None or end < high):
+        high = end
+    return low, high
+
+
+class SortedKeys:
+    """Keys kept in order, for range scans of backends indexed by a dictionary.
+
+    Adding or removing a key is a binary search plus a list insertion, and a
+    scan is a binary search plus a slice, instead of sorting every key.
+    """
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._keys = sorted(keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str) -> None:
+        """Add a key that is not present."""
+        bisect.insort(self._keys, key)
+
+    def remove(self, key: str) -> None:
+        """Remove a key that is present."""
+        del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def range(
+        self,
+        prefix: str = "",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Return the keys selected like :meth:`StateBackend.scan`, in order."""
+        keys = self._keys
+        low, high = key_range(prefix, start, end)
+        first = bisect.bisect_left(keys, low)
+        last = len(keys) if high is None else bisect.bisect_left(keys, high, first)
+        if limit is not None:
+            last = min(last, first + limit)
+        return keys[first:last]
+
+
+class StateBackend(ABC):
+    """Async key/value store of byte values."""
+
+    def __init__(self, durability: Durability = Durability.BATCH):
+        """Initialize backend.
+
+        Args:
+            durability: When writes are acknowledged (see :class:`Durability`)
+        """
+        self.durability = Durability(durability)
+
+    async def open(self) -> None:
+        """Open the store (create or recover it)."""
+        pass
+
+    async def close(self) -> None:
+        """Make every write durable and release the store."""
+        pass
+
+    async def __aenter__(self) -> "StateBackend":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the value of ``key``, or None if it is not set."""
+        pass
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Return the values of ``keys`` (None for missing keys), in order."""
+        return [await self.get(key) for key in keys]
+
+    @abstractmethod
+    async def write(self, writes: Iterable[Write]) -> None:
+        """Apply a batch of writes atomically.
+
+        Args:
+            writes: ``(key, value)`` pairs; a None value deletes the key
+        """
+        pass
+
+    async def put(self, key: str, value: bytes) -> None:
+        """Set ``key`` to ``value``."""
+        await self.write([(key, value)])
+
+    async def delete(self, key: str) -> bool:
+        """Delete ``key``; return whether it existed."""
+        existed = await self.get(key) is not None
+        await self.write([(key, None)])
+        return existed
+
+    @abstractmethod
+    async def scan(
+        self,
+        prefix: str = "",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, bytes]]:
+        """Return the ``(key, value)`` pairs whose key starts with ``prefix``, by key.
+
+        Args:
+            prefix: Prefix of the keys
+            start: Smallest key to return (inclusive)
+            end: Key to stop before (exclusive)
+            limit: Maximum number of pairs to return
+        """
+        pass
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Return the number of keys."""
+        pass
+
+    async def flush(self) -> None:
+        """Make every acknowledged write durable, whatever the durability level."""
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend counters (commits, syncs, sizes), for monitoring and benchmarks."""
+        return {}
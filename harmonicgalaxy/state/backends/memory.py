@@ -0,0 +1,61 @@
+"""In-memory state backend."""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from harmonicgalaxy.state.backends.base import Durability, SortedKeys, StateBackend, Write
+
+
+class MemoryBackend(StateBackend):
+    """Dictionary of byte values, lost when the process exits.
+
+    For tests, ephemeral missions and as a baseline for the durable
+    backends. The durability level is ignored.
+    """
+
+    def __init__(self, durability: Durability = Durability.NONE):
+        super().__init__(durability)
+        self._data: Dict[str, bytes] = {}
+        self._keys = SortedKeys()
+        self.writes = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._data.get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        data = self._data
+        return [data.get(key) for key in keys]
+
+    async def write(self, writes: Iterable[Write]) -> None:
+        data, keys = self._data, self._keys
+        for key, value in writes:
+            if value is None:
+                if data.pop(key, None) is not None:
+                    keys.remove(key)
+            else:
+                if key not in data:
+                    keys.add(key)
+                data[key] = bytes(value)
+            self.writes += 1
+
+    async def delete(self, key: str) -> bool:
+        self.writes += 1
+        if self._data.pop(key, None) is None:
+            return False
+        self._keys.remove(key)
+        return True
+
+    async def scan(
+        self,
+        prefix: str = "",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, bytes]]:
+        data = self._data
+        return [(key, data[key]) for key in self._keys.range(prefix, start, end, limit)]
+
+    async def count(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"keys": len(self._data), "writes": self.writes}
@@ -0,0 +1,422 @@
+"""Memory-mapped, log-structured state backend.
+
+The store is one append-only file, mapped into memory::
+
+    file:    b"HGSTLOG1" record* zero-filled tail
+    record:  crc32 (4) | flags (1) | key length (4) | value length (4) | key | value
+
+A write appends one record per key (a delete appends a tombstone) and an
+in-memory index maps every key to the offset of its latest value, so a
+read is a dictionary lookup and a copy out of the mapping, without a
+system call. The file grows by doubling and is remapped when it does.
+
+On open, the log is replayed to rebuild the index. Records of one batch
+are chained by a flag and only applied once the whole batch is read, so
+batches stay atomic; replay stops at the first record whose checksum does
+not match (a write torn by a crash), and the rest of the file is zeroed
+so later appends cannot bring stale records back.
+
+Overwritten values and tombstones stay in the file until
+:meth:`MmapLogBackend.compact` rewrites the live records into a new file.
+
+Writes reach the disk through ``fsync`` of the file descriptor, which also
+writes back the pages dirtied through the mapping. At
+:attr:`~Durability.BATCH`, one fsync covers every write appended before it
+started, and writers arriving while it runs share the next one.
+"""
+
+import asyncio
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from harmonicgalaxy.state.backends.base import Durability, SortedKeys, StateBackend, Write
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_MAGIC = b"HGSTLOG1"
+# crc32 of the rest of the record, flags, key length, value length
+_RECORD = struct.Struct("<IBII")
+_HEAD = struct.Struct("<BII")
+_DELETE = 1
+# Set on every record of a batch but the last
+_MORE = 2
+
+# Granularity of the zero checks of the file tail
+_CHUNK = 1 << 20
+
+# Index entry: offset of the value, its length and the length of the whole record
+_Location = Tuple[int, int, int]
+
+
+def _encode(key: str, value: Optional[bytes], more: bool) -> Tuple[bytes, int]:
+    """Encode a record; return it and the offset of the value inside it."""
+    key_bytes = key.encode("utf-8")
+    flags = (_DELETE if value is None else 0) | (_MORE if more else 0)
+    value = value if value is not None else b""
+    head = _HEAD.pack(flags, len(key_bytes), len(value))
+    crc = zlib.crc32(value, zlib.crc32(key_bytes, zlib.crc32(head)))
+    record = b"".join((struct.pack("<I", crc), head, key_bytes, value))
+    return record, _RECORD.size + len(key_bytes)
+
+
+def _is_zero(mm: mmap.mmap, start: int) -> bool:
+    zeros = bytes(_CHUNK)
+    for offset in range(start, len(mm), _CHUNK):
+        chunk = mm[offset : offset + _CHUNK]
+        if chunk != zeros[: len(chunk)]:
+            return False
+    return True
+
+
+def _zero(mm: mmap.mmap, start: int) -> None:
+    zeros = bytes(_CHUNK)
+    for offset in range(start, len(mm), _CHUNK):
+        end = min(offset + _CHUNK, len(mm))
+        mm[offset:end] = zeros[: end - offset]
+
+
+def _write_log(path: Path, items: List[Tuple[str, bytes]]) -> Tuple[int, Dict[str, _Location]]:
+    """Write a fresh log holding ``items`` and fsync it; return its end and index."""
+    index: Dict[str, _Location] = {}
+    offset = len(_MAGIC)
+    with open(path, "wb") as file:
+        file.write(_MAGIC)
+        for key, value in items:
+            record, value_offset = _encode(key, value, False)
+            index[key] = (offset + value_offset, len(value), len(record))
+            file.write(record)
+            offset += len(record)
+        file.flush()
+        os.fsync(file.fileno())
+    return offset, index
+
+
+class MmapLogBackend(StateBackend):
+    """State in a memory-mapped append-only log file."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        durability: Durability = Durability.BATCH,
+        initial_size: int = 1 << 20,
+    ):
+        """Initialize backend.
+
+        Args:
+            path: Log file (created if missing)
+            durability: When writes are acknowledged (see :class:`Durability`)
+            initial_size: Initial size of the file, in bytes
+        """
+        super().__init__(durability)
+        self.path = Path(path)
+        self.initial_size = max(initial_size, mmap.PAGESIZE)
+        self._fd = -1
+        self._mm: Optional[mmap.mmap] = None
+        self._end = 0
+        self._index: Dict[str, _Location] = {}
+        # Keys of the index in order, for scans
+        self._keys = SortedKeys()
+        self._live = 0
+        # Bytes appended since open, and how many of them are known durable
+        self._appended = 0
+        self._synced = 0
+        self._group_sync: Optional["asyncio.Future[None]"] = None
+        self._syncing = 0
+        self._sync_idle = asyncio.Event()
+        self._sync_idle.set()
+        # Write batches made while a compaction rewrites the file
+        self._compaction: Optional[List[List[Write]]] = None
+        self.syncs = 0
+        self.compactions = 0
+
+    # -- file management -----------------------------------------------------
+
+    async def open(self) -> None:
+        if self._mm is not None:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._open)
+        logger.debug(
+            f"Mmap state log opened: {self.path} ({len(self._index)} keys, "
+            f"{self._end} bytes, {self.durability.value})"
+        )
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                os.write(fd, _MAGIC)
+                size = self.initial_size
+                os.ftruncate(fd, size)
+                os.fsync(fd)
+            mm = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        if mm[: len(_MAGIC)] != _MAGIC:
+            mm.close()
+            os.close(fd)
+            raise ValueError(f"Not a state log: {self.path}")
+        self._fd, self._mm = fd, mm
+        self._replay()
+
+    def _replay(self) -> None:
+        """Rebuild the index from the log, dropping a torn tail."""
+        mm = self._mm
+        assert mm is not None
+        size = len(mm)
+        index: Dict[str, _Location] = {}
+        live = 0
+        batch: List[Tuple[str, Optional[_Location]]] = []
+        offset = committed = len(_MAGIC)
+        with memoryview(mm) as view:
+            while offset + _RECORD.size <= size:
+                crc, flags, key_length, value_length = _RECORD.unpack_from(mm, offset)
+                value_offset = offset + _RECORD.size + key_length
+                end = value_offset + value_length
+                if end > size or flags & ~(_DELETE | _MORE) or (crc == 0 and key_length == 0):
+                    break
+                if zlib.crc32(view[offset + 4 : end]) != crc:
+                    break
+                key = bytes(view[offset + _RECORD.size : value_offset]).decode("utf-8")
+                location = None if flags & _DELETE else (value_offset, value_length, end - offset)
+                batch.append((key, location))
+                offset = end
+                if not flags & _MORE:
+                    for key, location in batch:
+                        previous = index.pop(key, None)
+                        if previous is not None:
+                            live -= previous[2]
+                        if location is not None:
+                            index[key] = location
+                            live += location[2]
+                    batch.clear()
+                    committed = offset
+        if not _is_zero(mm, committed):
+            logger.warning(f"Mmap state log {self.path}: dropping torn tail at offset {committed}")
+            _zero(mm, committed)
+            os.fsync(self._fd)
+        self._index, self._live, self._end = index, live, committed
+        self._keys = SortedKeys(index)
+
+    def _reserve(self, length: int) -> None:
+        """Grow (and remap) the file so ``length`` more bytes fit."""
+        assert self._mm is not None
+        size = len(self._mm)
+        needed = self._end + length
+        if needed <= size:
+            return
+        while size < needed:
+            size *= 2
+        os.ftruncate(self._fd, size)
+        self._mm.close()
+        self._mm = mmap.mmap(self._fd, size)
+
+    async def close(self) -> None:
+        if self._mm is None:
+            return
+        await self.flush()
+        await self._sync_idle.wait()
+        self._mm.close()
+        os.close(self._fd)
+        self._mm, self._fd = None, -1
+
+    # -- reads ---------------------------------------------------------------
+
+    def _check_open(self) -> mmap.mmap:
+        if self._mm is None:
+            raise RuntimeError("Mmap state log is not open")
+        return self._mm
+
+    async def get(self, key: str) -> Optional[bytes]:
+        mm = self._check_open()
+        location = self._index.get(key)
+        if location is None:
+            return None
+        offset, length, _ = location
+        return mm[offset : offset + length]
+
+    async def get_many(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        mm = self._check_open()
+        index = self._index
+        values: List[Optional[bytes]] = []
+        for key in keys:
+            location = index.get(key)
+            values.append(None if location is None else mm[location[0] : location[0] + location[1]])
+        return values
+
+    async def scan(
+        self,
+        prefix: str = "",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, bytes]]:
+        mm = self._check_open()
+        index = self._index
+        return [
+            (key, mm[index[key][0] : index[key][0] + index[key][1]])
+            for key in self._keys.range(prefix, start, end, limit)
+        ]
+
+    async def count(self) -> int:
+        self._check_open()
+        return len(self._index)
+
+    # -- writes --------------------------------------------------------------
+
+    def _append(self, writes: List[Write]) -> None:
+        """Append a batch to the log and update the index."""
+        last = len(writes) - 1
+        encoded = [_encode(key, value, i < last) for i, (key, value) in enumerate(writes)]
+        data = b"".join(record for record, _ in encoded)
+        self._reserve(len(data))
+        mm = self._mm
+        assert mm is not None
+        start = self._end
+        mm[start : start + len(data)] = data
+        offset = start
+        index = self._index
+        keys = self._keys
+        for (key, value), (record, value_offset) in zip(writes, encoded):
+            previous = index.pop(key, None)
+            if previous is not None:
+                self._live -= previous[2]
+            if value is not None:
+                index[key] = (offset + value_offset, len(value), len(record))
+                self._live += len(record)
+                if previous is None:
+                    keys.add(key)
+            elif previous is not None:
+                keys.remove(key)
+            offset += len(record)
+        self._end = offset
+        self._appended += len(data)
+
+    async def write(self, writes: Iterable[Write]) -> None:
+        self._check_open()
+        writes = [(key, None if value is None else bytes(value)) for key, value in writes]
+        if not writes:
+            return
+        self._append(writes)
+        if self._compaction is not None:
+            self._compaction.append(writes)
+        await self._persist()
+
+    async def delete(self, key: str) -> bool:
+        self._check_open()
+        if key not in self._index:
+            return False
+        await self.write([(key, None)])
+        return True
+
+    async def _fsync(self) -> None:
+        """fsync the file in a thread; mark what was appended before as durable."""
+        target = self._appended
+        loop = asyncio.get_running_loop()
+        self._syncing += 1
+        self._sync_idle.clear()
+        try:
+            await loop.run_in_executor(None, os.fsync, self._fd)
+        finally:
+            self._syncing -= 1
+            if not self._syncing:
+                self._sync_idle.set()
+        self.syncs += 1
+        self._synced = max(self._synced, target)
+
+    async def _persist(self) -> None:
+        if self.durability is Durability.NONE:
+            return
+        if self.durability is Durability.FULL:
+            await self._fsync()
+            return
+        target = self._appended
+        while self._synced < target:
+            if self._group_sync is None:
+                self._group_sync = asyncio.ensure_future(self._run_group_sync())
+            await asyncio.shield(self._group_sync)
+
+    async def _run_group_sync(self) -> None:
+        try:
+            await self._fsync()
+        finally:
+            self._group_sync = None
+
+    async def flush(self) -> None:
+        if self._mm is not None and self._synced < self._appended:
+            await self._fsync()
+
+    async def compact(self) -> None:
+        """Rewrite the live records into a new file, dropping overwritten values.
+
+        The rewrite runs in a thread while reads and writes go on; writes
+        made meanwhile are carried over before the new file replaces the
+        old one, which briefly blocks for a final fsync.
+        """
+        mm = self._check_open()
+        if self._compaction is not None:
+            raise RuntimeError("Compaction already running")
+        items = [
+            (key, mm[offset : offset + length])
+            for key, (offset, length, _) in self._index.items()
+        ]
+        self._compaction = []
+        temporary = self.path.with_name(self.path.name + ".compact")
+        loop = asyncio.get_running_loop()
+        try:
+            end, index = await loop.run_in_executor(None, _write_log, temporary, items)
+            await self._sync_idle.wait()
+        except BaseException:
+            self._compaction = None
+            temporary.unlink(missing_ok=True)
+            raise
+        # From here on, no awaits: writes cannot interleave with the swap
+        pending, self._compaction = self._compaction, None
+        old_mm, old_fd = self._mm, self._fd
+        fd = os.open(temporary, os.O_RDWR)
+        os.ftruncate(fd, max(self.initial_size, end * 2))
+        self._fd, self._mm = fd, mmap.mmap(fd, os.fstat(fd).st_size)
+        self._index, self._end = index, end
+        self._keys = SortedKeys(index)
+        self._live = sum(location[2] for location in index.values())
+        for writes in pending:
+            self._append(writes)
+        os.fsync(fd)
+        os.replace(temporary, self.path)
+        _fsync_directory(self.path.parent)
+        self._synced = self._appended
+        old_mm.close()
+        os.close(old_fd)
+        self.compactions += 1
+        logger.debug(f"Mmap state log {self.path} compacted to {self._end} bytes")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._index),
+            "log_bytes": self._end,
+            "live_bytes": self._live,
+            "file_bytes": len(self._mm) if self._mm is not None else 0,
+            "syncs": self.syncs,
+            "compactions": self.compactions,
+        }
+
+
+def _fsync_directory(path: Path) -> None:
+    """Make a rename in ``path`` durable (no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,287 @@
+"""SQLite state backend in WAL mode with group commit.
+
+SQLite connections block, so the backend runs them on dedicated threads:
+
+- a **writer thread** owns the write connection. Writes are queued with
+  their futures; the thread takes every write pending when it becomes
+  free (up to ``max_batch``), applies them in one transaction and commits
+  once. Under load, many writes share one commit and, at
+  :attr:`Durability.BATCH`, one fsync of the write-ahead log (group
+  commit); an idle store commits each write immediately, with no added
+  latency. At :attr:`Durability.FULL` every write gets its own commit.
+- a **reader thread** owns a second connection. In WAL mode readers see
+  the last committed state without blocking the writer, and writes are
+  acknowledged only once committed, so a task reads its own writes.
+
+``synchronous`` is ``OFF`` at :attr:`Durability.NONE` and ``FULL`` (fsync
+of the WAL on every commit) otherwise.
+"""
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from harmonicgalaxy.state.backends.base import Durability, StateBackend, Write, key_range
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID"
+)
+
+# Writer operations: apply writes, delete one key (reporting whether it existed), checkpoint
+_WRITE = "write"
+_DELETE = "delete"
+_CHECKPOINT = "checkpoint"
+
+
+class SQLiteBackend(StateBackend):
+    """State in an SQLite database file (WAL mode, group commit)."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        durability: Durability = Durability.BATCH,
+        max_batch: int = 1024,
+    ):
+        """Initialize backend.
+
+        Args:
+            path: Database file (created if missing)
+            durability: When writes are acknowledged (see :class:`Durability`)
+            max_batch: Maximum number of queued operations committed together
+        """
+        super().__init__(durability)
+        self.path = Path(path)
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._reader: Optional[ThreadPoolExecutor] = None
+        self._read_connection: Optional[sqlite3.Connection] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.commits = 0
+        self.operations = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        synchronous = "OFF" if self.durability is Durability.NONE else "FULL"
+        connection.execute(f"PRAGMA synchronous={synchronous}")
+        return connection
+
+    def _open_connections(self) -> Tuple[sqlite3.Connection, sqlite3.Connection]:
+        """Create the table and connect the reader and the writer (blocking)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute(_SCHEMA)
+            return connection, self._connect()
+        except BaseException:
+            connection.close()
+            raise
+
+    async def open(self) -> None:
+        if self._writer is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-state-reader")
+        # Connecting may wait on the database lock: keep it off the event loop
+        try:
+            connection, write_connection = await self._loop.run_in_executor(
+                reader, self._open_connections
+            )
+        except BaseException:
+            reader.shutdown(wait=False)
+            raise
+        self._reader = reader
+        self._read_connection = connection
+        self._writer = threading.Thread(
+            target=self._write_loop,
+            args=(write_connection,),
+            name="sqlite-state-writer",
+            daemon=True,
+        )
+        self._writer.start()
+        logger.debug(f"SQLite state backend opened: {self.path} ({self.durability.value})")
+
+    async def close(self) -> None:
+        if self._writer is None:
+            return
+        await self.flush()
+        self._queue.put(None)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.join)
+        self._writer = None
+        reader, self._reader = self._reader, None
+        connection, self._read_connection = self._read_connection, None
+        if reader is not None and connection is not None:
+            await loop.run_in_executor(reader, connection.close)
+            reader.shutdown(wait=False)
+
+    # -- reads ---------------------------------------------------------------
+
+    async def _read(self, query: str, parameters: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        if self._reader is None or self._read_connection is None:
+            raise RuntimeError("SQLite state backend is not open")
+        connection = self._read_connection
+        return await asyncio.get_running_loop().run_in_executor(
+            self._reader, lambda: connection.execute(query, parameters).fetchall()
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        rows = await self._read("SELECT value FROM state WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    async def get_many(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        keys = list(keys)
+        if not keys:
+            return []
+        values: Dict[str, bytes] = {}
+        # Stay under SQLite's bound parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = await self._read(
+                f"SELECT key, value FROM state WHERE key IN ({placeholders})", tuple(chunk)
+            )
+            values.update(rows)
+        return [values.get(key) for key in keys]
+
+    async def scan(
+        self,
+        prefix: str = "",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, bytes]]:
+        low, high = key_range(prefix, start, end)
+        query, parameters = "SELECT key, value FROM state WHERE key >= ?", [low]
+        if high is not None:
+            query += " AND key < ?"
+            parameters.append(high)
+        query += " ORDER BY key"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        rows = await self._read(query, tuple(parameters))
+        return [(key, value) for key, value in rows]
+
+    async def count(self) -> int:
+        rows = await self._read("SELECT count(*) FROM state", ())
+        return rows[0][0]
+
+    # -- writes --------------------------------------------------------------
+
+    async def _submit(self, operation: str, payload: Any) -> Any:
+        if self._writer is None or self._loop is None:
+            raise RuntimeError("SQLite state backend is not open")
+        future = self._loop.create_future()
+        self._queue.put((operation, payload, future))
+        return await future
+
+    async def write(self, writes: Iterable[Write]) -> None:
+        writes = [(key, None if value is None else bytes(value)) for key, value in writes]
+        if writes:
+            await self._submit(_WRITE, writes)
+
+    async def delete(self, key: str) -> bool:
+        return await self._submit(_DELETE, key)
+
+    async def flush(self) -> None:
+        """Checkpoint the WAL into the database file with fsyncs."""
+        if self._writer is not None:
+            await self._submit(_CHECKPOINT, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"commits": self.commits, "operations": self.operations}
+
+    def _write_loop(self, connection: sqlite3.Connection) -> None:
+        """Writer thread: commit the queued operations in groups."""
+        batch_limit = 1 if self.durability is Durability.FULL else self.max_batch
+        stopping = False
+        try:
+            while not stopping:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < batch_limit:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                self._commit(connection, batch)
+        finally:
+            connection.close()
+
+    def _commit(self, connection: sqlite3.Connection, batch: List[Tuple[str, Any, Any]]) -> None:
+        results: List[Any] = []
+        try:
+            connection.execute("BEGIN")
+            for operation, payload, _ in batch:
+                if operation == _WRITE:
+                    results.append(self._apply(connection, payload))
+                elif operation == _DELETE:
+                    cursor = connection.execute("DELETE FROM state WHERE key = ?", (payload,))
+                    results.append(cursor.rowcount > 0)
+                else:
+                    results.append(None)
+            connection.execute("COMMIT")
+            if any(operation == _CHECKPOINT for operation, _, _ in batch):
+                connection.execute("PRAGMA synchronous=FULL")
+                connection.execute("PRAGMA wal_checkpoint(FULL)")
+                if self.durability is Durability.NONE:
+                    connection.execute("PRAGMA synchronous=OFF")
+        except Exception as e:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            if len(batch) > 1:
+                # Do not fail every write of the group for one bad operation
+                for item in batch:
+                    self._commit(connection, [item])
+                return
+            logger.error(f"SQLite state commit failed: {e}")
+            self._loop.call_soon_threadsafe(_set_exception, batch[0][2], e)
+            return
+        self.commits += 1
+        self.operations += len(batch)
+        for (_, _, future), result in zip(batch, results):
+            self._loop.call_soon_threadsafe(_set_result, future, result)
+
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, writes: List[Write]) -> None:
+        puts = [(key, value) for key, value in writes if value is not None]
+        deletes = [(key,) for key, value in writes if value is None]
+        # Writes of one batch apply in order: a later write of a key wins
+        if puts and deletes:
+            for key, value in writes:
+                if value is None:
+                    connection.execute("DELETE FROM state WHERE key = ?", (key,))
+                else:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value)
+                    )
+            return
+        if puts:
+            connection.executemany("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", puts)
+        if deletes:
+            connection.executemany("DELETE FROM state WHERE key = ?", deletes)
+
+
+def _set_result(future: "asyncio.Future[Any]", result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: "asyncio.Future[Any]", error: BaseException) -> None:
+    if not future.done():
+        future.set_exception(error)
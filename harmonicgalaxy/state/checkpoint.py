@@ -0,0 +1,317 @@
+"""Mission checkpoints: a journal of state deltas plus periodic snapshots.
+
+Saving a whole mission after every step rewrites its context and full
+history each time, so the cost of a step grows with the mission. A
+:class:`MissionCheckpointer` instead appends one small delta per
+checkpoint to a write-ahead journal in the state store:
+
+- the steps recorded since the previous checkpoint and their new payloads
+  (the history is append-only, so this is a slice of it);
+- the changes to the other mission fields (status, context, result, ...)
+  by path, computed with :func:`~harmonicgalaxy.state.persistent.diff`
+  against the version frozen at the previous checkpoint. Only the fields
+  and context entries that were replaced or may have changed in place are
+  frozen again; the others keep their frozen version, so the diff skips
+  them by identity.
+
+Every ``snapshot_every`` deltas (or ``snapshot_bytes`` of them), the
+mission is written whole instead, and the deltas it covers are deleted in
+the same atomic batch, so the journal never grows without bound.
+:meth:`MissionCheckpointer.recover` loads the last snapshot and replays
+only the deltas written after it.
+
+Checkpoints also update the mission's secondary indexes in the state
+manager, in the same batch, so running missions can be queried.
+
+Each checkpoint is acknowledged according to the backend's durability
+(e.g. group commit), so a mission restored after a crash has every step
+that was checkpointed. :class:`~harmonicgalaxy.orchestrator.engine.OrchestrationEngine`
+checkpoints after each step when given a checkpointer and, when it runs a
+recovered mission, skips the steps that already succeeded.
+
+Example:
+    >>> checkpointer = MissionCheckpointer(state, snapshot_every=32)
+    >>> await engine.run(mission, graph)           # engine has the checkpointer
+    ... # the worker dies; on another worker:
+    >>> mission = await checkpointer.recover(mission_id)
+    >>> await engine.run(mission, graph)           # resumes after the last step
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.llm.serialization import dumps
+from harmonicgalaxy.state.journal import (
+    CHECKPOINT_PREFIX,
+    delta_key,
+    delta_prefix,
+    read_journal,
+    snapshot_key,
+)
+from harmonicgalaxy.state.manager import StateManager
+from harmonicgalaxy.state.persistent import MISSING, PersistentMap, diff, freeze, thaw
+
+# Values that cannot change without being replaced
+_IMMUTABLE = (str, bytes, int, float, bool, type(None))
+
+
+def _unchanged(raw: Dict[str, Any], key: str, value: Any) -> bool:
+    """Whether ``value`` is the immutable object frozen for ``key`` last time."""
+    return isinstance(value, _IMMUTABLE) and key in raw and raw[key] is value
+
+
+def _freeze_entries(
+    data: Dict[str, Any], frozen: PersistentMap, raw: Dict[str, Any]
+) -> PersistentMap:
+    """Freeze the entries of a dict, reusing the frozen values of the unchanged ones."""
+    for key in raw.keys() - data.keys():
+        frozen = frozen.delete(key)
+    for key, value in data.items():
+        if not _unchanged(raw, key, value):
+            frozen = frozen.set(key, freeze(value))
+    return frozen
+
+
+def _fields(
+    data: Dict[str, Any],
+    previous: Optional[PersistentMap] = None,
+    raw: Optional[Dict[str, Any]] = None,
+) -> Tuple[PersistentMap, Dict[str, Any]]:
+    """Mission fields other than the history, frozen for diffing.
+
+    Dict fields (context, metadata) are compared entry by entry, so a
+    checkpoint costs the size of the entries that changed, not of the
+    whole context. Mutable values may have changed in place, so they are
+    always frozen again.
+
+    Args:
+        data: Mission in dictionary format
+        previous: Fields frozen by the previous call (None: freeze everything)
+        raw: Values frozen by the previous call, as returned by it
+
+    Returns:
+        The frozen fields and the values they were frozen from
+    """
+    frozen = PersistentMap() if previous is None else previous
+    raw = {} if raw is None else raw
+    values: Dict[str, Any] = {}
+    for key in raw.keys() - data.keys():
+        frozen = frozen.delete(key)
+    for key, value in data.items():
+        if key == "history":
+            continue
+        if isinstance(value, dict):
+            # A shallow copy: entries replaced later are told apart by identity
+            values[key] = entries = dict(value)
+            previous_entries, previous_value = raw.get(key), frozen.get(key)
+            if isinstance(previous_entries, dict) and isinstance(previous_value, PersistentMap):
+                frozen = frozen.set(
+                    key, _freeze_entries(entries, previous_value, previous_entries)
+                )
+                continue
+        else:
+            values[key] = value
+            if _unchanged(raw, key, value):
+                continue
+        frozen = frozen.set(key, freeze(value))
+    return frozen, values
+
+
+@dataclass
+class _Journal:
+    """What was last checkpointed for one mission."""
+
+    #: Sequence number of the last delta (or of the snapshot, if none since)
+    seq: int = 0
+    #: Sequence number of the last snapshot
+    base: int = 0
+    steps: int = 0
+    payloads: int = 0
+    fields: Optional[PersistentMap] = None
+    #: Values the fields were frozen from
+    raw: Dict[str, Any] = field(default_factory=dict)
+    #: Encoded size of the deltas written since the snapshot
+    delta_bytes: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class MissionCheckpointer:
+    """Journals mission state to a state store and recovers it."""
+
+    def __init__(
+        self,
+        state: StateManager,
+        snapshot_every: int = 32,
+        snapshot_bytes: int = 1 << 20,
+    ):
+        """Initialize checkpointer.
+
+        Args:
+            state: Store of the journals
+            snapshot_every: Deltas after which the next checkpoint is a snapshot
+            snapshot_bytes: Encoded size of deltas after which the next
+                checkpoint is a snapshot
+        """
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1")
+        self.state = state
+        self.snapshot_every = snapshot_every
+        self.snapshot_bytes = snapshot_bytes
+        self._journals: Dict[str, _Journal] = {}
+        # Counters
+        self.deltas = 0
+        self.snapshots = 0
+        self.bytes_written = 0
+        self.replayed = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"MissionCheckpointer(missions={len(self._journals)}, "
+            f"snapshot_every={self.snapshot_every})"
+        )
+
+    async def checkpoint(self, mission: Mission) -> int:
+        """Journal the changes to ``mission`` since its previous checkpoint.
+
+        The first checkpoint of a mission (in this process, unless it was
+        recovered) is a snapshot that replaces any previous journal.
+        Journals of finished missions are kept in the store, but no longer
+        tracked in memory after their last checkpoint.
+
+        Returns:
+            Sequence number of the checkpoint (unchanged if nothing changed)
+        """
+        journal = self._journals.get(mission.id)
+        if journal is None:
+            journal = self._journals[mission.id] = _Journal()
+        async with journal.lock:
+            if journal.fields is None:
+                await self._write_snapshot(mission, journal, replace=True)
+            else:
+                await self._write_delta(mission, journal)
+            if mission.status.is_terminal and self._journals.get(mission.id) is journal:
+                del self._journals[mission.id]
+            return journal.seq
+
+    async def snapshot(self, mission: Mission) -> int:
+        """Write ``mission`` whole and drop the deltas the snapshot covers.
+
+        Returns:
+            Sequence number of the snapshot
+        """
+        journal = self._journals.get(mission.id)
+        if journal is None:
+            journal = self._journals[mission.id] = _Journal()
+        async with journal.lock:
+            await self._write_snapshot(mission, journal, replace=journal.fields is None)
+            return journal.seq
+
+    async def _write_delta(self, mission: Mission, journal: _Journal) -> None:
+        fields, raw = _fields(mission.to_dict(include_history=False), journal.fields, journal.raw)
+        changes = diff(journal.fields, fields)
+        history = mission.history
+        if not changes and len(history) == journal.steps:
+            return
+        if (
+            journal.seq - journal.base >= self.snapshot_every
+            or journal.delta_bytes >= self.snapshot_bytes
+        ):
+            await self._write_snapshot(mission, journal)
+            return
+        mission.updated_at = updated_at = time.time()
+        fields = fields.set("updated_at", updated_at)
+        raw["updated_at"] = updated_at
+        delta = {
+            "changes": [
+                [list(change.path)] if change.new is MISSING
+                else [list(change.path), thaw(change.new)]
+                for change in changes
+                if change.path != ("updated_at",)
+            ]
+            + [[["updated_at"], updated_at]],
+            "history": history.to_dict(start=journal.steps, payload_start=journal.payloads),
+        }
+        data = dumps(delta)
+        seq = journal.seq + 1
+        await self.state.index_mission(mission, [(delta_key(mission.id, seq), data)])
+        journal.seq = seq
+        journal.steps = len(history)
+        journal.payloads = history.payload_count
+        journal.fields, journal.raw = fields, raw
+        journal.delta_bytes += len(data)
+        self.deltas += 1
+        self.bytes_written += len(data)
+
+    async def _write_snapshot(
+        self, mission: Mission, journal: _Journal, replace: bool = False
+    ) -> None:
+        mission.updated_at = time.time()
+        mission_data = mission.to_dict()
+        # The first snapshot of a journal is checkpoint 0
+        seq = 0 if replace else journal.seq + 1
+        data = dumps({"seq": seq, "mission": mission_data})
+        writes = [(snapshot_key(mission.id), data)]
+        if replace:
+            # Unknown journal: drop whatever deltas a previous run left
+            keys = [key for key, _ in await self.state.backend.scan(delta_prefix(mission.id))]
+        else:
+            keys = [delta_key(mission.id, seq) for seq in range(journal.base + 1, journal.seq + 1)]
+        writes.extend((key, None) for key in keys)
+        await self.state.index_mission(mission, writes)
+        journal.seq = journal.base = seq
+        journal.steps = len(mission.history)
+        journal.payloads = mission.history.payload_count
+        journal.fields, journal.raw = _fields(mission_data)
+        journal.delta_bytes = 0
+        self.snapshots += 1
+        self.bytes_written += len(data)
+
+    async def recover(self, mission_id: str) -> Optional[Mission]:
+        """Restore a mission from its last snapshot and the deltas written after it.
+
+        The mission's next checkpoint continues its journal.
+
+        Returns:
+            The mission as of its last checkpoint, or None if it has no journal
+        """
+        replay = await read_journal(self.state.backend, mission_id)
+        if replay is None:
+            return None
+        self.replayed += replay.deltas
+        mission = Mission.from_dict(replay.data)
+        fields, raw = _fields(mission.to_dict(include_history=False))
+        self._journals[mission_id] = _Journal(
+            seq=replay.seq,
+            base=replay.base,
+            steps=len(mission.history),
+            payloads=mission.history.payload_count,
+            fields=fields,
+            raw=raw,
+            delta_bytes=replay.delta_bytes,
+        )
+        return mission
+
+    async def discard(self, mission_id: str) -> bool:
+        """Delete the journal and index entries of a mission; return whether it had a journal."""
+        self._journals.pop(mission_id, None)
+        prefix = f"{CHECKPOINT_PREFIX}{mission_id}/"
+        keys = [key for key, _ in await self.state.backend.scan(prefix)]
+        await self.state.unindex_mission(mission_id, [(key, None) for key in keys])
+        return bool(keys)
+
+    def forget(self, mission_id: str) -> None:
+        """Stop tracking a mission in memory (its journal stays in the store)."""
+        self._journals.pop(mission_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return checkpoint counters."""
+        return {
+            "missions": len(self._journals),
+            "deltas": self.deltas,
+            "snapshots": self.snapshots,
+            "bytes_written": self.bytes_written,
+            "replayed": self.replayed,
+        }
@@ -0,0 +1,138 @@
+"""Secondary indexes of missions in the state store.
+
+Answering "which running missions are at step X" or "missions created more
+than an hour ago" from saved missions alone means loading and decoding all
+of them. A :class:`MissionIndex` declares a value (or several) to extract
+from a mission; the :class:`~harmonicgalaxy.state.manager.StateManager`
+stores one empty entry per indexed value in the same backend, in the same
+atomic batch as every mission write::
+
+    index/<index name>/<encoded value>\\x00<mission id>
+
+Values are encoded so that the order of the keys is the order of the
+values (numbers by numeric value, strings lexicographically), so a lookup
+is a prefix scan and a :class:`Range` of values, e.g. a time window, is a
+range scan of the backend, both proportional to the number of matches.
+
+The default ``step`` and ``agent`` indexes hold the steps in flight
+(:attr:`~harmonicgalaxy.core.mission.Mission.running_steps`), which the
+orchestration engine checkpoints when it dispatches a step, and ``updated``
+holds the time of the latest write of the mission.
+
+The entries written for a mission are recorded under ``indexed/<mission
+id>``, so the next write only replaces the entries that changed.
+
+Example:
+    >>> state = StateManager(backend)             # the default indexes
+    >>> stuck = await state.query(
+    ...     status="running", step="review", updated=Range(end=time.time() - 600)
+    ... )
+    >>> urgent = await state.query_missions(tag="urgent", limit=20)
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Tuple
+
+from harmonicgalaxy.core.mission import Mission
+
+#: Key prefix of index entries
+INDEX_PREFIX = "index/"
+#: Key prefix of the index entries recorded per mission
+INDEXED_PREFIX = "indexed/"
+
+# Separates the encoded value from the mission id; sorts before any other character
+_SEPARATOR = "\x00"
+_DOUBLE = struct.Struct(">d")
+_UINT64 = struct.Struct(">Q")
+_SIGN = 1 << 63
+
+
+@dataclass(frozen=True)
+class MissionIndex:
+    """A secondary index of missions.
+
+    Attributes:
+        name: Index name, used as the keyword of queries
+        values: Extracts the indexed value of a mission: a string, a number,
+            a list/tuple/set of them (e.g. tags), or None to leave the mission
+            out of the index
+    """
+
+    name: str
+    values: Callable[[Mission], Any]
+
+    def __post_init__(self) -> None:
+        if not self.name or "/" in self.name:
+            raise ValueError(f"Invalid index name: {self.name!r}")
+
+    def keys(self, mission: Mission) -> Iterator[str]:
+        """Yield the index entries of ``mission``."""
+        values = self.values(mission)
+        if values is None:
+            return
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            values = (values,)
+        prefix = f"{INDEX_PREFIX}{self.name}/"
+        for value in values:
+            if value is not None:
+                yield f"{prefix}{encode_value(value)}{_SEPARATOR}{mission.id}"
+
+
+class Range(NamedTuple):
+    """Query condition matching the values in ``[start, end)`` (None: unbounded)."""
+
+    start: Any = None
+    end: Any = None
+
+
+def encode_value(value: Any) -> str:
+    """Encode an indexed value so that string order follows value order.
+
+    Booleans sort before numbers, which sort before strings.
+
+    Raises:
+        TypeError: If the value is not a string, a number or a boolean
+    """
+    if isinstance(value, bool):
+        return "b1" if value else "b0"
+    if isinstance(value, (int, float)):
+        # IEEE 754 bits, with the sign bit flipped for positive numbers and
+        # every bit flipped for negative ones, compare like the numbers
+        (bits,) = _UINT64.unpack(_DOUBLE.pack(float(value)))
+        bits = bits ^ 0xFFFFFFFFFFFFFFFF if bits & _SIGN else bits | _SIGN
+        return f"n{bits:016x}"
+    if isinstance(value, str):
+        return "s" + value
+    raise TypeError(f"Cannot index a value of type {type(value).__name__}")
+
+
+def lookup_bounds(name: str, condition: Any) -> Tuple[str, Optional[str], Optional[str]]:
+    """Scan ``(prefix, start, end)`` of the entries of index ``name`` matching ``condition``."""
+    prefix = f"{INDEX_PREFIX}{name}/"
+    if isinstance(condition, Range):
+        start = None if condition.start is None else prefix + encode_value(condition.start)
+        end = None if condition.end is None else prefix + encode_value(condition.end)
+        return prefix, start, end
+    return f"{prefix}{encode_value(condition)}{_SEPARATOR}", None, None
+
+
+def entry_mission_id(key: str) -> str:
+    """Mission id of an index entry."""
+    return key.rpartition(_SEPARATOR)[2]
+
+
+#: Indexes of a state manager by default
+DEFAULT_INDEXES = (
+    MissionIndex("status", lambda mission: mission.status.value),
+    # Agents of the steps in flight
+    MissionIndex("agent", lambda mission: set(mission.running_steps.values())),
+    # Ids of the steps in flight
+    MissionIndex("step", lambda mission: list(mission.running_steps)),
+    MissionIndex("tag", lambda mission: mission.metadata.get("tags")),
+    MissionIndex("created", lambda mission: mission.created_at),
+    MissionIndex("started", lambda mission: mission.started_at),
+    MissionIndex("finished", lambda mission: mission.finished_at),
+    # Time of the latest write of the mission
+    MissionIndex("updated", lambda mission: mission.updated_at),
+)
@@ -0,0 +1,119 @@
+"""Layout and replay of the mission journals written by checkpoints.
+
+A journal is stored under ``checkpoint/<mission id>/``: the last snapshot
+of the mission, whole, and the deltas written after it, in sequence order
+(see :mod:`harmonicgalaxy.state.checkpoint`). This module only reads them,
+so that both the checkpointer and the
+:class:`~harmonicgalaxy.state.manager.StateManager` can restore journaled
+missions.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from harmonicgalaxy.llm.serialization import loads
+from harmonicgalaxy.state.backends import StateBackend
+from harmonicgalaxy.state.persistent import MISSING
+from harmonicgalaxy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+#: Key prefix of mission journals
+CHECKPOINT_PREFIX = "checkpoint/"
+
+_SNAPSHOT = "/snapshot"
+
+
+def snapshot_key(mission_id: str) -> str:
+    """Key of the last snapshot of a mission."""
+    return f"{CHECKPOINT_PREFIX}{mission_id}{_SNAPSHOT}"
+
+
+def delta_prefix(mission_id: str) -> str:
+    """Key prefix of the deltas of a mission."""
+    return f"{CHECKPOINT_PREFIX}{mission_id}/delta/"
+
+
+def delta_key(mission_id: str, seq: int) -> str:
+    """Key of delta ``seq`` of a mission."""
+    # Zero-padded so that scans return deltas in sequence order
+    return f"{delta_prefix(mission_id)}{seq:012d}"
+
+
+def _apply_change(data: Dict[str, Any], path: List[Any], value: Any = MISSING) -> None:
+    """Set (or delete, for MISSING) the value at ``path`` in nested dicts and lists."""
+    container: Any = data
+    for key in path[:-1]:
+        container = container[key]
+    last = path[-1]
+    if isinstance(container, list):
+        # Vector diffs list removals and appends by increasing index
+        if value is MISSING:
+            del container[last:]
+        elif last == len(container):
+            container.append(value)
+        else:
+            container[last] = value
+    elif value is MISSING:
+        container.pop(last, None)
+    else:
+        container[last] = value
+
+
+def apply_delta(data: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Replay one journal delta onto a mission in dictionary format."""
+    for change in delta["changes"]:
+        _apply_change(data, *change)
+    history = data.setdefault("history", {"steps": [], "payloads": []})
+    history["steps"].extend(delta["history"]["steps"])
+    history["payloads"].extend(delta["history"]["payloads"])
+
+
+class Replay(NamedTuple):
+    """A mission restored from its journal."""
+
+    #: Mission in dictionary format
+    data: Dict[str, Any]
+    #: Sequence number of the last delta replayed (or of the snapshot)
+    seq: int
+    #: Sequence number of the snapshot
+    base: int
+    #: Number of deltas replayed
+    deltas: int
+    #: Encoded size of the deltas replayed
+    delta_bytes: int
+
+
+async def read_journal(backend: StateBackend, mission_id: str) -> Optional[Replay]:
+    """Load the last snapshot of a mission and replay the deltas written after it.
+
+    Returns:
+        The replayed journal, or None if the mission has no journal
+    """
+    snapshot = await backend.get(snapshot_key(mission_id))
+    if snapshot is None:
+        return None
+    snapshot = loads(snapshot)
+    data, base = snapshot["mission"], snapshot["seq"]
+    seq, deltas, delta_bytes = base, 0, 0
+    prefix = delta_prefix(mission_id)
+    for key, raw in await backend.scan(prefix):
+        delta_seq = int(key[len(prefix):])
+        if delta_seq <= base:
+            continue
+        if delta_seq != seq + 1:
+            logger.warning(f"Checkpoint journal of mission {mission_id} skips delta {seq + 1}")
+            break
+        apply_delta(data, loads(raw))
+        seq = delta_seq
+        deltas += 1
+        delta_bytes += len(raw)
+    return Replay(data, seq, base, deltas, delta_bytes)
+
+
+async def journaled_mission_ids(backend: StateBackend) -> List[str]:
+    """Ids of the missions with a journal, in id order."""
+    return [
+        key[len(CHECKPOINT_PREFIX) : -len(_SNAPSHOT)]
+        for key, _ in await backend.scan(CHECKPOINT_PREFIX)
+        if key.endswith(_SNAPSHOT)
+    ]
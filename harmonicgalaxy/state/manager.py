@@ -0,0 +1,307 @@
+"""State manager: persistent mission state and context.
+
+:class:`StateManager` stores JSON-compatible values under string keys on
+top of a pluggable :class:`~harmonicgalaxy.state.backends.StateBackend`,
+and saves and restores whole missions. The backends share one async API:
+
+- :class:`~harmonicgalaxy.state.backends.MemoryBackend`: a dictionary,
+  for tests and ephemeral missions;
+- :class:`~harmonicgalaxy.state.backends.SQLiteBackend`: an SQLite file
+  in WAL mode with group commit of concurrent writes;
+- :class:`~harmonicgalaxy.state.backends.MmapLogBackend`: a memory-mapped
+  append-only log with an in-memory index.
+
+Missions are indexed by status, steps in flight and their agents, tags
+and timestamps (see :mod:`harmonicgalaxy.state.indexes`); the indexes are
+updated atomically with every mission write, and :meth:`StateManager.query`
+uses them to find missions without loading the others.
+
+Missions are either saved whole, under ``mission/<id>``, or journaled by a
+:class:`~harmonicgalaxy.state.checkpoint.MissionCheckpointer`. Loading,
+listing and querying missions restore both kinds; a mission that is both
+saved and journaled is restored from the most recent write.
+
+Example:
+    >>> async with StateManager(SQLiteBackend("state.db")) as state:
+    ...     await state.save_mission(mission)
+    ...     await state.put("context/" + mission.id, {"documents": 12})
+    ...     restored = await state.load_mission(mission.id)
+    ...     running = await state.query(status="running", agent="writer")
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple, Union
+
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.llm.serialization import dumps, loads
+from harmonicgalaxy.state.backends import (
+    Durability,
+    MemoryBackend,
+    MmapLogBackend,
+    SQLiteBackend,
+    StateBackend,
+    Write,
+)
+from harmonicgalaxy.state.indexes import (
+    DEFAULT_INDEXES,
+    INDEXED_PREFIX,
+    MissionIndex,
+    Range,
+    entry_mission_id,
+    lookup_bounds,
+)
+from harmonicgalaxy.state.journal import journaled_mission_ids, read_journal
+
+#: Key prefix of saved missions
+MISSION_PREFIX = "mission/"
+
+# Locks serializing the index updates of a mission, striped by mission id
+_INDEX_LOCK_STRIPES = 64
+
+
+def create_backend(
+    url: str, durability: Union[Durability, str] = Durability.BATCH
+) -> StateBackend:
+    """Create a backend from a URL.
+
+    Args:
+        url: ``memory://``, ``sqlite:///path/to/state.db`` or ``mmap:///path/to/state.log``
+            (three slashes before a relative path, four before an absolute one)
+        durability: When writes are acknowledged (see :class:`Durability`)
+
+    Raises:
+        ValueError: If the scheme is not supported
+    """
+    scheme, _, path = url.partition("://")
+    durability = Durability(durability)
+    if scheme == "memory":
+        return MemoryBackend()
+    path = path[1:] if path.startswith("/") else path
+    if scheme == "sqlite" and path:
+        return SQLiteBackend(path, durability=durability)
+    if scheme == "mmap" and path:
+        return MmapLogBackend(path, durability=durability)
+    raise ValueError(f"Unsupported state backend URL: {url}")
+
+
+class StateManager:
+    """Mission state and context on a state backend."""
+
+    def __init__(
+        self,
+        backend: Optional[StateBackend] = None,
+        indexes: Optional[Iterable[MissionIndex]] = None,
+    ):
+        """Initialize state manager.
+
+        Args:
+            backend: Storage backend (default: a new :class:`MemoryBackend`)
+            indexes: Secondary indexes of missions (default:
+                :data:`~harmonicgalaxy.state.indexes.DEFAULT_INDEXES`; empty: none)
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        indexes = DEFAULT_INDEXES if indexes is None else indexes
+        self.indexes: Dict[str, MissionIndex] = {index.name: index for index in indexes}
+        self._index_locks = [asyncio.Lock() for _ in range(_INDEX_LOCK_STRIPES)]
+
+    def __repr__(self) -> str:
+        return f"StateManager(backend={type(self.backend).__name__})"
+
+    async def open(self) -> None:
+        """Open the backend."""
+        await self.backend.open()
+
+    async def close(self) -> None:
+        """Make every write durable and close the backend."""
+        await self.backend.close()
+
+    async def __aenter__(self) -> "StateManager":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    # -- values --------------------------------------------------------------
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of ``key``, or ``default`` if it is not set."""
+        data = await self.backend.get(key)
+        return default if data is None else loads(data)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the values of the keys that are set."""
+        keys = list(keys)
+        values = await self.backend.get_many(keys)
+        return {key: loads(data) for key, data in zip(keys, values) if data is not None}
+
+    async def put(self, key: str, value: Any) -> None:
+        """Set ``key`` to the JSON-compatible ``value``."""
+        await self.backend.put(key, dumps(value))
+
+    async def put_many(self, values: Mapping[str, Any]) -> None:
+        """Set several keys atomically."""
+        await self.backend.write([(key, dumps(value)) for key, value in values.items()])
+
+    async def delete(self, key: str) -> bool:
+        """Delete ``key``; return whether it existed."""
+        return await self.backend.delete(key)
+
+    async def scan(
+        self,
+        prefix: str = "",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, Any]]:
+        """Return the ``(key, value)`` pairs whose key starts with ``prefix``, by key.
+
+        ``start`` (inclusive), ``end`` (exclusive) and ``limit`` narrow the
+        scan as in :meth:`StateBackend.scan`.
+        """
+        pairs = await self.backend.scan(prefix, start, end, limit)
+        return [(key, loads(data)) for key, data in pairs]
+
+    async def count(self) -> int:
+        """Return the number of keys."""
+        return await self.backend.count()
+
+    async def flush(self) -> None:
+        """Make every acknowledged write durable."""
+        await self.backend.flush()
+
+    # -- missions ------------------------------------------------------------
+
+    async def save_mission(self, mission: Mission) -> None:
+        """Save ``mission`` (state, context and history) and update its indexes."""
+        mission.updated_at = time.time()
+        data = dumps(mission.to_dict())
+        await self.index_mission(mission, [(MISSION_PREFIX + mission.id, data)])
+
+    async def load_mission(self, mission_id: str) -> Optional[Mission]:
+        """Restore a saved or journaled mission, or return None if there is none with this id."""
+        data = await self.backend.get(MISSION_PREFIX + mission_id)
+        return await self._restore(mission_id, data)
+
+    async def _restore(self, mission_id: str, data: Optional[bytes]) -> Optional[Mission]:
+        """Restore a mission from its saved record ``data`` or its journal, whichever is newer."""
+        saved = None if data is None else Mission.from_dict(loads(data))
+        replay = await read_journal(self.backend, mission_id)
+        if replay is None:
+            return saved
+        journaled = Mission.from_dict(replay.data)
+        if saved is not None and (saved.updated_at or 0.0) > (journaled.updated_at or 0.0):
+            return saved
+        return journaled
+
+    async def delete_mission(self, mission_id: str) -> bool:
+        """Delete a saved mission and its index entries; return whether it existed."""
+        key = MISSION_PREFIX + mission_id
+        if not self.indexes:
+            return await self.delete(key)
+        existed = await self.backend.get(key) is not None
+        await self.unindex_mission(mission_id, [(key, None)])
+        return existed
+
+    async def list_missions(self) -> List[Mission]:
+        """Restore every saved or journaled mission, by id."""
+        saved = {
+            key[len(MISSION_PREFIX) :]: data
+            for key, data in await self.backend.scan(MISSION_PREFIX)
+        }
+        journaled = set(await journaled_mission_ids(self.backend))
+        missions = []
+        for mission_id in sorted(saved.keys() | journaled):
+            if mission_id in journaled:
+                mission = await self._restore(mission_id, saved.get(mission_id))
+            else:
+                mission = Mission.from_dict(loads(saved[mission_id]))
+            if mission is not None:
+                missions.append(mission)
+        return missions
+
+    # -- indexes -------------------------------------------------------------
+
+    async def index_mission(self, mission: Mission, writes: Sequence[Write] = ()) -> None:
+        """Update the index entries of ``mission``, atomically with ``writes``."""
+        keys = {key for index in self.indexes.values() for key in index.keys(mission)}
+        await self._write_index_entries(mission.id, keys, writes)
+
+    async def unindex_mission(self, mission_id: str, writes: Sequence[Write] = ()) -> None:
+        """Remove the index entries of a mission, atomically with ``writes``."""
+        await self._write_index_entries(mission_id, set(), writes)
+
+    async def _write_index_entries(
+        self, mission_id: str, keys: Set[str], writes: Sequence[Write]
+    ) -> None:
+        """Replace the entries recorded for a mission by ``keys`` in one batch with ``writes``."""
+        if not self.indexes:
+            await self.backend.write(writes)
+            return
+        record = INDEXED_PREFIX + mission_id
+        async with self._index_locks[hash(mission_id) % _INDEX_LOCK_STRIPES]:
+            previous = set(await self.get(record, ()))
+            batch = list(writes)
+            batch.extend((key, None) for key in previous - keys)
+            batch.extend((key, b"") for key in keys - previous)
+            if keys != previous:
+                batch.append((record, dumps(sorted(keys)) if keys else None))
+            await self.backend.write(batch)
+
+    async def reindex(self) -> int:
+        """Rebuild the index entries of every saved or journaled mission; return their number."""
+        missions = await self.list_missions()
+        for mission in missions:
+            await self.index_mission(mission)
+        return len(missions)
+
+    async def query(self, limit: Optional[int] = None, **conditions: Any) -> List[str]:
+        """Return the ids of the missions matching every condition, using the indexes.
+
+        Each keyword names an index; its value is either the value to match
+        or a :class:`~harmonicgalaxy.state.indexes.Range` of values, e.g.
+        ``query(status="running", created=Range(end=time.time() - 3600))``.
+
+        Args:
+            limit: Maximum number of ids to return
+            **conditions: Index name to value or range
+
+        Returns:
+            Mission ids, in the order of the first condition's index (by
+            value, then id)
+
+        Raises:
+            ValueError: If no condition is given or an index does not exist
+        """
+        if not conditions:
+            raise ValueError("A query needs at least one condition")
+        for name in conditions:
+            if name not in self.indexes:
+                raise ValueError(f"No mission index named {name!r}")
+        matches: Optional[Dict[str, None]] = None
+        for name, condition in conditions.items():
+            prefix, start, end = lookup_bounds(name, condition)
+            # The limit only applies to the scan when nothing filters it afterwards
+            exact = len(conditions) == 1 and not isinstance(condition, Range)
+            scan_limit = limit if exact else None
+            entries = await self.backend.scan(prefix, start, end, scan_limit)
+            ids = dict.fromkeys(entry_mission_id(key) for key, _ in entries)
+            if matches is None:
+                matches = ids
+            else:
+                matches = {mission_id: None for mission_id in matches if mission_id in ids}
+            if not matches:
+                return []
+        assert matches is not None
+        result = list(matches)
+        return result if limit is None else result[:limit]
+
+    async def query_missions(self, limit: Optional[int] = None, **conditions: Any) -> List[Mission]:
+        """Restore the saved or journaled missions matching every condition (see :meth:`query`)."""
+        ids = await self.query(limit=limit, **conditions)
+        values = await self.backend.get_many([MISSION_PREFIX + mission_id for mission_id in ids])
+        missions = await asyncio.gather(
+            *(self._restore(mission_id, data) for mission_id, data in zip(ids, values))
+        )
+        return [mission for mission in missions if mission is not None]
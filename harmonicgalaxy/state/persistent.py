@@ -0,0 +1,781 @@
+"""Persistent (immutable, structurally shared) mapping and vector.
+
+Snapshotting a mission context with ``copy.deepcopy`` before every step
+copies the whole context each time. With persistent structures, a
+snapshot is just a reference: updates never modify a structure in place,
+they return a new version that shares every untouched part with the old
+one.
+
+- :class:`PersistentMap` is a hash array mapped trie (HAMT): 32-way nodes
+  indexed by 5-bit slices of the key hash. An update copies the nodes on
+  the path to the key, at most ~7 small nodes, whatever the map size.
+- :class:`PersistentVector` is a 32-way trie of leaves plus a tail buffer,
+  so appends are amortized O(1) and updates copy one path.
+- :func:`diff` compares two versions of a structure by walking both tries
+  side by side and skipping every subtree they share, so its cost depends
+  on the size of the change rather than on the size of the structures.
+  Nested persistent values are compared recursively and reported by path.
+
+:func:`freeze` converts plain dicts and lists (recursively) into persistent
+structures once, and :func:`thaw` converts them back (e.g. to serialize).
+
+Example:
+    >>> state = freeze({"documents": [{"title": "a"}], "step": 0})
+    >>> snapshot = state                                   # O(1)
+    >>> state = state.set_in(("documents", 0, "summary"), "...").set("step", 1)
+    >>> diff(snapshot, state)
+    [Change(path=('step',), old=0, new=1),
+     Change(path=('documents', 0, 'summary'), old=MISSING, new='...')]
+"""
+
+from collections.abc import ItemsView, Mapping, Sequence, ValuesView
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+
+
+class _Missing:
+    """Marker of an absent key or index in a :class:`Change`."""
+
+    _instance: Optional["_Missing"] = None
+
+    def __new__(cls) -> "_Missing":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+
+#: Old value of an added entry, new value of a removed one
+MISSING: Any = _Missing()
+
+
+class Change(NamedTuple):
+    """A difference between two versions, at a path of keys and indices."""
+
+    path: Tuple[Any, ...]
+    old: Any
+    new: Any
+
+
+# -- HAMT nodes ----------------------------------------------------------------
+
+# Key slot marking a child node in a bitmap node's array
+_NODE = object()
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & _HASH_MASK
+
+
+class _BitmapNode:
+    """Up to 32 entries, as ``key, value`` (or ``_NODE, child``) pairs in ``array``."""
+
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap: int, array: Tuple[Any, ...]):
+        self.bitmap = bitmap
+        self.array = array
+
+    def find(self, shift: int, keyhash: int, key: Any, default: Any) -> Any:
+        bit = 1 << ((keyhash >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return default
+        index = 2 * (self.bitmap & (bit - 1)).bit_count()
+        slot_key, slot_value = self.array[index], self.array[index + 1]
+        if slot_key is _NODE:
+            return slot_value.find(shift + _BITS, keyhash, key, default)
+        if slot_key is key or slot_key == key:
+            return slot_value
+        return default
+
+    def _replace(self, index: int, key: Any, value: Any) -> "_BitmapNode":
+        array = self.array
+        return _BitmapNode(self.bitmap, array[:index] + (key, value) + array[index + 2 :])
+
+    def assoc(self, shift: int, keyhash: int, key: Any, value: Any) -> Tuple[Any, bool]:
+        """Return the node with ``key`` set, and whether the key was added."""
+        bit = 1 << ((keyhash >> shift) & _MASK)
+        index = 2 * (self.bitmap & (bit - 1)).bit_count()
+        array = self.array
+        if not self.bitmap & bit:
+            array = array[:index] + (key, value) + array[index:]
+            return _BitmapNode(self.bitmap | bit, array), True
+        slot_key, slot_value = array[index], array[index + 1]
+        if slot_key is _NODE:
+            child, added = slot_value.assoc(shift + _BITS, keyhash, key, value)
+            if child is slot_value:
+                return self, False
+            return self._replace(index, _NODE, child), added
+        if slot_key is key or slot_key == key:
+            if slot_value is value:
+                return self, False
+            return self._replace(index, slot_key, value), False
+        child = _pair(shift + _BITS, _hash(slot_key), slot_key, slot_value, keyhash, key, value)
+        return self._replace(index, _NODE, child), True
+
+    def dissoc(self, shift: int, keyhash: int, key: Any) -> Tuple[Any, bool]:
+        """Return the node without ``key`` (None if empty), and whether it was removed."""
+        bit = 1 << ((keyhash >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self, False
+        index = 2 * (self.bitmap & (bit - 1)).bit_count()
+        array = self.array
+        slot_key, slot_value = array[index], array[index + 1]
+        if slot_key is _NODE:
+            child, removed = slot_value.dissoc(shift + _BITS, keyhash, key)
+            if not removed:
+                return self, False
+            if child is None:
+                return self._without(bit, index), True
+            single = child.single_leaf()
+            if single is not None:
+                # Pull a lone remaining entry up, keeping the trie canonical
+                return self._replace(index, single[0], single[1]), True
+            return self._replace(index, _NODE, child), True
+        if slot_key is key or slot_key == key:
+            return self._without(bit, index), True
+        return self, False
+
+    def _without(self, bit: int, index: int) -> Optional["_BitmapNode"]:
+        if self.bitmap == bit:
+            return None
+        return _BitmapNode(self.bitmap ^ bit, self.array[:index] + self.array[index + 2 :])
+
+    def single_leaf(self) -> Optional[Tuple[Any, Any]]:
+        """The only entry of the node, if it has exactly one and it is not a child node."""
+        if len(self.array) == 2 and self.array[0] is not _NODE:
+            return self.array[0], self.array[1]
+        return None
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        array = self.array
+        for index in range(0, len(array), 2):
+            if array[index] is _NODE:
+                yield from array[index + 1].items()
+            else:
+                yield array[index], array[index + 1]
+
+    def slot(self, bit: int) -> Optional[Tuple[Any, Any]]:
+        if not self.bitmap & bit:
+            return None
+        index = 2 * (self.bitmap & (bit - 1)).bit_count()
+        return self.array[index], self.array[index + 1]
+
+
+class _CollisionNode:
+    """Entries whose keys have the same full hash."""
+
+    __slots__ = ("keyhash", "array")
+
+    def __init__(self, keyhash: int, array: Tuple[Any, ...]):
+        self.keyhash = keyhash
+        self.array = array
+
+    def _index(self, key: Any) -> int:
+        array = self.array
+        for index in range(0, len(array), 2):
+            if array[index] is key or array[index] == key:
+                return index
+        return -1
+
+    def find(self, shift: int, keyhash: int, key: Any, default: Any) -> Any:
+        index = self._index(key) if keyhash == self.keyhash else -1
+        return default if index < 0 else self.array[index + 1]
+
+    def assoc(self, shift: int, keyhash: int, key: Any, value: Any) -> Tuple[Any, bool]:
+        if keyhash != self.keyhash:
+            # Push this node one level down next to the new key
+            node = _BitmapNode(1 << ((self.keyhash >> shift) & _MASK), (_NODE, self))
+            return node.assoc(shift, keyhash, key, value)
+        index = self._index(key)
+        array = self.array
+        if index < 0:
+            return _CollisionNode(keyhash, array + (key, value)), True
+        if array[index + 1] is value:
+            return self, False
+        return _CollisionNode(keyhash, array[: index + 1] + (value,) + array[index + 2 :]), False
+
+    def dissoc(self, shift: int, keyhash: int, key: Any) -> Tuple[Any, bool]:
+        index = self._index(key) if keyhash == self.keyhash else -1
+        if index < 0:
+            return self, False
+        array = self.array[:index] + self.array[index + 2 :]
+        if not array:
+            return None, True
+        return _CollisionNode(self.keyhash, array), True
+
+    def single_leaf(self) -> Optional[Tuple[Any, Any]]:
+        if len(self.array) == 2:
+            return self.array[0], self.array[1]
+        return None
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        array = self.array
+        for index in range(0, len(array), 2):
+            yield array[index], array[index + 1]
+
+
+_Node = Union[_BitmapNode, _CollisionNode]
+
+
+def _pair(shift: int, hash1: int, key1: Any, value1: Any, hash2: int, key2: Any, value2: Any):
+    """Node holding two entries whose hashes agree below ``shift``."""
+    if hash1 == hash2:
+        return _CollisionNode(hash1, (key1, value1, key2, value2))
+    index1 = (hash1 >> shift) & _MASK
+    index2 = (hash2 >> shift) & _MASK
+    if index1 == index2:
+        child = _pair(shift + _BITS, hash1, key1, value1, hash2, key2, value2)
+        return _BitmapNode(1 << index1, (_NODE, child))
+    if index1 < index2:
+        return _BitmapNode((1 << index1) | (1 << index2), (key1, value1, key2, value2))
+    return _BitmapNode((1 << index1) | (1 << index2), (key2, value2, key1, value1))
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+_NOT_FOUND = object()
+
+
+class PersistentMap(Mapping):
+    """Immutable mapping with O(log32 n) structurally shared updates."""
+
+    __slots__ = ("_root", "_count", "_hash")
+
+    def __init__(self, items: Union[Mapping, Iterable[Tuple[Any, Any]], None] = None):
+        """Initialize map.
+
+        Args:
+            items: Mapping or ``(key, value)`` pairs (values are not frozen,
+                see :func:`freeze`)
+        """
+        root, count = _EMPTY_NODE, 0
+        if items:
+            pairs = items.items() if isinstance(items, Mapping) else items
+            for key, value in pairs:
+                root, added = root.assoc(0, _hash(key), key, value)
+                count += added
+        self._root: _Node = root
+        self._count = count
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def _make(cls, root: _Node, count: int) -> "PersistentMap":
+        new = cls.__new__(cls)
+        new._root = root
+        new._count = count
+        new._hash = None
+        return new
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        for key, _ in self._root.items():
+            yield key
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._root.find(0, _hash(key), key, _NOT_FOUND)
+        if value is _NOT_FOUND:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._root.find(0, _hash(key), key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return self._root.find(0, _hash(key), key, _NOT_FOUND) is not _NOT_FOUND
+
+    def items(self) -> "_ItemsView":
+        """View of the ``(key, value)`` pairs (in hash order)."""
+        return _ItemsView(self)
+
+    def values(self) -> "_ValuesView":
+        """View of the values (in hash order)."""
+        return _ValuesView(self)
+
+    def set(self, key: Any, value: Any) -> "PersistentMap":
+        """Return a map with ``key`` set to ``value``."""
+        root, added = self._root.assoc(0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return self._make(root, self._count + added)
+
+    def delete(self, key: Any) -> "PersistentMap":
+        """Return a map without ``key``.
+
+        Raises:
+            KeyError: If ``key`` is not in the map
+        """
+        root, removed = self._root.dissoc(0, _hash(key), key)
+        if not removed:
+            raise KeyError(key)
+        return self._make(root if root is not None else _EMPTY_NODE, self._count - 1)
+
+    def discard(self, key: Any) -> "PersistentMap":
+        """Return a map without ``key``, whether it was there or not."""
+        root, removed = self._root.dissoc(0, _hash(key), key)
+        if not removed:
+            return self
+        return self._make(root if root is not None else _EMPTY_NODE, self._count - 1)
+
+    def update(
+        self, *others: Union[Mapping, Iterable[Tuple[Any, Any]]], **values: Any
+    ) -> "PersistentMap":
+        """Return a map with the entries of ``others`` and ``values`` set."""
+        root, count = self._root, self._count
+        for other in others + (values,):
+            pairs = other.items() if isinstance(other, Mapping) else other
+            for key, value in pairs:
+                root, added = root.assoc(0, _hash(key), key, value)
+                count += added
+        return self if root is self._root else self._make(root, count)
+
+    def get_in(self, path: Sequence, default: Any = None) -> Any:
+        """Return the value at a path of keys and indices, or ``default``."""
+        return _get_in(self, path, default)
+
+    def set_in(self, path: Sequence, value: Any) -> "PersistentMap":
+        """Return a map with the value at a path of keys and indices replaced.
+
+        Missing intermediate keys are created as empty maps.
+        """
+        return _set_in(self, tuple(path), value)
+
+    def diff(self, other: "PersistentMap") -> List[Change]:
+        """Changes turning this map into ``other`` (see :func:`diff`)."""
+        return diff(self, other)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, PersistentMap):
+            return self._count == other._count and not diff(self, other)
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return PersistentMap, (list(self.items()),)
+
+
+class _ItemsView(ItemsView):
+    """Items view iterating the trie directly, without a lookup per key."""
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return self._mapping._root.items()
+
+
+class _ValuesView(ValuesView):
+    def __iter__(self) -> Iterator[Any]:
+        for _, value in self._mapping._root.items():
+            yield value
+
+
+# -- vector ------------------------------------------------------------------
+
+
+class PersistentVector(Sequence):
+    """Immutable sequence with amortized O(1) append and O(log32 n) updates."""
+
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_hash")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        """Initialize vector.
+
+        Args:
+            items: Initial items (not frozen, see :func:`freeze`)
+        """
+        vector = _EMPTY_VECTOR.extend(items) if items else None
+        if vector is None:
+            self._count, self._shift, self._root, self._tail = 0, _BITS, (), ()
+        else:
+            self._count, self._shift = vector._count, vector._shift
+            self._root, self._tail = vector._root, vector._tail
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def _make(
+        cls, count: int, shift: int, root: Tuple[Any, ...], tail: Tuple[Any, ...]
+    ) -> "PersistentVector":
+        new = cls.__new__(cls)
+        new._count, new._shift, new._root, new._tail = count, shift, root, tail
+        new._hash = None
+        return new
+
+    def _tail_offset(self) -> int:
+        return 0 if self._count < _WIDTH else ((self._count - 1) >> _BITS) << _BITS
+
+    def _leaf(self, index: int) -> Tuple[Any, ...]:
+        """Leaf (or tail) holding ``index``."""
+        if index >= self._tail_offset():
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(index >> level) & _MASK]
+            level -= _BITS
+        return node
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return PersistentVector([self[i] for i in range(*index.indices(self._count))])
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("vector index out of range")
+        return self._leaf(index)[index & _MASK]
+
+    def __iter__(self) -> Iterator[Any]:
+        tail_offset = self._tail_offset()
+        for start in range(0, tail_offset, _WIDTH):
+            yield from self._leaf(start)
+        yield from self._tail
+
+    def append(self, value: Any) -> "PersistentVector":
+        """Return a vector with ``value`` appended."""
+        count = self._count
+        if count - self._tail_offset() < _WIDTH:
+            return self._make(count + 1, self._shift, self._root, self._tail + (value,))
+        # Full tail: push it into the tree
+        shift = self._shift
+        if (count >> _BITS) > (1 << shift):
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _BITS
+        else:
+            root = _push_tail(count, shift, self._root, self._tail)
+        return self._make(count + 1, shift, root, (value,))
+
+    def extend(self, values: Iterable[Any]) -> "PersistentVector":
+        """Return a vector with ``values`` appended."""
+        vector = self
+        for value in values:
+            vector = vector.append(value)
+        return vector
+
+    def set(self, index: int, value: Any) -> "PersistentVector":
+        """Return a vector with the item at ``index`` replaced (``len`` appends).
+
+        Raises:
+            IndexError: If ``index`` is out of range
+        """
+        count = self._count
+        if index < 0:
+            index += count
+        if index == count:
+            return self.append(value)
+        if not 0 <= index < count:
+            raise IndexError("vector index out of range")
+        if index >= self._tail_offset():
+            position = index & _MASK
+            if self._tail[position] is value:
+                return self
+            tail = self._tail[:position] + (value,) + self._tail[position + 1 :]
+            return self._make(count, self._shift, self._root, tail)
+        root = _assoc_path(self._shift, self._root, index, value)
+        return self if root is self._root else self._make(count, self._shift, root, self._tail)
+
+    def pop(self) -> "PersistentVector":
+        """Return a vector without its last item.
+
+        Raises:
+            IndexError: If the vector is empty
+        """
+        count = self._count
+        if count == 0:
+            raise IndexError("pop from empty vector")
+        if count == 1:
+            return _EMPTY_VECTOR
+        if count - self._tail_offset() > 1:
+            return self._make(count - 1, self._shift, self._root, self._tail[:-1])
+        tail = self._leaf(count - 2)
+        root = _pop_tail(count, self._shift, self._root)
+        shift = self._shift
+        if root is None:
+            root = ()
+        if shift > _BITS and len(root) == 1:
+            root = root[0]
+            shift -= _BITS
+        return self._make(count - 1, shift, root, tail)
+
+    def get_in(self, path: Sequence, default: Any = None) -> Any:
+        """Return the value at a path of indices and keys, or ``default``."""
+        return _get_in(self, path, default)
+
+    def set_in(self, path: Sequence, value: Any) -> "PersistentVector":
+        """Return a vector with the value at a path of indices and keys replaced."""
+        return _set_in(self, tuple(path), value)
+
+    def diff(self, other: "PersistentVector") -> List[Change]:
+        """Changes turning this vector into ``other`` (see :func:`diff`)."""
+        return diff(self, other)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, PersistentVector):
+            return self._count == other._count and not diff(self, other)
+        if isinstance(other, (list, tuple)):
+            return self._count == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"PersistentVector({list(self)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return PersistentVector, (list(self),)
+
+
+def _new_path(level: int, node: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    while level > 0:
+        node = (node,)
+        level -= _BITS
+    return node
+
+
+def _push_tail(
+    count: int, level: int, parent: Tuple[Any, ...], tail: Tuple[Any, ...]
+) -> Tuple[Any, ...]:
+    index = ((count - 1) >> level) & _MASK
+    if level == _BITS:
+        child = tail
+    elif index < len(parent):
+        child = _push_tail(count, level - _BITS, parent[index], tail)
+    else:
+        child = _new_path(level - _BITS, tail)
+    return parent[:index] + (child,) + parent[index + 1 :]
+
+
+def _assoc_path(level: int, node: Tuple[Any, ...], index: int, value: Any) -> Tuple[Any, ...]:
+    if level == 0:
+        position = index & _MASK
+        if node[position] is value:
+            return node
+        return node[:position] + (value,) + node[position + 1 :]
+    position = (index >> level) & _MASK
+    child = _assoc_path(level - _BITS, node[position], index, value)
+    if child is node[position]:
+        return node
+    return node[:position] + (child,) + node[position + 1 :]
+
+
+def _pop_tail(count: int, level: int, node: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+    index = ((count - 2) >> level) & _MASK
+    if level > _BITS:
+        child = _pop_tail(count, level - _BITS, node[index])
+        if child is None:
+            return node[:index] if index else None
+        return node[:index] + (child,)
+    return node[:index] if index else None
+
+
+_EMPTY_VECTOR = PersistentVector.__new__(PersistentVector)
+_EMPTY_VECTOR._count, _EMPTY_VECTOR._shift = 0, _BITS
+_EMPTY_VECTOR._root, _EMPTY_VECTOR._tail, _EMPTY_VECTOR._hash = (), (), None
+
+
+# -- nested access -------------------------------------------------------------
+
+
+def _get_in(container: Any, path: Sequence, default: Any) -> Any:
+    value = container
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return value
+
+
+def _set_in(container: Any, path: Tuple[Any, ...], value: Any) -> Any:
+    if not path:
+        return value
+    key = path[0]
+    if isinstance(container, PersistentVector):
+        return container.set(key, _set_in(container[key], path[1:], value))
+    if isinstance(container, PersistentMap):
+        child = container.get(key, _NOT_FOUND)
+        if child is _NOT_FOUND:
+            child = PersistentMap()
+        return container.set(key, _set_in(child, path[1:], value))
+    raise TypeError(f"Cannot set {key!r} in {type(container).__name__}")
+
+
+# -- conversion ----------------------------------------------------------------
+
+
+def freeze(value: Any) -> Any:
+    """Convert nested dicts and lists into persistent maps and vectors."""
+    if isinstance(value, dict):
+        return PersistentMap((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return PersistentVector(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Convert nested persistent maps and vectors back into dicts and lists."""
+    if isinstance(value, PersistentMap):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, PersistentVector):
+        return [thaw(item) for item in value]
+    return value
+
+
+# -- diff ----------------------------------------------------------------------
+
+
+def diff(old: Any, new: Any) -> List[Change]:
+    """Changes turning ``old`` into ``new``.
+
+    Persistent maps and vectors are compared entry by entry, recursively;
+    subtrees shared by both versions are skipped without being visited.
+    Added entries have ``old=MISSING``, removed ones ``new=MISSING``. Other
+    values are compared with ``==`` and reported whole, at the empty path
+    for the top level.
+
+    Returns:
+        Changes by path; those of a vector's entries by increasing index
+        (so they can be replayed in order), others in unspecified order
+    """
+    changes: List[Change] = []
+    _diff_value((), old, new, changes)
+    return changes
+
+
+def _diff_value(path: Tuple[Any, ...], old: Any, new: Any, changes: List[Change]) -> None:
+    if old is new:
+        return
+    if isinstance(old, PersistentMap) and isinstance(new, PersistentMap):
+        _diff_nodes(path, old._root, new._root, changes)
+    elif isinstance(old, PersistentVector) and isinstance(new, PersistentVector):
+        _diff_vectors(path, old, new, changes)
+    elif old != new:
+        changes.append(Change(path, old, new))
+
+
+def _diff_nodes(path: Tuple[Any, ...], old: Any, new: Any, changes: List[Change]) -> None:
+    if old is new:
+        return
+    if type(old) is _BitmapNode and type(new) is _BitmapNode:
+        bitmap = old.bitmap | new.bitmap
+        while bitmap:
+            bit = bitmap & -bitmap
+            bitmap ^= bit
+            old_slot, new_slot = old.slot(bit), new.slot(bit)
+            if old_slot is not None and new_slot is not None:
+                (old_key, old_value), (new_key, new_value) = old_slot, new_slot
+                if old_key is _NODE and new_key is _NODE:
+                    _diff_nodes(path, old_value, new_value, changes)
+                    continue
+                if old_key is not _NODE and new_key is not _NODE and (
+                    old_key is new_key or old_key == new_key
+                ):
+                    _diff_value(path + (old_key,), old_value, new_value, changes)
+                    continue
+            _diff_entries(path, _slot_items(old_slot), _slot_items(new_slot), changes)
+    else:
+        _diff_entries(path, dict(old.items()), dict(new.items()), changes)
+
+
+def _slot_items(slot: Optional[Tuple[Any, Any]]) -> Dict[Any, Any]:
+    if slot is None:
+        return {}
+    key, value = slot
+    return dict(value.items()) if key is _NODE else {key: value}
+
+
+def _diff_entries(
+    path: Tuple[Any, ...], old: Dict[Any, Any], new: Dict[Any, Any], changes: List[Change]
+) -> None:
+    for key, value in old.items():
+        if key in new:
+            _diff_value(path + (key,), value, new[key], changes)
+        else:
+            changes.append(Change(path + (key,), value, MISSING))
+    for key, value in new.items():
+        if key not in old:
+            changes.append(Change(path + (key,), MISSING, value))
+
+
+def _diff_vectors(
+    path: Tuple[Any, ...], old: PersistentVector, new: PersistentVector, changes: List[Change]
+) -> None:
+    common = min(old._count, new._count)
+    # Indices below both tail offsets live in the tries
+    tree_end = min(old._tail_offset(), new._tail_offset(), common)
+    if old._shift == new._shift:
+        _diff_vector_nodes(path, old._root, new._root, old._shift, 0, tree_end, changes)
+    else:
+        for start in range(0, tree_end, _WIDTH):
+            old_leaf, new_leaf = old._leaf(start), new._leaf(start)
+            if old_leaf is not new_leaf:
+                for offset, (a, b) in enumerate(zip(old_leaf, new_leaf)):
+                    _diff_value(path + (start + offset,), a, b, changes)
+    for index in range(tree_end, common):
+        _diff_value(path + (index,), old[index], new[index], changes)
+    for index in range(common, old._count):
+        changes.append(Change(path + (index,), old[index], MISSING))
+    for index in range(common, new._count):
+        changes.append(Change(path + (index,), MISSING, new[index]))
+
+
+def _diff_vector_nodes(
+    path: Tuple[Any, ...],
+    old: Tuple[Any, ...],
+    new: Tuple[Any, ...],
+    level: int,
+    start: int,
+    end: int,
+    changes: List[Change],
+) -> None:
+    if old is new or start >= end:
+        return
+    if level == 0:
+        for offset in range(min(len(old), len(new), end - start)):
+            _diff_value(path + (start + offset,), old[offset], new[offset], changes)
+        return
+    step = 1 << level
+    for position in range(min(len(old), len(new))):
+        child_start = start + position * step
+        if child_start >= end:
+            return
+        _diff_vector_nodes(
+            path, old[position], new[position], level - _BITS, child_start, end, changes
+        )
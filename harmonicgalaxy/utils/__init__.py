@@ -1,6 +1,6 @@
 """Utility modules for HarmonicGalaxy."""
 
-from harmonicgalaxy.utils.logging import get_logger, setup_logging, LogLevel
+from harmonicgalaxy.utils.logging import get_logger, setup_logging, shutdown_logging, LogLevel
 
-__all__ = ["get_logger", "setup_logging", "LogLevel"]
+__all__ = ["get_logger", "setup_logging", "shutdown_logging", "LogLevel"]
 
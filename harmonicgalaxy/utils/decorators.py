@@ -1,13 +1,27 @@
 """Decorators for HarmonicGalaxy."""
 
+import cProfile
 import functools
-from typing import Callable, Any
-from harmonicgalaxy.utils.logging import get_logger
+import inspect
+import logging
+import sys
+import traceback
+from random import random
+from time import perf_counter
+from typing import Callable, Optional
+from harmonicgalaxy.utils.logging import get_logger, short_repr
+from harmonicgalaxy.utils.profiling import get_function_stats
+
+# Frames kept per stack sample
+MAX_STACK_DEPTH = 16
 
 
 def log_function_call(logger_name: str = None):
     """Decorator to log function calls with galaxy theme.
 
+    Nothing is formatted unless DEBUG is enabled for the logger, and argument
+    reprs are truncated (see :func:`~harmonicgalaxy.utils.logging.short_repr`).
+
     Args:
         logger_name: Optional logger name. If None, uses function's module.
 
@@ -19,16 +33,26 @@ def log_function_call(logger_name: str = None):
 
     def decorator(func: Callable) -> Callable:
         logger = get_logger(logger_name or func.__module__)
+        name = func.__name__
 
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            logger.debug(f"🔭 Calling {func.__name__} with args={args}, kwargs={kwargs}")
+            if not logger.isEnabledFor(logging.DEBUG):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    logger.error("💥 %s failed: %s", name, e, exc_info=True)
+                    raise
+
+            logger.debug(
+                "🔭 Calling %s with args=%s, kwargs=%s", name, short_repr(args), short_repr(kwargs)
+            )
             try:
                 result = func(*args, **kwargs)
-                logger.debug(f"✨ {func.__name__} completed successfully")
+                logger.debug("✨ %s completed successfully", name)
                 return result
             except Exception as e:
-                logger.error(f"💥 {func.__name__} failed: {e}", exc_info=True)
+                logger.error("💥 %s failed: %s", name, e, exc_info=True)
                 raise
 
         return wrapper
@@ -39,6 +63,9 @@ def log_function_call(logger_name: str = None):
 def log_async_function_call(logger_name: str = None):
     """Decorator to log async function calls with galaxy theme.
 
+    Nothing is formatted unless DEBUG is enabled for the logger, and argument
+    reprs are truncated (see :func:`~harmonicgalaxy.utils.logging.short_repr`).
+
     Args:
         logger_name: Optional logger name. If None, uses function's module.
 
@@ -50,19 +77,190 @@ def log_async_function_call(logger_name: str = None):
 
     def decorator(func: Callable) -> Callable:
         logger = get_logger(logger_name or func.__module__)
+        name = func.__name__
 
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            logger.debug(f"🔭 Calling async {func.__name__} with args={args}, kwargs={kwargs}")
+            if not logger.isEnabledFor(logging.DEBUG):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    logger.error("💥 Async %s failed: %s", name, e, exc_info=True)
+                    raise
+
+            logger.debug(
+                "🔭 Calling async %s with args=%s, kwargs=%s",
+                name,
+                short_repr(args),
+                short_repr(kwargs),
+            )
             try:
                 result = await func(*args, **kwargs)
-                logger.debug(f"✨ Async {func.__name__} completed successfully")
+                logger.debug("✨ Async %s completed successfully", name)
                 return result
             except Exception as e:
-                logger.error(f"💥 Async {func.__name__} failed: {e}", exc_info=True)
+                logger.error("💥 Async %s failed: %s", name, e, exc_info=True)
                 raise
 
         return wrapper
 
     return decorator
 
+
+def _stats_name(func: Callable, name: Optional[str]) -> str:
+    """Return the stats name of a decorated function."""
+    return name or f"{func.__module__}.{func.__qualname__}"
+
+
+def timed(name: Optional[str] = None):
+    """Decorator to record call count, errors and latency of a function.
+
+    Works for sync and async functions. Latencies go into a fixed-memory
+    histogram (see :mod:`harmonicgalaxy.utils.profiling`); the overhead is a
+    couple of clock reads per call, so it can stay on in production.
+
+    Args:
+        name: Stats name. If None, uses ``module.qualname`` of the function.
+
+    Example:
+        >>> @timed("llm.chat")
+        >>> async def chat(messages):
+        ...     ...
+        >>> get_function_stats("llm.chat").snapshot()["p99"]
+    """
+
+    def decorator(func: Callable) -> Callable:
+        stats = get_function_stats(_stats_name(func, name))
+        record = stats.latency.record
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    stats.errors += 1
+                    record(perf_counter() - start)
+                    raise
+                except BaseException:
+                    # Cancellation and exits are not errors of the function
+                    record(perf_counter() - start)
+                    raise
+                record(perf_counter() - start)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                record(perf_counter() - start)
+                raise
+            except BaseException:
+                # Cancellation and exits are not errors of the function
+                record(perf_counter() - start)
+                raise
+            record(perf_counter() - start)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+PROFILE_MODES = ("cprofile", "stack")
+
+
+def profiled(name: Optional[str] = None, sample_rate: float = 0.01, mode: str = "cprofile"):
+    """Decorator like :func:`timed` that also profiles a fraction of calls.
+
+    In "cprofile" mode sampled calls run under ``cProfile`` and are merged into
+    one report (``get_function_stats(name).profile_report()``). For async
+    functions the profile also covers other tasks that run while the call is
+    suspended. In "stack" mode the caller's stack is recorded instead
+    (``top_stacks(name)``), which is much cheaper. Calls that are not sampled
+    cost the same as with :func:`timed` plus one random draw.
+
+    Args:
+        name: Stats name. If None, uses ``module.qualname`` of the function.
+        sample_rate: Fraction (0-1) of calls to profile
+        mode: "cprofile" or "stack"
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Invalid profile mode: {mode}. Must be one of {PROFILE_MODES}")
+    if not 0.0 <= sample_rate <= 1.0:
+        raise ValueError("sample_rate must be between 0 and 1")
+
+    def decorator(func: Callable) -> Callable:
+        stats = get_function_stats(_stats_name(func, name))
+        record = stats.latency.record
+
+        def start_sample() -> Optional[cProfile.Profile]:
+            if mode == "stack":
+                frames = traceback.extract_stack(sys._getframe(2), limit=MAX_STACK_DEPTH)
+                stats.add_stack(tuple(f"{f.filename}:{f.lineno} {f.name}" for f in frames))
+                return None
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is active in this thread
+                return None
+            return profiler
+
+        def finish_sample(profiler: Optional[cProfile.Profile]) -> None:
+            if profiler is not None:
+                profiler.disable()
+                stats.add_profile(profiler)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profiler = start_sample() if random() < sample_rate else None
+                start = perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    stats.errors += 1
+                    record(perf_counter() - start)
+                    raise
+                except BaseException:
+                    # Cancellation and exits are not errors of the function
+                    record(perf_counter() - start)
+                    raise
+                finally:
+                    finish_sample(profiler)
+                record(perf_counter() - start)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = start_sample() if random() < sample_rate else None
+            start = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                record(perf_counter() - start)
+                raise
+            except BaseException:
+                # Cancellation and exits are not errors of the function
+                record(perf_counter() - start)
+                raise
+            finally:
+                finish_sample(profiler)
+            record(perf_counter() - start)
+            return result
+
+        return wrapper
+
+    return decorator
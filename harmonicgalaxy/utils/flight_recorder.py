@@ -0,0 +1,349 @@
+"""Flight recorder: the latest log records in a memory-mapped ring file.
+
+:class:`FlightRecorderHandler` keeps the most recent records (typically at
+DEBUG level) in a fixed-size file mapped into memory. Each record is packed
+into one fixed-size binary slot, overwriting the oldest one, so a write is a
+single memory copy: no formatting beyond the message itself, no system
+call and no disk I/O in the logging thread (forks are noticed through
+:func:`os.register_at_fork`, not by checking the pid on every record).
+The mapping is shared with the kernel page cache, so the records survive a
+crash of the process.
+
+After a crash, or on demand, the ring is turned into readable text::
+
+    python -m harmonicgalaxy.utils.flight_recorder logs/flight.ring
+    python -m harmonicgalaxy.utils.flight_recorder logs/flight.ring --last 200 --level INFO
+
+A running process can also dump it when it receives a signal, see
+:meth:`FlightRecorderHandler.install_signal_handler`.
+
+Sequence numbers are counted per process, so a process forked after the
+handler was created (e.g. a worker of a pre-fork server) switches to a
+ring of its own on its first record, ``<name>.<pid><suffix>`` next to the
+parent's (``logs/flight.4242.ring``), instead of overwriting its parent's
+slots.
+
+Example:
+    >>> handler = FlightRecorderHandler("logs/flight.ring", size=4 * 1024 * 1024)
+    >>> logging.getLogger().addHandler(handler)
+"""
+
+import argparse
+import logging
+import mmap
+import os
+import signal
+import struct
+import sys
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, TextIO, Union
+
+# File header: magic, version, slot size, slot count, pid of the last writer
+_HEADER = struct.Struct("<8sIIII")
+_HEADER_SIZE = 64
+_MAGIC = b"HGFLIGHT"
+_VERSION = 1
+
+# Slot header: sequence (0 = empty), created, pid, thread, level, name and message lengths
+_SLOT = struct.Struct("<QdIIBBH")
+
+DEFAULT_SIZE = 4 * 1024 * 1024
+DEFAULT_SLOT_SIZE = 256
+
+# Handlers with a ring open, flagged in a forked child before it runs any code
+_handlers: "weakref.WeakSet[FlightRecorderHandler]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    """Flag the rings inherited from the parent process."""
+    for handler in list(_handlers):
+        handler._forked = True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class FlightRecord(NamedTuple):
+    """One record read back from a ring file."""
+
+    sequence: int
+    created: float
+    pid: int
+    thread: int
+    levelno: int
+    name: str
+    message: str
+
+    def format(self) -> str:
+        """Render the record as one line of text."""
+        timestamp = datetime.fromtimestamp(self.created).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        level = logging.getLevelName(self.levelno)
+        return (
+            f"{timestamp} {level:<8} [{self.name}] "
+            f"pid={self.pid} tid={self.thread:x} {self.message}"
+        )
+
+
+class FlightRecorderHandler(logging.Handler):
+    """Logging handler writing records into a memory-mapped ring of fixed-size slots.
+
+    Messages longer than a slot are truncated. Opening an existing ring of
+    the same geometry continues after its latest record, so the records of
+    a crashed process are kept until they are overwritten. A forked child
+    process writes to a ring of its own (see :meth:`child_filename`).
+    """
+
+    def __init__(
+        self,
+        filename: Union[str, Path],
+        size: int = DEFAULT_SIZE,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+        level: int = logging.DEBUG,
+    ):
+        """Initialize handler and map the ring file.
+
+        Args:
+            filename: Ring file (created if missing)
+            size: Size of the ring in bytes (rounded down to whole slots)
+            slot_size: Bytes per record, including a 28-byte header
+            level: Minimum level of the recorded records
+        """
+        super().__init__(level)
+        if not _SLOT.size + 16 <= slot_size <= _SLOT.size + 0xFFFF:
+            raise ValueError(
+                f"slot_size must be between {_SLOT.size + 16} and {_SLOT.size + 0xFFFF} bytes"
+            )
+        self.filename = Path(filename)
+        # Name of the ring of the process that created the handler
+        self._root_filename = self.filename
+        self.slot_size = slot_size
+        self.slot_count = max(1, (size - _HEADER_SIZE) // slot_size)
+        self._payload_size = slot_size - _SLOT.size
+        # The name length is stored in one byte and must leave the message room
+        self._name_limit = min(255, self._payload_size)
+        # Header and zero-padded payload of a slot, packed with a single call
+        self._slot = struct.Struct(f"{_SLOT.format}{self._payload_size}s")
+        self._open()
+
+    def _open(self) -> None:
+        """Map ``self.filename`` as the ring of the current process."""
+        self._pid = os.getpid()
+        self._forked = False
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        file_size = _HEADER_SIZE + self.slot_count * self.slot_size
+        fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            reuse = self._has_geometry(fd)
+            if not reuse:
+                os.ftruncate(fd, 0)
+            os.ftruncate(fd, file_size)
+            self._map = mmap.mmap(fd, file_size)
+        finally:
+            os.close(fd)
+        _handlers.add(self)
+
+        _HEADER.pack_into(
+            self._map, 0, _MAGIC, _VERSION, self.slot_size, self.slot_count, self._pid
+        )
+        self._sequence = max(
+            (
+                record.sequence
+                for record in _iter_slots(self._map, self.slot_size, self.slot_count)
+            ),
+            default=0,
+        )
+
+    def child_filename(self, pid: int) -> Path:
+        """Ring file of the forked child process ``pid``."""
+        path = self._root_filename
+        return path.with_name(f"{path.stem}.{pid}{path.suffix}")
+
+    def _reopen_in_child(self) -> None:
+        """Leave the parent's ring to it and map a ring of this process."""
+        # Unmaps only this process's view of the parent's ring
+        self._map.close()
+        self.filename = self.child_filename(os.getpid())
+        self._open()
+
+    def _has_geometry(self, fd: int) -> bool:
+        """Check whether the file is a ring with this handler's slot layout."""
+        header = os.pread(fd, _HEADER.size, 0)
+        if len(header) < _HEADER.size:
+            return False
+        magic, version, slot_size, slot_count, _ = _HEADER.unpack(header)
+        return (magic, version, slot_size, slot_count) == (
+            _MAGIC,
+            _VERSION,
+            self.slot_size,
+            self.slot_count,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Pack a record into the next slot (called with the handler lock held)."""
+        try:
+            message = record.getMessage()
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                message = f"{message}\n{record.exc_text}"
+            name = record.name.encode("utf-8", "replace")[: self._name_limit]
+            body = message.encode("utf-8", "replace")[: self._payload_size - len(name)]
+
+            if self._forked:
+                self._reopen_in_child()
+            self._sequence += 1
+            self._slot.pack_into(
+                self._map,
+                _HEADER_SIZE + (self._sequence % self.slot_count) * self.slot_size,
+                self._sequence,
+                record.created,
+                self._pid,
+                record.thread & 0xFFFFFFFF if record.thread else 0,
+                min(record.levelno, 255),
+                len(name),
+                len(body),
+                name + body,
+            )
+        except Exception:
+            self.handleError(record)
+
+    def records(self) -> List[FlightRecord]:
+        """Return the records in the ring, oldest first."""
+        return read_records(self._map)
+
+    def dump(self, stream: Optional[TextIO] = None) -> int:
+        """Write the records as text to ``stream`` (default: ``<filename>.txt``).
+
+        Reads the ring without taking the handler lock, so it is safe to call
+        from a signal handler; a record being written concurrently may be
+        skipped.
+
+        Returns:
+            Number of records written
+        """
+        if stream is None:
+            with open(f"{self.filename}.txt", "w", encoding="utf-8") as output:
+                return self.dump(output)
+        records = self.records()
+        for record in records:
+            stream.write(record.format() + "\n")
+        stream.flush()
+        return len(records)
+
+    def install_signal_handler(self, signum: Optional[int] = None) -> None:
+        """Dump the ring to ``<filename>.txt`` whenever the process receives ``signum``.
+
+        Args:
+            signum: Signal number (default: ``SIGUSR1``). Must be called from
+                the main thread.
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+            if signum is None:  # pragma: no cover - Windows
+                raise ValueError("SIGUSR1 is not available on this platform; pass signum")
+
+        def handle(received: int, frame) -> None:
+            try:
+                self.dump()
+            except OSError as e:
+                print(f"Failed to dump flight recorder {self.filename}: {e}", file=sys.stderr)
+
+        signal.signal(signum, handle)
+
+    def flush(self) -> None:
+        """Schedule the mapped pages to be written to disk."""
+        if not self._map.closed:
+            self._map.flush()
+
+    def close(self) -> None:
+        """Unmap the ring file."""
+        self.acquire()
+        try:
+            _handlers.discard(self)
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+        finally:
+            self.release()
+        super().close()
+
+
+def _iter_slots(buffer, slot_size: int, slot_count: int) -> Iterator[FlightRecord]:
+    """Yield the valid records of a ring in slot order."""
+    payload_size = slot_size - _SLOT.size
+    for index in range(slot_count):
+        offset = _HEADER_SIZE + index * slot_size
+        sequence, created, pid, thread, levelno, name_length, body_length = _SLOT.unpack_from(
+            buffer, offset
+        )
+        if sequence == 0 or name_length + body_length > payload_size:
+            continue
+        start = offset + _SLOT.size
+        payload = bytes(buffer[start : start + name_length + body_length])
+        yield FlightRecord(
+            sequence,
+            created,
+            pid,
+            thread,
+            levelno,
+            payload[:name_length].decode("utf-8", "replace"),
+            payload[name_length:].decode("utf-8", "replace"),
+        )
+
+
+def read_records(source: Union[str, Path, bytes, mmap.mmap]) -> List[FlightRecord]:
+    """Read the records of a ring file (or of its contents), oldest first.
+
+    Raises:
+        ValueError: If ``source`` is not a flight recorder ring
+    """
+    if isinstance(source, (str, Path)):
+        source = Path(source).read_bytes()
+    if len(source) < _HEADER_SIZE:
+        raise ValueError("Not a flight recorder file: too short")
+    magic, version, slot_size, slot_count, _ = _HEADER.unpack_from(source, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a flight recorder file: bad header")
+    if len(source) < _HEADER_SIZE + slot_size * slot_count:
+        raise ValueError("Flight recorder file is truncated")
+    return sorted(_iter_slots(source, slot_size, slot_count))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Dump a flight recorder ring file as text."""
+    parser = argparse.ArgumentParser(
+        prog="python -m harmonicgalaxy.utils.flight_recorder",
+        description="Print the records of a flight recorder ring file, oldest first.",
+    )
+    parser.add_argument("path", help="Ring file")
+    parser.add_argument("--last", type=int, default=0, help="Only print the last N records")
+    parser.add_argument("--level", default="DEBUG", help="Minimum level to print")
+    parser.add_argument("--pid", type=int, help="Only print records of this process")
+    args = parser.parse_args(argv)
+
+    try:
+        records = read_records(args.path)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    min_level = logging.getLevelName(args.level.upper())
+    if not isinstance(min_level, int):
+        parser.error(f"unknown level: {args.level}")
+    records = [
+        record
+        for record in records
+        if record.levelno >= min_level and (args.pid is None or record.pid == args.pid)
+    ]
+    if args.last:
+        records = records[-args.last :]
+    for record in records:
+        print(record.format())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
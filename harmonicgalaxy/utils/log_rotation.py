@@ -0,0 +1,260 @@
+"""Rotating log files with background compression.
+
+:class:`RotatingLogFileHandler` rolls the active log file over when it
+reaches a size limit and/or at local midnight. Rotated segments are
+compressed (gzip, or zstd when ``zstandard`` is installed) by a background
+thread, so the thread that logs never waits on compression, and old
+segments are pruned by count and age.
+
+The file name may contain ``strftime`` codes, e.g. ``harmonicgalaxy_%Y%m%d.log``:
+the active file is then re-resolved at every rollover, so a long-running
+process starts a new dated file each day.
+
+Example:
+    >>> handler = RotatingLogFileHandler(
+    ...     "logs/harmonicgalaxy_%Y%m%d.log",
+    ...     max_bytes=100 * 1024 * 1024,
+    ...     rotate_daily=True,
+    ...     backup_count=30,
+    ... )
+"""
+
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Supported compression of rotated segments
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+_STRFTIME_CODE = re.compile(r"%[a-zA-Z]")
+_STRFTIME_TOKEN = re.compile(r"%[a-zA-Z%]")
+
+# What each strftime code of a file name expands to, for matching segment names
+_STRFTIME_PATTERNS = {
+    "%Y": r"\d{4}",
+    "%y": r"\d{2}",
+    "%m": r"\d{2}",
+    "%d": r"\d{2}",
+    "%H": r"\d{2}",
+    "%M": r"\d{2}",
+    "%S": r"\d{2}",
+    "%j": r"\d{3}",
+    "%%": "%",
+}
+
+# Stamp added to segments rolled over under the same name (see _segment_name)
+_SEGMENT_STAMP = r"(?:\.\d{8}-\d{6}(?:-\d+)?)?"
+
+
+def _strftime_regex(text: str) -> str:
+    """Regex matching what ``text`` expands to with ``strftime``."""
+    parts = []
+    position = 0
+    for match in _STRFTIME_TOKEN.finditer(text):
+        parts.append(re.escape(text[position : match.start()]))
+        parts.append(_STRFTIME_PATTERNS.get(match.group(), r"[^/\\]+?"))
+        position = match.end()
+    parts.append(re.escape(text[position:]))
+    return "".join(parts)
+
+
+def _next_midnight(now: float) -> float:
+    """Return the timestamp of the next local midnight after ``now``."""
+    tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+class RotatingLogFileHandler(logging.handlers.BaseRotatingHandler):
+    """File handler with size/midnight rotation and background compression."""
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 0,
+        rotate_daily: bool = False,
+        backup_count: int = 0,
+        max_age_days: Optional[float] = None,
+        compression: str = "gzip",
+        encoding: str = "utf-8",
+    ):
+        """Initialize rotating file handler.
+
+        Args:
+            filename: Log file path, optionally with ``strftime`` codes
+            max_bytes: Roll over once the active file reaches this size (0 disables)
+            rotate_daily: Roll over at local midnight
+            backup_count: Number of rotated segments to keep (0 keeps all)
+            max_age_days: Delete rotated segments older than this many days
+            compression: "gzip", "zstd" or "none"
+            encoding: File encoding
+        """
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Invalid compression: {compression}. "
+                f"Must be one of {tuple(COMPRESSION_SUFFIXES)}"
+            )
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+
+        self.pattern = os.path.abspath(filename)
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily or bool(_STRFTIME_CODE.search(self.pattern))
+        self.backup_count = backup_count
+        self.max_age_days = max_age_days
+        self.compression = compression
+
+        active = self._resolve_active()
+        Path(active).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(active, mode="a", encoding=encoding, delay=False)
+        self.rollover_at = _next_midnight(time.time()) if self.rotate_daily else None
+
+        self._jobs: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def _resolve_active(self) -> str:
+        """Return the active file name for the current time."""
+        return datetime.now().strftime(self.pattern)
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Return whether the active file should be rolled over before ``record``."""
+        if self.rollover_at is not None and record.created >= self.rollover_at:
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            return self.stream.tell() >= self.max_bytes
+        return False
+
+    def doRollover(self) -> None:
+        """Close the active file, hand it to the compressor and open a new one."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        segment = self.baseFilename
+        active = self._resolve_active()
+        if active == segment and os.path.exists(segment):
+            # Same name as before (size rollover, or undated name): move it aside
+            segment = self._segment_name(segment)
+            os.replace(self.baseFilename, segment)
+
+        self.baseFilename = active
+        Path(active).parent.mkdir(parents=True, exist_ok=True)
+        self.stream = self._open()
+        if self.rotate_daily:
+            self.rollover_at = _next_midnight(time.time())
+        self._submit(segment)
+
+    def _segment_name(self, path: str) -> str:
+        """Return an unused name for a rotated segment of ``path``."""
+        root, ext = os.path.splitext(path)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        candidate = f"{root}.{stamp}{ext}"
+        index = 1
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        while os.path.exists(candidate) or os.path.exists(candidate + suffix):
+            candidate = f"{root}.{stamp}-{index}{ext}"
+            index += 1
+        return candidate
+
+    def _submit(self, segment: str) -> None:
+        """Queue a rotated segment for compression and retention."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run_jobs, name="harmonicgalaxy-log-rotation", daemon=True
+            )
+            self._worker.start()
+        self._jobs.put(segment)
+
+    def _run_jobs(self) -> None:
+        """Background thread: compress segments and apply retention."""
+        while True:
+            segment = self._jobs.get()
+            if segment is None:
+                return
+            try:
+                self._compress(segment)
+                self._apply_retention()
+            except Exception:
+                # Never let a compression failure take logging down
+                logging.getLogger(__name__).exception("Failed to rotate log segment %s", segment)
+
+    def _compress(self, segment: str) -> None:
+        """Compress ``segment`` next to itself and remove the original."""
+        if self.compression == "none" or not os.path.exists(segment):
+            return
+        target = segment + COMPRESSION_SUFFIXES[self.compression]
+        partial = target + ".part"
+        with open(segment, "rb") as source:
+            if self.compression == "gzip":
+                with gzip.open(partial, "wb") as sink:
+                    shutil.copyfileobj(source, sink, 1024 * 1024)
+            else:
+                with open(partial, "wb") as raw:
+                    with zstandard.ZstdCompressor().stream_writer(raw) as sink:
+                        shutil.copyfileobj(source, sink, 1024 * 1024)
+        os.replace(partial, target)
+        os.remove(segment)
+
+    def rotated_segments(self) -> List[Path]:
+        """Return rotated segments of this log, oldest first.
+
+        Only names this handler produces match: ``<root>[.<stamp>[-N]]<ext>``
+        with the ``strftime`` codes of the root expanded, optionally followed
+        by a compression suffix. Other files next to the log are left alone.
+        """
+        directory = Path(self.pattern).parent
+        root, ext = os.path.splitext(os.path.basename(self.pattern))
+        suffixes = "|".join(re.escape(suffix) for suffix in COMPRESSION_SUFFIXES.values() if suffix)
+        segment = re.compile(
+            f"{_strftime_regex(root)}{_SEGMENT_STAMP}{_strftime_regex(ext)}(?:{suffixes})?"
+        )
+        active = Path(self.baseFilename)
+        segments = [
+            path
+            for path in directory.iterdir()
+            if path != active and segment.fullmatch(path.name)
+        ]
+        return sorted(segments, key=lambda path: path.stat().st_mtime)
+
+    def _apply_retention(self) -> None:
+        """Delete segments beyond ``backup_count`` or older than ``max_age_days``."""
+        segments = self.rotated_segments()
+        expired: List[Path] = []
+        if self.backup_count > 0 and len(segments) > self.backup_count:
+            expired = segments[: len(segments) - self.backup_count]
+            segments = segments[len(expired) :]
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            expired += [path for path in segments if path.stat().st_mtime < cutoff]
+        for path in expired:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def flush_rotation(self) -> None:
+        """Wait until queued segments are compressed and retention is applied."""
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            return
+        self._jobs.put(None)
+        worker.join()
+        self._worker = None
+
+    def close(self) -> None:
+        """Close the active file and finish background compression."""
+        self.flush_rotation()
+        super().close()
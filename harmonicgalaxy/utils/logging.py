@@ -5,14 +5,30 @@ where log levels are represented as celestial bodies and events flow
 like stars in a constellation.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import reprlib
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from pathlib import Path
 import os
 from datetime import datetime
 
+from harmonicgalaxy.utils.log_rotation import COMPRESSION_SUFFIXES, RotatingLogFileHandler
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 
 class LogLevel(str, Enum):
     """Log levels represented as celestial bodies."""
@@ -176,46 +192,430 @@ class GalaxyFormatter(logging.Formatter):
         return " ".join(filter(None, log_parts))
 
 
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter producing one compact JSON object per record (JSON lines).
+
+    Fields: ``ts`` (local time, millisecond precision), ``level``, ``logger``,
+    ``msg``, every attribute passed through ``extra`` (e.g. ``mission_id``,
+    ``agent_id``) and ``exc`` when exception info is present. The timestamp
+    prefix is rebuilt only once per second. Uses ``orjson`` when available.
+    """
+
+    def __init__(self) -> None:
+        """Initialize JSON formatter."""
+        super().__init__()
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def _timestamp_prefix(self, created: float) -> str:
+        """Return ``{"ts":"YYYY-mm-ddTHH:MM:SS`` for the record's second."""
+        second = int(created)
+        if second != self._cached_second:
+            stamp = datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+            self._cached_prefix = '{"ts":"' + stamp
+            self._cached_second = second
+        return self._cached_prefix
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format log record as a single JSON line."""
+        payload: Dict[str, Any] = {
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and key[0] != "_":
+                payload[key] = value
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            payload["exc"] = record.exc_text
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+
+        if orjson is not None:
+            body = orjson.dumps(payload, default=str).decode("utf-8")
+        else:
+            body = json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+
+        millis = int((record.created % 1) * 1000)
+        return f'{self._timestamp_prefix(record.created)}.{millis:03d}",{body[1:]}'
+
+
+# Size-bounded repr for values that end up in log messages
+_VALUE_REPR = reprlib.Repr()
+_VALUE_REPR.maxstring = 80
+_VALUE_REPR.maxother = 80
+_VALUE_REPR.maxlist = _VALUE_REPR.maxtuple = _VALUE_REPR.maxdict = 6
+_VALUE_REPR.maxset = _VALUE_REPR.maxfrozenset = _VALUE_REPR.maxdeque = 6
+_VALUE_REPR.maxlevel = 3
+MAX_VALUE_REPR_LENGTH = 240
+
+
+def short_repr(value: Any) -> str:
+    """Return a truncated, size-bounded repr of ``value`` for log messages.
+
+    Containers are cut after a few items and nesting levels, long strings
+    are elided, and the result never exceeds ``MAX_VALUE_REPR_LENGTH``.
+    Objects whose ``repr`` raises are rendered by :mod:`reprlib` as
+    ``<ClassName instance at 0x...>``.
+    """
+    text = _VALUE_REPR.repr(value)
+    if len(text) > MAX_VALUE_REPR_LENGTH:
+        text = text[: MAX_VALUE_REPR_LENGTH - 3] + "..."
+    return text
+
+
+def _short_str(value: Any) -> str:
+    """Like :func:`short_repr`, but strings are shown without quotes."""
+    if isinstance(value, str):
+        if len(value) > _VALUE_REPR.maxstring:
+            return value[: _VALUE_REPR.maxstring - 3] + "..."
+        return value
+    return short_repr(value)
+
+
+# Fields added to every record created in the current context (see log_context)
+_log_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "harmonicgalaxy_log_context", default=None
+)
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """Attach ``fields`` to every record logged in the enclosed block.
+
+    The fields follow the call chain across ``await`` and into tasks spawned
+    from the current context, like ``extra`` passed to every call. Nested
+    blocks add to (and may override) the outer fields. Explicit ``extra``
+    values take precedence.
+
+    Example:
+        >>> with log_context(mission_id="m-42", agent_id="planner"):
+        ...     logger.info("Planning")  # record.mission_id == "m-42"
+
+    Yields:
+        The fields active inside the block
+    """
+    current = _log_context.get()
+    merged = {**current, **fields} if current else fields
+    token = _log_context.set(merged)
+    try:
+        yield merged
+    finally:
+        _log_context.reset(token)
+
+
+def get_log_context() -> Dict[str, Any]:
+    """Return the fields attached to records logged in the current context."""
+    return dict(_log_context.get() or {})
+
+
 class GalaxyLogger(logging.Logger):
-    """Extended logger with galaxy-themed methods."""
+    """Extended logger with galaxy-themed methods.
+
+    Every helper checks the level first, so nothing is formatted when the
+    message would be discarded. Records carry the fields of the active
+    :func:`log_context` (e.g. the trace and span IDs of the current span).
+    """
+
+    def makeRecord(self, *args: Any, **kwargs: Any) -> logging.LogRecord:  # noqa: N802
+        """Create a record and attach the fields of the active log context."""
+        record = super().makeRecord(*args, **kwargs)
+        fields = _log_context.get()
+        if fields:
+            attributes = record.__dict__
+            for key, value in fields.items():
+                attributes.setdefault(key, value)
+        return record
 
     def mission_start(self, mission_name: str, **kwargs):
         """Log mission start (like a new constellation formation)."""
-        details = " ".join([f"{k}={v}" for k, v in kwargs.items()])
-        self.info(f"🚀 Mission '{mission_name}' initiated {details}".strip())
+        if self.isEnabledFor(logging.INFO):
+            self._log(
+                logging.INFO, "🚀 Mission '%s' initiated%s", (mission_name, _details(kwargs))
+            )
 
     def mission_complete(self, mission_name: str, **kwargs):
         """Log mission completion."""
-        details = " ".join([f"{k}={v}" for k, v in kwargs.items()])
-        self.info(f"✅ Mission '{mission_name}' completed {details}".strip())
+        if self.isEnabledFor(logging.INFO):
+            self._log(
+                logging.INFO, "✅ Mission '%s' completed%s", (mission_name, _details(kwargs))
+            )
 
     def agent_activated(self, agent_name: str, capability: Optional[str] = None):
         """Log agent activation (like a planet coming online)."""
-        cap_info = f" (capability: {capability})" if capability else ""
-        self.info(f"🪐 Agent '{agent_name}' activated{cap_info}")
+        if self.isEnabledFor(logging.INFO):
+            cap_info = f" (capability: {capability})" if capability else ""
+            self._log(logging.INFO, "🪐 Agent '%s' activated%s", (agent_name, cap_info))
 
     def agent_deactivated(self, agent_name: str):
         """Log agent deactivation."""
-        self.info(f"🌑 Agent '{agent_name}' deactivated")
+        if self.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, "🌑 Agent '%s' deactivated", (agent_name,))
 
     def orchestration_step(self, step: int, description: str):
         """Log orchestration step."""
-        self.debug(f"🎼 Orchestration step {step}: {description}")
+        if self.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, "🎼 Orchestration step %s: %s", (step, description))
 
     def state_update(self, state_key: str, old_value: Any, new_value: Any):
         """Log state update."""
-        self.debug(f"🔄 State '{state_key}' updated: {old_value} → {new_value}")
+        if self.isEnabledFor(logging.DEBUG):
+            self._log(
+                logging.DEBUG,
+                "🔄 State '%s' updated: %s → %s",
+                (state_key, _short_str(old_value), _short_str(new_value)),
+            )
 
     def event_emitted(self, event_type: str, event_data: Optional[Dict[str, Any]] = None):
         """Log event emission."""
-        data_str = f" {event_data}" if event_data else ""
-        self.debug(f"📡 Event '{event_type}' emitted{data_str}")
+        if self.isEnabledFor(logging.DEBUG):
+            data_str = f" {short_repr(event_data)}" if event_data else ""
+            self._log(logging.DEBUG, "📡 Event '%s' emitted%s", (event_type, data_str))
+
+
+def _details(kwargs: Dict[str, Any]) -> str:
+    """Format helper keyword arguments as `` key=value ...``."""
+    if not kwargs:
+        return ""
+    return " " + " ".join(f"{k}={_short_str(v)}" for k, v in kwargs.items())
 
 
 # Register custom logger class
 logging.setLoggerClass(GalaxyLogger)
 
 
+# Overflow policies for the bounded logging queue
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_new")
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler with a bounded queue and a configurable overflow policy.
+
+    Records are formatted in the calling thread (see ``QueueHandler.prepare``)
+    and handed to a background listener thread that does the actual I/O, so
+    logging from a coroutine never blocks the event loop on a slow stream.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Any]", overflow_policy: str = "block"):
+        """Initialize bounded queue handler.
+
+        Args:
+            log_queue: Bounded queue shared with the listener
+            overflow_policy: What to do when the queue is full - "block" (wait
+                for room), "drop_oldest" (discard the oldest queued record) or
+                "drop_new" (discard the incoming record)
+        """
+        super().__init__(log_queue)
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy: {overflow_policy}. Must be one of {OVERFLOW_POLICIES}"
+            )
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue a record, applying the overflow policy when the queue is full."""
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == "drop_new":
+            self.dropped += 1
+            return
+
+        # drop_oldest: make room by discarding queued records
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+
+class _BlockingSentinelListener(logging.handlers.QueueListener):
+    """QueueListener whose stop sentinel waits for room in a bounded queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class _TokenBucket:
+    """Token bucket and suppression counters of one call site."""
+
+    __slots__ = ("tokens", "updated", "over_limit", "suppressed")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.over_limit = 0
+        self.suppressed = 0
+
+
+class RateLimitFilter(logging.Filter):
+    """Rate-limit (and optionally sample) records per call site.
+
+    Records are grouped by (logger, source file, line, message template) and
+    each group gets a token bucket refilled at ``rate`` records per second
+    with room for ``burst`` records. Records arriving with an empty bucket are
+    suppressed, except every ``1 / sample_rate``-th one. At most every
+    ``summary_interval`` seconds a WARNING ``Suppressed N similar messages``
+    is logged for each group that lost records.
+
+    One instance may be attached to several handlers; each record is
+    accounted for once.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        sample_rate: float = 0.0,
+        summary_interval: float = 60.0,
+        max_sites: int = 10000,
+    ):
+        """Initialize rate-limit filter.
+
+        Args:
+            rate: Sustained records per second allowed per call site
+            burst: Records a call site may log at once before being limited
+            sample_rate: Fraction (0-1) of over-limit records let through anyway
+            summary_interval: Seconds between suppression summaries
+            max_sites: Maximum number of call sites tracked at once
+        """
+        super().__init__()
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.rate = rate
+        self.burst = burst
+        self.sample_rate = sample_rate
+        self.summary_interval = summary_interval
+        self.max_sites = max_sites
+        self.suppressed = 0
+
+        self._sample_every = round(1.0 / sample_rate) if sample_rate > 0 else 0
+        self._buckets: Dict[Tuple[str, str, int, str], _TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._next_summary = time.monotonic() + summary_interval
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record may be emitted."""
+        attributes = record.__dict__
+        decision = attributes.get("_rate_limit_decision")
+        if decision is not None:
+            # Already accounted for by another handler sharing this filter
+            return decision
+        if "_rate_limit_summary" in attributes:
+            return True
+
+        msg = record.msg if isinstance(record.msg, str) else type(record.msg).__name__
+        key = (record.name, record.pathname, record.lineno, msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_sites:
+                    # Forget the call site tracked the longest
+                    self._buckets.pop(next(iter(self._buckets)))
+                bucket = self._buckets[key] = _TokenBucket(float(self.burst), now)
+            else:
+                bucket.tokens = min(
+                    float(self.burst), bucket.tokens + (now - bucket.updated) * self.rate
+                )
+                bucket.updated = now
+
+            if bucket.tokens >= 1.0:
+                bucket.tokens -= 1.0
+                allowed = True
+            else:
+                bucket.over_limit += 1
+                allowed = bool(self._sample_every) and bucket.over_limit % self._sample_every == 0
+                if not allowed:
+                    bucket.suppressed += 1
+                    self.suppressed += 1
+            summary_due = now >= self._next_summary
+
+        record._rate_limit_decision = allowed
+        if summary_due:
+            self.flush_summary()
+        return allowed
+
+    def flush_summary(self) -> None:
+        """Log a summary for every call site that suppressed records since the last one."""
+        now = time.monotonic()
+        pending = []
+        with self._lock:
+            self._next_summary = now + self.summary_interval
+            for key, bucket in list(self._buckets.items()):
+                if bucket.suppressed:
+                    pending.append((key, bucket.suppressed))
+                    bucket.suppressed = 0
+                elif now - bucket.updated > self.burst / self.rate:
+                    # Bucket is full again; nothing worth remembering
+                    del self._buckets[key]
+
+        for (name, pathname, lineno, msg), count in pending:
+            logging.getLogger(name).warning(
+                "Suppressed %d similar messages from %s:%d: %s",
+                count,
+                os.path.basename(pathname),
+                lineno,
+                _short_str(msg),
+                extra={"_rate_limit_summary": True, "suppressed": count},
+            )
+
+
+class _RecordCounter(logging.Handler):
+    """Counts records reaching the root logger, by level name.
+
+    ``handle`` is overridden to skip the handler lock: one dict update per record.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: Dict[str, int] = {}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        counts = self.counts
+        counts[record.levelname] = counts.get(record.levelname, 0) + 1
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        pass
+
+
+# Counts survive reconfiguration so they can back monotonic metrics
+_record_counter = _RecordCounter()
+# Records lost to a full queue or to rate limiting, across reconfigurations
+_lost_records = {"dropped": 0, "suppressed": 0}
+
+
+# Active queue pipeline (set by setup_logging when async_logging is enabled)
+_queue_handler: Optional[BoundedQueueHandler] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_rate_limit_filter: Optional[RateLimitFilter] = None
+_flight_recorder: Optional[logging.Handler] = None
+_atexit_registered = False
+
+
 class LoggingConfig:
     """Configuration for HarmonicGalaxy logging."""
 
@@ -223,38 +623,100 @@ class LoggingConfig:
         self,
         level: str = "INFO",
         enabled: bool = True,
-        theme: str = "galaxy",  # "galaxy" or "standard"
+        theme: str = "galaxy",  # "galaxy", "standard" or "json"
         use_colors: bool = True,
         show_emoji: bool = True,
         show_constellation: bool = True,
         log_file: Optional[str] = None,
         log_dir: Optional[str] = None,
         file_level: Optional[str] = None,
+        async_logging: bool = False,
+        queue_size: int = 10000,
+        overflow_policy: str = "block",
+        rate_limit: Optional[float] = None,
+        rate_burst: int = 20,
+        sample_rate: float = 0.0,
+        rate_summary_interval: float = 60.0,
+        max_bytes: int = 0,
+        rotate_daily: bool = False,
+        backup_count: int = 0,
+        max_age_days: Optional[float] = None,
+        compression: str = "gzip",
+        flight_recorder: Optional[str] = None,
+        flight_recorder_size: int = 4 * 1024 * 1024,
+        flight_recorder_level: str = "DEBUG",
     ):
         """Initialize logging configuration.
 
         Args:
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             enabled: Whether logging is enabled
-            theme: Log theme - "galaxy" (with emojis and galaxy theme) or "standard" (plain format)
+            theme: Log theme - "galaxy" (with emojis and galaxy theme), "standard" (plain
+                format) or "json" (one JSON object per line)
             use_colors: Whether to use colors in console output
             show_emoji: Whether to show celestial emojis (only for galaxy theme)
             show_constellation: Whether to show constellation prefix
             log_file: Optional log file path
             log_dir: Optional log directory (log_file will be created here)
             file_level: Optional different log level for file (defaults to level)
+            async_logging: Route records through a bounded queue drained by a
+                background thread, so logging never does blocking I/O in the caller
+            queue_size: Capacity of the logging queue (async_logging only)
+            overflow_policy: Behaviour when the queue is full - "block",
+                "drop_oldest" or "drop_new" (async_logging only)
+            rate_limit: Records per second allowed per call site; None disables
+                rate limiting (see :class:`RateLimitFilter`)
+            rate_burst: Records a call site may log at once before being limited
+            sample_rate: Fraction of over-limit records kept anyway (0-1)
+            rate_summary_interval: Seconds between "suppressed N similar
+                messages" summaries
+            max_bytes: Roll the log file over once it reaches this size (0 disables)
+            rotate_daily: Roll the log file over at midnight (always on with log_dir,
+                whose file names are dated)
+            backup_count: Number of rotated log files to keep (0 keeps all)
+            max_age_days: Delete rotated log files older than this many days
+            compression: Compression of rotated log files - "gzip", "zstd" or "none"
+            flight_recorder: Optional ring file keeping the latest records in memory-mapped
+                binary form for post-mortem debugging (see :class:`FlightRecorderHandler`)
+            flight_recorder_size: Size of the flight recorder ring in bytes
+            flight_recorder_level: Minimum level of the records kept by the flight
+                recorder, independently of ``level``
         """
         self.level = level.upper()
         self.enabled = enabled
         self.theme = theme.lower()
-        if self.theme not in ["galaxy", "standard"]:
-            raise ValueError(f"Invalid theme: {theme}. Must be 'galaxy' or 'standard'")
+        if self.theme not in ["galaxy", "standard", "json"]:
+            raise ValueError(f"Invalid theme: {theme}. Must be 'galaxy', 'standard' or 'json'")
         self.use_colors = use_colors
         self.show_emoji = show_emoji
         self.show_constellation = show_constellation
         self.log_file = log_file
         self.log_dir = log_dir
         self.file_level = (file_level or level).upper()
+        self.async_logging = async_logging
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy.lower()
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy: {overflow_policy}. Must be one of {OVERFLOW_POLICIES}"
+            )
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.sample_rate = sample_rate
+        self.rate_summary_interval = rate_summary_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.backup_count = backup_count
+        self.max_age_days = max_age_days
+        self.compression = compression.lower()
+        if self.compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"Invalid compression: {compression}. "
+                f"Must be one of {tuple(COMPRESSION_SUFFIXES)}"
+            )
+        self.flight_recorder = flight_recorder
+        self.flight_recorder_size = flight_recorder_size
+        self.flight_recorder_level = flight_recorder_level.upper()
 
     @classmethod
     def from_env(cls) -> "LoggingConfig":
@@ -263,11 +725,27 @@ class LoggingConfig:
         Environment variables:
             HARMONICGALAXY_LOG_LEVEL: Log level (default: INFO)
             HARMONICGALAXY_LOG_ENABLED: Enable/disable logging (default: true)
-            HARMONICGALAXY_LOG_THEME: Log theme - "galaxy" or "standard" (default: galaxy)
+            HARMONICGALAXY_LOG_THEME: Log theme - "galaxy", "standard" or "json" (default: galaxy)
             HARMONICGALAXY_LOG_COLORS: Enable/disable colors (default: true)
             HARMONICGALAXY_LOG_EMOJI: Enable/disable emojis (default: true, only for galaxy theme)
             HARMONICGALAXY_LOG_FILE: Log file path
             HARMONICGALAXY_LOG_DIR: Log directory
+            HARMONICGALAXY_LOG_ASYNC: Enable/disable the background logging queue (default: false)
+            HARMONICGALAXY_LOG_QUEUE_SIZE: Logging queue capacity (default: 10000)
+            HARMONICGALAXY_LOG_OVERFLOW: Queue overflow policy (default: block)
+            HARMONICGALAXY_LOG_RATE_LIMIT: Records per second per call site (default: unlimited)
+            HARMONICGALAXY_LOG_RATE_BURST: Burst size per call site (default: 20)
+            HARMONICGALAXY_LOG_SAMPLE_RATE: Fraction of over-limit records kept (default: 0)
+            HARMONICGALAXY_LOG_SUMMARY_INTERVAL: Seconds between suppression summaries
+                (default: 60)
+            HARMONICGALAXY_LOG_MAX_BYTES: Log file size that triggers rotation (default: 0)
+            HARMONICGALAXY_LOG_ROTATE_DAILY: Rotate the log file at midnight (default: false)
+            HARMONICGALAXY_LOG_BACKUP_COUNT: Rotated log files to keep (default: 0, all)
+            HARMONICGALAXY_LOG_MAX_AGE_DAYS: Maximum age of rotated log files
+            HARMONICGALAXY_LOG_COMPRESSION: gzip, zstd or none (default: gzip)
+            HARMONICGALAXY_LOG_FLIGHT_RECORDER: Flight recorder ring file
+            HARMONICGALAXY_LOG_FLIGHT_RECORDER_SIZE: Ring size in bytes (default: 4 MiB)
+            HARMONICGALAXY_LOG_FLIGHT_RECORDER_LEVEL: Minimum recorded level (default: DEBUG)
         """
         level = os.getenv("HARMONICGALAXY_LOG_LEVEL", "INFO").upper()
         enabled = os.getenv("HARMONICGALAXY_LOG_ENABLED", "true").lower() == "true"
@@ -276,6 +754,23 @@ class LoggingConfig:
         show_emoji = os.getenv("HARMONICGALAXY_LOG_EMOJI", "true").lower() == "true"
         log_file = os.getenv("HARMONICGALAXY_LOG_FILE")
         log_dir = os.getenv("HARMONICGALAXY_LOG_DIR")
+        async_logging = os.getenv("HARMONICGALAXY_LOG_ASYNC", "false").lower() == "true"
+        queue_size = int(os.getenv("HARMONICGALAXY_LOG_QUEUE_SIZE", "10000"))
+        overflow_policy = os.getenv("HARMONICGALAXY_LOG_OVERFLOW", "block").lower()
+        rate_limit = os.getenv("HARMONICGALAXY_LOG_RATE_LIMIT")
+        rate_burst = int(os.getenv("HARMONICGALAXY_LOG_RATE_BURST", "20"))
+        sample_rate = float(os.getenv("HARMONICGALAXY_LOG_SAMPLE_RATE", "0"))
+        rate_summary_interval = float(os.getenv("HARMONICGALAXY_LOG_SUMMARY_INTERVAL", "60"))
+        max_bytes = int(os.getenv("HARMONICGALAXY_LOG_MAX_BYTES", "0"))
+        rotate_daily = os.getenv("HARMONICGALAXY_LOG_ROTATE_DAILY", "false").lower() == "true"
+        backup_count = int(os.getenv("HARMONICGALAXY_LOG_BACKUP_COUNT", "0"))
+        max_age_days = os.getenv("HARMONICGALAXY_LOG_MAX_AGE_DAYS")
+        compression = os.getenv("HARMONICGALAXY_LOG_COMPRESSION", "gzip").lower()
+        flight_recorder = os.getenv("HARMONICGALAXY_LOG_FLIGHT_RECORDER")
+        flight_recorder_size = int(
+            os.getenv("HARMONICGALAXY_LOG_FLIGHT_RECORDER_SIZE", str(4 * 1024 * 1024))
+        )
+        flight_recorder_level = os.getenv("HARMONICGALAXY_LOG_FLIGHT_RECORDER_LEVEL", "DEBUG")
 
         return cls(
             level=level,
@@ -285,9 +780,41 @@ class LoggingConfig:
             show_emoji=show_emoji,
             log_file=log_file,
             log_dir=log_dir,
+            async_logging=async_logging,
+            queue_size=queue_size,
+            overflow_policy=overflow_policy,
+            rate_limit=float(rate_limit) if rate_limit else None,
+            rate_burst=rate_burst,
+            sample_rate=sample_rate,
+            rate_summary_interval=rate_summary_interval,
+            max_bytes=max_bytes,
+            rotate_daily=rotate_daily,
+            backup_count=backup_count,
+            max_age_days=float(max_age_days) if max_age_days else None,
+            compression=compression,
+            flight_recorder=flight_recorder,
+            flight_recorder_size=flight_recorder_size,
+            flight_recorder_level=flight_recorder_level,
         )
 
 
+def _create_formatter(config: LoggingConfig, use_colors: bool) -> logging.Formatter:
+    """Create the formatter for the configured theme."""
+    if config.theme == "galaxy":
+        return GalaxyFormatter(
+            use_colors=use_colors,
+            show_emoji=config.show_emoji,
+            show_constellation=config.show_constellation,
+        )
+    if config.theme == "json":
+        return JsonFormatter()
+    # standard theme
+    return StandardFormatter(
+        use_colors=use_colors,
+        show_project_prefix=config.show_constellation,
+    )
+
+
 def setup_logging(config: Optional[LoggingConfig] = None) -> None:
     """Setup HarmonicGalaxy logging system.
 
@@ -297,9 +824,19 @@ def setup_logging(config: Optional[LoggingConfig] = None) -> None:
     if config is None:
         config = LoggingConfig.from_env()
 
+    # Drain and stop a queue pipeline from a previous setup
+    shutdown_logging()
+    global _flight_recorder
+    if _flight_recorder is not None:
+        logging.getLogger().removeHandler(_flight_recorder)
+        _flight_recorder.close()
+        _flight_recorder = None
+
     if not config.enabled:
         logging.disable(logging.CRITICAL + 1)
         return
+    # Undo a previous setup with logging disabled
+    logging.disable(logging.NOTSET)
 
     # Get root logger
     root_logger = logging.getLogger()
@@ -307,57 +844,150 @@ def setup_logging(config: Optional[LoggingConfig] = None) -> None:
 
     # Clear existing handlers
     root_logger.handlers.clear()
+    handlers: List[logging.Handler] = []
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, config.level, logging.INFO))
 
-    # Choose formatter based on theme
-    if config.theme == "galaxy":
-        console_formatter = GalaxyFormatter(
-            use_colors=config.use_colors,
-            show_emoji=config.show_emoji,
-            show_constellation=config.show_constellation,
-        )
-    else:  # standard theme
-        console_formatter = StandardFormatter(
-            use_colors=config.use_colors,
-            show_project_prefix=config.show_constellation,
-        )
-
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(_create_formatter(config, use_colors=config.use_colors))
+    handlers.append(console_handler)
 
     # File handler (if configured)
     if config.log_file or config.log_dir:
         if config.log_dir:
-            log_dir_path = Path(config.log_dir)
-            log_dir_path.mkdir(parents=True, exist_ok=True)
-            log_file_path = log_dir_path / f"harmonicgalaxy_{datetime.now().strftime('%Y%m%d')}.log"
+            # Dated file name, re-resolved at every midnight rollover
+            log_file_path = Path(config.log_dir) / "harmonicgalaxy_%Y%m%d.log"
         else:
             log_file_path = Path(config.log_file)
 
-        # Ensure log file directory exists
-        log_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-        file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
+        file_handler = RotatingLogFileHandler(
+            str(log_file_path),
+            max_bytes=config.max_bytes,
+            rotate_daily=config.rotate_daily,
+            backup_count=config.backup_count,
+            max_age_days=config.max_age_days,
+            compression=config.compression,
+        )
         file_handler.setLevel(getattr(logging, config.file_level, logging.DEBUG))
 
-        # Choose formatter based on theme for file
-        if config.theme == "galaxy":
-            file_formatter = GalaxyFormatter(
-                use_colors=False,
-                show_emoji=config.show_emoji,
-                show_constellation=config.show_constellation,
-            )
-        else:  # standard theme
-            file_formatter = StandardFormatter(
-                use_colors=False,
-                show_project_prefix=config.show_constellation,
-            )
+        file_handler.setFormatter(_create_formatter(config, use_colors=False))
+        handlers.append(file_handler)
+
+    global _queue_handler, _queue_listener, _rate_limit_filter, _atexit_registered
+    if config.rate_limit is not None:
+        _rate_limit_filter = RateLimitFilter(
+            rate=config.rate_limit,
+            burst=config.rate_burst,
+            sample_rate=config.sample_rate,
+            summary_interval=config.rate_summary_interval,
+        )
+
+    if config.async_logging:
+        # Route records through a bounded queue drained by a background thread
+        log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=config.queue_size)
+        _queue_handler = BoundedQueueHandler(log_queue, overflow_policy=config.overflow_policy)
+        _queue_listener = _BlockingSentinelListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _queue_listener.start()
+        # Suppress records before they are formatted and queued
+        handlers = [_queue_handler]
+
+    for handler in handlers:
+        if _rate_limit_filter is not None:
+            handler.addFilter(_rate_limit_filter)
+        root_logger.addHandler(handler)
+    root_logger.addHandler(_record_counter)
+
+    if config.flight_recorder:
+        # Imported here so `python -m harmonicgalaxy.utils.flight_recorder` runs cleanly
+        from harmonicgalaxy.utils.flight_recorder import FlightRecorderHandler
+
+        # Written synchronously (bypassing queue and rate limiting), so the
+        # latest records are in the ring even if the process dies right after
+        flight_level = getattr(logging, config.flight_recorder_level, logging.DEBUG)
+        _flight_recorder = FlightRecorderHandler(
+            config.flight_recorder, size=config.flight_recorder_size, level=flight_level
+        )
+        if flight_level < root_logger.level:
+            # Let the recorder see records below the configured level without
+            # passing them to the other handlers
+            for handler in handlers:
+                handler.setLevel(max(handler.level, root_logger.level))
+            root_logger.setLevel(flight_level)
+        root_logger.addHandler(_flight_recorder)
+
+    if (config.async_logging or _rate_limit_filter is not None) and not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the background logging queue, if one is running.
+
+    All records queued before the call are written out before it returns.
+    Pending rate-limit summaries are logged first. Registered with
+    ``atexit`` when async logging or rate limiting is enabled.
+    """
+    global _queue_handler, _queue_listener, _rate_limit_filter
+    if _rate_limit_filter is not None:
+        _rate_limit_filter.flush_summary()
+        _lost_records["suppressed"] += _rate_limit_filter.suppressed
+        _rate_limit_filter = None
+
+    if _queue_listener is None:
+        return
 
-        file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+    listener, handler = _queue_listener, _queue_handler
+    _queue_listener = None
+    _queue_handler = None
+    _lost_records["dropped"] += handler.dropped
+
+    logging.getLogger().removeHandler(handler)
+    listener.stop()
+    for target in listener.handlers:
+        target.flush()
+        if isinstance(target, logging.FileHandler):
+            target.close()
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Return statistics of the background logging queue and rate limiting.
+
+    Returns:
+        Dictionary with ``async`` (whether the queue is active), ``queued``
+        (records waiting to be written), ``dropped`` (records discarded by
+        the overflow policy) and ``suppressed`` (records discarded by the
+        rate-limit filter)
+    """
+    suppressed = _rate_limit_filter.suppressed if _rate_limit_filter is not None else 0
+    if _queue_handler is None:
+        return {"async": False, "queued": 0, "dropped": 0, "suppressed": suppressed}
+    return {
+        "async": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "suppressed": suppressed,
+    }
+
+
+def get_record_counts() -> Dict[str, int]:
+    """Return the number of records logged since startup, by level name."""
+    return dict(_record_counter.counts)
+
+
+def get_lost_record_totals() -> Dict[str, int]:
+    """Return records lost since startup, across reconfigurations.
+
+    Returns:
+        Dictionary with ``dropped`` (full queue) and ``suppressed`` (rate limiting)
+    """
+    stats = get_logging_stats()
+    return {
+        "dropped": _lost_records["dropped"] + stats["dropped"],
+        "suppressed": _lost_records["suppressed"] + stats["suppressed"],
+    }
 
 
 def get_logger(name: Optional[str] = None) -> GalaxyLogger:
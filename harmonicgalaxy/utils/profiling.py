@@ -0,0 +1,254 @@
+"""Low-overhead latency statistics for HarmonicGalaxy.
+
+:class:`LatencyHistogram` keeps latencies in a fixed number of log-scaled
+buckets (HDR-style): each power of two is split into ``SUB_BUCKETS`` linear
+sub-buckets, so percentiles are accurate to a few percent over the whole
+range from one nanosecond to days, in constant memory.
+
+:class:`FunctionStats` groups the call count, error count and histogram of
+one function, plus optional cProfile/stack samples. They are kept in a
+process-wide registry filled by the ``timed``/``profiled`` decorators in
+:mod:`harmonicgalaxy.utils.decorators`.
+
+Example:
+    >>> @timed("agents.plan")
+    ... async def plan(mission): ...
+    >>> get_function_stats("agents.plan").snapshot()
+    {'calls': 1200, 'errors': 3, 'mean': 0.041, 'p50': 0.038, 'p90': 0.061, ...}
+"""
+
+import io
+import math
+from math import frexp
+import pstats
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Linear sub-buckets per power of two (relative error about 1 / (2 * SUB_BUCKETS))
+SUB_BUCKETS = 16
+# Octaves covered, in nanoseconds: 1ns .. 2**50ns (about 13 days)
+OCTAVES = 51
+
+_BUCKET_COUNT = OCTAVES * SUB_BUCKETS
+
+
+def _bucket_value(index: int) -> float:
+    """Return the midpoint (in nanoseconds) of a bucket.
+
+    Bucket ``(e - 1) * SUB_BUCKETS + s`` covers ``[2**(e-1) * (1 + s / SUB_BUCKETS),
+    2**(e-1) * (1 + (s + 1) / SUB_BUCKETS))``, see :meth:`LatencyHistogram.record`.
+    """
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    low = (1 << exponent) * (1 + sub / SUB_BUCKETS)
+    high = (1 << exponent) * (1 + (sub + 1) / SUB_BUCKETS)
+    return (low + high) / 2
+
+
+class LatencyHistogram:
+    """Fixed-memory, log-bucketed latency histogram.
+
+    Recording is lock-free: under heavy contention from several threads a
+    count may very rarely be lost, which is acceptable for statistics.
+    """
+
+    __slots__ = ("_counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one latency in seconds."""
+        nanos = seconds * 1e9
+        if nanos < 1.0:
+            index = 0
+        else:
+            # nanos == mantissa * 2**exponent with 0.5 <= mantissa < 1 (inlined for speed)
+            mantissa, exponent = frexp(nanos)
+            index = (exponent - 1) * SUB_BUCKETS + int((mantissa - 0.5) * (2 * SUB_BUCKETS))
+            if index >= _BUCKET_COUNT:
+                index = _BUCKET_COUNT - 1
+        self._counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if seconds < self.min:
+            self.min = seconds
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds (0.0 when empty)."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return the ``q``-th percentile (0-100) in seconds.
+
+        The result is accurate to the bucket resolution and clamped to the
+        observed min/max; ``q`` of 0 and 100 return the exact min and max.
+        """
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 100:
+            return self.max
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                value = _bucket_value(index) / 1e9
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the samples of ``other`` to this histogram."""
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        """Discard all samples."""
+        self.__init__()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return count, mean, p50/p90/p99 and max (seconds)."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+# Distinct call stacks kept per function by stack sampling
+MAX_STACK_SAMPLES = 1000
+
+
+class FunctionStats:
+    """Calls, errors, latencies and optional profile samples of one function."""
+
+    def __init__(self, name: str):
+        """Initialize stats.
+
+        Args:
+            name: Name the stats are registered under
+        """
+        self.name = name
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.profile: Optional[pstats.Stats] = None
+        self.profiled_calls = 0
+        self.stack_samples: Counter = Counter()
+        self._profile_lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        """Number of recorded calls."""
+        return self.latency.count
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        """Record one call."""
+        if failed:
+            self.errors += 1
+        self.latency.record(seconds)
+
+    def reset(self) -> None:
+        """Discard calls, errors, latencies and profile samples, in place."""
+        with self._profile_lock:
+            self.errors = 0
+            self.latency.reset()
+            self.profile = None
+            self.profiled_calls = 0
+            self.stack_samples.clear()
+
+    def add_profile(self, profiler: Any) -> None:
+        """Merge a finished ``cProfile.Profile`` into the aggregated profile."""
+        with self._profile_lock:
+            self.profiled_calls += 1
+            if self.profile is None:
+                self.profile = pstats.Stats(profiler, stream=io.StringIO())
+            else:
+                self.profile.add(profiler)
+
+    def add_stack(self, stack: Tuple[str, ...]) -> None:
+        """Count one sampled call stack."""
+        with self._profile_lock:
+            if stack in self.stack_samples or len(self.stack_samples) < MAX_STACK_SAMPLES:
+                self.stack_samples[stack] += 1
+
+    def profile_report(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """Return the aggregated cProfile report as text ('' if nothing was sampled)."""
+        with self._profile_lock:
+            if self.profile is None:
+                return ""
+            stream = io.StringIO()
+            self.profile.stream = stream
+            self.profile.sort_stats(sort).print_stats(limit)
+            return stream.getvalue()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return calls, errors and latency percentiles (seconds)."""
+        latency = self.latency.snapshot()
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean": latency["mean"],
+            "p50": latency["p50"],
+            "p90": latency["p90"],
+            "p99": latency["p99"],
+            "max": latency["max"],
+            "profiled_calls": self.profiled_calls,
+        }
+
+
+_function_stats: Dict[str, FunctionStats] = {}
+_registry_lock = threading.Lock()
+
+
+def get_function_stats(name: str) -> FunctionStats:
+    """Return the stats registered under ``name``, creating them on first use."""
+    stats = _function_stats.get(name)
+    if stats is None:
+        with _registry_lock:
+            stats = _function_stats.setdefault(name, FunctionStats(name))
+    return stats
+
+
+def stats_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Return the snapshot of every registered function, by name."""
+    return {name: stats.snapshot() for name, stats in list(_function_stats.items())}
+
+
+def top_stacks(name: str, limit: int = 10) -> List[Tuple[Tuple[str, ...], int]]:
+    """Return the most frequently sampled call stacks of a function."""
+    stats = _function_stats.get(name)
+    return stats.stack_samples.most_common(limit) if stats is not None else []
+
+
+def reset_stats(name: Optional[str] = None) -> None:
+    """Reset the stats of one function, or of all functions.
+
+    Stats are reset in place rather than unregistered: decorated functions
+    keep recording into the object they got when they were decorated.
+    """
+    with _registry_lock:
+        if name is None:
+            targets = list(_function_stats.values())
+        else:
+            stats = _function_stats.get(name)
+            targets = [stats] if stats is not None else []
+    for stats in targets:
+        stats.reset()
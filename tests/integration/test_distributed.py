@@ -0,0 +1,119 @@
+"""Coordinator with several local worker processes."""
+
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.distributed.coordinator import Coordinator
+from harmonicgalaxy.distributed.protocol import format_address
+
+ROOT = Path(__file__).parent.parent.parent
+
+
+class Sleeper(Agent):
+    """Sleeps ``inputs["seconds"]`` and returns the worker pid."""
+
+    async def run(self, inputs, mission):
+        await asyncio.sleep(inputs.get("seconds", 0))
+        return os.getpid()
+
+
+def sleeper():
+    return Sleeper("sleeper")
+
+
+async def spawn_worker(coordinator, *extra):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "harmonicgalaxy.distributed",
+        "--connect",
+        format_address(coordinator.address),
+        "--agent",
+        "tests.integration.test_distributed:sleeper",
+        *extra,
+        cwd=ROOT,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    return process
+
+
+async def stop_workers(processes):
+    for process in processes:
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(sys.platform != "linux", reason="uses POSIX signals on local processes")
+class TestDistributedWorkers:
+    """Test placement and failover across worker processes."""
+
+    @pytest.mark.asyncio
+    async def test_placement_and_spread(self, tmp_path):
+        """Test capability-aware placement and load spreading over a Unix socket."""
+        path = str(tmp_path / "coordinator.sock")
+        async with Coordinator(path=path, heartbeat_interval=0.2) as coordinator:
+            gpu = await spawn_worker(coordinator, "--capability", "gpu", "--slots", "2")
+            cpu = [await spawn_worker(coordinator, "--slots", "2") for _ in range(2)]
+            try:
+                await coordinator.wait_for_workers(3, timeout=30)
+
+                pids = await asyncio.gather(
+                    *(coordinator.submit("sleeper", {}, requires=["gpu"]) for _ in range(4))
+                )
+                assert set(pids) == {gpu.pid}
+
+                pids = await asyncio.gather(
+                    *(coordinator.submit("sleeper", {"seconds": 0.3}) for _ in range(6))
+                )
+                assert set(pids) == {gpu.pid} | {process.pid for process in cpu}
+            finally:
+                await stop_workers([gpu, *cpu])
+
+    @pytest.mark.asyncio
+    async def test_redispatch_on_worker_death(self):
+        """Test a task survives the worker running it being killed."""
+        async with Coordinator(heartbeat_interval=0.2) as coordinator:
+            processes = [await spawn_worker(coordinator, "--slots", "1") for _ in range(2)]
+            try:
+                await coordinator.wait_for_workers(2, timeout=30)
+                pending = asyncio.ensure_future(coordinator.submit("sleeper", {"seconds": 1}))
+                await asyncio.sleep(0.3)
+                busy = [w for w in coordinator.workers() if w["running"]]
+                victim = next(p for p in processes if busy[0]["worker_id"].endswith(f":{p.pid}"))
+                victim.kill()
+
+                survivor = await asyncio.wait_for(pending, 10)
+                assert survivor != victim.pid
+                assert survivor in {process.pid for process in processes}
+            finally:
+                await stop_workers(processes)
+
+    @pytest.mark.asyncio
+    async def test_redispatch_on_hung_worker(self):
+        """Test a task moves on when its worker stops responding (SIGSTOP)."""
+        async with Coordinator(heartbeat_interval=0.2) as coordinator:
+            processes = [await spawn_worker(coordinator, "--slots", "1") for _ in range(2)]
+            try:
+                await coordinator.wait_for_workers(2, timeout=30)
+                pending = asyncio.ensure_future(coordinator.submit("sleeper", {"seconds": 1}))
+                await asyncio.sleep(0.3)
+                busy = [w for w in coordinator.workers() if w["running"]]
+                hung = next(p for p in processes if busy[0]["worker_id"].endswith(f":{p.pid}"))
+                os.kill(hung.pid, signal.SIGSTOP)
+
+                survivor = await asyncio.wait_for(pending, 10)
+                assert survivor != hung.pid
+                assert len(coordinator.workers()) == 1
+            finally:
+                for process in processes:
+                    if process.returncode is None:
+                        os.kill(process.pid, signal.SIGCONT)
+                await stop_workers(processes)
@@ -0,0 +1,187 @@
+"""Tests for warm agent instance pools."""
+
+import asyncio
+import itertools
+
+import pytest
+from harmonicgalaxy.agents.base import Agent
+from harmonicgalaxy.agents.pool import AgentPool, PooledAgent
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine
+
+
+class Notebook(Agent):
+    """Remembers the inputs of the steps it ran until reset."""
+
+    serial = itertools.count()
+
+    def __init__(self):
+        super().__init__("notebook")
+        self.index = next(self.serial)
+        self.notes = []
+        self.ready = False
+        self.closed = False
+        self.healthy = True
+        self.resets = 0
+
+    async def setup(self):
+        await asyncio.sleep(0)
+        self.ready = True
+
+    async def reset(self):
+        self.resets += 1
+        self.notes = []
+
+    async def check_health(self):
+        return self.healthy
+
+    async def close(self):
+        self.closed = True
+
+    async def run(self, inputs, mission):
+        assert self.ready and not self.closed
+        self.notes.append(inputs.get("note"))
+        await asyncio.sleep(inputs.get("seconds", 0))
+        return list(self.notes)
+
+
+@pytest.mark.unit
+class TestAgentPool:
+    """Test borrowing, isolation and maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_and_reuse(self):
+        """Test start sets up min_size instances which are reused."""
+        async with AgentPool(Notebook, min_size=2, max_size=4) as pool:
+            assert pool.stats()["idle"] == 2
+            assert pool.created == 2
+            agent = await pool.acquire()
+            assert agent.ready
+            await pool.release(agent)
+            assert await pool.acquire() is agent
+            await pool.release(agent)
+            assert pool.created == 2
+        assert agent.closed
+
+    @pytest.mark.asyncio
+    async def test_max_size_and_waiting(self):
+        """Test borrowers wait beyond max_size and time out."""
+        async with AgentPool(Notebook, min_size=0, max_size=2) as pool:
+            first = await pool.acquire()
+            second = await pool.acquire()
+            assert pool.size == 2
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.acquire(timeout=0.01)
+
+            waiting = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0)
+            assert pool.stats()["waiting"] == 1
+            await pool.release(first)
+            assert await waiting is first
+
+            waiting = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0)
+            await pool.release(second, discard=True)
+            replacement = await waiting
+            assert replacement is not second and second.closed
+            assert pool.size == 2 and pool.discarded == 1
+            await pool.release(first)
+            await pool.release(replacement)
+
+    @pytest.mark.asyncio
+    async def test_per_mission_isolation(self):
+        """Test state stays within a mission and is reset across missions."""
+        async with AgentPool(Notebook, min_size=1, max_size=1) as pool:
+            async with pool.lease("m1") as agent:
+                await agent.run({"note": "a"}, None)
+            async with pool.lease("m1") as same:
+                assert same is agent
+                assert await same.run({"note": "b"}, None) == ["a", "b"]
+            async with pool.lease("m2") as other:
+                assert other is agent
+                assert await other.run({"note": "c"}, None) == ["c"]
+            assert agent.resets == 1
+
+    @pytest.mark.asyncio
+    async def test_prefers_instance_of_same_mission(self):
+        """Test an idle instance already serving the mission is preferred."""
+        async with AgentPool(Notebook, min_size=2, max_size=2) as pool:
+            first = await pool.acquire("m1")
+            second = await pool.acquire("m2")
+            await pool.release(first)
+            await pool.release(second)
+            assert await pool.acquire("m1") is first
+            assert first.resets == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_eviction_and_health_checks(self):
+        """Test idle instances are evicted to min_size and unhealthy ones replaced."""
+        pool = AgentPool(
+            Notebook, min_size=1, max_size=4, idle_timeout=0.05, health_check_interval=0.05
+        )
+        await pool.start()
+        try:
+            borrowed = [await pool.acquire() for _ in range(3)]
+            for agent in borrowed:
+                await pool.release(agent)
+            await asyncio.sleep(0.2)
+            assert pool.size == 1 and pool.evicted == 2
+
+            (survivor,) = pool._idle
+            survivor.agent.healthy = False
+            await asyncio.sleep(0.2)
+            assert survivor.agent.closed
+            assert pool.size == 1 and pool.discarded >= 1
+            assert pool._idle[0].agent is not survivor.agent
+        finally:
+            await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop(self):
+        """Test stopping fails waiters and closes instances as they come back."""
+        pool = AgentPool(Notebook, min_size=0, max_size=1, idle_timeout=None)
+        await pool.start()
+        agent = await pool.acquire()
+        waiting = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        await pool.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await waiting
+        await pool.release(agent)
+        assert agent.closed
+        with pytest.raises(RuntimeError, match="stopped"):
+            await pool.acquire()
+        with pytest.raises(ValueError, match="not borrowed"):
+            await pool.release(Notebook())
+
+    def test_sizes_validated(self):
+        """Test inconsistent sizes are rejected."""
+        with pytest.raises(ValueError):
+            AgentPool(Notebook, min_size=3, max_size=2)
+        with pytest.raises(ValueError):
+            AgentPool(Notebook, max_size=0)
+
+
+@pytest.mark.unit
+class TestPooledAgent:
+    """Test pooled agents in mission graphs."""
+
+    @pytest.mark.asyncio
+    async def test_steps_borrow_instances(self):
+        """Test concurrent steps use separate instances, missions do not share state."""
+        async with AgentPool(Notebook, min_size=2, max_size=2, name="notebook") as pool:
+            agent = PooledAgent(pool, capabilities={"notes"})
+            assert agent.name == "notebook"
+            graph = MissionGraph()
+            graph.add_step("a", agent, inputs={"note": "a", "seconds": 0.01})
+            graph.add_step("b", agent, inputs={"note": "b", "seconds": 0.01})
+            graph.add_step("c", agent, inputs={"note": "c"}, depends_on=["a", "b"])
+            engine = OrchestrationEngine()
+
+            outputs = await engine.run(Mission("first"), graph)
+            assert outputs["a"] == ["a"] and outputs["b"] == ["b"]
+            assert outputs["c"][-1] == "c" and len(outputs["c"]) == 2
+
+            outputs = await engine.run(Mission("second"), graph)
+            assert outputs["a"] == ["a"] and outputs["b"] == ["b"]
+            assert pool.created == 2
@@ -0,0 +1,123 @@
+"""Tests for the capability-indexed agent registry."""
+
+import pytest
+from harmonicgalaxy.agents.base import FunctionAgent
+from harmonicgalaxy.agents.registry import AgentRegistry
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.orchestrator.engine import (
+    MissionGraph,
+    OrchestrationEngine,
+    StepFailedError,
+)
+
+
+def agent(name, capabilities=(), input_types=(), output_types=()):
+    return FunctionAgent(
+        name,
+        lambda inputs, mission: name,
+        capabilities=capabilities,
+        input_types=input_types,
+        output_types=output_types,
+    )
+
+
+def names(matches):
+    return [match.agent.name for match in matches]
+
+
+@pytest.fixture
+def registry():
+    return AgentRegistry(
+        [
+            agent("summarizer", {"summarize"}, {"text"}, {"text"}),
+            agent("translator", {"translate", "summarize"}, {"text"}, {"text"}),
+            agent("captioner", {"describe"}, {"image"}, {"text"}),
+            agent("embedder", {"embed"}, {"text", "image"}, {"embedding"}),
+        ]
+    )
+
+
+@pytest.mark.unit
+class TestAgentRegistry:
+    """Test registration and matching."""
+
+    def test_required_capabilities_and_types(self, registry):
+        """Test all requirements must hold, across capabilities and types."""
+        assert names(registry.find(requires={"summarize"})) == ["summarizer", "translator"]
+        assert names(registry.find(requires={"summarize", "translate"})) == ["translator"]
+        assert names(registry.find(accepts={"image"})) == ["captioner", "embedder"]
+        assert names(registry.find(accepts={"image"}, produces={"text"})) == ["captioner"]
+        assert registry.find(requires={"summarize"}, accepts={"image"}) == []
+        assert registry.find(requires={"fly"}) == []
+        assert len(registry.find()) == 4
+
+    def test_preferred_capabilities_score(self, registry):
+        """Test preferred tags rank matches, ties keeping registration order."""
+        matches = registry.find(requires={"summarize"}, prefers={"translate", "fly"})
+        assert [(m.agent.name, m.score) for m in matches] == [
+            ("translator", 1),
+            ("summarizer", 0),
+        ]
+        assert matches[0].preferred == frozenset({"translate"})
+        assert registry.best(requires={"summarize"}).name == "summarizer"
+        assert registry.best(requires={"fly"}) is None
+        assert len(registry.find(accepts={"text"}, limit=1)) == 1
+
+    def test_incremental_updates(self, registry):
+        """Test register/unregister update the index and invalidate cached results."""
+        assert registry.best(requires={"summarize"}).name == "summarizer"
+        removed = registry.unregister("summarizer")
+        assert removed.name == "summarizer"
+        assert "summarizer" not in registry
+        assert registry.best(requires={"summarize"}).name == "translator"
+
+        registry.register(agent("fast", {"summarize", "fast"}))
+        assert registry.best(requires={"summarize"}, prefers={"fast"}).name == "fast"
+        registry.unregister("translator")
+        registry.unregister("fast")
+        assert registry.find(requires={"summarize"}) == []
+        assert "summarize" not in registry.capabilities()
+        assert registry.capabilities() == {"describe": 1, "embed": 1}
+
+    def test_duplicate_names(self, registry):
+        """Test names are unique unless replacing."""
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register(agent("embedder"))
+        registry.register(agent("embedder", {"vectorize"}), replace=True)
+        assert registry.find(requires={"embed"}) == []
+        assert registry.best(requires={"vectorize"}).name == "embedder"
+        with pytest.raises(KeyError):
+            registry.unregister("missing")
+
+
+@pytest.mark.unit
+class TestRegistryOrchestration:
+    """Test steps declared by capability."""
+
+    @pytest.mark.asyncio
+    async def test_steps_resolved_at_dispatch(self, registry):
+        """Test the engine picks each step's agent from the registry."""
+        graph = MissionGraph()
+        graph.add_step("caption", requires={"describe"})
+        graph.add_step("summary", requires={"summarize"}, prefers={"translate"})
+        engine = OrchestrationEngine(registry=registry)
+
+        outputs = await engine.run(Mission("m"), graph)
+        assert outputs == {"caption": "captioner", "summary": "translator"}
+
+        registry.unregister("captioner")
+        with pytest.raises(StepFailedError, match="No registered agent"):
+            await engine.run(Mission("m"), graph)
+
+    def test_step_needs_agent_or_capabilities(self):
+        """Test steps name an agent or the capabilities they need."""
+        with pytest.raises(ValueError, match="needs an agent"):
+            MissionGraph().add_step("empty")
+
+    @pytest.mark.asyncio
+    async def test_capability_steps_need_registry(self):
+        """Test capability steps are rejected by an engine without registry."""
+        graph = MissionGraph()
+        graph.add_step("summary", requires={"summarize"})
+        with pytest.raises(ValueError, match="registry"):
+            await OrchestrationEngine().run(Mission("m"), graph)
@@ -0,0 +1,142 @@
+"""Tests for mission checkpoints."""
+
+import asyncio
+
+import pytest
+from harmonicgalaxy.agents.base import FunctionAgent
+from harmonicgalaxy.core.mission import Mission, MissionStatus
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine
+from harmonicgalaxy.state.backends import MemoryBackend, SQLiteBackend
+from harmonicgalaxy.state.checkpoint import MissionCheckpointer, _fields
+from harmonicgalaxy.state.manager import StateManager
+from harmonicgalaxy.state.persistent import diff
+
+
+def make_mission():
+    mission = Mission("report", context={"documents": [{"title": "a"}]}, mission_id="m1")
+    mission.start()
+    return mission
+
+
+@pytest.mark.unit
+class TestMissionCheckpointer:
+    """Test journaling and recovery."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_and_recovery(self):
+        """Test deltas carry only changes and recovery replays them onto the snapshot."""
+        backend = MemoryBackend()
+        checkpointer = MissionCheckpointer(StateManager(backend), snapshot_every=3)
+        mission = make_mission()
+        assert await checkpointer.checkpoint(mission) == 0
+        shared = {"large": "x" * 1000}
+        for step in range(6):
+            mission.record_step("writer", f"s{step}", input=shared, output=[step])
+            mission.context["documents"].append({"title": f"d{step}"})
+            if step == 2:
+                del mission.context["documents"][0]
+                mission.metadata["owner"] = "ops"
+            await checkpointer.checkpoint(mission)
+        # Nothing changed: no new delta
+        assert await checkpointer.checkpoint(mission) == 6
+        # The snapshot at seq 4 dropped deltas 1-3
+        assert [key for key, _ in await backend.scan("checkpoint/m1/delta/")] == [
+            "checkpoint/m1/delta/000000000005",
+            "checkpoint/m1/delta/000000000006",
+        ]
+        # The shared payload is journaled once
+        assert checkpointer.stats()["bytes_written"] < 3000 + 2 * 1000
+
+        restored = await MissionCheckpointer(StateManager(backend)).recover("m1")
+        assert restored.to_dict() == mission.to_dict()
+        assert restored.history[5].input is restored.history[0].input
+
+    @pytest.mark.asyncio
+    async def test_recovered_journal_continues(self):
+        """Test checkpoints after a recovery extend the same journal."""
+        state = StateManager(MemoryBackend())
+        mission = make_mission()
+        await MissionCheckpointer(state).checkpoint(mission)
+        mission.record_step("writer", "draft", output="text")
+        await MissionCheckpointer(state).checkpoint(mission)  # a new process: snapshot
+
+        checkpointer = MissionCheckpointer(state)
+        restored = await checkpointer.recover("m1")
+        restored.record_step("editor", "edit", output="better text")
+        restored.complete(result="better text")
+        assert await checkpointer.checkpoint(restored) == 1
+        assert checkpointer.stats()["missions"] == 0
+
+        final = await MissionCheckpointer(state).recover("m1")
+        assert final.status is MissionStatus.COMPLETED
+        assert [step.action for step in final.history] == ["draft", "edit"]
+        assert await checkpointer.recover("missing") is None
+        assert await checkpointer.discard("m1") is True
+        assert await state.count() == 0
+
+    def test_fields_refreeze_only_changes(self):
+        """Test unchanged context entries keep their frozen version and in-place edits are seen."""
+        mission = make_mission()
+        mission.context.update(topic="lorem " * 1000, summary="short")
+        fields, raw = _fields(mission.to_dict(include_history=False))
+
+        mission.context["summary"] = "longer"
+        mission.context["documents"].append({"title": "b"})
+        del mission.context["topic"]
+        mission.complete()
+        new_fields, _ = _fields(mission.to_dict(include_history=False), fields, raw)
+
+        assert new_fields["context"]["summary"] == "longer"
+        assert sorted(change.path for change in diff(fields, new_fields)) == [
+            ("context", "documents", 1),
+            ("context", "summary"),
+            ("context", "topic"),
+            ("finished_at",),
+            ("status",),
+        ]
+        assert new_fields == _fields(mission.to_dict(include_history=False))[0]
+        assert new_fields["name"] is fields["name"]
+
+
+@pytest.mark.unit
+class TestEngineResume:
+    """Test the engine resumes recovered missions."""
+
+    @pytest.mark.asyncio
+    async def test_resume_after_crash(self, tmp_path):
+        """Test steps checkpointed before a crash are not run again."""
+        calls = []
+        blocked = asyncio.Event()
+
+        def agent(name):
+            async def run(inputs, mission):
+                calls.append(name)
+                if name == "write" and not blocked.is_set():
+                    blocked.set()
+                    await asyncio.sleep(3600)  # the worker dies here
+                return f"{name}({','.join(sorted(k for k in inputs if k != 'topic'))})"
+
+            return FunctionAgent(name, run)
+
+        graph = MissionGraph()
+        graph.add_step("research", agent("research"), inputs={"topic": "state"})
+        graph.add_step("outline", agent("outline"), depends_on=["research"])
+        graph.add_step("write", agent("write"), depends_on=["research", "outline"])
+
+        async with StateManager(SQLiteBackend(tmp_path / "state.db")) as state:
+            engine = OrchestrationEngine(checkpointer=MissionCheckpointer(state))
+            task = asyncio.create_task(engine.run(Mission("article", mission_id="m1"), graph))
+            await blocked.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        async with StateManager(SQLiteBackend(tmp_path / "state.db")) as state:
+            checkpointer = MissionCheckpointer(state)
+            mission = await checkpointer.recover("m1")
+            assert mission.status is MissionStatus.RUNNING
+            outputs = await OrchestrationEngine(checkpointer=checkpointer).run(mission, graph)
+        assert calls == ["research", "outline", "write", "write"]
+        assert outputs["write"] == "write(outline,research)"
+        assert mission.status is MissionStatus.COMPLETED
+        assert [step.action for step in mission.history] == ["research", "outline", "write"]
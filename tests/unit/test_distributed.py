@@ -0,0 +1,233 @@
+"""Tests for the coordinator/worker protocol, run in a single process."""
+
+import asyncio
+
+import pytest
+from harmonicgalaxy.agents.base import Agent, FunctionAgent
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.distributed import protocol
+from harmonicgalaxy.distributed.coordinator import (
+    Coordinator,
+    RemoteAgent,
+    RemoteTaskError,
+    TaskLostError,
+)
+from harmonicgalaxy.distributed.worker import Worker, load_agent
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine
+
+
+async def upper(inputs, mission):
+    return {"text": inputs["text"].upper(), "mission": mission.name}
+
+
+async def fail(inputs, mission):
+    raise ValueError("bad input")
+
+
+async def describe(inputs, mission):
+    return {"context": mission.context, "metadata": mission.metadata}
+
+
+def make_agent():
+    return FunctionAgent("made", upper)
+
+
+class Tagged(Agent):
+    """Agent returning the tag of the worker running it."""
+
+    def __init__(self, tag):
+        super().__init__("tagged")
+        self.tag = tag
+
+    async def run(self, inputs, mission):
+        await asyncio.sleep(inputs.get("sleep", 0))
+        return self.tag
+
+
+async def start_worker(coordinator, agents, **kwargs):
+    worker = Worker(agents, coordinator.address, **kwargs)
+    task = asyncio.get_running_loop().create_task(worker.run())
+    return worker, task
+
+
+@pytest.mark.unit
+class TestProtocol:
+    """Test addresses and framing."""
+
+    def test_addresses(self):
+        """Test address parsing and formatting round trip."""
+        assert protocol.parse_address("10.0.0.5:7700") == ("10.0.0.5", 7700)
+        assert protocol.parse_address("[::1]:7700") == ("::1", 7700)
+        assert protocol.parse_address("unix:/tmp/hg.sock") == "/tmp/hg.sock"
+        assert protocol.format_address(("::1", 7700)) == "[::1]:7700"
+        assert protocol.format_address("/tmp/hg.sock") == "unix:/tmp/hg.sock"
+        with pytest.raises(ValueError):
+            protocol.parse_address("localhost")
+
+    @pytest.mark.asyncio
+    async def test_framing(self):
+        """Test messages round trip and malformed frames are rejected."""
+        reader = asyncio.StreamReader()
+        data = protocol.dumps({"type": "task", "inputs": {"n": 1}})
+        reader.feed_data(len(data).to_bytes(4, "big") + data)
+        reader.feed_data((2).to_bytes(4, "big") + b"[]")
+        assert await protocol.read_message(reader) == {"type": "task", "inputs": {"n": 1}}
+        with pytest.raises(protocol.ProtocolError):
+            await protocol.read_message(reader)
+
+    def test_load_agent(self):
+        """Test agents are imported from module:attribute paths."""
+        assert load_agent("tests.unit.test_distributed:make_agent").name == "made"
+        with pytest.raises(ValueError):
+            load_agent("tests.unit.test_distributed")
+        with pytest.raises(TypeError):
+            load_agent("tests.unit.test_distributed:upper")
+
+
+@pytest.mark.unit
+class TestCoordinator:
+    """Test dispatching to in-process workers."""
+
+    @pytest.mark.asyncio
+    async def test_submit_waits_for_worker(self):
+        """Test tasks queue until a worker hosting the agent joins."""
+        async with Coordinator(heartbeat_interval=0.05) as coordinator:
+            pending = asyncio.ensure_future(
+                coordinator.submit("upper", {"text": "hi"}, mission={"id": "m1", "name": "n"})
+            )
+            await asyncio.sleep(0.05)
+            assert not pending.done()
+
+            worker, task = await start_worker(coordinator, [FunctionAgent("upper", upper)])
+            assert await asyncio.wait_for(pending, 2) == {"text": "HI", "mission": "n"}
+            assert coordinator.workers()[0]["agents"] == ["upper"]
+            worker.stop()
+            await task
+
+    @pytest.mark.asyncio
+    async def test_remote_error(self):
+        """Test an exception of the remote agent is raised to the caller."""
+        async with Coordinator(heartbeat_interval=0.05) as coordinator:
+            worker, task = await start_worker(coordinator, [FunctionAgent("fail", fail)])
+            with pytest.raises(RemoteTaskError, match="ValueError: bad input"):
+                await asyncio.wait_for(coordinator.submit("fail", {}), 2)
+            worker.stop()
+            await task
+
+    @pytest.mark.asyncio
+    async def test_unsendable_task_fails_alone(self):
+        """Test a task that cannot be sent fails without losing the others or the worker."""
+        async with Coordinator(heartbeat_interval=0.05) as coordinator:
+            with pytest.raises(TypeError):
+                await coordinator.submit("upper", {"text": object()})
+
+            inputs = {"text": "first"}
+            bad = asyncio.ensure_future(coordinator.submit("upper", inputs))
+            good = asyncio.ensure_future(coordinator.submit("upper", {"text": "second"}))
+            await asyncio.sleep(0.01)
+            # Made unsendable after submission: fails when dispatched
+            inputs["text"] = object()
+
+            worker, task = await start_worker(coordinator, [FunctionAgent("upper", upper)])
+            with pytest.raises(TypeError):
+                await asyncio.wait_for(bad, 2)
+            assert (await asyncio.wait_for(good, 2))["text"] == "SECOND"
+            assert await asyncio.wait_for(coordinator.submit("upper", {"text": "x"}), 2) == {
+                "text": "X",
+                "mission": "remote",
+            }
+            assert coordinator.workers()[0]["running"] == 0
+            worker.stop()
+            await task
+
+    @pytest.mark.asyncio
+    async def test_capability_placement(self):
+        """Test tasks only go to workers providing the required capabilities."""
+        async with Coordinator(heartbeat_interval=0.05) as coordinator:
+            cpu, cpu_task = await start_worker(coordinator, [Tagged("cpu")], worker_id="cpu")
+            gpu, gpu_task = await start_worker(
+                coordinator, [Tagged("gpu")], capabilities=["gpu"], worker_id="gpu"
+            )
+            await coordinator.wait_for_workers(2, timeout=2)
+
+            results = await asyncio.gather(
+                *(coordinator.submit("tagged", {}, requires=["gpu"]) for _ in range(5))
+            )
+            assert results == ["gpu"] * 5
+            results = await asyncio.gather(
+                *(coordinator.submit("tagged", {"sleep": 0.05}) for _ in range(8))
+            )
+            assert sorted(set(results)) == ["cpu", "gpu"]
+            for worker in (cpu, gpu):
+                worker.stop()
+            await asyncio.gather(cpu_task, gpu_task)
+
+    @pytest.mark.asyncio
+    async def test_silent_worker_tasks_redispatched(self):
+        """Test tasks of a worker that stops sending heartbeats move to another worker."""
+        async with Coordinator(heartbeat_interval=0.05) as coordinator:
+            # A worker that accepts tasks but never answers nor sends heartbeats
+            reader, writer = await protocol.open_connection(coordinator.address)
+            protocol.write_message(
+                writer, {"type": "hello", "worker_id": "mute", "agents": ["tagged"], "slots": 1}
+            )
+            await protocol.read_message(reader)
+            await coordinator.wait_for_workers(1, timeout=2)
+
+            pending = asyncio.ensure_future(coordinator.submit("tagged", {}))
+            assert (await protocol.read_message(reader))["type"] == "task"
+            worker, task = await start_worker(coordinator, [Tagged("alive")])
+
+            assert await asyncio.wait_for(pending, 2) == "alive"
+            assert [w["worker_id"] for w in coordinator.workers()] == [worker.worker_id]
+            writer.close()
+            worker.stop()
+            await task
+
+    @pytest.mark.asyncio
+    async def test_task_lost_after_max_attempts(self):
+        """Test a task fails once every attempt was lost."""
+        async with Coordinator(heartbeat_interval=0.05, max_attempts=1) as coordinator:
+            reader, writer = await protocol.open_connection(coordinator.address)
+            protocol.write_message(
+                writer, {"type": "hello", "worker_id": "crash", "agents": ["tagged"]}
+            )
+            await protocol.read_message(reader)
+            pending = asyncio.ensure_future(coordinator.submit("tagged", {}))
+            await protocol.read_message(reader)
+            writer.close()
+            with pytest.raises(TaskLostError):
+                await asyncio.wait_for(pending, 2)
+
+    @pytest.mark.asyncio
+    async def test_remote_agent_in_graph(self, tmp_path):
+        """Test remote steps run inside an orchestrated mission over a Unix socket."""
+        path = str(tmp_path / "coordinator.sock")
+        async with Coordinator(path=path, heartbeat_interval=0.05) as coordinator:
+            worker, task = await start_worker(coordinator, [FunctionAgent("upper", upper)])
+            graph = MissionGraph()
+            graph.add_step("local", FunctionAgent("local", lambda inputs, mission: "x"))
+            graph.add_step(
+                "remote",
+                RemoteAgent(coordinator, "upper"),
+                depends_on=["local"],
+                inputs={"text": "hello"},
+                timeout=2,
+            )
+            mission = Mission("hybrid")
+            outputs = await OrchestrationEngine().run(mission, graph)
+            assert outputs["remote"] == {"text": "HELLO", "mission": "hybrid"}
+            worker.stop()
+            await task
+
+    @pytest.mark.asyncio
+    async def test_remote_agent_sees_mission_context(self):
+        """Test a remote agent reads the context and metadata of its mission."""
+        async with Coordinator(heartbeat_interval=0.05) as coordinator:
+            worker, task = await start_worker(coordinator, [FunctionAgent("describe", describe)])
+            mission = Mission("shared", context={"lang": "en"}, metadata={"tenant": "acme"})
+            mission.start()
+            output = await RemoteAgent(coordinator, "describe").run({}, mission)
+            assert output == {"context": {"lang": "en"}, "metadata": {"tenant": "acme"}}
+            worker.stop()
+            await task
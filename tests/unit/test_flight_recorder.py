@@ -0,0 +1,196 @@
+"""Tests for the memory-mapped flight recorder."""
+
+import logging
+import os
+import signal
+
+import pytest
+from harmonicgalaxy.utils.flight_recorder import FlightRecorderHandler, main, read_records
+from harmonicgalaxy.utils.logging import LoggingConfig, get_logger, setup_logging
+
+
+def _logger(handler, name="test.flight"):
+    """Route a dedicated logger only to ``handler``."""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.handlers = [handler]
+    return logger
+
+
+@pytest.mark.unit
+class TestFlightRecorderHandler:
+    """Test the ring file handler."""
+
+    def teardown_method(self):
+        logging.getLogger("test.flight").handlers = []
+
+    def test_keeps_latest_records(self, tmp_path):
+        """Test the ring keeps only the latest slot_count records, oldest first."""
+        handler = FlightRecorderHandler(tmp_path / "ring", size=64 + 8 * 128, slot_size=128)
+        logger = _logger(handler)
+        for index in range(20):
+            logger.debug("event %d", index)
+
+        records = handler.records()
+        assert [record.message for record in records] == [f"event {i}" for i in range(12, 20)]
+        assert records[0].name == "test.flight"
+        assert records[0].levelno == logging.DEBUG
+        assert records[0].pid == os.getpid()
+        handler.close()
+
+    def test_truncates_long_messages(self, tmp_path):
+        """Test messages longer than a slot are truncated."""
+        handler = FlightRecorderHandler(tmp_path / "ring", size=4096, slot_size=64)
+        _logger(handler).info("x" * 500)
+        (record,) = handler.records()
+        assert record.message == "x" * (64 - 28 - len("test.flight"))
+        handler.close()
+
+    def test_truncates_long_logger_names(self, tmp_path):
+        """Test a logger name longer than the slot is truncated instead of losing the record."""
+        handler = FlightRecorderHandler(tmp_path / "ring", size=4096, slot_size=28 + 16)
+        name = "harmonicgalaxy.distributed.coordinator"
+        logger = _logger(handler, name)
+        try:
+            logger.info("dispatched")
+        finally:
+            logger.handlers = []
+        (record,) = handler.records()
+        assert record.name == name[:16]
+        assert record.message == ""
+        handler.close()
+
+    def test_survives_reopen(self, tmp_path):
+        """Test reopening a ring continues after the records of the previous process."""
+        path = tmp_path / "ring"
+        handler = FlightRecorderHandler(path, size=4096, slot_size=128)
+        _logger(handler).info("before crash")
+        handler.close()
+
+        handler = FlightRecorderHandler(path, size=4096, slot_size=128)
+        _logger(handler).info("after restart")
+        handler.close()
+        assert [record.message for record in read_records(path)] == [
+            "before crash",
+            "after restart",
+        ]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_forked_child_writes_own_ring(self, tmp_path):
+        """Test a forked child records to a ring of its own instead of the parent's slots."""
+        path = tmp_path / "flight.ring"
+        handler = FlightRecorderHandler(path, size=4096, slot_size=128)
+        logger = _logger(handler)
+        logger.info("parent 1")
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            try:
+                logger.info("child 1")
+                logger.info("child 2")
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        logger.info("parent 2")
+
+        assert [(r.sequence, r.message) for r in handler.records()] == [
+            (1, "parent 1"),
+            (2, "parent 2"),
+        ]
+        child_ring = handler.child_filename(pid)
+        assert child_ring == tmp_path / f"flight.{pid}.ring"
+        records = read_records(child_ring)
+        assert [record.message for record in records] == ["child 1", "child 2"]
+        assert {record.pid for record in records} == {pid}
+        handler.close()
+
+    def test_exception_text(self, tmp_path):
+        """Test tracebacks are recorded with the message."""
+        handler = FlightRecorderHandler(tmp_path / "ring", size=8192, slot_size=1024)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            _logger(handler).exception("failed")
+        (record,) = handler.records()
+        assert record.message.startswith("failed\nTraceback")
+        assert "ValueError: boom" in record.message
+        handler.close()
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test reading a file that is not a ring fails clearly."""
+        path = tmp_path / "not-a-ring"
+        path.write_bytes(b"hello" * 100)
+        with pytest.raises(ValueError):
+            read_records(path)
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="requires SIGUSR1")
+    def test_signal_dump(self, tmp_path):
+        """Test the ring is dumped to text when the process receives the signal."""
+        handler = FlightRecorderHandler(tmp_path / "ring", size=4096, slot_size=128)
+        _logger(handler).warning("about to be dumped")
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            handler.install_signal_handler()
+            os.kill(os.getpid(), signal.SIGUSR1)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        text = (tmp_path / "ring.txt").read_text(encoding="utf-8")
+        assert "WARNING  [test.flight]" in text
+        assert text.rstrip().endswith("about to be dumped")
+        handler.close()
+
+
+@pytest.mark.unit
+class TestFlightRecorderCLI:
+    """Test the dump command line."""
+
+    def teardown_method(self):
+        logging.getLogger("test.flight").handlers = []
+
+    def test_filters(self, tmp_path, capsys):
+        """Test --level and --last."""
+        path = tmp_path / "ring"
+        handler = FlightRecorderHandler(path, size=8192, slot_size=128)
+        logger = _logger(handler)
+        logger.debug("detail")
+        logger.info("step 1")
+        logger.info("step 2")
+        handler.close()
+
+        assert main([str(path), "--level", "info", "--last", "1"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1
+        assert lines[0].endswith("step 2")
+
+    def test_missing_file(self, tmp_path, capsys):
+        """Test a missing file is reported as an error."""
+        assert main([str(tmp_path / "missing")]) == 1
+        assert "error" in capsys.readouterr().err
+
+
+@pytest.mark.unit
+class TestFlightRecorderSetup:
+    """Test the flight recorder configured through setup_logging."""
+
+    def teardown_method(self):
+        setup_logging(LoggingConfig(level="INFO", use_colors=False))
+
+    def test_records_below_console_level(self, tmp_path, capsys):
+        """Test DEBUG records reach the ring but not the console."""
+        path = tmp_path / "flight.ring"
+        setup_logging(
+            LoggingConfig(
+                level="INFO", use_colors=False, flight_recorder=str(path), async_logging=True
+            )
+        )
+        logger = get_logger("test.recorder_setup")
+        logger.debug("quiet detail")
+        logger.info("visible")
+        setup_logging(LoggingConfig(level="INFO", use_colors=False))
+
+        messages = [record.message for record in read_records(path)]
+        assert messages[-2:] == ["quiet detail", "visible"]
+        output = capsys.readouterr().out
+        assert "visible" in output
+        assert "quiet detail" not in output
@@ -0,0 +1,209 @@
+"""Tests for deadline propagation across LLM calls."""
+
+import asyncio
+import time
+
+import pytest
+from harmonicgalaxy.llm.client import LLMClient, create_client
+from harmonicgalaxy.llm.deadline import (
+    DeadlineExceededError,
+    check_deadline,
+    deadline,
+    get_deadline,
+    time_remaining,
+)
+from harmonicgalaxy.llm.types import LLMConfig, LLMMessage, LLMProvider, LLMResponse
+
+
+class RateLimitError(Exception):
+    """Fake provider rate-limit error."""
+
+    status_code = 429
+
+
+class FakeClient(LLMClient):
+    """LLM client whose attempts are scripted by the test."""
+
+    def __init__(self, attempts, timeout=None, max_retries=3):
+        super().__init__(
+            LLMConfig(
+                provider=LLMProvider.OPENAI,
+                model="fake",
+                timeout=timeout,
+                max_retries=max_retries,
+            )
+        )
+        self.attempts = list(attempts)
+        self.timeouts = []
+
+    async def chat(self, messages, **kwargs):
+        async def attempt(timeout):
+            self.timeouts.append(timeout)
+            return await self.attempts.pop(0)()
+
+        return await self._send(attempt)
+
+    async def stream_chat(self, messages, **kwargs):
+        async def chunks():
+            for delay in (0.0, 0.0, 0.5):
+                await asyncio.sleep(delay)
+                yield "chunk"
+
+        async for chunk in self._iter_with_deadline(chunks()):
+            yield chunk
+
+
+def respond(delay=0.0):
+    async def attempt():
+        await asyncio.sleep(delay)
+        return LLMResponse(content="ok", model="fake", provider="openai")
+
+    return attempt
+
+
+def fail(error):
+    async def attempt():
+        raise error
+
+    return attempt
+
+
+@pytest.mark.unit
+class TestDeadlineContext:
+    """Test the deadline context manager."""
+
+    def test_no_deadline(self):
+        """Test nothing is active by default."""
+        assert get_deadline() is None
+        assert time_remaining() is None
+        check_deadline()
+
+    def test_nested_deadline_only_shrinks(self):
+        """Test an inner deadline cannot extend the outer one."""
+        with deadline(1.0) as outer:
+            with deadline(60.0) as inner:
+                assert inner == outer
+            with deadline(0.5) as inner:
+                assert inner < outer
+        assert get_deadline() is None
+
+    def test_expired_deadline(self):
+        """Test check_deadline raises once expired."""
+        with deadline(0.0):
+            with pytest.raises(DeadlineExceededError):
+                check_deadline()
+
+    @pytest.mark.asyncio
+    async def test_propagates_to_tasks(self):
+        """Test spawned tasks inherit the deadline."""
+        with deadline(5.0) as expires_at:
+            assert await asyncio.create_task(asyncio.to_thread(get_deadline)) == expires_at
+
+
+@pytest.mark.unit
+class TestClientDeadline:
+    """Test LLMClient deadline handling."""
+
+    @pytest.mark.asyncio
+    async def test_without_deadline_uses_client_defaults(self):
+        """Test a single attempt with timeout=None when no deadline is set."""
+        client = FakeClient([respond()])
+        await client.chat([])
+        assert client.timeouts == [None]
+
+    @pytest.mark.asyncio
+    async def test_timeout_shrinks_to_remaining(self):
+        """Test the per-request timeout is bounded by the deadline."""
+        client = FakeClient([respond()], timeout=60.0)
+        with deadline(2.0):
+            await client.chat([])
+        assert 0 < client.timeouts[0] <= 2.0
+
+    @pytest.mark.asyncio
+    async def test_config_timeout_when_shorter(self):
+        """Test config.timeout wins when it is shorter than the deadline."""
+        client = FakeClient([respond()], timeout=1.0)
+        with deadline(30.0):
+            await client.chat([])
+        assert client.timeouts == [1.0]
+
+    @pytest.mark.asyncio
+    async def test_expired_before_request(self):
+        """Test no request is started once the deadline has passed."""
+        client = FakeClient([respond()])
+        with deadline(0.0):
+            with pytest.raises(DeadlineExceededError):
+                await client.chat([])
+        assert client.timeouts == []
+
+    @pytest.mark.asyncio
+    async def test_slow_request_cancelled(self):
+        """Test a request outliving the deadline raises DeadlineExceededError."""
+        client = FakeClient([respond(delay=5.0)])
+        start = time.monotonic()
+        with deadline(0.1):
+            with pytest.raises(DeadlineExceededError):
+                await client.chat([])
+        assert time.monotonic() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_retries_within_deadline(self):
+        """Test transient errors are retried while time remains."""
+        client = FakeClient([fail(RateLimitError()), respond()])
+        with deadline(5.0):
+            response = await client.chat([])
+        assert response.content == "ok"
+        assert len(client.timeouts) == 2
+
+    @pytest.mark.asyncio
+    async def test_skips_retry_that_cannot_finish(self):
+        """Test retries are skipped when the backoff alone exceeds the budget."""
+        client = FakeClient([fail(RateLimitError()), respond()])
+        with deadline(0.2):
+            with pytest.raises(DeadlineExceededError) as exc_info:
+                await client.chat([])
+        assert isinstance(exc_info.value.__cause__, RateLimitError)
+        assert len(client.timeouts) == 1
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raised(self):
+        """Test non-transient errors are raised immediately."""
+        client = FakeClient([fail(ValueError("bad request")), respond()])
+        with deadline(5.0):
+            with pytest.raises(ValueError):
+                await client.chat([])
+
+    @pytest.mark.asyncio
+    async def test_stream_deadline(self):
+        """Test streaming stops with DeadlineExceededError when a chunk is late."""
+        client = FakeClient([])
+        chunks = []
+        with deadline(0.2):
+            with pytest.raises(DeadlineExceededError):
+                async for chunk in client.stream_chat([]):
+                    chunks.append(chunk)
+        assert chunks == ["chunk", "chunk"]
+
+    @pytest.mark.asyncio
+    async def test_openai_request_timeout(self, monkeypatch):
+        """Test the OpenAI client passes the shrunk timeout to the SDK."""
+        client = create_client(LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4", api_key="k"))
+        captured = {}
+
+        class FakeCompletions:
+            async def create(self, **params):
+                raise RateLimitError()
+
+        class FakeSDK:
+            def with_options(self, **options):
+                captured.update(options)
+                sdk = FakeSDK()
+                sdk.chat = type("Chat", (), {"completions": FakeCompletions()})()
+                return sdk
+
+        monkeypatch.setattr(client, "_client", FakeSDK())
+        with deadline(0.3):
+            with pytest.raises(DeadlineExceededError):
+                await client.chat([LLMMessage(role="user", content="hi")])
+        assert captured["max_retries"] == 0
+        assert 0 < captured["timeout"] <= 0.3
@@ -0,0 +1,222 @@
+"""Tests for the adaptive concurrency limiter."""
+
+import asyncio
+
+import pytest
+from harmonicgalaxy.llm.client import LLMClient, create_client
+from harmonicgalaxy.llm.limiter import (
+    AdaptiveConcurrencyLimiter,
+    configure_adaptive_limits,
+    get_limiter,
+    limiter_snapshot,
+)
+from harmonicgalaxy.llm.types import LLMConfig, LLMMessage, LLMProvider
+
+
+class RateLimitError(Exception):
+    """Fake provider rate-limit error."""
+
+    status_code = 429
+
+
+@pytest.mark.unit
+class TestAdaptiveConcurrencyLimiter:
+    """Test AdaptiveConcurrencyLimiter."""
+
+    def test_invalid_bounds(self):
+        """Test inconsistent bounds are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=5)
+
+    def test_grows_while_latency_flat(self):
+        """Test additive increase while the limit is in use and latency is flat."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        limiter._in_flight = 4
+        for _ in range(40):
+            limiter.observe(0.1)
+        assert limiter.limit > 4
+
+    def test_no_growth_when_idle(self):
+        """Test the limit does not grow when it is not being used."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        for _ in range(40):
+            limiter.observe(0.1)
+        assert limiter.limit == 4
+
+    def test_cuts_on_rate_limit(self):
+        """Test multiplicative decrease on rate-limit errors, once per cooldown."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=20, backoff_ratio=0.5)
+        limiter.observe(0.0, rate_limited=True)
+        limiter.observe(0.0, rate_limited=True)
+        assert limiter.limit == 10
+        assert limiter.decreases == 1
+        assert limiter.rate_limited == 2
+
+    def test_cuts_on_rising_latency(self):
+        """Test multiplicative decrease when latency rises above the baseline."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=20, smoothing=1.0)
+        limiter.observe(0.1)
+        limiter.observe(0.5)
+        assert limiter.limit < 20
+
+    def test_respects_min_limit(self):
+        """Test the limit never drops below min_limit."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=2)
+        limiter.observe(0.0, rate_limited=True)
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_caps_in_flight(self):
+        """Test no more than ``limit`` requests run concurrently."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter.permit():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(10)))
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+
+@pytest.mark.unit
+class TestClientLimiting:
+    """Test LLMClient feeds the limiter."""
+
+    @pytest.mark.asyncio
+    async def test_client_reports_rate_limits(self):
+        """Test rate-limit errors from a client shrink its endpoint limit."""
+        attempts = []
+
+        class FlakyClient(LLMClient):
+            async def chat(self, messages, **kwargs):
+                async def attempt(timeout):
+                    attempts.append(timeout)
+                    raise RateLimitError()
+
+                async with self._request_scope("chat"):
+                    return await self._send(attempt)
+
+            async def stream_chat(self, messages, **kwargs):
+                yield ""
+
+        configure_adaptive_limits(initial_limit=10, backoff_ratio=0.5)
+        try:
+            client = FlakyClient(
+                LLMConfig(
+                    provider=LLMProvider.OPENAI,
+                    model="limit-test",
+                    base_url="http://x",
+                    max_retries=1,
+                )
+            )
+            with pytest.raises(RateLimitError):
+                await client.chat([])
+
+            # Retried by the client, not the SDK, even without a deadline
+            assert attempts == [None, None]
+            limiter = get_limiter("openai", "limit-test", "http://x")
+            # Each attempt after the backoff is a new rate-limit signal
+            assert limiter.rate_limited == 2
+            assert limiter.decreases == 2
+            assert limiter.limit == 2
+            assert limiter.in_flight == 0
+            snapshot = limiter_snapshot()
+            assert snapshot[0]["model"] == "limit-test"
+            assert snapshot[0]["limit"] == 2
+        finally:
+            configure_adaptive_limits(enabled=False)
+        assert get_limiter("openai", "limit-test", "http://x") is None
+
+    @pytest.mark.asyncio
+    async def test_sdk_retries_disabled_under_limiter(self, monkeypatch):
+        """Test the SDK does not retry (and hide 429s) when the endpoint has a limiter."""
+        client = create_client(
+            LLMConfig(provider=LLMProvider.OPENAI, model="sdk-test", api_key="k", max_retries=0)
+        )
+        captured = {}
+
+        class FakeCompletions:
+            async def create(self, **params):
+                raise RateLimitError()
+
+        class FakeSDK:
+            def with_options(self, **options):
+                captured.update(options)
+                sdk = FakeSDK()
+                sdk.chat = type("Chat", (), {"completions": FakeCompletions()})()
+                return sdk
+
+        monkeypatch.setattr(client, "_client", FakeSDK())
+        configure_adaptive_limits(initial_limit=10)
+        try:
+            with pytest.raises(RateLimitError):
+                await client.chat([LLMMessage(role="user", content="hi")])
+        finally:
+            configure_adaptive_limits(enabled=False)
+        assert captured == {"max_retries": 0}
+
+    @pytest.mark.asyncio
+    async def test_anthropic_stream_retried_under_limiter(self, monkeypatch):
+        """Test a rate-limited Anthropic stream is retried and reported to the limiter."""
+        client = create_client(
+            LLMConfig(
+                provider=LLMProvider.ANTHROPIC, model="stream-test", api_key="k", max_retries=1
+            )
+        )
+        calls = []
+
+        class FakeStream:
+            def __init__(self, events):
+                self.events = iter(events)
+                self.closed = False
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                try:
+                    return next(self.events)
+                except StopIteration:
+                    raise StopAsyncIteration from None
+
+            async def close(self):
+                self.closed = True
+
+        def delta(text):
+            event = type("Event", (), {"type": "content_block_delta"})()
+            event.delta = type("Delta", (), {"type": "text_delta", "text": text})()
+            return event
+
+        stream = FakeStream([delta("Hel"), delta("lo")])
+
+        class FakeMessages:
+            async def create(self, **params):
+                calls.append(params)
+                if len(calls) == 1:
+                    raise RateLimitError()
+                return stream
+
+        class FakeSDK:
+            def with_options(self, **options):
+                assert options == {"max_retries": 0}
+                sdk = FakeSDK()
+                sdk.messages = FakeMessages()
+                return sdk
+
+        monkeypatch.setattr(client, "_client", FakeSDK())
+        configure_adaptive_limits(initial_limit=10)
+        try:
+            chunks = [
+                chunk async for chunk in client.stream_chat([LLMMessage(role="user", content="hi")])
+            ]
+            limiter = get_limiter("anthropic", "stream-test", None)
+            assert limiter.rate_limited == 1
+        finally:
+            configure_adaptive_limits(enabled=False)
+        assert chunks == ["Hel", "lo"]
+        assert len(calls) == 2 and calls[0]["stream"] is True
+        assert stream.closed
@@ -0,0 +1,145 @@
+"""Tests for the priority-aware LLM request scheduler."""
+
+import asyncio
+
+import pytest
+from harmonicgalaxy.llm.client import LLMClient
+from harmonicgalaxy.llm.scheduler import (
+    LLMScheduler,
+    RequestPriority,
+    configure_scheduler,
+    get_scheduler,
+    remove_scheduler,
+    request_context,
+)
+from harmonicgalaxy.llm.types import LLMConfig, LLMProvider, LLMResponse
+
+
+async def _run_in_order(scheduler, requests):
+    """Queue ``requests`` behind a blocker and return the dispatch order."""
+    order = []
+    blocker = await scheduler.acquire()
+
+    async def run(label, priority, tenant):
+        async with scheduler.slot(priority, tenant):
+            order.append(label)
+
+    tasks = [asyncio.create_task(run(*request)) for request in requests]
+    await asyncio.sleep(0)
+    scheduler.release(blocker)
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.unit
+class TestLLMScheduler:
+    """Test LLMScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Test interactive requests overtake queued batch requests."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        order = await _run_in_order(
+            scheduler,
+            [
+                ("batch", RequestPriority.BATCH, "t"),
+                ("default", RequestPriority.DEFAULT, "t"),
+                ("interactive", RequestPriority.INTERACTIVE, "t"),
+            ],
+        )
+        assert order == ["interactive", "default", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_fair_queuing_across_tenants(self):
+        """Test a tenant with a deep backlog does not starve others."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        requests = [(f"a{i}", RequestPriority.BATCH, "a") for i in range(4)]
+        requests += [(f"b{i}", RequestPriority.BATCH, "b") for i in range(2)]
+        order = await _run_in_order(scheduler, requests)
+        assert order[:4] == ["a0", "b0", "a1", "b1"]
+
+    @pytest.mark.asyncio
+    async def test_tenant_weights(self):
+        """Test heavier tenants get proportionally more slots."""
+        scheduler = LLMScheduler(max_concurrency=1, tenant_weights={"heavy": 2.0})
+        requests = [(f"h{i}", RequestPriority.BATCH, "heavy") for i in range(4)]
+        requests += [(f"l{i}", RequestPriority.BATCH, "light") for i in range(2)]
+        order = await _run_in_order(scheduler, requests)
+        assert order == ["h0", "h1", "l0", "h2", "h3", "l1"]
+
+    @pytest.mark.asyncio
+    async def test_class_limit(self):
+        """Test per-class caps keep slots free for other classes."""
+        scheduler = LLMScheduler(max_concurrency=4, class_limits={RequestPriority.BATCH: 1})
+        first = await scheduler.acquire(RequestPriority.BATCH)
+        waiting = asyncio.create_task(scheduler.acquire(RequestPriority.BATCH))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        interactive = await asyncio.wait_for(
+            scheduler.acquire(RequestPriority.INTERACTIVE), timeout=1.0
+        )
+        scheduler.release(first)
+        second = await asyncio.wait_for(waiting, timeout=1.0)
+        scheduler.release(second)
+        scheduler.release(interactive)
+        assert scheduler.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        """Test cancelled requests do not take a slot."""
+        scheduler = LLMScheduler(max_concurrency=1)
+        blocker = await scheduler.acquire()
+        waiting = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        scheduler.release(blocker)
+        ticket = await asyncio.wait_for(scheduler.acquire(), timeout=1.0)
+        scheduler.release(ticket)
+        assert scheduler.stats()["classes"]["default"]["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stats_separate_queue_wait(self):
+        """Test queue wait and service time are reported separately."""
+        scheduler = LLMScheduler(max_concurrency=1)
+
+        async def hold():
+            async with scheduler.slot():
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(hold(), hold())
+        stats = scheduler.stats()["classes"]["default"]
+        assert stats["completed"] == 2
+        assert stats["max_queue_wait"] >= 0.04
+        assert stats["avg_service_time"] >= 0.04
+
+
+@pytest.mark.unit
+class TestClientScheduling:
+    """Test LLMClient requests go through the registered scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_client_uses_scheduler(self):
+        """Test chat calls honour the scheduler and request context."""
+
+        class SlowClient(LLMClient):
+            async def chat(self, messages, **kwargs):
+                async with self._request_scope("chat"):
+                    await asyncio.sleep(0.01)
+                    return LLMResponse(content="ok", model="m", provider="openai")
+
+            async def stream_chat(self, messages, **kwargs):
+                yield ""
+
+        scheduler = configure_scheduler(LLMProvider.OPENAI, "sched-test", max_concurrency=2)
+        try:
+            assert get_scheduler(LLMProvider.OPENAI, "sched-test") is scheduler
+            client = SlowClient(LLMConfig(provider=LLMProvider.OPENAI, model="sched-test"))
+            with request_context(priority=RequestPriority.INTERACTIVE, tenant="m1"):
+                await asyncio.gather(*(client.chat([]) for _ in range(5)))
+            assert scheduler.stats()["classes"]["interactive"]["completed"] == 5
+        finally:
+            remove_scheduler(LLMProvider.OPENAI, "sched-test")
+        assert get_scheduler(LLMProvider.OPENAI, "sched-test") is None
@@ -0,0 +1,45 @@
+"""Tests for bulk LLM serialization."""
+
+import pytest
+from harmonicgalaxy.llm import serialization
+from harmonicgalaxy.llm.types import FrozenLLMMessage, LLMMessage, LLMResponse, LLMToolCall
+
+
+def _messages():
+    return [
+        LLMMessage(role="system", content="Be brief."),
+        LLMMessage(role="user", content="你好"),
+        LLMMessage(
+            role="assistant",
+            content="",
+            tool_calls=[LLMToolCall(id="call_1", name="add", arguments={"a": 1})],
+        ),
+        LLMMessage.tool_result("call_1", "1"),
+    ]
+
+
+@pytest.mark.unit
+class TestSerialization:
+    """Test message and response serialization."""
+
+    def test_message_round_trip(self):
+        """Test messages survive dump/load."""
+        messages = _messages()
+        loaded = serialization.load_messages(serialization.dump_messages(messages))
+        assert all(isinstance(m, FrozenLLMMessage) for m in loaded)
+        assert [m.to_message() for m in loaded] == messages
+
+    def test_response_round_trip(self):
+        """Test responses survive dump/load."""
+        responses = [LLMResponse(content="Hi", model="gpt-4", provider="openai", usage={"t": 3})]
+        loaded = serialization.load_responses(serialization.dump_responses(responses))
+        assert loaded[0].to_dict() == responses[0].to_dict()
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Test the json fallback produces equivalent output."""
+        messages = _messages()
+        fast = serialization.dump_messages(messages)
+        monkeypatch.setattr(serialization, "orjson", None)
+        slow = serialization.dump_messages(messages)
+        assert isinstance(slow, bytes)
+        assert serialization.loads(slow) == serialization.loads(fast)
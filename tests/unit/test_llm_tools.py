@@ -0,0 +1,204 @@
+"""Tests for tool calling and the parallel tool executor."""
+
+import asyncio
+import time
+
+import pytest
+from harmonicgalaxy.llm.client import LLMClient, create_client
+from harmonicgalaxy.llm.tools import ToolExecutor
+from harmonicgalaxy.llm.types import (
+    LLMConfig,
+    LLMMessage,
+    LLMProvider,
+    LLMResponse,
+    LLMToolCall,
+    LLMToolDefinition,
+)
+
+
+class ScriptedClient(LLMClient):
+    """LLM client returning pre-scripted responses."""
+
+    def __init__(self, responses):
+        super().__init__(LLMConfig(provider=LLMProvider.OPENAI, model="scripted"))
+        self.responses = list(responses)
+        self.requests = []
+
+    async def chat(self, messages, **kwargs):
+        self.requests.append((list(messages), kwargs))
+        return self.responses.pop(0)
+
+    async def stream_chat(self, messages, **kwargs):
+        yield (await self.chat(messages, **kwargs)).content
+
+
+@pytest.mark.unit
+class TestToolTypes:
+    """Test tool-related type helpers."""
+
+    def test_parse_json_arguments(self):
+        """Test decoding JSON-encoded arguments."""
+        call = LLMToolCall.parse("call_1", "add", '{"a": 1, "b": 2}')
+        assert call.arguments == {"a": 1, "b": 2}
+
+    def test_parse_invalid_arguments(self):
+        """Test invalid JSON arguments are preserved."""
+        call = LLMToolCall.parse("call_1", "add", "{not json")
+        assert call.arguments == {"_raw": "{not json"}
+
+    def test_message_round_trip(self):
+        """Test tool calls survive to_dict/from_dict."""
+        msg = LLMMessage(
+            role="assistant",
+            content="",
+            tool_calls=[LLMToolCall(id="call_1", name="add", arguments={"a": 1})],
+        )
+        restored = LLMMessage.from_dict(msg.to_dict())
+        assert restored.tool_calls == msg.tool_calls
+
+    def test_tool_result_message(self):
+        """Test creating a tool result message."""
+        msg = LLMMessage.tool_result("call_1", "boom", is_error=True)
+        assert msg.role == "tool"
+        assert msg.tool_call_id == "call_1"
+        assert msg.metadata == {"is_error": True}
+
+
+@pytest.mark.unit
+class TestProviderConversion:
+    """Test tool message conversion for each provider."""
+
+    def _conversation(self):
+        return [
+            LLMMessage(role="user", content="Add numbers"),
+            LLMMessage(
+                role="assistant",
+                content="",
+                tool_calls=[
+                    LLMToolCall(id="call_1", name="add", arguments={"a": 1, "b": 2}),
+                    LLMToolCall(id="call_2", name="add", arguments={"a": 3, "b": 4}),
+                ],
+            ),
+            LLMMessage.tool_result("call_1", "3", name="add"),
+            LLMMessage.tool_result("call_2", "7", name="add"),
+        ]
+
+    def test_openai_conversion(self):
+        """Test OpenAI message and tool conversion."""
+        client = create_client(LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4", api_key="k"))
+        converted = client._convert_messages(self._conversation())
+        assert converted[1]["tool_calls"][0]["function"]["arguments"] == '{"a": 1, "b": 2}'
+        assert converted[2] == {"role": "tool", "tool_call_id": "call_1", "content": "3"}
+
+        tools = client._convert_tools([LLMToolDefinition(name="add")])
+        assert tools[0]["type"] == "function"
+        assert tools[0]["function"]["name"] == "add"
+
+    def test_anthropic_conversion(self):
+        """Test parallel tool results are merged into a single user turn."""
+        client = create_client(
+            LLMConfig(provider=LLMProvider.ANTHROPIC, model="claude-3-opus", api_key="k")
+        )
+        converted, _ = client._convert_messages(self._conversation())
+        assert len(converted) == 3
+        assert [block["type"] for block in converted[1]["content"]] == ["tool_use", "tool_use"]
+        assert [block["tool_use_id"] for block in converted[2]["content"]] == ["call_1", "call_2"]
+
+        tools = client._convert_tools([LLMToolDefinition(name="add")])
+        assert tools[0]["input_schema"]["type"] == "object"
+
+    def test_qwen_conversion(self):
+        """Test DashScope message conversion."""
+        client = create_client(LLMConfig(provider=LLMProvider.QWEN, model="qwen-max", api_key="k"))
+        converted, _ = client._convert_messages(self._conversation())
+        assert converted[1]["tool_calls"][1]["id"] == "call_2"
+        assert converted[3]["role"] == "tool"
+        assert converted[3]["name"] == "add"
+
+
+@pytest.mark.unit
+class TestToolExecutor:
+    """Test ToolExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_executes_calls_concurrently(self):
+        """Test independent tool calls run in parallel."""
+        executor = ToolExecutor()
+
+        @executor.tool()
+        async def slow(n: int) -> int:
+            """Sleep and echo."""
+            await asyncio.sleep(0.2)
+            return n
+
+        calls = [LLMToolCall(id=f"call_{i}", name="slow", arguments={"n": i}) for i in range(5)]
+        start = time.perf_counter()
+        results = await executor.execute(calls)
+        elapsed = time.perf_counter() - start
+
+        assert [r.content for r in results] == ["0", "1", "2", "3", "4"]
+        assert [r.tool_call_id for r in results] == [c.id for c in calls]
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_per_tool_timeout(self):
+        """Test a slow tool times out without failing the others."""
+        executor = ToolExecutor()
+        executor.register(lambda: "ok", name="fast")
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        executor.register(hang, timeout=0.05)
+
+        results = await executor.execute(
+            [LLMToolCall(id="a", name="hang"), LLMToolCall(id="b", name="fast")]
+        )
+        assert results[0].metadata == {"is_error": True}
+        assert "timed out" in results[0].content
+        assert results[1].content == "ok"
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported(self):
+        """Test failures and unknown tools become error results."""
+        executor = ToolExecutor()
+
+        def explode():
+            raise ValueError("bad input")
+
+        executor.register(explode)
+        results = await executor.execute(
+            [LLMToolCall(id="a", name="explode"), LLMToolCall(id="b", name="missing")]
+        )
+        assert "ValueError: bad input" in results[0].content
+        assert "unknown tool" in results[1].content
+
+    @pytest.mark.asyncio
+    async def test_run_sends_results_in_single_follow_up(self):
+        """Test tool results are sent back together in one request."""
+        executor = ToolExecutor()
+        executor.register(lambda a, b: a + b, name="add")
+        client = ScriptedClient(
+            [
+                LLMResponse(
+                    content="",
+                    model="scripted",
+                    provider="openai",
+                    tool_calls=[
+                        LLMToolCall(id="call_1", name="add", arguments={"a": 1, "b": 2}),
+                        LLMToolCall(id="call_2", name="add", arguments={"a": 3, "b": 4}),
+                    ],
+                ),
+                LLMResponse(content="3 and 7", model="scripted", provider="openai"),
+            ]
+        )
+
+        messages = [LLMMessage(role="user", content="Add")]
+        response = await executor.run(client, messages)
+
+        assert response.content == "3 and 7"
+        assert len(client.requests) == 2
+        follow_up, kwargs = client.requests[1]
+        assert [m.role for m in follow_up] == ["user", "assistant", "tool", "tool"]
+        assert [m.content for m in follow_up[2:]] == ["3", "7"]
+        assert kwargs["tools"][0].name == "add"
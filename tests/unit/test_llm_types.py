@@ -1,11 +1,16 @@
 """Tests for LLM types."""
 
 import pytest
+import dataclasses
+
 from harmonicgalaxy.llm.types import (
     LLMMessage,
     LLMResponse,
     LLMConfig,
     LLMProvider,
+    FrozenLLMMessage,
+    FrozenLLMResponse,
+    FrozenLLMConfig,
 )
 
 
@@ -106,3 +111,59 @@ class TestLLMProvider:
         assert LLMProvider.OPENAI.value == "openai"
         assert LLMProvider.ANTHROPIC.value == "anthropic"
 
+
+
+@pytest.mark.unit
+class TestFrozenTypes:
+    """Test slotted, frozen LLM types."""
+
+    def test_message_is_slotted_and_frozen(self):
+        """Test frozen messages have no __dict__ and reject mutation."""
+        msg = FrozenLLMMessage(role="user", content="Hello")
+        assert not hasattr(msg, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            msg.content = "changed"
+
+    def test_message_is_hashable(self):
+        """Test equal messages hash equally, even with metadata."""
+        a = FrozenLLMMessage(role="user", content="Hello", metadata={"k": 1})
+        b = FrozenLLMMessage(role="user", content="Hello", metadata={"k": 1})
+        assert a == b
+        assert len({a, b}) == 1
+
+    def test_roles_are_interned(self):
+        """Test role strings share one instance."""
+        role = "".join(["us", "er"])
+        assert FrozenLLMMessage(role=role, content="x").role is FrozenLLMMessage.from_dict(
+            {"role": "".join(["u", "ser"]), "content": "y"}
+        ).role
+
+    def test_invalid_role(self):
+        """Test invalid roles are rejected."""
+        with pytest.raises(ValueError):
+            FrozenLLMMessage(role="robot", content="x")
+        with pytest.raises(ValueError):
+            FrozenLLMMessage.from_dict({"role": "robot", "content": "x"})
+
+    def test_message_conversion(self):
+        """Test conversion to and from LLMMessage."""
+        msg = LLMMessage(role="assistant", content="Hi", name="bot")
+        frozen = FrozenLLMMessage.from_message(msg)
+        assert frozen.to_dict() == msg.to_dict()
+        assert frozen.to_message() == msg
+        assert FrozenLLMMessage.from_dict(msg.to_dict()) == frozen
+
+    def test_response_conversion(self):
+        """Test conversion from LLMResponse."""
+        response = LLMResponse(content="Hi", model="gpt-4", provider="openai", usage={"t": 1})
+        frozen = FrozenLLMResponse.from_response(response)
+        assert frozen.to_dict() == response.to_dict()
+        assert hash(frozen) == hash(FrozenLLMResponse.from_dict(response.to_dict()))
+
+    def test_config_is_hashable(self):
+        """Test frozen configs can be used as dictionary keys."""
+        config = LLMConfig(provider=LLMProvider.OPENAI, model="gpt-4", stop=["END"])
+        frozen = FrozenLLMConfig.from_config(config)
+        assert frozen.stop == ("END",)
+        assert {frozen: 1}[FrozenLLMConfig.from_config(config)] == 1
+        assert frozen.to_dict()["model"] == "gpt-4"
@@ -0,0 +1,175 @@
+"""Tests for rotating, background-compressed log files."""
+
+import gzip
+import logging
+import os
+import time
+from datetime import datetime
+
+import pytest
+from harmonicgalaxy.utils import log_rotation
+from harmonicgalaxy.utils.log_rotation import RotatingLogFileHandler
+from harmonicgalaxy.utils.logging import LoggingConfig, get_logger, setup_logging
+
+
+def _emit(handler, count, msg="line %d"):
+    for i in range(count):
+        handler.handle(logging.makeLogRecord({"msg": msg, "args": (i,), "levelno": logging.INFO}))
+
+
+def _read_all(directory):
+    """Return every logged line, from compressed segments and plain files."""
+    lines = []
+    for path in sorted(directory.iterdir()):
+        if path.suffix == ".gz":
+            lines += gzip.decompress(path.read_bytes()).decode("utf-8").splitlines()
+        else:
+            lines += path.read_text(encoding="utf-8").splitlines()
+    return lines
+
+
+@pytest.mark.unit
+class TestRotatingLogFileHandler:
+    """Test RotatingLogFileHandler."""
+
+    def test_size_rollover_compresses_segments(self, tmp_path):
+        """Test the file rolls over at max_bytes and segments are gzipped."""
+        handler = RotatingLogFileHandler(str(tmp_path / "app.log"), max_bytes=100)
+        _emit(handler, 50)
+        handler.close()
+
+        names = sorted(path.name for path in tmp_path.iterdir())
+        assert "app.log" in names
+        assert any(name.endswith(".log.gz") for name in names)
+        assert not any(name.endswith(".log") and name != "app.log" for name in names)
+        assert sorted(_read_all(tmp_path)) == sorted(f"line {i}" for i in range(50))
+
+    def test_midnight_rollover_dated_name(self, tmp_path):
+        """Test a dated file name switches to the new day's file at midnight."""
+        handler = RotatingLogFileHandler(str(tmp_path / "app_%Y%m%d.log"))
+        today = tmp_path / f"app_{datetime.now():%Y%m%d}.log"
+        assert handler.baseFilename == str(today)
+        _emit(handler, 3)
+
+        handler._resolve_active = lambda: str(tmp_path / "app_29991231.log")
+        handler.rollover_at = time.time() - 1
+        _emit(handler, 2, msg="next day %d")
+        handler.close()
+
+        assert not today.exists()
+        assert gzip.decompress((tmp_path / (today.name + ".gz")).read_bytes()).count(b"\n") == 3
+        assert (tmp_path / "app_29991231.log").read_text().splitlines() == [
+            "next day 0",
+            "next day 1",
+        ]
+        assert handler.rollover_at > time.time()
+
+    def test_daily_rollover_undated_name(self, tmp_path):
+        """Test rotate_daily moves an undated file aside."""
+        handler = RotatingLogFileHandler(
+            str(tmp_path / "app.log"), rotate_daily=True, compression="none"
+        )
+        _emit(handler, 1)
+        handler.rollover_at = time.time() - 1
+        _emit(handler, 1)
+        handler.close()
+
+        rotated = [path for path in tmp_path.iterdir() if path.name != "app.log"]
+        assert len(rotated) == 1
+        assert rotated[0].read_text() == "line 0\n"
+        assert (tmp_path / "app.log").read_text() == "line 0\n"
+
+    def test_backup_count(self, tmp_path):
+        """Test only the newest backup_count segments are kept."""
+        handler = RotatingLogFileHandler(str(tmp_path / "app.log"), max_bytes=1, backup_count=2)
+        _emit(handler, 6)
+        handler.close()
+        assert len(handler.rotated_segments()) == 2
+
+    def test_retention_spares_other_files(self, tmp_path):
+        """Test retention only deletes this handler's own segments."""
+        neighbours = ["app_audit.log", "app.log.bak", "app.notes.log", "other.log.gz"]
+        for name in neighbours:
+            (tmp_path / name).write_text("keep")
+        handler = RotatingLogFileHandler(str(tmp_path / "app.log"), max_bytes=1, backup_count=1)
+        _emit(handler, 5)
+        handler.close()
+        assert all((tmp_path / name).exists() for name in neighbours)
+        assert [path.name for path in handler.rotated_segments()][0].startswith("app.")
+        assert len(handler.rotated_segments()) == 1
+
+    def test_dated_segments(self, tmp_path):
+        """Test segments of a dated file name are matched by their date."""
+        (tmp_path / "app_20240101.log.gz").write_bytes(b"")
+        (tmp_path / "app_20240102.20240102-101010-2.log").write_bytes(b"")
+        (tmp_path / "app_audit.log").write_bytes(b"")
+        handler = RotatingLogFileHandler(str(tmp_path / "app_%Y%m%d.log"))
+        names = sorted(path.name for path in handler.rotated_segments())
+        handler.close()
+        assert names == ["app_20240101.log.gz", "app_20240102.20240102-101010-2.log"]
+
+    def test_max_age(self, tmp_path):
+        """Test segments older than max_age_days are deleted."""
+        old = tmp_path / "app.20000101-000000.log.gz"
+        old.write_bytes(b"")
+        os.utime(old, (0, 0))
+        handler = RotatingLogFileHandler(str(tmp_path / "app.log"), max_bytes=1, max_age_days=1)
+        _emit(handler, 2)
+        handler.close()
+        assert not old.exists()
+        assert len(handler.rotated_segments()) == 1
+
+    def test_invalid_compression(self, tmp_path):
+        """Test unknown compression formats are rejected."""
+        with pytest.raises(ValueError):
+            RotatingLogFileHandler(str(tmp_path / "app.log"), compression="rar")
+
+    @pytest.mark.skipif(log_rotation.zstandard is not None, reason="zstandard is installed")
+    def test_zstd_requires_zstandard(self, tmp_path):
+        """Test zstd compression needs the optional dependency."""
+        with pytest.raises(ValueError, match="zstandard"):
+            RotatingLogFileHandler(str(tmp_path / "app.log"), compression="zstd")
+
+
+@pytest.mark.unit
+class TestRotationConfig:
+    """Test rotation settings in LoggingConfig."""
+
+    def test_invalid_compression(self):
+        """Test LoggingConfig validates the compression format."""
+        with pytest.raises(ValueError):
+            LoggingConfig(compression="rar")
+
+    def test_log_dir_uses_dated_rotating_file(self, tmp_path):
+        """Test log_dir logging rolls over at midnight into dated files."""
+        setup_logging(LoggingConfig(level="INFO", log_dir=str(tmp_path), max_bytes=10_000))
+        try:
+            handler = next(
+                h
+                for h in logging.getLogger().handlers
+                if isinstance(h, RotatingLogFileHandler)
+            )
+            assert handler.rotate_daily
+            assert handler.max_bytes == 10_000
+            get_logger("test.rotation").info("hello")
+            handler.flush()
+            today = tmp_path / f"harmonicgalaxy_{datetime.now():%Y%m%d}.log"
+            assert "hello" in today.read_text(encoding="utf-8")
+        finally:
+            setup_logging(LoggingConfig(level="INFO"))
+            handler.close()
+
+    def test_from_env(self):
+        """Test rotation settings from environment."""
+        os.environ["HARMONICGALAXY_LOG_MAX_BYTES"] = "1048576"
+        os.environ["HARMONICGALAXY_LOG_BACKUP_COUNT"] = "7"
+        os.environ["HARMONICGALAXY_LOG_COMPRESSION"] = "none"
+        try:
+            config = LoggingConfig.from_env()
+        finally:
+            del os.environ["HARMONICGALAXY_LOG_MAX_BYTES"]
+            del os.environ["HARMONICGALAXY_LOG_BACKUP_COUNT"]
+            del os.environ["HARMONICGALAXY_LOG_COMPRESSION"]
+        assert config.max_bytes == 1048576
+        assert config.backup_count == 7
+        assert config.compression == "none"
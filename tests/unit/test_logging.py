@@ -1,14 +1,24 @@
 """Tests for logging utilities."""
 
 import pytest
+import json
 import logging
 import os
+import time
+from harmonicgalaxy.utils.decorators import log_function_call, log_async_function_call
 from harmonicgalaxy.utils.logging import (
     get_logger,
     setup_logging,
     LoggingConfig,
     LogLevel,
     GalaxyLogger,
+    BoundedQueueHandler,
+    JsonFormatter,
+    RateLimitFilter,
+    MAX_VALUE_REPR_LENGTH,
+    short_repr,
+    get_logging_stats,
+    shutdown_logging,
 )
 
 
@@ -153,3 +163,312 @@ class TestSetupLogging:
         logger = get_logger("test")
         assert logger.level <= logging.INFO
 
+
+
+@pytest.mark.unit
+class TestAsyncLogging:
+    """Test the queue-based logging pipeline."""
+
+    def teardown_method(self):
+        setup_logging(LoggingConfig(level="INFO"))
+
+    def test_invalid_overflow_policy(self):
+        """Test invalid overflow policies are rejected."""
+        with pytest.raises(ValueError):
+            LoggingConfig(overflow_policy="explode")
+
+    def test_records_flushed_on_shutdown(self, tmp_path):
+        """Test queued records reach the file when logging shuts down."""
+        log_file = tmp_path / "galaxy.log"
+        setup_logging(LoggingConfig(level="INFO", log_file=str(log_file), async_logging=True))
+        assert isinstance(logging.getLogger().handlers[0], BoundedQueueHandler)
+        logger = get_logger("test.async")
+        for i in range(100):
+            logger.info("record %d", i)
+
+        shutdown_logging()
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 100
+        assert lines[-1].endswith("record 99")
+
+    def test_drop_new_policy(self):
+        """Test drop_new discards incoming records when the queue is full."""
+        import queue
+
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow_policy="drop_new")
+        for i in range(5):
+            handler.handle(logging.makeLogRecord({"msg": f"m{i}"}))
+        assert handler.dropped == 3
+        assert [handler.queue.get_nowait().msg for _ in range(2)] == ["m0", "m1"]
+
+    def test_drop_oldest_policy(self):
+        """Test drop_oldest keeps the newest records."""
+        import queue
+
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow_policy="drop_oldest")
+        for i in range(5):
+            handler.handle(logging.makeLogRecord({"msg": f"m{i}"}))
+        assert handler.dropped == 3
+        assert [handler.queue.get_nowait().msg for _ in range(2)] == ["m3", "m4"]
+
+    def test_logging_stats(self):
+        """Test queue statistics."""
+        setup_logging(LoggingConfig(level="INFO", async_logging=True))
+        assert get_logging_stats()["async"] is True
+        shutdown_logging()
+        assert get_logging_stats() == {
+            "async": False,
+            "queued": 0,
+            "dropped": 0,
+            "suppressed": 0,
+        }
+
+    def test_from_env(self):
+        """Test async logging settings from environment."""
+        os.environ["HARMONICGALAXY_LOG_ASYNC"] = "true"
+        os.environ["HARMONICGALAXY_LOG_OVERFLOW"] = "drop_new"
+        try:
+            config = LoggingConfig.from_env()
+            assert config.async_logging is True
+            assert config.overflow_policy == "drop_new"
+        finally:
+            del os.environ["HARMONICGALAXY_LOG_ASYNC"]
+            del os.environ["HARMONICGALAXY_LOG_OVERFLOW"]
+
+
+@pytest.mark.unit
+class TestJsonFormatter:
+    """Test the JSON-lines theme."""
+
+    def _record(self, msg="hello %s", args=("world",), **extra):
+        return logging.makeLogRecord(
+            {
+                "name": "test.json",
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+                "msg": msg,
+                "args": args,
+                **extra,
+            }
+        )
+
+    def test_fields(self):
+        """Test standard fields and extra attributes are emitted."""
+        line = JsonFormatter().format(self._record(mission_id="m-1", agent_id="a-7"))
+        data = json.loads(line)
+        assert data["level"] == "INFO"
+        assert data["logger"] == "test.json"
+        assert data["msg"] == "hello world"
+        assert data["mission_id"] == "m-1"
+        assert data["agent_id"] == "a-7"
+        assert "\n" not in line
+        assert len(data["ts"]) == len("2025-01-08T10:30:45.123")
+
+    def test_timestamp_milliseconds(self):
+        """Test cached second prefix still carries per-record milliseconds."""
+        formatter = JsonFormatter()
+        first = self._record()
+        first.created = 1_700_000_000.25
+        second = self._record()
+        second.created = 1_700_000_000.75
+        assert json.loads(formatter.format(first))["ts"].endswith(".250")
+        assert json.loads(formatter.format(second))["ts"].endswith(".750")
+
+    def test_exception_and_unserializable_extra(self):
+        """Test exceptions are included and unknown objects fall back to str."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+
+            record = self._record(exc_info=sys.exc_info(), payload=object())
+        data = json.loads(JsonFormatter().format(record))
+        assert "ValueError: boom" in data["exc"]
+        assert data["payload"].startswith("<object")
+
+    def test_json_theme_file_output(self, tmp_path):
+        """Test the json theme writes one object per line."""
+        log_file = tmp_path / "galaxy.jsonl"
+        setup_logging(LoggingConfig(level="INFO", theme="json", log_file=str(log_file)))
+        try:
+            get_logger("test.json").info("step %d", 3, extra={"mission_id": "m-2"})
+        finally:
+            setup_logging(LoggingConfig(level="INFO"))
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        data = json.loads(lines[-1])
+        assert data["msg"] == "step 3"
+        assert data["mission_id"] == "m-2"
+
+
+class _ReprCounter:
+    """Object counting how often it is repr'd."""
+
+    calls = 0
+
+    def __repr__(self):
+        type(self).calls += 1
+        return "<counter>"
+
+
+@pytest.mark.unit
+class TestDisabledLoggingCost:
+    """Test helpers and decorators do no formatting when the level is disabled."""
+
+    def setup_method(self):
+        _ReprCounter.calls = 0
+
+    def test_short_repr_bounded(self):
+        """Test reprs of large values are truncated."""
+        text = short_repr([{"content": "x" * 1000}] * 1000)
+        assert len(text) <= MAX_VALUE_REPR_LENGTH
+        assert "..." in text
+
+    def test_short_repr_failing_repr(self):
+        """Test objects whose repr raises do not break logging."""
+
+        class Broken:
+            def __repr__(self):
+                raise RuntimeError("no repr")
+
+        assert short_repr(Broken()).startswith("<Broken instance")
+
+    def test_helpers_skip_formatting(self, caplog):
+        """Test GalaxyLogger helpers do not touch their arguments when disabled."""
+        logger = get_logger("test.cost")
+        with caplog.at_level(logging.WARNING):
+            logger.state_update("key", _ReprCounter(), _ReprCounter())
+            logger.event_emitted("event", {"value": _ReprCounter()})
+            logger.mission_start("mission", payload=_ReprCounter())
+        assert _ReprCounter.calls == 0
+        assert caplog.text == ""
+
+    def test_helpers_truncate_values(self, caplog):
+        """Test enabled helpers log bounded values."""
+        logger = get_logger("test.cost")
+        with caplog.at_level(logging.DEBUG):
+            logger.state_update("messages", [], list(range(10000)))
+        assert len(caplog.records[0].getMessage()) < 2 * MAX_VALUE_REPR_LENGTH
+
+    def test_decorator_skips_formatting(self, caplog):
+        """Test the decorator does not repr arguments when DEBUG is disabled."""
+
+        @log_function_call("test.cost")
+        def handle(value):
+            return value
+
+        with caplog.at_level(logging.INFO):
+            handle(_ReprCounter())
+        assert _ReprCounter.calls == 0
+
+        with caplog.at_level(logging.DEBUG):
+            handle(_ReprCounter())
+        assert _ReprCounter.calls == 1
+        assert "Calling handle with args=(<counter>,)" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_async_decorator_logs_errors(self, caplog):
+        """Test failures are still logged when DEBUG is disabled."""
+
+        @log_async_function_call("test.cost")
+        async def fail():
+            raise ValueError("boom")
+
+        with caplog.at_level(logging.INFO):
+            with pytest.raises(ValueError):
+                await fail()
+        assert "Async fail failed: boom" in caplog.text
+
+
+@pytest.mark.unit
+class TestRateLimitFilter:
+    """Test per-call-site rate limiting."""
+
+    def _record(self, msg="retrying %d", lineno=10, name="test.rate"):
+        return logging.makeLogRecord(
+            {
+                "name": name,
+                "msg": msg,
+                "args": (1,),
+                "pathname": "client.py",
+                "lineno": lineno,
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+            }
+        )
+
+    def test_burst_then_suppress(self):
+        """Test a call site may log ``burst`` records before being limited."""
+        rate_filter = RateLimitFilter(rate=0.001, burst=3, summary_interval=3600)
+        allowed = [rate_filter.filter(self._record()) for _ in range(10)]
+        assert allowed == [True] * 3 + [False] * 7
+        assert rate_filter.suppressed == 7
+
+    def test_call_sites_are_independent(self):
+        """Test different lines and templates have separate buckets."""
+        rate_filter = RateLimitFilter(rate=0.001, burst=1, summary_interval=3600)
+        assert rate_filter.filter(self._record(lineno=1))
+        assert rate_filter.filter(self._record(lineno=2))
+        assert rate_filter.filter(self._record(msg="other %d", lineno=1))
+        assert not rate_filter.filter(self._record(lineno=1))
+
+    def test_refill(self):
+        """Test tokens are refilled over time."""
+        rate_filter = RateLimitFilter(rate=1000.0, burst=1, summary_interval=3600)
+        assert rate_filter.filter(self._record())
+        time.sleep(0.01)
+        assert rate_filter.filter(self._record())
+
+    def test_sampling(self):
+        """Test a fraction of over-limit records is kept."""
+        rate_filter = RateLimitFilter(
+            rate=0.001, burst=1, sample_rate=0.25, summary_interval=3600
+        )
+        allowed = [rate_filter.filter(self._record()) for _ in range(9)]
+        assert allowed == [True, False, False, False, True, False, False, False, True]
+
+    def test_shared_between_handlers(self):
+        """Test a record seen by several handlers is counted once."""
+        rate_filter = RateLimitFilter(rate=0.001, burst=1, summary_interval=3600)
+        record = self._record()
+        assert rate_filter.filter(record) and rate_filter.filter(record)
+        second = self._record()
+        assert not rate_filter.filter(second) and not rate_filter.filter(second)
+        assert rate_filter.suppressed == 1
+
+    def test_summary(self, caplog):
+        """Test a summary is logged for suppressed records."""
+        rate_filter = RateLimitFilter(rate=0.001, burst=1, summary_interval=3600)
+        for _ in range(5):
+            rate_filter.filter(self._record())
+        with caplog.at_level(logging.INFO):
+            rate_filter.flush_summary()
+        assert "Suppressed 4 similar messages from client.py:10: retrying %d" in caplog.text
+        assert caplog.records[0].suppressed == 4
+        assert rate_filter.filter(caplog.records[0])
+
+    def test_setup_and_env(self, tmp_path):
+        """Test rate limiting configured through LoggingConfig and the environment."""
+        os.environ["HARMONICGALAXY_LOG_RATE_LIMIT"] = "0.001"
+        os.environ["HARMONICGALAXY_LOG_RATE_BURST"] = "2"
+        try:
+            config = LoggingConfig.from_env()
+        finally:
+            del os.environ["HARMONICGALAXY_LOG_RATE_LIMIT"]
+            del os.environ["HARMONICGALAXY_LOG_RATE_BURST"]
+        assert config.rate_limit == 0.001
+        assert config.rate_burst == 2
+
+        log_file = tmp_path / "galaxy.log"
+        config.log_file = str(log_file)
+        config.use_colors = False
+        setup_logging(config)
+        try:
+            logger = get_logger("test.rate")
+            for i in range(50):
+                logger.info("chunk %d", i)
+            assert get_logging_stats()["suppressed"] == 48
+        finally:
+            setup_logging(LoggingConfig(level="INFO"))
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3
+        assert "Suppressed 48 similar messages" in lines[-1]
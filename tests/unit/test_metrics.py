@@ -0,0 +1,179 @@
+"""Tests for the metrics registry and Prometheus exposition."""
+
+import asyncio
+import urllib.request
+
+import pytest
+from harmonicgalaxy.llm.client import LLMClient
+from harmonicgalaxy.llm.types import LLMConfig, LLMProvider, LLMResponse
+from harmonicgalaxy.metrics import (
+    REGISTRY,
+    MetricsRegistry,
+    generate_text,
+    start_file_dump,
+    start_http_server,
+)
+from harmonicgalaxy.utils.logging import LoggingConfig, get_logger, setup_logging
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Test counters, gauges and histograms."""
+
+    def test_counter(self):
+        """Test counters increase and reject negative amounts."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs")
+        counter.inc()
+        counter.inc(2)
+        assert registry.get_sample_value("jobs_total") == 3
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+
+    def test_labels(self):
+        """Test labelled children by position and by name."""
+        registry = MetricsRegistry()
+        counter = registry.counter("calls_total", "Calls", ("agent", "status"))
+        counter.labels("planner", "ok").inc()
+        counter.labels(agent="planner", status="ok").inc()
+        assert registry.get_sample_value("calls_total", {"agent": "planner", "status": "ok"}) == 2
+        with pytest.raises(ValueError):
+            counter.labels("planner")
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_get_or_create(self):
+        """Test registering the same name returns the metric, or fails on a type clash."""
+        registry = MetricsRegistry()
+        assert registry.gauge("depth", "Depth") is registry.gauge("depth", "Depth")
+        with pytest.raises(ValueError):
+            registry.counter("depth", "Depth")
+
+    def test_gauge_function(self):
+        """Test gauges can be read from a callback."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("queue_depth", "Depth")
+        gauge.set(5)
+        gauge.dec(2)
+        assert registry.get_sample_value("queue_depth") == 3
+        gauge.set_function(lambda: 42)
+        assert registry.get_sample_value("queue_depth") == 42
+
+    def test_histogram(self):
+        """Test histogram buckets are cumulative."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        assert registry.get_sample_value("latency_seconds_bucket", {"le": "0.1"}) == 2
+        assert registry.get_sample_value("latency_seconds_bucket", {"le": "1.0"}) == 3
+        assert registry.get_sample_value("latency_seconds_bucket", {"le": "+Inf"}) == 4
+        assert registry.get_sample_value("latency_seconds_count") == 4
+        assert registry.get_sample_value("latency_seconds_sum") == pytest.approx(2.65)
+
+
+@pytest.mark.unit
+class TestExposition:
+    """Test Prometheus text exposition."""
+
+    def _registry(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests\nserved", ("path",)).labels('/a"b').inc()
+        registry.gauge("up", "Up").set(1)
+        return registry
+
+    def test_text_format(self):
+        """Test HELP/TYPE lines and label escaping."""
+        text = generate_text(self._registry())
+        assert "# HELP requests_total Requests\\nserved\n" in text
+        assert "# TYPE requests_total counter\n" in text
+        assert 'requests_total{path="/a\\"b"} 1.0\n' in text
+        assert "# TYPE up gauge\nup 1.0\n" in text
+
+    def test_http_server(self):
+        """Test metrics are served on /metrics."""
+        server = start_http_server(0, registry=self._registry())
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode("utf-8")
+                assert response.headers["Content-Type"].startswith("text/plain")
+        finally:
+            server.stop()
+        assert "up 1.0" in body
+
+    def test_file_dump(self, tmp_path):
+        """Test metrics are dumped to a file."""
+        path = tmp_path / "metrics.prom"
+        registry = self._registry()
+        dumper = start_file_dump(path, interval=3600, registry=registry)
+        registry.gauge("up", "Up").set(0)
+        dumper.stop()
+        assert "up 0.0" in path.read_text(encoding="utf-8")
+
+
+class _FakeClient(LLMClient):
+    """Client returning a canned response through the request pipeline."""
+
+    def __init__(self, config, fail=False):
+        super().__init__(config)
+        self.fail = fail
+
+    async def chat(self, messages, **kwargs):
+        async def attempt(timeout):
+            if self.fail:
+                raise ConnectionError("down")
+            return {"input_tokens": 7, "output_tokens": 3}
+
+        async with self._request_scope("chat"):
+            usage = await self._send(attempt)
+        result = LLMResponse(content="ok", model="m", provider="anthropic", usage=usage)
+        self._record_usage(result.usage)
+        return result
+
+    async def stream_chat(self, messages, **kwargs):
+        async with self._request_scope("stream_chat"):
+            for chunk in ("a", "b"):
+                await asyncio.sleep(0)
+                yield chunk
+
+
+@pytest.mark.unit
+class TestInstrumentation:
+    """Test LLM and logging metrics."""
+
+    @pytest.mark.asyncio
+    async def test_llm_metrics(self):
+        """Test requests, errors, latency and tokens are recorded per provider/model."""
+        config = LLMConfig(provider=LLMProvider.ANTHROPIC, model="metrics-test")
+        labels = {"provider": "anthropic", "model": "metrics-test"}
+
+        await _FakeClient(config).chat([])
+        with pytest.raises(ConnectionError):
+            await _FakeClient(config, fail=True).chat([])
+        stream = _FakeClient(config).stream_chat([])
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+
+        def value(name, **extra):
+            return REGISTRY.get_sample_value(name, {**labels, **extra})
+
+        requests = "harmonicgalaxy_llm_requests_total"
+        assert value(requests, operation="chat", outcome="success") == 1
+        assert value(requests, operation="chat", outcome="error") == 1
+        assert value(requests, operation="stream_chat", outcome="cancelled") == 1
+        assert value("harmonicgalaxy_llm_errors_total", error="ConnectionError") == 1
+        assert value("harmonicgalaxy_llm_tokens_total", direction="input") == 7
+        assert value("harmonicgalaxy_llm_tokens_total", direction="output") == 3
+        assert value("harmonicgalaxy_llm_request_duration_seconds_count", operation="chat") == 2
+        assert value("harmonicgalaxy_llm_requests_in_flight") == 0
+
+    def test_logging_metrics(self):
+        """Test log records are counted by level."""
+        setup_logging(LoggingConfig(level="INFO", use_colors=False))
+        sample = ("harmonicgalaxy_log_records_total", {"level": "WARNING"})
+        before = REGISTRY.get_sample_value(*sample)
+        get_logger("test.metrics").warning("careful")
+        get_logger("test.metrics").debug("not emitted")
+        assert REGISTRY.get_sample_value(*sample) == before + 1
+        assert "harmonicgalaxy_log_records_lost_total" in generate_text()
@@ -0,0 +1,128 @@
+"""Tests for the mission model."""
+
+import pytest
+from harmonicgalaxy.core.mission import (
+    Mission,
+    MissionHistory,
+    MissionStateError,
+    MissionStatus,
+    StepStatus,
+)
+
+
+@pytest.mark.unit
+class TestMissionHistory:
+    """Test the column-wise step history."""
+
+    def test_append_and_lookup(self):
+        """Test steps are read back by positive and negative index."""
+        history = MissionHistory()
+        history.append("planner", "plan", duration=0.5, output=["a", "b"])
+        history.append("executor", "run", status="failed", error="timeout")
+
+        first, last = history[0], history[-1]
+        assert (first.agent, first.action) == ("planner", "plan")
+        assert first.status == StepStatus.SUCCEEDED
+        assert first.duration == 0.5
+        assert first.output == ["a", "b"]
+        assert last.status == StepStatus.FAILED
+        assert last.error == "timeout"
+        assert last.input is None
+        assert len(history) == 2
+        with pytest.raises(IndexError):
+            history[2]
+        with pytest.raises(ValueError):
+            history.append("executor", "run", status="exploded")
+
+    def test_payloads_stored_by_reference(self):
+        """Test a payload shared by many steps is stored once, without copies."""
+        context = {"document": "x" * 100000}
+        history = MissionHistory()
+        for index in range(1000):
+            history.append("reader", "read", input=context, output=index)
+
+        assert history[0].input is context
+        assert history[999].input is context
+        assert repr(history) == "MissionHistory(steps=1000, payloads=1001)"
+
+    def test_iteration_and_queries(self):
+        """Test iteration, per-agent lookup, counts and errors."""
+        history = MissionHistory()
+        for index in range(10):
+            agent = "even" if index % 2 == 0 else "odd"
+            if index == 3:
+                history.append(agent, "step", status="failed", duration=1.0, error="bad")
+            else:
+                history.append(agent, "step", duration=1.0)
+
+        assert [step.index for step in history] == list(range(10))
+        assert [step.index for step in history.for_agent("odd")] == [1, 3, 5, 7, 9]
+        assert list(history.for_agent("missing")) == []
+        assert history.count("failed") == 1
+        assert [step.index for step in history.errors()] == [3]
+        assert history.total_duration == 10.0
+        assert [step.index for step in history[-2:]] == [8, 9]
+
+    def test_round_trip(self):
+        """Test to_dict/from_dict preserve steps and shared payloads."""
+        shared = {"k": "v"}
+        history = MissionHistory()
+        history.append("a", "x", started_at=1.0, duration=2.0, input=shared, output=shared)
+        history.append("b", "y", status="skipped", started_at=3.0)
+
+        data = history.to_dict()
+        assert data["payloads"] == [shared]
+        restored = MissionHistory.from_dict(data)
+        assert restored[0] == history[0]
+        assert restored[0].input is restored[0].output
+        assert restored[1].status == StepStatus.SKIPPED
+
+
+@pytest.mark.unit
+class TestMission:
+    """Test mission state and serialization."""
+
+    def test_lifecycle(self):
+        """Test a mission runs through its states."""
+        mission = Mission("summarize", context={"topic": "stars"})
+        assert mission.status == MissionStatus.PENDING
+        assert mission.elapsed is None
+
+        mission.start()
+        mission.record_step("reader", "read", output="facts")
+        mission.pause()
+        mission.start()
+        mission.complete(result="summary")
+
+        assert mission.status == MissionStatus.COMPLETED
+        assert mission.status.is_terminal
+        assert mission.result == "summary"
+        assert mission.elapsed >= 0
+        assert len(mission.history) == 1
+
+    def test_invalid_transitions(self):
+        """Test finished missions cannot be restarted or extended."""
+        mission = Mission("m")
+        with pytest.raises(MissionStateError):
+            mission.complete()
+        mission.start()
+        mission.fail(RuntimeError("crashed"))
+        assert mission.error == "RuntimeError: crashed"
+        with pytest.raises(MissionStateError):
+            mission.start()
+        with pytest.raises(MissionStateError):
+            mission.record_step("agent", "late")
+
+    def test_round_trip(self):
+        """Test to_dict/from_dict."""
+        mission = Mission("m", context={"goal": "g"}, metadata={"tenant": "t1"})
+        mission.start()
+        mission.record_step("planner", "plan", duration=0.1, input=mission.context)
+        mission.complete(result=42)
+
+        restored = Mission.from_dict(mission.to_dict())
+        assert restored.id == mission.id
+        assert restored.status == MissionStatus.COMPLETED
+        assert restored.metadata == {"tenant": "t1"}
+        assert restored.result == 42
+        assert restored.history[0] == mission.history[0]
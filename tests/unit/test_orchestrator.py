@@ -0,0 +1,251 @@
+"""Tests for the DAG orchestration engine."""
+
+import asyncio
+
+import pytest
+from harmonicgalaxy.agents.base import FunctionAgent
+from harmonicgalaxy.core.mission import Mission, MissionStateError, MissionStatus, StepStatus
+from harmonicgalaxy.orchestrator.engine import (
+    MissionGraph,
+    OrchestrationEngine,
+    StepFailedError,
+)
+
+
+class Recorder:
+    """Async agent function that records concurrency and event order."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running = 0
+        self.peak = 0
+        self.events = []
+
+    def agent(self, name):
+        async def run(inputs, mission):
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.events.append(("start", name))
+            try:
+                await asyncio.sleep(self.delays.get(name, 0.01))
+            finally:
+                self.running -= 1
+            self.events.append(("end", name))
+            return name
+
+        return FunctionAgent(name, run)
+
+
+@pytest.mark.unit
+class TestMissionGraph:
+    """Test graph validation."""
+
+    def test_duplicate_step(self):
+        """Test step ids are unique."""
+        graph = MissionGraph()
+        graph.add_step("a", Recorder().agent("a"))
+        with pytest.raises(ValueError, match="Duplicate"):
+            graph.add_step("a", Recorder().agent("a"))
+
+    def test_unknown_dependency(self):
+        """Test dependencies must name existing steps."""
+        graph = MissionGraph()
+        graph.add_step("a", Recorder().agent("a"), depends_on=["missing"])
+        with pytest.raises(ValueError, match="unknown step 'missing'"):
+            graph.compile()
+
+    def test_cycle(self):
+        """Test cycles are rejected."""
+        recorder = Recorder()
+        graph = MissionGraph()
+        graph.add_step("root", recorder.agent("root"))
+        graph.add_step("a", recorder.agent("a"), depends_on=["root", "c"])
+        graph.add_step("b", recorder.agent("b"), depends_on=["a"])
+        graph.add_step("c", recorder.agent("c"), depends_on=["b"])
+        with pytest.raises(ValueError, match=r"cycle through steps: \['a', 'b', 'c'\]"):
+            graph.compile()
+
+
+@pytest.mark.unit
+class TestOrchestrationEngine:
+    """Test graph execution."""
+
+    @pytest.mark.asyncio
+    async def test_outputs_flow_to_dependents(self):
+        """Test a step receives its static inputs and its dependencies' outputs."""
+        seen = {}
+
+        async def join(inputs, mission):
+            seen.update(inputs)
+            return inputs["left"] + inputs["right"] + inputs["suffix"]
+
+        graph = MissionGraph()
+        graph.add_step("left", FunctionAgent("l", lambda inputs, mission: "L"))
+        graph.add_step("right", FunctionAgent("r", lambda inputs, mission: "R"))
+        graph.add_step(
+            "join", FunctionAgent("j", join), depends_on=["left", "right"], inputs={"suffix": "!"}
+        )
+        mission = Mission("join")
+
+        outputs = await OrchestrationEngine().run(mission, graph)
+
+        assert outputs == {"left": "L", "right": "R", "join": "LR!"}
+        assert seen == {"left": "L", "right": "R", "suffix": "!"}
+        assert mission.status == MissionStatus.COMPLETED
+        assert mission.result == outputs
+        assert sorted(step.action for step in mission.history) == ["join", "left", "right"]
+        assert mission.history[-1].input == seen
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        """Test independent steps overlap instead of running one by one."""
+        recorder = Recorder()
+        graph = MissionGraph()
+        for index in range(10):
+            graph.add_step(f"s{index}", recorder.agent(f"s{index}"))
+
+        await OrchestrationEngine().run(Mission("wide"), graph)
+
+        assert recorder.peak == 10
+
+    @pytest.mark.asyncio
+    async def test_dispatch_when_ready(self):
+        """Test a step starts as soon as its own dependency ends, not after its level."""
+        recorder = Recorder(delays={"fast": 0.01, "slow": 0.2, "after_fast": 0.01})
+        graph = MissionGraph()
+        graph.add_step("fast", recorder.agent("fast"))
+        graph.add_step("slow", recorder.agent("slow"))
+        graph.add_step("after_fast", recorder.agent("after_fast"), depends_on=["fast"])
+        graph.add_step("last", recorder.agent("last"), depends_on=["slow", "after_fast"])
+
+        await OrchestrationEngine().run(Mission("eager"), graph)
+
+        events = recorder.events
+        assert events.index(("end", "after_fast")) < events.index(("end", "slow"))
+        assert events[-2:] == [("start", "last"), ("end", "last")]
+
+    @pytest.mark.asyncio
+    async def test_parallelism_caps(self):
+        """Test the per-mission cap and the engine-wide cap shared by missions."""
+        recorder = Recorder()
+        graph = MissionGraph()
+        for index in range(12):
+            graph.add_step(f"s{index}", recorder.agent(f"s{index}"))
+
+        await OrchestrationEngine().run(Mission("capped"), graph, max_parallel=3)
+        assert recorder.peak == 3
+
+        recorder.peak = 0
+        engine = OrchestrationEngine(max_concurrency=4)
+        await asyncio.gather(engine.run(Mission("m1"), graph), engine.run(Mission("m2"), graph))
+        assert recorder.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_steps(self):
+        """Test the first failure cancels siblings, skips dependents and fails the mission."""
+        cancelled = asyncio.Event()
+
+        async def boom(inputs, mission):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def slow(inputs, mission):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        graph = MissionGraph()
+        graph.add_step("boom", FunctionAgent("boom", boom))
+        graph.add_step("slow", FunctionAgent("slow", slow))
+        graph.add_step("after", FunctionAgent("after", slow), depends_on=["boom"])
+        mission = Mission("doomed")
+
+        with pytest.raises(StepFailedError) as exc_info:
+            await OrchestrationEngine().run(mission, graph)
+
+        assert exc_info.value.step_id == "boom"
+        assert isinstance(exc_info.value.error, RuntimeError)
+        assert cancelled.is_set()
+        assert mission.status == MissionStatus.FAILED
+        assert [(step.action, step.status) for step in mission.history] == [
+            ("boom", StepStatus.FAILED)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_step_timeout(self):
+        """Test a step exceeding its timeout fails the mission."""
+
+        async def hang(inputs, mission):
+            await asyncio.sleep(10)
+
+        graph = MissionGraph()
+        graph.add_step("hang", FunctionAgent("hang", hang), timeout=0.05)
+
+        with pytest.raises(StepFailedError) as exc_info:
+            await OrchestrationEngine().run(Mission("slow"), graph)
+        assert isinstance(exc_info.value.error, asyncio.TimeoutError)
+
+    @pytest.mark.asyncio
+    async def test_empty_graph(self):
+        """Test an empty graph completes the mission immediately."""
+        mission = Mission("empty")
+        assert await OrchestrationEngine().run(mission, MissionGraph()) == {}
+        assert mission.status == MissionStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_finished_mission_is_rejected(self):
+        """Test running a finished mission again raises instead of running steps."""
+        recorder = Recorder()
+        graph = MissionGraph()
+        graph.add_step("a", recorder.agent("a"))
+        mission = Mission("done")
+        await OrchestrationEngine().run(mission, graph)
+
+        with pytest.raises(MissionStateError, match="completed"):
+            await OrchestrationEngine().run(mission, graph)
+        assert recorder.events == [("start", "a"), ("end", "a")]
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_failure_fails_mission(self):
+        """Test a failing checkpoint after a step fails the mission instead of hanging."""
+
+        class FailingCheckpointer:
+            def __init__(self):
+                self.calls = 0
+
+            async def checkpoint(self, mission):
+                self.calls += 1
+                if self.calls == 2:
+                    raise OSError("disk full")
+
+        graph = MissionGraph()
+        graph.add_step("a", Recorder().agent("a"))
+        graph.add_step("b", Recorder().agent("b"), depends_on=["a"])
+        mission = Mission("unlucky")
+        engine = OrchestrationEngine(checkpointer=FailingCheckpointer())
+
+        with pytest.raises(StepFailedError) as exc_info:
+            await asyncio.wait_for(engine.run(mission, graph), timeout=5)
+
+        assert exc_info.value.step_id == "a"
+        assert isinstance(exc_info.value.error, OSError)
+        assert mission.status == MissionStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_recording_failure_fails_mission(self, monkeypatch):
+        """Test an error recording a step result resolves the run."""
+        mission = Mission("broken")
+
+        def record_step(*args, **kwargs):
+            raise RuntimeError("cannot record")
+
+        monkeypatch.setattr(mission, "record_step", record_step)
+        graph = MissionGraph()
+        graph.add_step("a", Recorder().agent("a"))
+
+        with pytest.raises(StepFailedError) as exc_info:
+            await asyncio.wait_for(OrchestrationEngine().run(mission, graph), timeout=5)
+        assert isinstance(exc_info.value.error, RuntimeError)
+        assert mission.status == MissionStatus.FAILED
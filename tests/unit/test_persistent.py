@@ -0,0 +1,170 @@
+"""Tests for persistent maps and vectors."""
+
+import pickle
+import random
+
+import pytest
+from harmonicgalaxy.state.persistent import (
+    MISSING,
+    Change,
+    PersistentMap,
+    PersistentVector,
+    diff,
+    freeze,
+    thaw,
+)
+
+
+class Colliding:
+    """Key with a deliberately tiny hash space."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return self.value % 3
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.value == self.value
+
+
+@pytest.mark.unit
+class TestPersistentMap:
+    """Test the HAMT mapping."""
+
+    def test_updates_leave_versions_intact(self):
+        """Test set/delete return new versions and never modify old ones."""
+        empty = PersistentMap()
+        one = empty.set("a", 1)
+        two = one.set("b", 2)
+        assert len(empty) == 0 and dict(one) == {"a": 1}
+        assert two == {"a": 1, "b": 2}
+        assert two.delete("a") == {"b": 2}
+        assert two["a"] == 1 and "a" in two and two.get("z", 0) == 0
+        assert two.set("a", 1) is two
+        assert two.discard("z") is two
+        with pytest.raises(KeyError):
+            two.delete("z")
+        assert two.update({"c": 3}, d=4) == {"a": 1, "b": 2, "c": 3, "d": 4}
+
+    def test_matches_dict_under_random_operations(self):
+        """Test a long random sequence of updates, including hash collisions."""
+        rng = random.Random(7)
+        persistent, reference = PersistentMap(), {}
+        for _ in range(5000):
+            key = rng.choice([rng.randrange(2000), Colliding(rng.randrange(30))])
+            if rng.random() < 0.3 and key in reference:
+                del reference[key]
+                persistent = persistent.delete(key)
+            else:
+                reference[key] = rng.random()
+                persistent = persistent.set(key, reference[key])
+        assert len(persistent) == len(reference)
+        assert dict(persistent.items()) == reference
+        assert sorted(persistent.values()) == sorted(reference.values())
+
+    def test_hash_and_pickle(self):
+        """Test equal maps hash alike and survive pickling."""
+        built = PersistentMap({"a": 1, "b": 2})
+        assert hash(built) == hash(PersistentMap([("b", 2), ("a", 1)]))
+        assert pickle.loads(pickle.dumps(built)) == built
+
+
+@pytest.mark.unit
+class TestPersistentVector:
+    """Test the vector trie."""
+
+    def test_matches_list_under_random_operations(self):
+        """Test appends, sets and pops across several trie levels."""
+        rng = random.Random(3)
+        persistent, reference = PersistentVector(), []
+        for _ in range(20000):
+            roll = rng.random()
+            if roll < 0.6 or not reference:
+                value = rng.random()
+                persistent, _ = persistent.append(value), reference.append(value)
+            elif roll < 0.8:
+                persistent, _ = persistent.pop(), reference.pop()
+            else:
+                index = rng.randrange(len(reference))
+                reference[index] = rng.random()
+                persistent = persistent.set(index, reference[index])
+        assert len(persistent) == len(reference)
+        assert list(persistent) == reference
+        assert persistent[-1] == reference[-1]
+        assert list(persistent[10:20]) == reference[10:20]
+
+    def test_versions_share_structure(self):
+        """Test old versions are unaffected and unchanged leaves are shared."""
+        base = PersistentVector(range(2000))
+        updated = base.set(5, "x").append("y")
+        assert base[5] == 5 and len(base) == 2000
+        assert updated[5] == "x" and updated[-1] == "y"
+        assert updated._leaf(1000) is base._leaf(1000)
+        assert updated.set(5, updated[5]) is updated
+        with pytest.raises(IndexError):
+            base.set(2001, 0)
+        with pytest.raises(IndexError):
+            PersistentVector().pop()
+        assert PersistentVector([1, 2]) == [1, 2]
+        assert pickle.loads(pickle.dumps(base)) == base
+
+
+@pytest.mark.unit
+class TestDiffAndConversion:
+    """Test diffs, nested updates and freeze/thaw."""
+
+    def test_nested_updates_and_diff(self):
+        """Test set_in copies one path and diff reports changes by path."""
+        state = freeze({"documents": [{"title": "a"}, {"title": "b"}], "step": 0})
+        snapshot = state
+        state = state.set_in(("documents", 1, "summary"), "...").set("step", 1)
+        state = state.set_in(("meta", "owner"), "me")
+        assert state.get_in(("documents", 1, "summary")) == "..."
+        assert snapshot.get_in(("documents", 1, "summary")) is None
+        assert state["documents"][0] is snapshot["documents"][0]
+        assert sorted(diff(snapshot, state)) == sorted(
+            [
+                Change(("documents", 1, "summary"), MISSING, "..."),
+                Change(("step",), 0, 1),
+                Change(("meta",), MISSING, freeze({"owner": "me"})),
+            ]
+        )
+        assert diff(state, state) == []
+        assert thaw(state) == {
+            "documents": [{"title": "a"}, {"title": "b", "summary": "..."}],
+            "step": 1,
+            "meta": {"owner": "me"},
+        }
+
+    def test_diff_large_versions(self):
+        """Test diffs of large maps and vectors against an exhaustive comparison."""
+        rng = random.Random(11)
+        old_map = PersistentMap((index, index) for index in range(5000))
+        new_map = old_map
+        for _ in range(200):
+            key = rng.randrange(6000)
+            if key in new_map and rng.random() < 0.3:
+                new_map = new_map.delete(key)
+            else:
+                new_map = new_map.set(key, -key)
+        old, new = dict(old_map.items()), dict(new_map.items())
+        expected = {
+            (key,): (old.get(key, MISSING), new.get(key, MISSING))
+            for key in set(old) | set(new)
+            if old.get(key, MISSING) != new.get(key, MISSING)
+        }
+        assert {c.path: (c.old, c.new) for c in old_map.diff(new_map)} == expected
+
+        old_vector = PersistentVector(range(40000))
+        new_vector = old_vector.set(7, "x").set(39000, "y").pop().append("z").append("w")
+        assert sorted(old_vector.diff(new_vector), key=lambda c: c.path) == [
+            Change((7,), 7, "x"),
+            Change((39000,), 39000, "y"),
+            Change((39999,), 39999, "z"),
+            Change((40000,), MISSING, "w"),
+        ]
+        # A vector whose trie grew a level is compared leaf by leaf
+        grown = PersistentVector(range(1000)).extend(range(1000, 1100)).set(3, "x")
+        assert PersistentVector(range(1000)).diff(grown)[0] == Change((3,), 3, "x")
+        assert len(PersistentVector(range(1000)).diff(grown)) == 101
@@ -0,0 +1,119 @@
+"""Tests for the process pool backend of CPU-bound agents."""
+
+import asyncio
+import os
+import pickle
+import time
+
+import pytest
+from harmonicgalaxy.agents.base import CPUBoundAgent
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine
+from harmonicgalaxy.orchestrator.process_pool import ProcessPool
+
+_warmed = None
+
+
+def warm(value):
+    global _warmed
+    _warmed = value
+
+
+def warmed_value():
+    return _warmed, os.getpid()
+
+
+def checksum(data, scale=1):
+    return sum(data[::4096]) * scale, len(data)
+
+
+def pid():
+    return os.getpid()
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class Scorer(CPUBoundAgent):
+    def compute(self, inputs):
+        return len(inputs["text"].split()), os.getpid()
+
+
+@pytest.mark.unit
+class TestProcessPool:
+    """Test the managed process pool."""
+
+    @pytest.mark.asyncio
+    async def test_warm_workers(self):
+        """Test workers are spawned and initialized by start()."""
+        async with ProcessPool(max_workers=2, initializer=warm, initargs=("ready",)) as pool:
+            assert len(pool._generation.executor._processes) == 2
+            value, worker = await pool.run(warmed_value)
+        assert value == "ready"
+        assert worker != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_out_of_band_arguments(self):
+        """Test large buffers go through shared memory, small ones in-band."""
+        data = bytearray(os.urandom(3 << 20))
+        expected = (sum(data[::4096]) * 2, len(data))
+        async with ProcessPool(max_workers=1, shm_threshold=1 << 20) as pool:
+            assert await pool.run(checksum, pickle.PickleBuffer(data), scale=2) == expected
+            assert pool.out_of_band_bytes == len(data)
+            # bytearray and bytes are pickled in-band
+            assert await pool.run(checksum, data) == (expected[0] // 2, len(data))
+            assert pool.out_of_band_bytes == len(data)
+
+            small = bytearray(b"\x01" * 5000)
+            assert await pool.run(checksum, pickle.PickleBuffer(small)) == (2, 5000)
+            assert pool.out_of_band_bytes == len(data)
+
+    @pytest.mark.asyncio
+    async def test_timeout_replaces_stuck_worker(self):
+        """Test a timed-out task raises and later tasks run on a fresh worker."""
+        async with ProcessPool(max_workers=1) as pool:
+            stuck = pool._generation.executor
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.run(sleep, 10, timeout=0.2)
+            assert pool.timeouts == 1
+            assert await pool.run(sleep, 0) == 0
+            assert pool._generation.executor is not stuck
+
+    @pytest.mark.asyncio
+    async def test_recycling(self):
+        """Test workers are replaced after max_tasks_per_worker tasks."""
+        async with ProcessPool(max_workers=1, max_tasks_per_worker=2) as pool:
+            pids = [await pool.run(pid) for _ in range(5)]
+        assert pids[0] == pids[1]
+        assert len(set(pids)) == 3
+        assert pool.recycles == 2
+
+    @pytest.mark.asyncio
+    async def test_closed_pool(self):
+        """Test a shut down pool rejects tasks."""
+        pool = ProcessPool(max_workers=1)
+        await pool.shutdown()
+        with pytest.raises(RuntimeError, match="shut down"):
+            await pool.run(pid)
+
+
+@pytest.mark.unit
+class TestCPUBoundAgents:
+    """Test CPU-bound agents in the orchestration engine."""
+
+    @pytest.mark.asyncio
+    async def test_engine_uses_process_pool(self):
+        """Test CPU-bound steps run in the pool, or in a thread without one."""
+        graph = MissionGraph()
+        graph.add_step("score", Scorer("scorer"), inputs={"text": "one two three"})
+
+        async with ProcessPool(max_workers=1) as pool:
+            outputs = await OrchestrationEngine(process_pool=pool).run(Mission("m"), graph)
+        words, worker = outputs["score"]
+        assert words == 3
+        assert worker != os.getpid()
+
+        outputs = await OrchestrationEngine().run(Mission("m"), graph)
+        assert outputs["score"] == (3, os.getpid())
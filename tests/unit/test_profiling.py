@@ -0,0 +1,175 @@
+"""Tests for profiling decorators and latency histograms."""
+
+import asyncio
+
+import pytest
+from harmonicgalaxy.utils.decorators import profiled, timed
+from harmonicgalaxy.utils.profiling import (
+    LatencyHistogram,
+    get_function_stats,
+    reset_stats,
+    stats_snapshot,
+    top_stacks,
+)
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    """Test LatencyHistogram."""
+
+    def test_empty(self):
+        """Test an empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.snapshot()["count"] == 0
+
+    def test_percentiles_within_bucket_error(self):
+        """Test percentiles are accurate to a few percent across magnitudes."""
+        histogram = LatencyHistogram()
+        values = [i * 1e-5 for i in range(1, 10001)]  # 10us .. 100ms
+        for value in values:
+            histogram.record(value)
+        for q in (50, 90, 99):
+            expected = values[int(len(values) * q / 100) - 1]
+            assert histogram.percentile(q) == pytest.approx(expected, rel=0.05)
+        assert histogram.max == values[-1]
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_extreme_values(self):
+        """Test sub-nanosecond and very large values land in the edge buckets."""
+        histogram = LatencyHistogram()
+        histogram.record(1e-12)
+        histogram.record(1e-7)
+        histogram.record(1e9)
+        assert histogram.percentile(0) == 1e-12
+        assert histogram.percentile(50) == pytest.approx(1e-7, rel=0.05)
+        assert histogram.percentile(100) == 1e9
+
+    def test_merge(self):
+        """Test merging two histograms."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.001)
+        second.record(0.1)
+        first.merge(second)
+        assert first.count == 2
+        assert first.percentile(100) == pytest.approx(0.1, rel=0.05)
+
+
+@pytest.mark.unit
+class TestTimedDecorators:
+    """Test timed and profiled decorators."""
+
+    def teardown_method(self):
+        reset_stats()
+
+    def test_timed_sync(self):
+        """Test calls and errors of a sync function are recorded."""
+
+        @timed("test.sync")
+        def work(fail=False):
+            if fail:
+                raise ValueError("boom")
+            return 1
+
+        assert work() == 1
+        with pytest.raises(ValueError):
+            work(fail=True)
+        snapshot = stats_snapshot()["test.sync"]
+        assert snapshot["calls"] == 2
+        assert snapshot["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timed_async(self):
+        """Test latency of an async function covers the awaited time."""
+
+        @timed()
+        async def sleep():
+            await asyncio.sleep(0.01)
+
+        await sleep()
+        assert asyncio.iscoroutinefunction(sleep)
+        stats = get_function_stats(f"{__name__}.{sleep.__qualname__}")
+        assert stats.calls == 1
+        assert stats.latency.percentile(50) >= 0.009
+
+    def test_reset_keeps_decorated_functions_recording(self):
+        """Test reset_stats resets in place, so decorated functions keep recording."""
+
+        @timed("test.reset")
+        def work():
+            return 1
+
+        work()
+        stats = get_function_stats("test.reset")
+        reset_stats("test.reset")
+        assert stats.calls == 0 and stats.errors == 0
+        work()
+        reset_stats()
+        work()
+        assert get_function_stats("test.reset") is stats
+        assert get_function_stats("test.reset").calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancellation_is_not_an_error(self):
+        """Test only Exception counts as an error, not CancelledError."""
+
+        @timed("test.cancelled")
+        async def wait():
+            await asyncio.sleep(10)
+
+        task = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        stats = get_function_stats("test.cancelled")
+        assert stats.calls == 1
+        assert stats.errors == 0
+
+    def test_profiled_cprofile(self):
+        """Test sampled calls are merged into a cProfile report."""
+
+        def inner():
+            return sum(range(100))
+
+        @profiled("test.cprofile", sample_rate=1.0)
+        def work():
+            return inner()
+
+        for _ in range(3):
+            work()
+        stats = get_function_stats("test.cprofile")
+        assert stats.calls == 3
+        assert stats.profiled_calls == 3
+        assert "inner" in stats.profile_report()
+
+    def test_profiled_stack(self):
+        """Test stack sampling records the caller."""
+
+        @profiled("test.stack", sample_rate=1.0, mode="stack")
+        def work():
+            return 1
+
+        def caller():
+            return work()
+
+        for _ in range(2):
+            caller()
+        ((stack, count),) = top_stacks("test.stack")
+        assert count == 2
+        assert stack[-1].endswith("caller")
+
+    def test_profiled_never_samples(self):
+        """Test a zero sample rate only times calls."""
+
+        @profiled("test.nosample", sample_rate=0.0)
+        def work():
+            return 1
+
+        work()
+        assert get_function_stats("test.nosample").snapshot()["profiled_calls"] == 0
+
+    def test_profiled_invalid_mode(self):
+        """Test unknown profile modes are rejected."""
+        with pytest.raises(ValueError):
+            profiled(mode="perf")
@@ -0,0 +1,170 @@
+"""Tests for load-aware agent selection."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+from harmonicgalaxy.agents.base import FunctionAgent
+from harmonicgalaxy.agents.registry import AgentRegistry
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine
+from harmonicgalaxy.orchestrator.selection import (
+    FirstMatchPolicy,
+    LeastOutstandingPolicy,
+    LoadTracker,
+    PowerOfTwoChoicesPolicy,
+    SelectionPolicy,
+)
+
+
+def agent(name, capabilities=("work",)):
+    return FunctionAgent(name, lambda inputs, mission: name, capabilities=capabilities)
+
+
+def sleeper(name, seconds):
+    async def run(inputs, mission):
+        await asyncio.sleep(seconds)
+        return name
+
+    return FunctionAgent(name, run, capabilities={"work"})
+
+
+@pytest.mark.unit
+class TestLoadTracker:
+    """Test load signal tracking."""
+
+    def test_ewma_latency_and_errors(self):
+        """Test latency and error rate are exponentially weighted averages."""
+        loads = LoadTracker(alpha=0.5)
+        loads.started("a")
+        assert loads["a"].in_flight == 1
+        loads.finished("a", 1.0)
+        assert loads["a"].latency == 1.0
+        loads.started("a")
+        loads.finished("a", 3.0, failed=True)
+        assert loads["a"].latency == 2.0
+        assert loads["a"].error_rate == 0.5
+        assert loads.snapshot()["a"] == {
+            "in_flight": 0,
+            "latency": 2.0,
+            "error_rate": 0.5,
+            "completed": 1,
+            "failed": 1,
+        }
+
+        loads.started("a")
+        loads.cancelled("a")
+        assert loads["a"].in_flight == 0
+        assert loads["a"].latency == 2.0
+
+        with pytest.raises(ValueError):
+            LoadTracker(alpha=0)
+
+    def test_cost_penalizes_queue_and_errors(self):
+        """Test the expected cost grows with steps in flight and error rate."""
+        loads = LoadTracker(alpha=1.0)
+        loads.started("a")
+        loads.finished("a", 1.0)
+        assert loads["a"].cost == 1.0
+        loads.started("a")
+        assert loads["a"].cost == 2.0
+        loads.finished("a", 1.0, failed=True)
+        assert loads["a"].cost == 20.0
+        assert loads["new"].cost == 0.0
+
+
+@pytest.mark.unit
+class TestSelectionPolicies:
+    """Test choices among equivalent candidates."""
+
+    def test_least_outstanding(self):
+        """Test the agent with the fewest steps in flight wins, then the cheaper one."""
+        candidates = [agent("a"), agent("b"), agent("c")]
+        loads = LoadTracker()
+        loads.started("a")
+        loads.started("b")
+        policy = LeastOutstandingPolicy()
+        assert policy.select(candidates, loads).name == "c"
+
+        loads.started("c")
+        loads.finished("a", 0.1)
+        loads.finished("b", 0.5)
+        assert policy.select(candidates, loads).name == "a"
+        assert FirstMatchPolicy().select(candidates, loads).name == "a"
+
+    def test_power_of_two_choices(self):
+        """Test sampled choices avoid an overloaded agent."""
+        candidates = [agent("a"), agent("b"), agent("c")]
+        loads = LoadTracker(alpha=1.0)
+        for name in ("a", "b", "c"):
+            loads.started(name)
+            loads.finished(name, 0.1)
+        for _ in range(10):
+            loads.started("b")
+        policy = PowerOfTwoChoicesPolicy(seed=7)
+        chosen = Counter(policy.select(candidates, loads).name for _ in range(100))
+        assert chosen["b"] == 0
+        assert chosen["a"] > 0 and chosen["c"] > 0
+        assert policy.select(candidates[:1], loads).name == "a"
+
+    def test_fast_failing_agent_loses(self):
+        """Test an agent failing fast does not look cheaper than a slower healthy one."""
+        candidates = [agent("flaky"), agent("healthy")]
+        loads = LoadTracker()
+        for _ in range(5):
+            loads.started("flaky")
+            loads.finished("flaky", 0.001, failed=True)
+            loads.started("healthy")
+            loads.finished("healthy", 0.5)
+        loads.started("healthy")
+        assert loads["flaky"].cost < loads["healthy"].cost
+
+        assert LeastOutstandingPolicy().select(candidates, loads).name == "healthy"
+        policy = PowerOfTwoChoicesPolicy(seed=3)
+        assert {policy.select(candidates, loads).name for _ in range(20)} == {"healthy"}
+
+
+@pytest.mark.unit
+class TestEngineSelection:
+    """Test the engine balancing capability steps."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_steps_spread(self):
+        """Test concurrent steps are spread over equivalent agents."""
+        registry = AgentRegistry([sleeper(name, 0.02) for name in ("a", "b", "c")])
+        graph = MissionGraph()
+        for index in range(9):
+            graph.add_step(f"s{index}", requires={"work"})
+        engine = OrchestrationEngine(registry=registry)
+
+        outputs = await engine.run(Mission("m"), graph)
+        assert Counter(outputs.values()) == {"a": 3, "b": 3, "c": 3}
+        snapshot = engine.loads.snapshot()
+        assert {load["completed"] for load in snapshot.values()} == {3}
+        assert {load["in_flight"] for load in snapshot.values()} == {0}
+
+    @pytest.mark.asyncio
+    async def test_preference_before_load(self):
+        """Test the policy only chooses among the best-scoring matches."""
+        registry = AgentRegistry([agent("plain"), agent("fast", {"work", "fast"})])
+        graph = MissionGraph()
+        for index in range(4):
+            graph.add_step(f"s{index}", requires={"work"}, prefers={"fast"})
+        engine = OrchestrationEngine(registry=registry)
+
+        outputs = await engine.run(Mission("m"), graph)
+        assert set(outputs.values()) == {"fast"}
+
+    @pytest.mark.asyncio
+    async def test_custom_policy(self):
+        """Test a custom policy decides among the candidates."""
+
+        class LastPolicy(SelectionPolicy):
+            def select(self, candidates, loads):
+                return candidates[-1]
+
+        registry = AgentRegistry([agent("a"), agent("b")])
+        graph = MissionGraph()
+        graph.add_step("s", requires={"work"})
+        engine = OrchestrationEngine(registry=registry, selection_policy=LastPolicy())
+        assert await engine.run(Mission("m"), graph) == {"s": "b"}
@@ -0,0 +1,236 @@
+"""Tests for the state manager and its backends."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.state.backends import (
+    Durability,
+    MemoryBackend,
+    MmapLogBackend,
+    SQLiteBackend,
+)
+from harmonicgalaxy.state.backends.base import prefix_end
+from harmonicgalaxy.state.manager import StateManager, create_backend
+
+
+def make_backend(kind, path, durability=Durability.BATCH):
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(path / "state.db", durability=durability)
+    return MmapLogBackend(path / "state.log", durability=durability, initial_size=4096)
+
+
+@pytest.fixture(params=["memory", "sqlite", "mmap"])
+def kind(request):
+    return request.param
+
+
+@pytest.mark.unit
+class TestStateBackends:
+    """Test the API shared by every backend."""
+
+    @pytest.mark.asyncio
+    async def test_get_put_delete(self, kind, tmp_path):
+        """Test single-key operations."""
+        async with make_backend(kind, tmp_path) as backend:
+            assert await backend.get("a") is None
+            await backend.put("a", b"1")
+            await backend.put("a", b"2")
+            assert await backend.get("a") == b"2"
+            assert await backend.delete("a") is True
+            assert await backend.delete("a") is False
+            assert await backend.get("a") is None
+            assert await backend.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_batches_and_scans(self, kind, tmp_path):
+        """Test batch writes apply in order and scans are sorted by key."""
+        async with make_backend(kind, tmp_path) as backend:
+            await backend.write(
+                [("m/2", b"two"), ("m/1", b"one"), ("x", b"x"), ("m/3", b"3"), ("m/3", None)]
+            )
+            assert await backend.scan("m/") == [("m/1", b"one"), ("m/2", b"two")]
+            assert [key for key, _ in await backend.scan()] == ["m/1", "m/2", "x"]
+            assert await backend.get_many(["x", "missing", "m/1"]) == [b"x", None, b"one"]
+            assert await backend.count() == 3
+
+    @pytest.mark.asyncio
+    async def test_range_scans(self, kind, tmp_path):
+        """Test scans bounded by start, end and limit stay sorted as keys change."""
+        async with make_backend(kind, tmp_path) as backend:
+            await backend.write([(f"k{i}", b"%d" % i) for i in (5, 1, 3, 2, 4)] + [("z", b"")])
+            await backend.delete("k3")
+            await backend.write([("k0", b"0"), ("k4", None)])
+            assert [key for key, _ in await backend.scan("k")] == ["k0", "k1", "k2", "k5"]
+            assert await backend.scan("k", start="k1", end="k5") == [("k1", b"1"), ("k2", b"2")]
+            assert [key for key, _ in await backend.scan("k", start="k2")] == ["k2", "k5"]
+            assert [key for key, _ in await backend.scan(end="k2", limit=2)] == ["k0", "k1"]
+            assert await backend.scan("k", start="l") == []
+            assert await backend.get("z") == b""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes(self, kind, tmp_path):
+        """Test concurrent writers are all acknowledged and visible."""
+        async with make_backend(kind, tmp_path) as backend:
+            await asyncio.gather(*(backend.put(f"k{i:03}", b"%d" % i) for i in range(200)))
+            assert await backend.count() == 200
+            assert await backend.get("k123") == b"123"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("durability", list(Durability))
+    async def test_reopen(self, kind, tmp_path, durability):
+        """Test durable backends recover their state at every durability level."""
+        if kind == "memory":
+            pytest.skip("memory backend is not persistent")
+        async with make_backend(kind, tmp_path, durability) as backend:
+            await backend.write([("a", b"1"), ("b", b"2")])
+            await backend.put("a", b"3")
+            await backend.delete("b")
+        async with make_backend(kind, tmp_path, durability) as backend:
+            assert await backend.scan() == [("a", b"3")]
+
+    def test_prefix_end(self):
+        """Test the upper bound of prefix scans."""
+        assert prefix_end("m/") == "m0"
+        assert prefix_end("") is None
+        assert prefix_end("a\U0010ffff") == "b"
+
+
+@pytest.mark.unit
+class TestSQLiteBackend:
+    """Test SQLite specifics."""
+
+    @pytest.mark.asyncio
+    async def test_group_commit(self, tmp_path):
+        """Test concurrent writes share commits, except at full durability."""
+        async with SQLiteBackend(tmp_path / "batch.db") as backend:
+            await asyncio.gather(*(backend.put(f"k{i}", b"v") for i in range(100)))
+            assert backend.commits < 100
+        async with SQLiteBackend(tmp_path / "full.db", durability=Durability.FULL) as backend:
+            await asyncio.gather(*(backend.put(f"k{i}", b"v") for i in range(20)))
+            assert backend.commits == 20
+
+    @pytest.mark.asyncio
+    async def test_open_off_event_loop(self, tmp_path, monkeypatch):
+        """Test the connections are opened and the table created outside the event loop."""
+        threads = []
+        connect = SQLiteBackend._connect
+
+        def record_thread(backend):
+            threads.append(threading.current_thread())
+            return connect(backend)
+
+        monkeypatch.setattr(SQLiteBackend, "_connect", record_thread)
+        async with SQLiteBackend(tmp_path / "state.db") as backend:
+            await backend.put("k", b"v")
+            assert await backend.get("k") == b"v"
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+
+@pytest.mark.unit
+class TestMmapLogBackend:
+    """Test log specifics: growth, group sync, torn tails and compaction."""
+
+    @pytest.mark.asyncio
+    async def test_growth_and_group_sync(self, tmp_path):
+        """Test the file grows on demand and concurrent writes share fsyncs."""
+        async with MmapLogBackend(tmp_path / "state.log", initial_size=4096) as backend:
+            await asyncio.gather(*(backend.put(f"k{i}", bytes(100)) for i in range(200)))
+            assert backend.stats()["file_bytes"] > 4096
+            assert backend.syncs < 200
+            assert await backend.get("k199") == bytes(100)
+
+    @pytest.mark.asyncio
+    async def test_torn_tail(self, tmp_path):
+        """Test a torn record and an incomplete batch are dropped on recovery."""
+        path = tmp_path / "state.log"
+        async with MmapLogBackend(path) as backend:
+            await backend.put("a", b"1")
+            end = backend.stats()["log_bytes"]
+            await backend.write([("b", b"2"), ("c", b"3")])
+        # Crash halfway through the batch: its second record is garbage
+        with open(path, "r+b") as file:
+            file.seek(end)
+            first = file.read(13 + 1 + 1)
+            file.seek(end + len(first))
+            file.write(b"\xff" * 8)
+        async with MmapLogBackend(path) as backend:
+            assert await backend.scan() == [("a", b"1")]
+            await backend.put("d", b"4")
+        async with MmapLogBackend(path) as backend:
+            assert await backend.scan() == [("a", b"1"), ("d", b"4")]
+
+    @pytest.mark.asyncio
+    async def test_compaction(self, tmp_path):
+        """Test compaction drops dead records and keeps concurrent writes."""
+        path = tmp_path / "state.log"
+        async with MmapLogBackend(path) as backend:
+            for version in range(50):
+                await backend.put("hot", b"%d" % version)
+            await backend.put("gone", b"x")
+            await backend.delete("gone")
+            before = backend.stats()["log_bytes"]
+            await asyncio.gather(backend.compact(), backend.put("late", b"1"))
+            assert backend.stats()["log_bytes"] < before / 10
+            assert await backend.scan() == [("hot", b"49"), ("late", b"1")]
+            await backend.put("after", b"2")
+        assert not os.path.exists(str(path) + ".compact")
+        async with MmapLogBackend(path) as backend:
+            assert await backend.scan() == [("after", b"2"), ("hot", b"49"), ("late", b"1")]
+
+    @pytest.mark.asyncio
+    async def test_not_a_log(self, tmp_path):
+        """Test foreign files are rejected."""
+        path = tmp_path / "state.log"
+        path.write_bytes(b"something else")
+        with pytest.raises(ValueError, match="Not a state log"):
+            await MmapLogBackend(path).open()
+
+
+@pytest.mark.unit
+class TestStateManager:
+    """Test values and missions on top of a backend."""
+
+    @pytest.mark.asyncio
+    async def test_values(self, kind, tmp_path):
+        """Test JSON values round-trip."""
+        async with StateManager(make_backend(kind, tmp_path)) as state:
+            await state.put("context/m1", {"documents": [1, 2], "done": False})
+            await state.put_many({"a": 1, "b": "two"})
+            assert await state.get("context/m1") == {"documents": [1, 2], "done": False}
+            assert await state.get("missing", 0) == 0
+            assert await state.get_many(["a", "b", "c"]) == {"a": 1, "b": "two"}
+            assert await state.scan("context/") == [
+                ("context/m1", {"documents": [1, 2], "done": False})
+            ]
+
+    @pytest.mark.asyncio
+    async def test_missions(self, tmp_path):
+        """Test missions are saved and restored across reopening."""
+        mission = Mission("report", context={"topic": "state"}, mission_id="m1")
+        mission.start()
+        mission.record_step("writer", "draft", output="text")
+        async with StateManager(create_backend(f"sqlite:///{tmp_path}/state.db")) as state:
+            await state.save_mission(mission)
+        async with StateManager(create_backend(f"sqlite:///{tmp_path}/state.db")) as state:
+            restored = await state.load_mission("m1")
+            assert restored.to_dict() == mission.to_dict()
+            assert [m.id for m in await state.list_missions()] == ["m1"]
+            assert await state.delete_mission("m1") is True
+            assert await state.load_mission("m1") is None
+
+    def test_create_backend(self, tmp_path):
+        """Test backend URLs."""
+        assert isinstance(create_backend("memory://"), MemoryBackend)
+        backend = create_backend("mmap:///relative/state.log", durability="full")
+        assert isinstance(backend, MmapLogBackend)
+        assert str(backend.path) == "relative/state.log"
+        assert backend.durability is Durability.FULL
+        assert str(create_backend("sqlite:////abs/state.db").path) == "/abs/state.db"
+        with pytest.raises(ValueError):
+            create_backend("redis://localhost")
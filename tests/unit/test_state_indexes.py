@@ -0,0 +1,204 @@
+"""Tests for the secondary indexes of missions."""
+
+import pytest
+from harmonicgalaxy.agents.base import FunctionAgent
+from harmonicgalaxy.core.mission import Mission
+from harmonicgalaxy.state.backends import MemoryBackend, MmapLogBackend, SQLiteBackend
+from harmonicgalaxy.state.checkpoint import MissionCheckpointer
+from harmonicgalaxy.state.indexes import MissionIndex, Range, encode_value
+from harmonicgalaxy.orchestrator.engine import MissionGraph, OrchestrationEngine
+from harmonicgalaxy.state.manager import StateManager
+
+
+def make_state(kind, path, **kwargs):
+    backends = {
+        "memory": lambda: MemoryBackend(),
+        "sqlite": lambda: SQLiteBackend(path / "state.db"),
+        "mmap": lambda: MmapLogBackend(path / "state.log", initial_size=4096),
+    }
+    return StateManager(backends[kind](), **kwargs)
+
+
+def make_mission(mission_id, created_at, tags=(), running=()):
+    """A started mission with ``running`` (agent, step id) pairs in flight."""
+    mission = Mission("task", mission_id=mission_id, metadata={"tags": list(tags)})
+    mission.created_at = created_at
+    mission.start()
+    for agent, step_id in running:
+        mission.running_steps[step_id] = agent
+    return mission
+
+
+@pytest.mark.unit
+class TestEncoding:
+    """Test the order-preserving encoding of indexed values."""
+
+    def test_order(self):
+        """Test encoded values sort like the values."""
+        numbers = [-1e300, -2.5, -1, -0.0, 0, 1e-9, 1, 2.5, 10, 1e300]
+        encoded = [encode_value(number) for number in numbers]
+        assert encoded == sorted(encoded)
+        assert encode_value(3) == encode_value(3.0)
+        assert encode_value(False) < encode_value(True) < encode_value(-1) < encode_value("a")
+        with pytest.raises(TypeError):
+            encode_value(None)
+
+
+@pytest.mark.unit
+class TestMissionQueries:
+    """Test queries through the indexes of the state manager."""
+
+    @pytest.fixture(params=["memory", "sqlite", "mmap"])
+    def kind(self, request):
+        return request.param
+
+    @pytest.mark.asyncio
+    async def test_query(self, kind, tmp_path):
+        """Test equality, tag and time range conditions, alone and combined."""
+        async with make_state(kind, tmp_path) as state:
+            await state.save_mission(make_mission("a", 100, ["urgent"], [("writer", "draft")]))
+            await state.save_mission(make_mission("b", 200, ["urgent", "eu"], [("editor", "edit")]))
+            paused = make_mission("c", 300, ["eu"], [("writer", "draft"), ("writer", "outline")])
+            paused.pause()
+            await state.save_mission(paused)
+            done = make_mission("d", 400, running=[("writer", "draft")])
+            done.complete()
+            await state.save_mission(done)
+
+            assert await state.query(status="running") == ["a", "b"]
+            assert await state.query(agent="writer") == ["a", "c"]
+            assert await state.query(status="running", agent="writer") == ["a"]
+            assert await state.query(step="outline") == ["c"]
+            assert await state.query(tag="eu") == ["b", "c"]
+            assert await state.query(created=Range(end=250)) == ["a", "b"]
+            assert await state.query(created=Range(150, 300)) == ["b"]
+            assert await state.query(created=Range(start=150), tag="urgent") == ["b"]
+            assert await state.query(tag=Range("a", "z")) == ["b", "c", "a"]
+            assert await state.query(tag="urgent", limit=1) == ["a"]
+            assert await state.query(step="review") == []
+            missions = await state.query_missions(finished=Range(start=0))
+            assert [mission.id for mission in missions] == ["d"]
+
+    @pytest.mark.asyncio
+    async def test_updates_and_deletes(self, kind, tmp_path):
+        """Test index entries follow mission writes and disappear with the mission."""
+        async with make_state(kind, tmp_path) as state:
+            mission = make_mission("a", 100, ["urgent"], [("writer", "draft")])
+            await state.save_mission(mission)
+            mission.running_steps = {"edit": "editor"}
+            mission.metadata["tags"] = ["eu"]
+            await state.save_mission(mission)
+            assert await state.query(agent="writer") == []
+            assert await state.query(agent="editor", step="edit", tag="eu") == ["a"]
+            assert await state.query(tag="urgent") == []
+
+            assert await state.delete_mission("a") is True
+            assert await state.delete_mission("a") is False
+            assert await state.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_updated_time_is_stored(self, tmp_path):
+        """Test the updated index holds the time of the latest write, even after reindexing."""
+        async with make_state("sqlite", tmp_path) as state:
+            mission = make_mission("a", 100)
+            await state.save_mission(mission)
+            saved_at = mission.updated_at
+            assert await state.query(updated=Range(end=saved_at + 1e-6)) == ["a"]
+
+            assert await state.reindex() == 1
+            assert await state.query(updated=Range(end=saved_at + 1e-6)) == ["a"]
+            (loaded,) = await state.query_missions(status="running")
+            assert loaded.updated_at == saved_at
+
+    @pytest.mark.asyncio
+    async def test_custom_indexes(self, tmp_path):
+        """Test declared indexes, reindexing and invalid queries."""
+        tenant = MissionIndex("tenant", lambda mission: mission.metadata.get("tenant"))
+        backend = MemoryBackend()
+        unindexed = StateManager(backend, indexes=())
+        mission = make_mission("a", 100)
+        mission.metadata["tenant"] = "acme"
+        await unindexed.save_mission(mission)
+        assert await backend.scan("index/") == []
+
+        state = StateManager(backend, indexes=[tenant])
+        assert await state.query(tenant="acme") == []
+        assert await state.reindex() == 1
+        assert await state.query(tenant="acme") == ["a"]
+        with pytest.raises(ValueError, match="No mission index"):
+            await state.query(status="running")
+        with pytest.raises(ValueError):
+            await state.query()
+        with pytest.raises(ValueError):
+            MissionIndex("a/b", lambda mission: None)
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_update_indexes(self):
+        """Test journaled missions are indexed at every checkpoint."""
+        state = StateManager(MemoryBackend())
+        checkpointer = MissionCheckpointer(state)
+        mission = make_mission("a", 100, running=[("writer", "draft")])
+        await checkpointer.checkpoint(mission)
+        assert await state.query(status="running", step="draft") == ["a"]
+        first_write = mission.updated_at
+        del mission.running_steps["draft"]
+        mission.record_step("writer", "draft")
+        mission.running_steps["review"] = "editor"
+        await checkpointer.checkpoint(mission)
+        assert await state.query(step="draft") == []
+        assert await state.query(step="review", updated=Range(start=first_write + 1e-9)) == ["a"]
+
+        restored = await MissionCheckpointer(state).recover("a")
+        assert restored.running_steps == {"review": "editor"}
+        assert restored.updated_at == mission.updated_at
+        await checkpointer.discard("a")
+        assert await state.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_journaled_missions_load(self):
+        """Test checkpointed missions are loaded, listed and reindexed like saved ones."""
+        backend = MemoryBackend()
+        state = StateManager(backend)
+        checkpointer = MissionCheckpointer(state)
+        mission = make_mission("a", 100, running=[("writer", "s1")])
+        await checkpointer.checkpoint(mission)
+        mission.record_step("writer", "s0")
+        await checkpointer.checkpoint(mission)
+        await state.save_mission(make_mission("b", 200))
+
+        (loaded,) = await state.query_missions(agent="writer")
+        assert loaded.to_dict() == mission.to_dict()
+        assert (await state.load_mission("a")).running_steps == {"s1": "writer"}
+        assert [m.id for m in await state.list_missions()] == ["a", "b"]
+
+        reindexed = StateManager(backend, indexes=[MissionIndex("name", lambda m: m.name)])
+        assert await reindexed.reindex() == 2
+        assert await reindexed.query(name="task") == ["a", "b"]
+
+        # Saved after its last checkpoint: the newer record wins
+        mission.running_steps.clear()
+        await state.save_mission(mission)
+        assert (await state.load_mission("a")).running_steps == {}
+        assert len(await state.list_missions()) == 2
+
+    @pytest.mark.asyncio
+    async def test_engine_indexes_steps_in_flight(self):
+        """Test a mission run by the engine is found by the step it is running."""
+        state = StateManager(MemoryBackend())
+        seen = {}
+
+        async def review(inputs, mission):
+            seen["step"] = await state.query(status="running", step="review")
+            seen["agent"] = await state.query(agent="reviewer")
+            return "ok"
+
+        graph = MissionGraph()
+        graph.add_step("draft", FunctionAgent("writer", lambda inputs, mission: "text"))
+        graph.add_step("review", FunctionAgent("reviewer", review), depends_on=["draft"])
+        engine = OrchestrationEngine(checkpointer=MissionCheckpointer(state))
+        mission = Mission("report", mission_id="a")
+        await engine.run(mission, graph)
+
+        assert seen == {"step": ["a"], "agent": ["a"]}
+        assert mission.running_steps == {}
+        assert await state.query(step="review") == []
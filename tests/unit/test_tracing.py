@@ -0,0 +1,212 @@
+"""Tests for contextvar-based tracing spans."""
+
+import asyncio
+import json
+import logging
+
+import pytest
+from harmonicgalaxy.events.tracing import (
+    STATUS_ERROR,
+    configure_tracing,
+    current_span,
+    shutdown_tracing,
+    span,
+    traced,
+)
+from harmonicgalaxy.llm.client import LLMClient
+from harmonicgalaxy.llm.deadline import deadline
+from harmonicgalaxy.llm.types import LLMConfig, LLMProvider
+from harmonicgalaxy.utils.logging import get_logger, log_context
+
+
+class _ListExporter:
+    """Exporter keeping exported batches in memory."""
+
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append(list(spans))
+
+    def shutdown(self):
+        pass
+
+    @property
+    def spans(self):
+        return [item for batch in self.batches for item in batch]
+
+
+@pytest.fixture
+def exporter():
+    exporter = _ListExporter()
+    configure_tracing(exporter=exporter, schedule_delay=3600)
+    yield exporter
+    shutdown_tracing()
+
+
+@pytest.mark.unit
+class TestSpans:
+    """Test span nesting and export."""
+
+    def test_nesting(self, exporter):
+        """Test child spans share the trace and point to their parent."""
+        with span("mission", mission_id="m-1") as mission:
+            with span("agent") as agent:
+                assert current_span() is agent
+            assert current_span() is mission
+        assert current_span() is None
+        shutdown_tracing()
+
+        child, parent = exporter.spans
+        assert (child.name, parent.name) == ("agent", "mission")
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert parent.parent_id is None
+        assert parent.attributes == {"mission_id": "m-1"}
+        assert parent.duration >= child.duration
+
+    def test_error_status(self, exporter):
+        """Test a failing block marks its span as failed."""
+        with pytest.raises(ValueError):
+            with span("step"):
+                raise ValueError("boom")
+        shutdown_tracing()
+        (failed,) = exporter.spans
+        assert failed.status == STATUS_ERROR
+        assert failed.attributes["exception.type"] == "ValueError"
+
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_span(self):
+        """Test spans opened in spawned tasks are children of the active span."""
+
+        @traced("agent.step")
+        async def step():
+            await asyncio.sleep(0)
+            return current_span()
+
+        with span("mission") as mission:
+            first, second = await asyncio.gather(step(), step())
+        assert first.parent_id == second.parent_id == mission.span_id
+        assert first.span_id != second.span_id
+        assert first.name == "agent.step"
+
+    def test_batching(self, exporter):
+        """Test spans are exported in batches of at most max_batch_size."""
+        configure_tracing(exporter=exporter, max_batch_size=4, schedule_delay=3600)
+        for index in range(10):
+            with span(f"step-{index}"):
+                pass
+        shutdown_tracing()
+        assert [len(batch) for batch in exporter.batches][-3:] == [4, 4, 2]
+
+    def test_jsonl_export(self, tmp_path):
+        """Test the file exporter writes OTLP/JSON lines."""
+        path = tmp_path / "traces.jsonl"
+        configure_tracing(path, service_name="galaxy-test", schedule_delay=3600)
+        with span("mission", retries=2, ratio=0.5, dry_run=False):
+            pass
+        shutdown_tracing()
+
+        (line,) = path.read_text(encoding="utf-8").splitlines()
+        resource_spans = json.loads(line)["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["value"] == {
+            "stringValue": "galaxy-test"
+        }
+        (exported,) = resource_spans["scopeSpans"][0]["spans"]
+        assert exported["name"] == "mission"
+        assert len(exported["traceId"]) == 32 and len(exported["spanId"]) == 16
+        assert int(exported["endTimeUnixNano"]) >= int(exported["startTimeUnixNano"])
+        assert {"key": "retries", "value": {"intValue": "2"}} in exported["attributes"]
+        assert {"key": "dry_run", "value": {"boolValue": False}} in exported["attributes"]
+
+
+@pytest.mark.unit
+class TestLogCorrelation:
+    """Test span IDs are attached to log records."""
+
+    def test_records_carry_span_ids(self, caplog):
+        """Test records logged in a span carry its trace and span IDs."""
+        logger = get_logger("test.tracing")
+        with caplog.at_level(logging.INFO, logger="test.tracing"):
+            with log_context(mission_id="m-7"):
+                with span("agent") as agent:
+                    logger.info("inside")
+            logger.info("outside")
+
+        inside, outside = caplog.records
+        assert inside.trace_id == agent.trace_id
+        assert inside.span_id == agent.span_id
+        assert inside.mission_id == "m-7"
+        assert not hasattr(outside, "span_id")
+
+    def test_extra_takes_precedence(self, caplog):
+        """Test explicit extra values override the log context."""
+        logger = get_logger("test.tracing")
+        with caplog.at_level(logging.INFO, logger="test.tracing"):
+            with log_context(agent_id="outer"):
+                logger.info("message", extra={"agent_id": "explicit"})
+        assert caplog.records[0].agent_id == "explicit"
+
+
+class _FakeClient(LLMClient):
+    """Client whose first attempt fails with a retryable error."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    async def chat(self, messages, **kwargs):
+        async def attempt(timeout):
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("flaky")
+            return current_span()
+
+        async with self._request_scope("chat"):
+            return await self._send(attempt)
+
+    async def stream_chat(self, messages, **kwargs):
+        async with self._request_scope("stream_chat"):
+            for chunk in ("a", "b"):
+                yield current_span()
+
+
+@pytest.mark.unit
+class TestLLMSpans:
+    """Test LLM requests are traced."""
+
+    @pytest.mark.asyncio
+    async def test_chat_spans(self, exporter, monkeypatch):
+        """Test chat opens a request span with one child span per attempt."""
+        monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+        client = _FakeClient(LLMConfig(provider=LLMProvider.OPENAI, model="trace-test"))
+        with span("mission") as mission:
+            with deadline(30):
+                attempt_span = await client.chat([])
+        shutdown_tracing()
+
+        by_name = {}
+        for item in exporter.spans:
+            by_name.setdefault(item.name, []).append(item)
+        (request,) = by_name["llm.chat"]
+        assert request.parent_id == mission.span_id
+        assert request.attributes["llm.model"] == "trace-test"
+        assert [item.attributes["llm.attempt"] for item in by_name["llm.attempt"]] == [0, 1]
+        assert by_name["llm.attempt"][0].status == STATUS_ERROR
+        assert attempt_span.parent_id == request.span_id
+
+    @pytest.mark.asyncio
+    async def test_stream_span_not_active(self, exporter):
+        """Test the stream span does not leak into the consumer's context."""
+        client = _FakeClient(LLMConfig(provider=LLMProvider.OPENAI, model="trace-test"))
+        with span("mission") as mission:
+            async for active in client.stream_chat([]):
+                assert active is mission
+                assert current_span() is mission
+        shutdown_tracing()
+        (request,) = [item for item in exporter.spans if item.name == "llm.stream_chat"]
+        assert request.parent_id == mission.span_id
+
+
+async def _no_sleep(delay):
+    return None